@@ -9,6 +9,10 @@ Usage:
     python build.py              # Build for current platform
     python build.py --onefile    # Build as single executable
     python build.py --clean      # Clean build artifacts first
+
+The build also writes src/mcp_server/tools/tool_manifest.json and bundles it,
+so the packaged server registers tools without scanning plugin directories,
+parsing config.yaml files or importing handlers at startup.
 """
 
 import argparse
@@ -194,6 +198,27 @@ def get_hidden_imports():
     return hidden_imports
 
 
+def generate_tool_manifest() -> Path | None:
+    """Generate the tool manifest used for lazy plugin loading."""
+    manifest_path = PROJECT_ROOT / "src" / "mcp_server" / "tools" / "tool_manifest.json"
+    print("[Manifest] Generating tool manifest...")
+
+    env = os.environ.copy()
+    src_dir = str(PROJECT_ROOT / "src")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [src_dir, env.get("PYTHONPATH")]))
+
+    cmd = [sys.executable, "-m", "mcp_server.tools.manifest", "--output", str(manifest_path)]
+    try:
+        _ = subprocess.run(cmd, check=True, env=env, capture_output=True, text=True)
+    except subprocess.CalledProcessError as e:
+        print(f"[Warning] Tool manifest generation failed (exit code {e.returncode})")
+        print("  The bundle will load all plugins eagerly at startup.\n")
+        return None
+
+    print(f"  Wrote {manifest_path.relative_to(PROJECT_ROOT)}\n")
+    return manifest_path
+
+
 def get_data_files() -> list[Any]:
     """Get list of data files to include (auto-detected)."""
     site_packages = find_site_packages()
@@ -220,6 +245,12 @@ def get_data_files() -> list[Any]:
             data_files.append((str(config_yaml), dest))
             print(f"  Including plugin config: {plugin_name}/config.yaml")
 
+        # Include the tool manifest for lazy plugin loading
+        manifest_path = tools_dir / "tool_manifest.json"
+        if manifest_path.exists():
+            data_files.append((str(manifest_path), os.path.join("mcp_server", "tools")))
+            print("  Including tool manifest: tool_manifest.json")
+
     return data_files
 
 
@@ -291,6 +322,9 @@ def build_executable(onefile: bool = False) -> bool:
         cmd.extend(["--hidden-import", module])
     print()
 
+    # Generate the tool manifest before collecting data files
+    generate_tool_manifest()
+
     # Add data files
     data_files = get_data_files()
     print(f"[Data] Adding {len(data_files)} data files")
@@ -4,7 +4,7 @@ Command execution infrastructure for MCP server.
 Provides secure command execution with:
 - Command whitelist validation
 - Argument sanitization
-- Timeout protection
+- Timeout protection and cooperative cancellation
 - Output size limits
 - Working directory isolation
 - Audit logging
@@ -21,12 +21,19 @@ from .utils import (
     CommandExecutionError,
     CommandTimeoutError,
     CommandValidationError,
+    DeadlineExceededError,
     SecurityError,
+    check_deadline,
+    hot_logger,
     logger,
     sanitize_command_output,
+    time_remaining,
     validate_command_path,
 )
 
+# Seconds between checks for cancellation while a command runs
+_CANCEL_POLL_INTERVAL = 0.1
+
 
 class CommandValidator:
     """Validates commands and arguments for safe execution."""
@@ -145,6 +152,52 @@ class CommandExecutor:
 
         return shutil.which(command) is not None
 
+    def _run_process(self, full_command: list[str], cwd: str, timeout: int) -> tuple[int, str, str]:
+        """
+        Run a command, killing it on timeout or when the tool call is cancelled.
+
+        Args:
+            full_command: Command and arguments
+            cwd: Working directory
+            timeout: Timeout in seconds
+
+        Returns:
+            Tuple of (returncode, stdout, stderr)
+
+        Raises:
+            subprocess.TimeoutExpired: If the command runs longer than timeout
+            DeadlineExceededError: If the tool call is cancelled or out of time
+        """
+        import time
+
+        end_time = time.monotonic() + timeout
+        process = subprocess.Popen(
+            full_command,
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            shell=False,  # CRITICAL: Never use shell=True
+            stdin=subprocess.DEVNULL,  # Close stdin to prevent hanging
+        )
+        try:
+            while True:
+                wait = min(_CANCEL_POLL_INTERVAL, end_time - time.monotonic())
+                remaining = time_remaining()
+                if remaining is not None:
+                    wait = min(wait, remaining)
+                try:
+                    stdout, stderr = process.communicate(timeout=max(0.0, wait))
+                    return process.returncode, stdout, stderr
+                except subprocess.TimeoutExpired:
+                    if time.monotonic() >= end_time:
+                        raise subprocess.TimeoutExpired(full_command, timeout) from None
+                    check_deadline()
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.communicate()
+
     def _validate_working_directory(self, cwd: Optional[str]) -> Path:
         """
         Validate and resolve working directory.
@@ -243,36 +296,28 @@ class CommandExecutor:
 
             # Log command execution (audit)
             logger.info(f"Executing command: {command} with {len(args)} args in {working_dir}")
-            logger.debug(f"Full command: {' '.join(full_command)}")
+            hot_logger.debug(f"Full command: {' '.join(full_command)}")
 
             # Execute command with subprocess (shell=False for security)
-            result = subprocess.run(
-                full_command,
-                cwd=str(working_dir),
-                capture_output=True,
-                text=True,
-                timeout=timeout,
-                shell=False,  # CRITICAL: Never use shell=True
-                stdin=subprocess.DEVNULL,  # Close stdin to prevent hanging
+            returncode, raw_stdout, raw_stderr = self._run_process(
+                full_command, str(working_dir), timeout
             )
 
             execution_time = time.time() - start_time
 
             # Sanitize output
-            stdout = sanitize_command_output(result.stdout)
-            stderr = sanitize_command_output(result.stderr)
+            stdout = sanitize_command_output(raw_stdout)
+            stderr = sanitize_command_output(raw_stderr)
 
             # Log result
-            if result.returncode == 0:
-                logger.info(f"Command completed successfully in {execution_time:.2f}s")
+            if returncode == 0:
+                hot_logger.info(f"Command completed successfully in {execution_time:.2f}s")
             else:
-                logger.warning(
-                    f"Command failed with code {result.returncode} in {execution_time:.2f}s"
-                )
+                logger.warning(f"Command failed with code {returncode} in {execution_time:.2f}s")
 
             return {
-                "success": result.returncode == 0,
-                "returncode": result.returncode,
+                "success": returncode == 0,
+                "returncode": returncode,
                 "stdout": stdout,
                 "stderr": stderr,
                 "execution_time": execution_time,
@@ -284,6 +329,10 @@ class CommandExecutor:
             logger.error(f"Command timed out after {timeout}s")
             raise CommandTimeoutError(f"Command timed out after {timeout} seconds") from e
 
+        except DeadlineExceededError:
+            logger.warning(f"Command stopped: {command} (tool call cancelled or out of time)")
+            raise
+
         except (CommandValidationError, CommandExecutionError, SecurityError):
             raise
 
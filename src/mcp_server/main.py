@@ -7,7 +7,10 @@ Tool counts and descriptions are dynamically loaded from each plugin.
 Author: MCP Server Project
 """
 
+import multiprocessing
+import os
 import sys
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -22,10 +25,21 @@ else:
     except ImportError:
         tomllib = None  # type: ignore
 
-from mcp_server.tools import load_all_plugins
-from mcp_server.utils import logger
+from mcp_server.tools import PluginRegistry, load_all_plugins
+from mcp_server.tools.metrics import cache_stats, get_metrics
+from mcp_server.tools.reloader import PluginWatcher
+from mcp_server.tools.reloader import reload_plugin as _reload_plugin
+from mcp_server.tools.result_cache import get_result_cache
+from mcp_server.tools.streaming import read_next_page
+from mcp_server.utils import logger, to_json
+
+# CPU-bound tools run in spawned worker processes; in a PyInstaller bundle those
+# re-launch this executable and must exit here instead of starting a server.
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
 
 
+@lru_cache(maxsize=1)
 def get_version() -> str:
     """Read version from pyproject.toml"""
     if tomllib is None:
@@ -41,6 +55,13 @@ def get_version() -> str:
         return "0.1.0"
 
 
+# Register tools from the tool manifest and import handlers on first use.
+# Set MCP_SERVER_LAZY_LOAD=0 to import every plugin at startup.
+LAZY_LOAD = os.getenv("MCP_SERVER_LAZY_LOAD", "1").strip().lower() not in ("0", "false", "no")
+
+# Reload plugins automatically when their handlers.py or config.yaml changes
+WATCH_PLUGINS = os.getenv("MCP_SERVER_WATCH_PLUGINS", "0").strip().lower() in ("1", "true", "yes")
+
 # Create the MCP server
 mcp = FastMCP("oh-my-mcp")
 
@@ -51,10 +72,10 @@ logger.info(f"Starting oh-my-mcp v{version}")
 logger.info("=" * 60)
 
 # Load and register all tool plugins
-plugins = load_all_plugins()
-logger.info(f"Discovered {len(plugins)} tool plugins")
+plugin_registry = PluginRegistry(load_all_plugins(lazy=LAZY_LOAD))
+logger.info(f"Discovered {len(plugin_registry.plugins)} tool plugins")
 
-for plugin in plugins:
+for plugin in plugin_registry.plugins:
     logger.info(f"Registering {plugin.category_name} plugin ({len(plugin.tools)} tools)...")
     plugin.register_to_mcp(mcp)
 
@@ -62,7 +83,7 @@ for plugin in plugins:
 # Helper functions for resources
 def get_all_tools_info() -> dict[str, Any]:
     """Get all tools information as a dictionary."""
-    plugins = load_all_plugins()
+    plugins = plugin_registry.plugins
     categories = {}
     total_tools = 0
 
@@ -91,14 +112,12 @@ def get_all_tools_info() -> dict[str, Any]:
 @mcp.resource("config://tools")
 def list_all_tools() -> str:
     """List all available tools organized by category."""
-    import json
-
-    return json.dumps(get_all_tools_info(), indent=2)
+    return plugin_registry.render("config://tools", get_all_tools_info)
 
 
 def get_version_info() -> dict[str, Any]:
     """Get server version information as a dictionary."""
-    plugins = load_all_plugins()
+    plugins = plugin_registry.plugins
     total_tools = sum(len(plugin.tools) for plugin in plugins)
 
     # Build features list from plugin descriptions
@@ -118,9 +137,71 @@ def get_version_info() -> dict[str, Any]:
 @mcp.resource("config://version")
 def get_server_version() -> str:
     """Get server version and information."""
-    import json
+    return plugin_registry.render("config://version", get_version_info)
+
+
+@mcp.resource("config://metrics")
+def get_tool_metrics() -> str:
+    """Get per-tool call counts, latency percentiles, payload sizes, errors and cache usage."""
+    snapshot = get_metrics().snapshot()
+    snapshot["result_cache"] = get_result_cache().stats()
+    # Web caches are reported once the web tools have been loaded
+    snapshot.update(cache_stats())
+    snapshot["concurrency"] = {}
+    for plugin in plugin_registry.plugins:
+        limits = plugin.concurrency_stats()
+        if limits["plugin"] or limits["tools"]:
+            snapshot["concurrency"][plugin.name] = limits
+    return to_json(snapshot)
+
+
+@mcp.resource("config://metrics/prometheus", mime_type="text/plain")
+def get_tool_metrics_prometheus() -> str:
+    """Get per-tool metrics in the Prometheus text exposition format."""
+    return get_metrics().render_prometheus()
+
 
-    return json.dumps(get_version_info(), indent=2)
+@mcp.tool()
+def reload_plugin(name: str) -> str:
+    """
+    Reload a tool plugin from disk without restarting the server.
+
+    Re-imports tools/<name>/handlers.py and config.yaml and re-registers only
+    that plugin's tools. Browser sessions and caches held by other modules are kept.
+
+    Args:
+        name: Plugin directory name (e.g. "web", "browser")
+
+    Returns:
+        JSON string with the added, removed and reloaded tool names
+    """
+    try:
+        result = _reload_plugin(plugin_registry, mcp, name)
+        return to_json({"success": True, **result})
+    except Exception as e:
+        logger.error(f"Failed to reload plugin {name}: {e}")
+        return to_json({"success": False, "plugin": name, "error": str(e)})
+
+
+@mcp.tool()
+async def read_result_page(cursor: str) -> str:
+    """
+    Read the next page of a large tool result.
+
+    Tools with large outputs (e.g. read_file, list_directory, fetch_webpage) return
+    their first page with a next_cursor when the result does not fit in one page.
+    Concatenating the content of all pages gives the complete result.
+
+    Args:
+        cursor: The next_cursor value from the previous page
+
+    Returns:
+        JSON string with content, page number, complete flag and next_cursor
+    """
+    try:
+        return to_json(await read_next_page(cursor))
+    except KeyError as e:
+        return to_json({"success": False, "error": str(e.args[0])})
 
 
 logger.info("=" * 60)
@@ -131,6 +212,9 @@ logger.info("=" * 60)
 
 def main() -> None:
     """Main entry point for the MCP server."""
+    if WATCH_PLUGINS:
+        interval = float(os.getenv("MCP_SERVER_WATCH_INTERVAL", "2"))
+        PluginWatcher(plugin_registry, mcp, interval).start()
     mcp.run()
 
 
@@ -11,7 +11,8 @@ from typing import List
 
 from mcp_server.utils import logger
 
-from .registry import ToolPlugin, load_plugin_config
+from .manifest import is_entry_current, load_manifest, refresh_manifest
+from .registry import PluginRegistry, ToolPlugin, load_plugin_config
 
 
 def _get_tools_dir() -> Path:
@@ -51,23 +52,45 @@ def discover_tool_plugins() -> List[Path]:
     return plugin_dirs
 
 
-def load_all_plugins() -> List[ToolPlugin]:
+def load_all_plugins(lazy: bool = False) -> List[ToolPlugin]:
     """
     Load all enabled tool plugins.
 
     Discovers plugins, loads their configurations, and initializes ToolPlugin instances.
     Disabled plugins (enabled: false in config) are skipped.
 
+    In lazy mode, plugins whose entry in the tool manifest matches their current
+    source hash take their configuration and stub tools from the manifest, and
+    their handlers module is only imported when one of their tools is first
+    called. Plugins without a valid manifest entry are loaded eagerly, after
+    which the manifest is refreshed for the next start. In a PyInstaller bundle
+    the manifest is trusted and also replaces directory discovery.
+
+    Args:
+        lazy: Defer handler imports using the tool manifest (default: False)
+
     Returns:
         List of loaded and enabled ToolPlugin instances
     """
-    plugin_dirs = discover_tool_plugins()
+    manifest = load_manifest() if lazy else None
+    frozen = getattr(sys, "frozen", False)
+
+    if manifest is not None and frozen:
+        tools_dir = _get_tools_dir()
+        plugin_dirs = [tools_dir / name for name in manifest["plugins"]]
+    else:
+        plugin_dirs = discover_tool_plugins()
+
     plugins = []
+    manifest_outdated = lazy and manifest is None
 
     for plugin_dir in plugin_dirs:
         try:
+            entry = manifest["plugins"].get(plugin_dir.name) if manifest else None
+            use_manifest = is_entry_current(entry, plugin_dir)
+
             # Load plugin configuration
-            config = load_plugin_config(plugin_dir)
+            config = entry["config"] if use_manifest and entry else load_plugin_config(plugin_dir)
 
             # Check if plugin is enabled
             if not config.get("enabled", True):
@@ -77,18 +100,35 @@ def load_all_plugins() -> List[ToolPlugin]:
             # Create plugin instance
             plugin = ToolPlugin(plugin_dir, config)
 
-            # Load tool handlers
-            plugin.load_handlers()
+            # Use manifest stubs when they are up to date, otherwise import handlers
+            if use_manifest and entry:
+                try:
+                    plugin.load_stubs(entry["tools"])
+                except Exception as e:
+                    logger.warning(f"Invalid tool manifest entry for {plugin.name}: {e}")
+                    use_manifest = False
+            if use_manifest and entry:
+                logger.info(
+                    f"Registered lazy plugin: {plugin.category_name} ({len(plugin.tools)} tools)"
+                )
+            else:
+                if lazy:
+                    logger.info(f"Tool manifest is outdated for {plugin.name}, loading eagerly")
+                    manifest_outdated = True
+                plugin.load_handlers()
+                logger.info(f"Loaded plugin: {plugin.category_name} ({len(plugin.tools)} tools)")
 
             plugins.append(plugin)
-            logger.info(f"Loaded plugin: {plugin.category_name} ({len(plugin.tools)} tools)")
 
         except Exception as e:
             logger.error(f"Failed to load plugin {plugin_dir.name}: {e}")
             # Continue loading other plugins even if one fails
             continue
 
+    if manifest_outdated and not frozen:
+        refresh_manifest(plugins)
+
     return plugins
 
 
-__all__ = ["load_all_plugins", "ToolPlugin"]
+__all__ = ["load_all_plugins", "PluginRegistry", "ToolPlugin"]
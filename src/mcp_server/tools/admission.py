@@ -0,0 +1,216 @@
+"""
+Concurrency limits and admission control for tool calls.
+
+Tools and whole plugins can cap how many calls run at once. A call that finds
+its limit reached waits in a bounded queue for up to ``queue_timeout`` seconds;
+when the queue is full, or the wait times out, the call is rejected at once
+with ToolBusyError instead of piling up threads, sockets or browser sessions.
+
+Limits are declared per tool (``@tool_handler(max_concurrent=2)`` or under
+``tools:`` in config.yaml) and per plugin (``concurrency:`` in config.yaml):
+
+    concurrency:            # all tools of the plugin together
+      max_concurrent: 8
+    tools:
+      browser_open:
+        max_concurrent: 2   # calls running at once
+        max_queue: 8        # calls waiting for a slot (default: 0, reject at once)
+        queue_timeout: 60   # seconds a call may wait (default: 30)
+"""
+
+import asyncio
+import functools
+import threading
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from mcp_server.utils import ToolBusyError, logger
+
+DEFAULT_QUEUE_TIMEOUT = 30.0
+
+
+class ConcurrencyLimiter:
+    """
+    Semaphore with a bounded wait queue, usable from any event loop.
+
+    Waiters are woken in FIFO order. Unlike asyncio.Semaphore it is not bound
+    to one event loop, so it can be shared by every call of a tool.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrent: int,
+        max_queue: int = 0,
+        queue_timeout: float = DEFAULT_QUEUE_TIMEOUT,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            name: Tool or plugin name, used in error messages
+            max_concurrent: Maximum number of calls running at once
+            max_queue: Maximum number of calls waiting for a slot
+            queue_timeout: Maximum seconds a call waits for a slot
+        """
+        self.name = name
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.rejected = 0
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, "asyncio.Future[None]"]] = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def waiting(self) -> int:
+        """Number of calls waiting for a slot."""
+        return len(self._waiters)
+
+    async def acquire(self, timeout: Optional[float] = None) -> None:
+        """
+        Take a slot, waiting in the queue if all slots are in use.
+
+        Args:
+            timeout: Maximum seconds to wait (default: queue_timeout)
+
+        Raises:
+            ToolBusyError: If the queue is full or no slot frees up in time
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self.active < self.max_concurrent and not self._waiters:
+                self.active += 1
+                return
+            if len(self._waiters) >= self.max_queue:
+                self.rejected += 1
+                raise ToolBusyError(
+                    f"{self.name} is busy ({self.active} running, "
+                    f"{len(self._waiters)} queued); try again later"
+                )
+            future: "asyncio.Future[None]" = loop.create_future()
+            waiter = (loop, future)
+            self._waiters.append(waiter)
+
+        wait = self.queue_timeout if timeout is None else timeout
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout=max(0.0, wait))
+        except (TimeoutError, asyncio.CancelledError) as e:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                    granted = False
+                else:
+                    # The slot was handed over just as the wait ended
+                    granted = True
+            if granted:
+                self.release()
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            with self._lock:
+                self.rejected += 1
+            raise ToolBusyError(
+                f"{self.name} is busy; no slot became free within {wait:g}s"
+            ) from None
+
+    def release(self) -> None:
+        """Free a slot, handing it to the first waiting call if any."""
+        with self._lock:
+            while self._waiters:
+                loop, future = self._waiters.popleft()
+                if loop.is_closed():
+                    continue
+                # The slot passes directly to the waiter, so active stays the same
+                loop.call_soon_threadsafe(_grant, future)
+                return
+            self.active -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the limiter's current usage."""
+        with self._lock:
+            return {
+                "max_concurrent": self.max_concurrent,
+                "max_queue": self.max_queue,
+                "active": self.active,
+                "waiting": len(self._waiters),
+                "rejected": self.rejected,
+            }
+
+
+def _grant(future: "asyncio.Future[None]") -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+def limiter_from_options(name: str, options: Dict[str, Any]) -> Optional[ConcurrencyLimiter]:
+    """
+    Create a limiter from tool or plugin options.
+
+    Args:
+        name: Tool or plugin name
+        options: Dictionary that may contain max_concurrent, max_queue and queue_timeout
+
+    Returns:
+        A limiter, or None if max_concurrent is not set
+    """
+    max_concurrent = options.get("max_concurrent")
+    if not max_concurrent:
+        return None
+    return ConcurrencyLimiter(
+        name,
+        int(max_concurrent),
+        max_queue=int(options.get("max_queue", 0)),
+        queue_timeout=float(options.get("queue_timeout", DEFAULT_QUEUE_TIMEOUT)),
+    )
+
+
+def limit_concurrency(
+    func: Callable[..., Awaitable[Any]], limiters: List[ConcurrencyLimiter]
+) -> Callable[..., Awaitable[Any]]:
+    """
+    Wrap an async tool so each call holds a slot of every limiter while it runs.
+
+    Args:
+        func: Async tool function
+        limiters: Limiters to acquire in order (e.g. tool, then plugin)
+
+    Returns:
+        Async function with the same signature
+    """
+    if not limiters:
+        return func
+
+    @functools.wraps(func)
+    async def limited_tool(*args: Any, **kwargs: Any) -> Any:
+        async with hold_slots(limiters, func.__name__):
+            return await func(*args, **kwargs)
+
+    return limited_tool
+
+
+@asynccontextmanager
+async def hold_slots(limiters: List[ConcurrencyLimiter], name: str) -> AsyncIterator[None]:
+    """
+    Hold a slot of every limiter for the enclosed code.
+
+    Args:
+        limiters: Limiters to acquire in order (e.g. tool, then plugin)
+        name: Tool name used in log messages
+
+    Raises:
+        ToolBusyError: If a limiter rejects the call
+    """
+    acquired: List[ConcurrencyLimiter] = []
+    try:
+        for limiter in limiters:
+            try:
+                await limiter.acquire()
+            except ToolBusyError as e:
+                logger.warning(f"Rejected call to {name}: {e}")
+                raise
+            acquired.append(limiter)
+        yield
+    finally:
+        for limiter in reversed(acquired):
+            limiter.release()
@@ -19,14 +19,18 @@ import base64
 import json
 import time
 from datetime import datetime
+from typing import Iterator
 
 from mcp_server.tools.registry import tool_handler
+from mcp_server.tools.streaming import CHUNK_SIZE, StreamedString, iter_json_object
 from mcp_server.utils import (
     BrowserError,
     SecurityError,
     ValidationError,
+    deadline_timeout,
     logger,
     sanitize_path,
+    to_json,
     truncate_text,
 )
 
@@ -91,17 +95,17 @@ def browser_open(
             "current_url": driver.current_url,
             "title": driver.title,
         }
-        return json.dumps(result, indent=2, ensure_ascii=False)
+        return to_json(result)
 
     except (ValidationError, SecurityError) as e:
         logger.warning(f"browser_open validation error: {e}")
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
     except BrowserError as e:
         logger.error(f"browser_open failed: {e}")
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
     except Exception as e:
         logger.error(f"browser_open unexpected error: {e}")
-        return json.dumps({"error": f"Failed to open browser: {e}"})
+        return to_json({"error": f"Failed to open browser: {e}"})
 
 
 @tool_handler
@@ -119,13 +123,13 @@ def browser_close(session_id: str) -> str:
     """
     try:
         session_manager.close_session(session_id)
-        return json.dumps({"success": True, "message": f"Session {session_id} closed"})
+        return to_json({"success": True, "message": f"Session {session_id} closed"})
     except BrowserError as e:
         logger.error(f"browser_close failed: {e}")
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
     except Exception as e:
         logger.error(f"browser_close unexpected error: {e}")
-        return json.dumps({"error": f"Failed to close browser: {e}"})
+        return to_json({"error": f"Failed to close browser: {e}"})
 
 
 @tool_handler
@@ -141,18 +145,16 @@ def browser_list_sessions() -> str:
     """
     try:
         sessions = session_manager.list_sessions()
-        return json.dumps(
+        return to_json(
             {
                 "success": True,
                 "session_count": len(sessions),
                 "sessions": sessions,
-            },
-            indent=2,
-            ensure_ascii=False,
+            }
         )
     except Exception as e:
         logger.error(f"browser_list_sessions failed: {e}")
-        return json.dumps({"error": f"Failed to list sessions: {e}"})
+        return to_json({"error": f"Failed to list sessions: {e}"})
 
 
 # =============================================================================
@@ -177,23 +179,21 @@ def browser_navigate(session_id: str, url: str) -> str:
         driver = session_manager.get_session(session_id)
         driver.get(url)
 
-        return json.dumps(
+        return to_json(
             {
                 "success": True,
                 "session_id": session_id,
                 "current_url": driver.current_url,
                 "title": driver.title,
-            },
-            indent=2,
-            ensure_ascii=False,
+            }
         )
     except (ValidationError, SecurityError) as e:
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
     except BrowserError as e:
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
     except Exception as e:
         logger.error(f"browser_navigate failed: {e}")
-        return json.dumps({"error": f"Navigation failed: {e}"})
+        return to_json({"error": f"Navigation failed: {e}"})
 
 
 @tool_handler
@@ -212,21 +212,19 @@ def browser_back(session_id: str) -> str:
         driver.back()
         time.sleep(0.5)  # Allow page to load
 
-        return json.dumps(
+        return to_json(
             {
                 "success": True,
                 "session_id": session_id,
                 "current_url": driver.current_url,
                 "title": driver.title,
-            },
-            indent=2,
-            ensure_ascii=False,
+            }
         )
     except BrowserError as e:
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
     except Exception as e:
         logger.error(f"browser_back failed: {e}")
-        return json.dumps({"error": f"Back navigation failed: {e}"})
+        return to_json({"error": f"Back navigation failed: {e}"})
 
 
 @tool_handler
@@ -245,21 +243,19 @@ def browser_forward(session_id: str) -> str:
         driver.forward()
         time.sleep(0.5)  # Allow page to load
 
-        return json.dumps(
+        return to_json(
             {
                 "success": True,
                 "session_id": session_id,
                 "current_url": driver.current_url,
                 "title": driver.title,
-            },
-            indent=2,
-            ensure_ascii=False,
+            }
         )
     except BrowserError as e:
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
     except Exception as e:
         logger.error(f"browser_forward failed: {e}")
-        return json.dumps({"error": f"Forward navigation failed: {e}"})
+        return to_json({"error": f"Forward navigation failed: {e}"})
 
 
 @tool_handler
@@ -277,21 +273,19 @@ def browser_refresh(session_id: str) -> str:
         driver = session_manager.get_session(session_id)
         driver.refresh()
 
-        return json.dumps(
+        return to_json(
             {
                 "success": True,
                 "session_id": session_id,
                 "current_url": driver.current_url,
                 "title": driver.title,
-            },
-            indent=2,
-            ensure_ascii=False,
+            }
         )
     except BrowserError as e:
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
     except Exception as e:
         logger.error(f"browser_refresh failed: {e}")
-        return json.dumps({"error": f"Refresh failed: {e}"})
+        return to_json({"error": f"Refresh failed: {e}"})
 
 
 # =============================================================================
@@ -299,14 +293,15 @@ def browser_refresh(session_id: str) -> str:
 # =============================================================================
 
 
-@tool_handler
-def browser_get_page_source(session_id: str, max_length: int = 50000) -> str:
+@tool_handler(streaming=True)
+def browser_get_page_source(session_id: str, max_length: int = 50000) -> Iterator[str]:
     """
     Get the HTML source code of the current page.
 
     Args:
         session_id: The session ID
-        max_length: Maximum length of source to return (truncated if exceeded)
+        max_length: Maximum length of source to return (truncated if exceeded,
+            0 returns the full source in pages)
 
     Returns:
         JSON string with page source (may be truncated)
@@ -314,30 +309,29 @@ def browser_get_page_source(session_id: str, max_length: int = 50000) -> str:
     try:
         driver = session_manager.get_session(session_id)
         source = driver.page_source
+        source_length = len(source)
 
         truncated = False
-        if len(source) > max_length:
+        if 0 < max_length < source_length:
             source = truncate_text(source, max_length, suffix="... [TRUNCATED]")
             truncated = True
 
-        return json.dumps(
-            {
-                "success": True,
-                "session_id": session_id,
-                "url": driver.current_url,
-                "title": driver.title,
-                "source_length": len(driver.page_source),
-                "truncated": truncated,
-                "source": source,
-            },
-            indent=2,
-            ensure_ascii=False,
-        )
+        chunks = (source[i : i + CHUNK_SIZE] for i in range(0, len(source), CHUNK_SIZE))
+        fields = [
+            ("success", True),
+            ("session_id", session_id),
+            ("url", driver.current_url),
+            ("title", driver.title),
+            ("source_length", source_length),
+            ("truncated", truncated),
+            ("source", StreamedString(chunks)),
+        ]
+        yield from iter_json_object(fields)
     except BrowserError as e:
-        return json.dumps({"error": str(e)})
+        yield to_json({"error": str(e)})
     except Exception as e:
         logger.error(f"browser_get_page_source failed: {e}")
-        return json.dumps({"error": f"Failed to get page source: {e}"})
+        yield to_json({"error": f"Failed to get page source: {e}"})
 
 
 @tool_handler
@@ -369,7 +363,7 @@ def browser_get_text(
             text = truncate_text(text, max_length, suffix="... [TRUNCATED]")
             truncated = True
 
-        return json.dumps(
+        return to_json(
             {
                 "success": True,
                 "session_id": session_id,
@@ -377,15 +371,13 @@ def browser_get_text(
                 "text_length": len(element.text),
                 "truncated": truncated,
                 "text": text,
-            },
-            indent=2,
-            ensure_ascii=False,
+            }
         )
     except BrowserError as e:
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
     except Exception as e:
         logger.error(f"browser_get_text failed: {e}")
-        return json.dumps({"error": f"Failed to get element text: {e}"})
+        return to_json({"error": f"Failed to get element text: {e}"})
 
 
 @tool_handler
@@ -402,21 +394,19 @@ def browser_get_url(session_id: str) -> str:
     try:
         driver = session_manager.get_session(session_id)
 
-        return json.dumps(
+        return to_json(
             {
                 "success": True,
                 "session_id": session_id,
                 "url": driver.current_url,
                 "title": driver.title,
-            },
-            indent=2,
-            ensure_ascii=False,
+            }
         )
     except BrowserError as e:
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
     except Exception as e:
         logger.error(f"browser_get_url failed: {e}")
-        return json.dumps({"error": f"Failed to get URL: {e}"})
+        return to_json({"error": f"Failed to get URL: {e}"})
 
 
 # =============================================================================
@@ -448,26 +438,24 @@ def browser_click(session_id: str, selector: str, by: str = "css", timeout: int
         driver = session_manager.get_session(session_id)
         by_type = _resolve_selector(by)
 
-        wait = WebDriverWait(driver, timeout)
+        wait = WebDriverWait(driver, deadline_timeout(timeout))
         element = wait.until(EC.element_to_be_clickable((by_type, selector)))
         element.click()
 
-        return json.dumps(
+        return to_json(
             {
                 "success": True,
                 "session_id": session_id,
                 "action": "click",
                 "selector": selector,
                 "current_url": driver.current_url,
-            },
-            indent=2,
-            ensure_ascii=False,
+            }
         )
     except BrowserError as e:
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
     except Exception as e:
         logger.error(f"browser_click failed: {e}")
-        return json.dumps({"error": f"Click failed: {e}"})
+        return to_json({"error": f"Click failed: {e}"})
 
 
 @tool_handler
@@ -501,7 +489,7 @@ def browser_type(
         driver = session_manager.get_session(session_id)
         by_type = _resolve_selector(by)
 
-        wait = WebDriverWait(driver, timeout)
+        wait = WebDriverWait(driver, deadline_timeout(timeout))
         element = wait.until(EC.presence_of_element_located((by_type, selector)))
 
         if clear:
@@ -509,7 +497,7 @@ def browser_type(
 
         element.send_keys(text)
 
-        return json.dumps(
+        return to_json(
             {
                 "success": True,
                 "session_id": session_id,
@@ -517,15 +505,13 @@ def browser_type(
                 "selector": selector,
                 "text_length": len(text),
                 "cleared": clear,
-            },
-            indent=2,
-            ensure_ascii=False,
+            }
         )
     except BrowserError as e:
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
     except Exception as e:
         logger.error(f"browser_type failed: {e}")
-        return json.dumps({"error": f"Type failed: {e}"})
+        return to_json({"error": f"Type failed: {e}"})
 
 
 @tool_handler
@@ -559,7 +545,7 @@ def browser_select(
         driver = session_manager.get_session(session_id)
         by_type = _resolve_selector(by)
 
-        wait = WebDriverWait(driver, timeout)
+        wait = WebDriverWait(driver, deadline_timeout(timeout))
         element = wait.until(EC.presence_of_element_located((by_type, selector)))
 
         select = Select(element)
@@ -573,7 +559,7 @@ def browser_select(
         else:
             raise ValidationError(f"Invalid select_by value: {select_by}")
 
-        return json.dumps(
+        return to_json(
             {
                 "success": True,
                 "session_id": session_id,
@@ -581,17 +567,15 @@ def browser_select(
                 "selector": selector,
                 "value": value,
                 "select_by": select_by,
-            },
-            indent=2,
-            ensure_ascii=False,
+            }
         )
     except BrowserError as e:
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
     except ValidationError as e:
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
     except Exception as e:
         logger.error(f"browser_select failed: {e}")
-        return json.dumps({"error": f"Select failed: {e}"})
+        return to_json({"error": f"Select failed: {e}"})
 
 
 @tool_handler
@@ -627,7 +611,7 @@ def browser_wait_for(
         driver = session_manager.get_session(session_id)
         by_type = _resolve_selector(by)
 
-        wait = WebDriverWait(driver, timeout)
+        wait = WebDriverWait(driver, deadline_timeout(timeout))
 
         if condition == "present":
             wait.until(EC.presence_of_element_located((by_type, selector)))
@@ -642,25 +626,23 @@ def browser_wait_for(
                 f"Invalid condition: {condition}. " f"Use: present, visible, clickable, gone"
             )
 
-        return json.dumps(
+        return to_json(
             {
                 "success": True,
                 "session_id": session_id,
                 "selector": selector,
                 "condition": condition,
                 "timeout": timeout,
-            },
-            indent=2,
-            ensure_ascii=False,
+            }
         )
     except BrowserError as e:
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
     except ValidationError as e:
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
     except Exception as e:
         # Timeout exceptions
         logger.warning(f"browser_wait_for timed out: {e}")
-        return json.dumps(
+        return to_json(
             {
                 "error": f"Timeout waiting for element '{selector}' to be {condition}",
                 "timeout": timeout,
@@ -762,36 +744,32 @@ def browser_screenshot(
             with open(final_save_path, "wb") as f:
                 f.write(screenshot_data)
 
-            return json.dumps(
+            return to_json(
                 {
                     "success": True,
                     "session_id": session_id,
                     "saved_to": str(final_save_path),
                     "size_bytes": len(screenshot_data),
-                },
-                indent=2,
-                ensure_ascii=False,
+                }
             )
         else:
             # Return base64 encoded
             b64_data = base64.b64encode(screenshot_data).decode("utf-8")
-            return json.dumps(
+            return to_json(
                 {
                     "success": True,
                     "session_id": session_id,
                     "format": "png",
                     "size_bytes": len(screenshot_data),
                     "base64": b64_data,
-                },
-                indent=2,
-                ensure_ascii=False,
+                }
             )
 
     except BrowserError as e:
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
     except Exception as e:
         logger.error(f"browser_screenshot failed: {e}")
-        return json.dumps({"error": f"Screenshot failed: {e}"})
+        return to_json({"error": f"Screenshot failed: {e}"})
 
 
 # =============================================================================
@@ -824,25 +802,23 @@ def browser_execute_js(session_id: str, script: str, args: str = "[]") -> str:
 
         # Serialize result (handle non-JSON-serializable types)
         try:
-            serialized = json.dumps(result, ensure_ascii=False)
+            serialized = to_json(result)
             result_data = json.loads(serialized)
         except (TypeError, ValueError):
             result_data = str(result)
 
-        return json.dumps(
+        return to_json(
             {
                 "success": True,
                 "session_id": session_id,
                 "result": result_data,
-            },
-            indent=2,
-            ensure_ascii=False,
+            }
         )
     except BrowserError as e:
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
     except Exception as e:
         logger.error(f"browser_execute_js failed: {e}")
-        return json.dumps({"error": f"JavaScript execution failed: {e}"})
+        return to_json({"error": f"JavaScript execution failed: {e}"})
 
 
 # =============================================================================
@@ -867,22 +843,20 @@ def browser_get_console_logs(session_id: str, level: str = "all") -> str:
     try:
         logs = session_manager.get_console_logs(session_id, level)
 
-        return json.dumps(
+        return to_json(
             {
                 "success": True,
                 "session_id": session_id,
                 "level_filter": level,
                 "log_count": len(logs),
                 "logs": logs,
-            },
-            indent=2,
-            ensure_ascii=False,
+            }
         )
     except BrowserError as e:
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
     except Exception as e:
         logger.error(f"browser_get_console_logs failed: {e}")
-        return json.dumps({"error": f"Failed to get console logs: {e}"})
+        return to_json({"error": f"Failed to get console logs: {e}"})
 
 
 # =============================================================================
@@ -909,21 +883,19 @@ def browser_get_cookies(session_id: str, name: str = "") -> str:
         if name:
             cookies = [c for c in cookies if c.get("name") == name]
 
-        return json.dumps(
+        return to_json(
             {
                 "success": True,
                 "session_id": session_id,
                 "cookie_count": len(cookies),
                 "cookies": cookies,
-            },
-            indent=2,
-            ensure_ascii=False,
+            }
         )
     except BrowserError as e:
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
     except Exception as e:
         logger.error(f"browser_get_cookies failed: {e}")
-        return json.dumps({"error": f"Failed to get cookies: {e}"})
+        return to_json({"error": f"Failed to get cookies: {e}"})
 
 
 @tool_handler
@@ -972,21 +944,19 @@ def browser_set_cookie(
 
         driver.add_cookie(cookie)
 
-        return json.dumps(
+        return to_json(
             {
                 "success": True,
                 "session_id": session_id,
                 "cookie_name": name,
                 "message": f"Cookie '{name}' set successfully",
-            },
-            indent=2,
-            ensure_ascii=False,
+            }
         )
     except BrowserError as e:
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
     except Exception as e:
         logger.error(f"browser_set_cookie failed: {e}")
-        return json.dumps({"error": f"Failed to set cookie: {e}"})
+        return to_json({"error": f"Failed to set cookie: {e}"})
 
 
 @tool_handler
@@ -1011,20 +981,18 @@ def browser_delete_cookies(session_id: str, name: str = "") -> str:
             driver.delete_all_cookies()
             message = "All cookies deleted"
 
-        return json.dumps(
+        return to_json(
             {
                 "success": True,
                 "session_id": session_id,
                 "message": message,
-            },
-            indent=2,
-            ensure_ascii=False,
+            }
         )
     except BrowserError as e:
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
     except Exception as e:
         logger.error(f"browser_delete_cookies failed: {e}")
-        return json.dumps({"error": f"Failed to delete cookies: {e}"})
+        return to_json({"error": f"Failed to delete cookies: {e}"})
 
 
 # =============================================================================
@@ -1049,20 +1017,18 @@ def browser_enable_network_log(session_id: str) -> str:
     try:
         session_manager.enable_network_logging(session_id)
 
-        return json.dumps(
+        return to_json(
             {
                 "success": True,
                 "session_id": session_id,
                 "message": "Network logging enabled. Use browser_get_network_logs to retrieve.",
-            },
-            indent=2,
-            ensure_ascii=False,
+            }
         )
     except BrowserError as e:
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
     except Exception as e:
         logger.error(f"browser_enable_network_log failed: {e}")
-        return json.dumps({"error": f"Failed to enable network logging: {e}"})
+        return to_json({"error": f"Failed to enable network logging: {e}"})
 
 
 @tool_handler
@@ -1094,7 +1060,7 @@ def browser_get_network_logs(
             limit=limit,
         )
 
-        return json.dumps(
+        return to_json(
             {
                 "success": True,
                 "session_id": session_id,
@@ -1102,15 +1068,13 @@ def browser_get_network_logs(
                 "filter_method": filter_method,
                 "log_count": len(logs),
                 "logs": logs,
-            },
-            indent=2,
-            ensure_ascii=False,
+            }
         )
     except BrowserError as e:
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
     except Exception as e:
         logger.error(f"browser_get_network_logs failed: {e}")
-        return json.dumps({"error": f"Failed to get network logs: {e}"})
+        return to_json({"error": f"Failed to get network logs: {e}"})
 
 
 # =============================================================================
@@ -1194,23 +1158,21 @@ def browser_fill_form(session_id: str, form_data: str, by: str = "css") -> str:
             except Exception as e:
                 results.append({"selector": selector, "status": "error", "error": str(e)})
 
-        return json.dumps(
+        return to_json(
             {
                 "success": True,
                 "session_id": session_id,
                 "fields_processed": len(results),
                 "results": results,
-            },
-            indent=2,
-            ensure_ascii=False,
+            }
         )
     except BrowserError as e:
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
     except ValidationError as e:
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
     except Exception as e:
         logger.error(f"browser_fill_form failed: {e}")
-        return json.dumps({"error": f"Form fill failed: {e}"})
+        return to_json({"error": f"Form fill failed: {e}"})
 
 
 # =============================================================================
@@ -1244,24 +1206,22 @@ def browser_new_tab(session_id: str, url: str = "") -> str:
             _validate_navigation_url(url)
             driver.get(url)
 
-        return json.dumps(
+        return to_json(
             {
                 "success": True,
                 "session_id": session_id,
                 "tab_index": len(handles) - 1,
                 "tab_count": len(handles),
                 "current_url": driver.current_url,
-            },
-            indent=2,
-            ensure_ascii=False,
+            }
         )
     except (ValidationError, SecurityError) as e:
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
     except BrowserError as e:
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
     except Exception as e:
         logger.error(f"browser_new_tab failed: {e}")
-        return json.dumps({"error": f"Failed to open new tab: {e}"})
+        return to_json({"error": f"Failed to open new tab: {e}"})
 
 
 @tool_handler
@@ -1287,7 +1247,7 @@ def browser_switch_tab(session_id: str, tab_index: int) -> str:
 
         driver.switch_to.window(handles[tab_index])
 
-        return json.dumps(
+        return to_json(
             {
                 "success": True,
                 "session_id": session_id,
@@ -1295,17 +1255,15 @@ def browser_switch_tab(session_id: str, tab_index: int) -> str:
                 "tab_count": len(handles),
                 "current_url": driver.current_url,
                 "title": driver.title,
-            },
-            indent=2,
-            ensure_ascii=False,
+            }
         )
     except ValidationError as e:
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
     except BrowserError as e:
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
     except Exception as e:
         logger.error(f"browser_switch_tab failed: {e}")
-        return json.dumps({"error": f"Failed to switch tab: {e}"})
+        return to_json({"error": f"Failed to switch tab: {e}"})
 
 
 @tool_handler
@@ -1352,23 +1310,21 @@ def browser_close_tab(session_id: str, tab_index: int = -1) -> str:
             else:
                 driver.switch_to.window(remaining[0])
 
-        return json.dumps(
+        return to_json(
             {
                 "success": True,
                 "session_id": session_id,
                 "tab_count": len(driver.window_handles),
                 "current_url": driver.current_url,
-            },
-            indent=2,
-            ensure_ascii=False,
+            }
         )
     except ValidationError as e:
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
     except BrowserError as e:
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
     except Exception as e:
         logger.error(f"browser_close_tab failed: {e}")
-        return json.dumps({"error": f"Failed to close tab: {e}"})
+        return to_json({"error": f"Failed to close tab: {e}"})
 
 
 @tool_handler
@@ -1403,21 +1359,19 @@ def browser_list_tabs(session_id: str) -> str:
         # Switch back to original tab
         driver.switch_to.window(current_handle)
 
-        return json.dumps(
+        return to_json(
             {
                 "success": True,
                 "session_id": session_id,
                 "tab_count": len(tabs),
                 "tabs": tabs,
-            },
-            indent=2,
-            ensure_ascii=False,
+            }
         )
     except BrowserError as e:
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
     except Exception as e:
         logger.error(f"browser_list_tabs failed: {e}")
-        return json.dumps({"error": f"Failed to list tabs: {e}"})
+        return to_json({"error": f"Failed to list tabs: {e}"})
 
 
 # =============================================================================
@@ -1472,22 +1426,20 @@ def browser_find_elements(
             except Exception:
                 continue
 
-        return json.dumps(
+        return to_json(
             {
                 "success": True,
                 "session_id": session_id,
                 "selector": selector,
                 "element_count": len(element_data),
                 "elements": element_data,
-            },
-            indent=2,
-            ensure_ascii=False,
+            }
         )
     except BrowserError as e:
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
     except Exception as e:
         logger.error(f"browser_find_elements failed: {e}")
-        return json.dumps({"error": f"Failed to find elements: {e}"})
+        return to_json({"error": f"Failed to find elements: {e}"})
 
 
 @tool_handler
@@ -1518,22 +1470,20 @@ def browser_get_element_attribute(
         element = driver.find_element(by_type, selector)
         value = element.get_attribute(attribute)
 
-        return json.dumps(
+        return to_json(
             {
                 "success": True,
                 "session_id": session_id,
                 "selector": selector,
                 "attribute": attribute,
                 "value": value,
-            },
-            indent=2,
-            ensure_ascii=False,
+            }
         )
     except BrowserError as e:
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
     except Exception as e:
         logger.error(f"browser_get_element_attribute failed: {e}")
-        return json.dumps({"error": f"Failed to get attribute: {e}"})
+        return to_json({"error": f"Failed to get attribute: {e}"})
 
 
 @tool_handler
@@ -1595,22 +1545,20 @@ def browser_scroll(
                     f"Invalid direction: {direction}. Use: up, down, left, right, top, bottom"
                 )
 
-        return json.dumps(
+        return to_json(
             {
                 "success": True,
                 "session_id": session_id,
                 "action": action,
-            },
-            indent=2,
-            ensure_ascii=False,
+            }
         )
     except ValidationError as e:
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
     except BrowserError as e:
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
     except Exception as e:
         logger.error(f"browser_scroll failed: {e}")
-        return json.dumps({"error": f"Scroll failed: {e}"})
+        return to_json({"error": f"Scroll failed: {e}"})
 
 
 # =============================================================================
@@ -1653,13 +1601,13 @@ def browser_config_get(key: str = "") -> str:
         elif key == "screenshot_dir":
             result = {"screenshot_dir": config.get_screenshot_dir()}
         else:
-            return json.dumps({"error": f"Unknown config key: {key}"})
+            return to_json({"error": f"Unknown config key: {key}"})
 
-        return json.dumps(result, indent=2, ensure_ascii=False)
+        return to_json(result)
 
     except Exception as e:
         logger.error(f"browser_config_get failed: {e}")
-        return json.dumps({"error": f"Failed to get config: {e}"})
+        return to_json({"error": f"Failed to get config: {e}"})
 
 
 @tool_handler
@@ -1697,18 +1645,18 @@ def browser_config_set(key: str, value: str) -> str:
         elif key == "screenshot_dir":
             config.set_screenshot_dir(value)
         else:
-            return json.dumps({"error": f"Unknown config key: {key}"})
+            return to_json({"error": f"Unknown config key: {key}"})
 
         result = {
             "success": True,
             "message": f"Configuration saved: {key} = {value}",
             "config_file": str(config.config_path),
         }
-        return json.dumps(result, indent=2, ensure_ascii=False)
+        return to_json(result)
 
     except Exception as e:
         logger.error(f"browser_config_set failed: {e}")
-        return json.dumps({"error": f"Failed to set config: {e}"})
+        return to_json({"error": f"Failed to set config: {e}"})
 
 
 @tool_handler
@@ -1725,16 +1673,14 @@ def browser_config_reset() -> str:
         config = get_browser_config()
         config.reset_config()
 
-        return json.dumps(
+        return to_json(
             {
                 "success": True,
                 "message": "Browser configuration has been reset to defaults",
                 "config_file": str(config.config_path),
-            },
-            indent=2,
-            ensure_ascii=False,
+            }
         )
 
     except Exception as e:
         logger.error(f"browser_config_reset failed: {e}")
-        return json.dumps({"error": f"Failed to reset config: {e}"})
+        return to_json({"error": f"Failed to reset config: {e}"})
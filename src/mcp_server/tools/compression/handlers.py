@@ -7,7 +7,6 @@ Provides tools for:
 - Archive content listing
 """
 
-import json
 import tarfile
 import zipfile
 from typing import List, Optional
@@ -20,6 +19,7 @@ from mcp_server.utils import (
     logger,
     safe_get_file_size,
     sanitize_path,
+    to_json,
     validate_archive_safety,
 )
 
@@ -79,7 +79,7 @@ def compress_zip(files: List[str], output_path: str, compression_level: int = 6)
             f"{format_bytes(compressed_size)})"
         )
 
-        return json.dumps(
+        return to_json(
             {
                 "success": True,
                 "archive_path": str(output),
@@ -92,10 +92,10 @@ def compress_zip(files: List[str], output_path: str, compression_level: int = 6)
 
     except (ValidationError, FileOperationError) as e:
         logger.error(f"ZIP compression failed: {e}")
-        return json.dumps({"error": str(e), "type": "validation"})
+        return to_json({"error": str(e), "type": "validation"})
     except Exception as e:
         logger.error(f"Unexpected error in compress_zip: {e}")
-        return json.dumps({"error": str(e), "type": "unknown"})
+        return to_json({"error": str(e), "type": "unknown"})
 
 
 @tool_handler
@@ -156,7 +156,7 @@ def extract_zip(zip_path: str, extract_to: str = ".", password: Optional[str] =
             f"{format_bytes(total_size)})"
         )
 
-        return json.dumps(
+        return to_json(
             {
                 "success": True,
                 "extracted_files": extracted_files,
@@ -168,17 +168,17 @@ def extract_zip(zip_path: str, extract_to: str = ".", password: Optional[str] =
 
     except (ValidationError, FileOperationError) as e:
         logger.error(f"ZIP extraction failed: {e}")
-        return json.dumps({"error": str(e), "type": "validation"})
+        return to_json({"error": str(e), "type": "validation"})
     except zipfile.BadZipFile as e:
         logger.error(f"Invalid ZIP file: {e}")
-        return json.dumps({"error": f"Invalid ZIP file: {e}", "type": "file"})
+        return to_json({"error": f"Invalid ZIP file: {e}", "type": "file"})
     except RuntimeError as e:
         # 密码错误或加密问题
         logger.error(f"ZIP extraction error: {e}")
-        return json.dumps({"error": f"Extraction failed (check password): {e}", "type": "file"})
+        return to_json({"error": f"Extraction failed (check password): {e}", "type": "file"})
     except Exception as e:
         logger.error(f"Unexpected error in extract_zip: {e}")
-        return json.dumps({"error": str(e), "type": "unknown"})
+        return to_json({"error": str(e), "type": "unknown"})
 
 
 @tool_handler
@@ -238,7 +238,7 @@ def compress_tar(files: List[str], output_path: str, compression: str = "gz") ->
             f"{format_bytes(compressed_size)})"
         )
 
-        return json.dumps(
+        return to_json(
             {
                 "success": True,
                 "archive_path": str(output),
@@ -252,10 +252,10 @@ def compress_tar(files: List[str], output_path: str, compression: str = "gz") ->
 
     except (ValidationError, FileOperationError) as e:
         logger.error(f"TAR compression failed: {e}")
-        return json.dumps({"error": str(e), "type": "validation"})
+        return to_json({"error": str(e), "type": "validation"})
     except Exception as e:
         logger.error(f"Unexpected error in compress_tar: {e}")
-        return json.dumps({"error": str(e), "type": "unknown"})
+        return to_json({"error": str(e), "type": "unknown"})
 
 
 @tool_handler
@@ -310,7 +310,7 @@ def extract_tar(tar_path: str, extract_to: str = ".") -> str:
             f"{format_bytes(total_size)})"
         )
 
-        return json.dumps(
+        return to_json(
             {
                 "success": True,
                 "extracted_files": extracted_files,
@@ -322,13 +322,13 @@ def extract_tar(tar_path: str, extract_to: str = ".") -> str:
 
     except (ValidationError, FileOperationError) as e:
         logger.error(f"TAR extraction failed: {e}")
-        return json.dumps({"error": str(e), "type": "validation"})
+        return to_json({"error": str(e), "type": "validation"})
     except tarfile.TarError as e:
         logger.error(f"Invalid TAR file: {e}")
-        return json.dumps({"error": f"Invalid TAR file: {e}", "type": "file"})
+        return to_json({"error": f"Invalid TAR file: {e}", "type": "file"})
     except Exception as e:
         logger.error(f"Unexpected error in extract_tar: {e}")
-        return json.dumps({"error": str(e), "type": "unknown"})
+        return to_json({"error": str(e), "type": "unknown"})
 
 
 @tool_handler
@@ -394,7 +394,7 @@ def list_archive_contents(archive_path: str) -> str:
 
         logger.info(f"Listed archive contents: {archive_file} ({len(files_info)} files)")
 
-        return json.dumps(
+        return to_json(
             {
                 "success": True,
                 "archive_path": str(archive_file),
@@ -409,10 +409,10 @@ def list_archive_contents(archive_path: str) -> str:
 
     except (ValidationError, FileOperationError) as e:
         logger.error(f"Failed to list archive contents: {e}")
-        return json.dumps({"error": str(e), "type": "validation"})
+        return to_json({"error": str(e), "type": "validation"})
     except (zipfile.BadZipFile, tarfile.TarError) as e:
         logger.error(f"Invalid archive file: {e}")
-        return json.dumps({"error": f"Invalid archive file: {e}", "type": "file"})
+        return to_json({"error": f"Invalid archive file: {e}", "type": "file"})
     except Exception as e:
         logger.error(f"Unexpected error in list_archive_contents: {e}")
-        return json.dumps({"error": str(e), "type": "unknown"})
+        return to_json({"error": str(e), "type": "unknown"})
@@ -18,7 +18,7 @@ import xml.etree.ElementTree as ET
 from typing import Any, Dict
 
 from mcp_server.tools.registry import tool_handler
-from mcp_server.utils import logger
+from mcp_server.utils import logger, to_json
 
 # Import YAML support
 try:
@@ -49,13 +49,13 @@ def parse_json(json_string: str) -> str:
     """
     try:
         data = json.loads(json_string)
-        return json.dumps(data, indent=2, ensure_ascii=False)
+        return to_json(data, pretty=True)
     except json.JSONDecodeError as e:
         logger.error(f"JSON parsing failed: {e}")
         return f'{{"error": "Invalid JSON: {str(e)}"}}'
 
 
-@tool_handler
+@tool_handler(cacheable=True)
 def format_json(json_string: str, indent: int = 2, sort_keys: bool = False) -> str:
     """
     Format JSON with pretty printing.
@@ -109,7 +109,7 @@ def json_query(json_string: str, path: str) -> str:
             if current is None:
                 return f'{{"error": "Path not found: {path}"}}'
 
-        return json.dumps({"path": path, "value": current}, indent=2, ensure_ascii=False)
+        return to_json({"path": path, "value": current})
 
     except json.JSONDecodeError as e:
         return f'{{"error": "Invalid JSON: {str(e)}"}}'
@@ -148,7 +148,7 @@ def csv_to_json(csv_string: str, delimiter: str = ",", has_header: bool = True)
         else:
             data = [{"col_" + str(i): val for i, val in enumerate(row)} for row in rows]
 
-        return json.dumps({"data": data, "count": len(data)}, indent=2, ensure_ascii=False)
+        return to_json({"data": data, "count": len(data)})
 
     except Exception as e:
         logger.error(f"CSV to JSON conversion failed: {e}")
@@ -217,14 +217,12 @@ def parse_csv(csv_string: str, delimiter: str = ",") -> str:
         reader = csv.DictReader(io.StringIO(csv_string), delimiter=delimiter)
         data = list(reader)
 
-        return json.dumps(
+        return to_json(
             {
                 "data": data,
                 "count": len(data),
                 "columns": reader.fieldnames if reader.fieldnames else [],
-            },
-            indent=2,
-            ensure_ascii=False,
+            }
         )
 
     except Exception as e:
@@ -264,23 +262,19 @@ def validate_json_schema(json_string: str) -> str:
 
         structure = analyze_structure(data)
 
-        return json.dumps(
-            {"valid": True, "structure": structure, "size_bytes": len(json_string)},
-            indent=2,
-        )
+        return to_json({"valid": True, "structure": structure, "size_bytes": len(json_string)})
 
     except json.JSONDecodeError as e:
-        return json.dumps(
+        return to_json(
             {
                 "valid": False,
                 "error": str(e),
                 "position": e.pos if hasattr(e, "pos") else None,
-            },
-            indent=2,
+            }
         )
 
 
-@tool_handler
+@tool_handler(cacheable=True)
 def flatten_json(json_string: str, separator: str = ".") -> str:
     """
     Flatten nested JSON object into single-level object.
@@ -316,7 +310,7 @@ def flatten_json(json_string: str, separator: str = ".") -> str:
             return dict(items)
 
         flattened = flatten(data)
-        return json.dumps(flattened, indent=2, ensure_ascii=False)
+        return to_json(flattened)
 
     except json.JSONDecodeError as e:
         return f'{{"error": "Invalid JSON: {str(e)}"}}'
@@ -358,7 +352,7 @@ def merge_json(json_string1: str, json_string2: str, deep: bool = True) -> str:
         else:
             merged = {**data1, **data2}
 
-        return json.dumps(merged, indent=2, ensure_ascii=False)
+        return to_json(merged)
 
     except json.JSONDecodeError as e:
         return f'{{"error": "Invalid JSON: {str(e)}"}}'
@@ -366,7 +360,7 @@ def merge_json(json_string1: str, json_string2: str, deep: bool = True) -> str:
         return f'{{"error": "Merge failed: {str(e)}"}}'
 
 
-@tool_handler
+@tool_handler(cacheable=True)
 def xml_to_json(xml_string: str) -> str:
     """
     Convert XML to JSON format.
@@ -413,7 +407,7 @@ def xml_to_json(xml_string: str) -> str:
             return result if result else element.text
 
         converted = {root.tag: element_to_dict(root)}
-        return json.dumps(converted, indent=2, ensure_ascii=False)
+        return to_json(converted)
 
     except ET.ParseError as e:
         return f'{{"error": "Invalid XML: {str(e)}"}}'
@@ -434,20 +428,20 @@ def parse_yaml(yaml_string: str) -> str:
         JSON string representation of YAML data
     """
     if yaml is None:
-        return json.dumps({"error": "YAML support not available. Install pyyaml."})
+        return to_json({"error": "YAML support not available. Install pyyaml."})
 
     try:
         data = yaml.safe_load(yaml_string)
-        return json.dumps(data, indent=2, ensure_ascii=False)
+        return to_json(data)
     except yaml.YAMLError as e:
         logger.error(f"YAML parsing failed: {e}")
-        return json.dumps({"error": f"Invalid YAML: {str(e)}"})
+        return to_json({"error": f"Invalid YAML: {str(e)}"})
     except Exception as e:
         logger.error(f"YAML parsing error: {e}")
-        return json.dumps({"error": f"Parsing failed: {str(e)}"})
+        return to_json({"error": f"Parsing failed: {str(e)}"})
 
 
-@tool_handler
+@tool_handler(cacheable=True)
 def yaml_to_json(yaml_string: str, indent: int = 2) -> str:
     """
     Convert YAML to formatted JSON.
@@ -460,17 +454,17 @@ def yaml_to_json(yaml_string: str, indent: int = 2) -> str:
         Formatted JSON string
     """
     if yaml is None:
-        return json.dumps({"error": "YAML support not available. Install pyyaml."})
+        return to_json({"error": "YAML support not available. Install pyyaml."})
 
     try:
         data = yaml.safe_load(yaml_string)
         return json.dumps(data, indent=indent, ensure_ascii=False)
     except yaml.YAMLError as e:
         logger.error(f"YAML to JSON conversion failed: {e}")
-        return json.dumps({"error": f"Invalid YAML: {str(e)}"})
+        return to_json({"error": f"Invalid YAML: {str(e)}"})
     except Exception as e:
         logger.error(f"Conversion error: {e}")
-        return json.dumps({"error": f"Conversion failed: {str(e)}"})
+        return to_json({"error": f"Conversion failed: {str(e)}"})
 
 
 @tool_handler
@@ -511,16 +505,14 @@ def parse_toml(toml_string: str) -> str:
         JSON string representation of TOML data
     """
     if tomllib is None:
-        return json.dumps(
-            {"error": "TOML support not available. Install tomli or use Python 3.11+."}
-        )
+        return to_json({"error": "TOML support not available. Install tomli or use Python 3.11+."})
 
     try:
         data = tomllib.loads(toml_string)
-        return json.dumps(data, indent=2, ensure_ascii=False)
+        return to_json(data)
     except Exception as e:
         logger.error(f"TOML parsing failed: {e}")
-        return json.dumps({"error": f"Invalid TOML: {str(e)}"})
+        return to_json({"error": f"Invalid TOML: {str(e)}"})
 
 
 @tool_handler
@@ -536,13 +528,11 @@ def toml_to_json(toml_string: str, indent: int = 2) -> str:
         Formatted JSON string
     """
     if tomllib is None:
-        return json.dumps(
-            {"error": "TOML support not available. Install tomli or use Python 3.11+."}
-        )
+        return to_json({"error": "TOML support not available. Install tomli or use Python 3.11+."})
 
     try:
         data = tomllib.loads(toml_string)
         return json.dumps(data, indent=indent, ensure_ascii=False)
     except Exception as e:
         logger.error(f"TOML to JSON conversion failed: {e}")
-        return json.dumps({"error": f"Invalid TOML: {str(e)}"})
+        return to_json({"error": f"Invalid TOML: {str(e)}"})
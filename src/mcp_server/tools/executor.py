@@ -0,0 +1,219 @@
+"""
+Worker pools for running tool handlers.
+
+Tool handlers are plain synchronous functions. When registered through
+ToolPlugin.register_to_mcp they are wrapped so that a call runs on a shared,
+bounded thread pool instead of the event loop, which lets concurrent tool calls
+overlap. Handlers marked ``cpu_bound`` run on a process pool so they do not
+hold the GIL of the server process, and native ``async def`` handlers are
+awaited directly on the event loop.
+
+Every call also runs under a deadline (``@tool_handler(deadline=...)``, 0 for
+none). When it passes, or the client cancels the call, the caller gets an error
+at once and the handler's cancellation event is set, so blocking work that
+checks it (retries, HTTP requests, subprocesses, browser waits) stops early.
+Handlers running on the process pool are only abandoned, not interrupted.
+
+Pool sizes and the default deadline can be configured with environment variables:
+    MCP_SERVER_THREAD_WORKERS   - Thread pool size (default: 16)
+    MCP_SERVER_PROCESS_WORKERS  - Process pool size (default: CPU count, max 4)
+    MCP_SERVER_TOOL_DEADLINE    - Default seconds per tool call (default: 600, 0 disables)
+"""
+
+import asyncio
+import atexit
+import contextvars
+import functools
+import inspect
+import logging
+import logging.handlers
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Optional
+
+from mcp_server.utils import (
+    DeadlineExceededError,
+    call_deadline,
+    forward_worker_logs,
+    logger,
+    time_remaining,
+)
+
+EXECUTION_MODES = ("thread", "process")
+DEFAULT_TOOL_DEADLINE = 600.0
+
+_thread_pool: Optional[ThreadPoolExecutor] = None
+_process_pool: Optional[ProcessPoolExecutor] = None
+_worker_log_listener: Optional[logging.handlers.QueueListener] = None
+_pool_lock = threading.Lock()
+
+# Event loop serving the tool call a worker thread runs, for progress notifications
+_handler_loop: contextvars.ContextVar[Optional[asyncio.AbstractEventLoop]] = contextvars.ContextVar(
+    "mcp_handler_loop", default=None
+)
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read a positive integer from the environment."""
+    try:
+        return max(1, int(os.getenv(name, str(default))))
+    except ValueError:
+        logger.warning(f"Invalid value for {name}, using {default}")
+        return default
+
+
+def get_thread_pool() -> ThreadPoolExecutor:
+    """Get the shared thread pool for blocking tool handlers."""
+    global _thread_pool
+    if _thread_pool is None:
+        with _pool_lock:
+            if _thread_pool is None:
+                workers = _env_int("MCP_SERVER_THREAD_WORKERS", 16)
+                _thread_pool = ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix="mcp-tool"
+                )
+                logger.info(f"Started tool thread pool ({workers} workers)")
+    return _thread_pool
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Get the shared process pool for CPU-bound tool handlers."""
+    global _process_pool, _worker_log_listener
+    if _process_pool is None:
+        with _pool_lock:
+            if _process_pool is None:
+                workers = _env_int("MCP_SERVER_PROCESS_WORKERS", min(4, os.cpu_count() or 1))
+                # spawn avoids forking a process that already runs threads
+                mp_context = multiprocessing.get_context("spawn")
+                # Workers log through this process's handlers instead of their own
+                log_queue = mp_context.Queue()
+                _worker_log_listener = logging.handlers.QueueListener(
+                    log_queue, *logging.getLogger().handlers, respect_handler_level=True
+                )
+                _worker_log_listener.start()
+                _process_pool = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=mp_context,
+                    initializer=forward_worker_logs,
+                    initargs=(log_queue,),
+                )
+                logger.info(f"Started tool process pool ({workers} workers)")
+    return _process_pool
+
+
+def shutdown_pools() -> None:
+    """Shut down the worker pools without waiting for running calls."""
+    global _thread_pool, _process_pool, _worker_log_listener
+    with _pool_lock:
+        if _thread_pool is not None:
+            _thread_pool.shutdown(wait=False, cancel_futures=True)
+            _thread_pool = None
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False, cancel_futures=True)
+            _process_pool = None
+        if _worker_log_listener is not None:
+            try:
+                _worker_log_listener.stop()
+            except RuntimeError as e:
+                # At interpreter exit the queue cannot start its feeder thread;
+                # the listener thread is a daemon and ends with the process
+                logger.debug(f"Worker log listener not stopped: {e}")
+            _worker_log_listener = None
+
+
+atexit.register(shutdown_pools)
+
+
+def make_async_handler(
+    func: Callable[..., Any],
+    mode: str = "thread",
+    resolve: Optional[Callable[[], Callable[..., Any]]] = None,
+) -> Callable[..., Awaitable[Any]]:
+    """
+    Wrap a tool handler so it can be awaited without blocking the event loop.
+
+    Args:
+        func: Tool handler (or lazy stub) to wrap
+        mode: "thread" for blocking I/O handlers, "process" for CPU-bound handlers
+        resolve: Returns the real, picklable handler; required for process mode
+            because lazy stubs cannot be sent to another process
+
+    Returns:
+        Async function with the same name, docstring and signature as func
+    """
+    if inspect.iscoroutinefunction(func):
+        return func
+
+    if mode not in EXECUTION_MODES:
+        raise ValueError(f"Unknown execution mode: {mode}")
+
+    @functools.wraps(func)
+    async def async_tool(*args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        executor: Executor
+        if mode == "process":
+            executor = get_process_pool()
+            target = resolve() if resolve is not None else func
+            call = functools.partial(target, *args, **kwargs)
+        else:
+            executor = get_thread_pool()
+            # Carry context variables (e.g. request state) into the worker thread
+            ctx = contextvars.copy_context()
+            ctx.run(_handler_loop.set, loop)
+            call = functools.partial(ctx.run, func, *args, **kwargs)
+        return await loop.run_in_executor(executor, call)
+
+    return async_tool
+
+
+def get_handler_loop() -> Optional[asyncio.AbstractEventLoop]:
+    """Get the event loop of the tool call running on this worker thread, if any."""
+    return _handler_loop.get()
+
+
+def get_default_deadline() -> float:
+    """Get the default deadline in seconds for tool calls (0 for none)."""
+    try:
+        return max(0.0, float(os.getenv("MCP_SERVER_TOOL_DEADLINE", str(DEFAULT_TOOL_DEADLINE))))
+    except ValueError:
+        logger.warning(f"Invalid value for MCP_SERVER_TOOL_DEADLINE, using {DEFAULT_TOOL_DEADLINE}")
+        return DEFAULT_TOOL_DEADLINE
+
+
+def apply_deadline(
+    func: Callable[..., Awaitable[Any]], seconds: Optional[float], tool_name: str
+) -> Callable[..., Awaitable[Any]]:
+    """
+    Wrap an async tool so each call runs under a deadline and can be cancelled.
+
+    Args:
+        func: Async tool function
+        seconds: Deadline per call (None or 0 for none)
+        tool_name: Tool name used in error messages
+
+    Returns:
+        Async function with the same signature
+    """
+    if not seconds or seconds <= 0:
+        return func
+
+    @functools.wraps(func)
+    async def deadline_tool(*args: Any, **kwargs: Any) -> Any:
+        # The context (and so the event) is copied into the worker thread
+        with call_deadline(seconds) as cancelled:
+            try:
+                return await asyncio.wait_for(func(*args, **kwargs), timeout=time_remaining())
+            except TimeoutError:
+                cancelled.set()
+                logger.warning(f"{tool_name} exceeded its deadline of {seconds:g}s")
+                raise DeadlineExceededError(
+                    f"{tool_name} did not finish within {seconds:g}s"
+                ) from None
+            except asyncio.CancelledError:
+                cancelled.set()
+                logger.info(f"{tool_name} call cancelled")
+                raise
+
+    return deadline_tool
@@ -11,12 +11,12 @@ Provides tools for:
 
 import difflib
 import glob
-import json
 import shutil
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 from mcp_server.tools.registry import tool_handler
+from mcp_server.tools.streaming import CHUNK_SIZE, StreamedArray, StreamedString, iter_json_object
 from mcp_server.utils import (
     FileOperationError,
     ValidationError,
@@ -24,14 +24,16 @@ from mcp_server.utils import (
     format_timestamp,
     logger,
     safe_get_file_size,
+    safe_iter_file,
     safe_read_file,
     safe_write_file,
     sanitize_path,
+    to_json,
 )
 
 
-@tool_handler
-def read_file(path: str, encoding: str = "utf-8") -> str:
+@tool_handler(streaming=True)
+def read_file(path: str, encoding: str = "utf-8") -> Iterator[str]:
     """
     Read the contents of a file.
 
@@ -40,13 +42,22 @@ def read_file(path: str, encoding: str = "utf-8") -> str:
         encoding: File encoding (default: utf-8)
 
     Returns:
-        File contents as string
+        File contents as string (large files are returned in pages)
+
+    Raises:
+        FileOperationError: If reading fails after part of the contents was returned
     """
+    started = False
     try:
-        return safe_read_file(path, encoding=encoding)
+        for chunk in safe_iter_file(path, encoding=encoding, chunk_size=CHUNK_SIZE):
+            started = True
+            yield chunk
     except FileOperationError as e:
         logger.error(f"Failed to read file: {e}")
-        return f"Error: {str(e)}"
+        # An error message after partial contents would read as file data
+        if started:
+            raise
+        yield f"Error: {str(e)}"
 
 
 @tool_handler
@@ -103,8 +114,8 @@ def append_file(path: str, content: str, encoding: str = "utf-8") -> str:
         return f"Error: {str(e)}"
 
 
-@tool_handler
-def list_directory(path: str = ".", pattern: str = "*", recursive: bool = False) -> str:
+@tool_handler(streaming=True)
+def list_directory(path: str = ".", pattern: str = "*", recursive: bool = False) -> Iterator[str]:
     """
     List contents of a directory.
 
@@ -114,18 +125,19 @@ def list_directory(path: str = ".", pattern: str = "*", recursive: bool = False)
         recursive: Search recursively in subdirectories (default: False)
 
     Returns:
-        JSON string containing list of files and directories
+        JSON string containing list of files and directories (large listings are
+        returned in pages)
     """
     try:
         p = sanitize_path(path)
 
         if not p.exists():
-            return f'{{"error": "Directory not found: {path}"}}'
+            yield f'{{"error": "Directory not found: {path}"}}'
+            return
 
         if not p.is_dir():
-            return f'{{"error": "Not a directory: {path}"}}'
-
-        items = []
+            yield f'{{"error": "Not a directory: {path}"}}'
+            return
 
         if recursive:
             search_pattern = str(p / "**" / pattern)
@@ -134,42 +146,46 @@ def list_directory(path: str = ".", pattern: str = "*", recursive: bool = False)
             search_pattern = str(p / pattern)
             paths = glob.glob(search_pattern)
 
-        for item_path in sorted(paths):
-            item = Path(item_path)
-            try:
-                is_file = item.is_file()
-                is_dir = item.is_dir()
+        count = 0
+
+        def iter_items() -> Iterator[dict[str, Any]]:
+            nonlocal count
+            for item_path in sorted(paths):
+                item = Path(item_path)
+                try:
+                    is_file = item.is_file()
+                    is_dir = item.is_dir()
+
+                    item_info: dict[str, Any] = {
+                        "name": item.name,
+                        "path": str(item),
+                        "type": ("file" if is_file else "directory" if is_dir else "other"),
+                    }
 
-                item_info: dict[str, Any] = {
-                    "name": item.name,
-                    "path": str(item),
-                    "type": ("file" if is_file else "directory" if is_dir else "other"),
-                }
+                    if is_file:
+                        item_info["size"] = format_bytes(safe_get_file_size(item))
+                        item_info["size_bytes"] = safe_get_file_size(item)
+                        item_info["modified"] = format_timestamp(item.stat().st_mtime)
 
-                if is_file:
-                    item_info["size"] = format_bytes(safe_get_file_size(item))
-                    item_info["size_bytes"] = safe_get_file_size(item)
-                    item_info["modified"] = format_timestamp(item.stat().st_mtime)
+                except Exception as e:
+                    logger.warning(f"Could not get info for {item_path}: {e}")
+                    continue
+                count += 1
+                yield item_info
 
-                items.append(item_info)
-            except Exception as e:
-                logger.warning(f"Could not get info for {item_path}: {e}")
-                continue
+        def iter_fields() -> Iterator[tuple[str, Any]]:
+            yield "directory", str(p)
+            yield "pattern", pattern
+            yield "recursive", recursive
+            # Items are streamed, so the count follows them
+            yield "items", StreamedArray(iter_items())
+            yield "count", count
 
-        return json.dumps(
-            {
-                "directory": str(p),
-                "pattern": pattern,
-                "recursive": recursive,
-                "count": len(items),
-                "items": items,
-            },
-            indent=2,
-        )
+        yield from iter_json_object(iter_fields())
 
     except Exception as e:
         logger.error(f"Failed to list directory: {e}")
-        return f'{{"error": "Failed to list directory: {str(e)}"}}'
+        yield f'{{"error": "Failed to list directory: {str(e)}"}}'
 
 
 @tool_handler
@@ -192,7 +208,7 @@ def file_exists(path: str) -> str:
         if exists:
             result["type"] = "file" if p.is_file() else "directory" if p.is_dir() else "other"
 
-        return json.dumps(result, indent=2)
+        return to_json(result)
 
     except Exception as e:
         return f'{{"error": "Failed to check path: {str(e)}"}}'
@@ -233,7 +249,7 @@ def get_file_info(path: str) -> str:
             info["extension"] = p.suffix
             info["stem"] = p.stem
 
-        return json.dumps(info, indent=2)
+        return to_json(info)
 
     except Exception as e:
         logger.error(f"Failed to get file info: {e}")
@@ -291,15 +307,14 @@ def search_files(directory: str = ".", pattern: str = "*", name_contains: str =
                 logger.warning(f"Could not get info for {item_path}: {e}")
                 continue
 
-        return json.dumps(
+        return to_json(
             {
                 "directory": str(p),
                 "pattern": pattern,
                 "name_contains": name_contains,
                 "count": len(matches),
                 "matches": matches,
-            },
-            indent=2,
+            }
         )
 
     except Exception as e:
@@ -407,13 +422,13 @@ def copy_file(source: str, destination: str, overwrite: bool = False) -> str:
         return f"Error: {str(e)}"
 
 
-@tool_handler
+@tool_handler(streaming=True)
 def diff_files(
     file1: str,
     file2: str,
     context_lines: int = 3,
     format: str = "unified",
-) -> str:
+) -> Iterator[str]:
     """
     Compare two files and show differences.
 
@@ -424,8 +439,12 @@ def diff_files(
         format: Output format - "unified", "context", or "ndiff" (default: "unified")
 
     Returns:
-        JSON string with diff results and statistics
+        JSON string with diff results and statistics (large diffs are returned in pages)
+
+    Raises:
+        Exception: If the diff fails after part of the result was returned
     """
+    started = False
     try:
         # 验证输入
         if format not in ["unified", "context", "ndiff"]:
@@ -439,59 +458,73 @@ def diff_files(
         # 分割为行
         lines1 = content1.splitlines(keepends=True)
         lines2 = content2.splitlines(keepends=True)
+        del content1, content2
 
-        # 生成差异
+        # 生成差异（惰性迭代，不保留完整差异文本）
         if format == "unified":
-            diff = list(
-                difflib.unified_diff(
-                    lines1,
-                    lines2,
-                    fromfile=file1,
-                    tofile=file2,
-                    n=context_lines,
-                )
+            diff = difflib.unified_diff(
+                lines1,
+                lines2,
+                fromfile=file1,
+                tofile=file2,
+                n=context_lines,
             )
         elif format == "context":
-            diff = list(
-                difflib.context_diff(
-                    lines1,
-                    lines2,
-                    fromfile=file1,
-                    tofile=file2,
-                    n=context_lines,
-                )
+            diff = difflib.context_diff(
+                lines1,
+                lines2,
+                fromfile=file1,
+                tofile=file2,
+                n=context_lines,
             )
         else:  # ndiff
-            diff = list(difflib.ndiff(lines1, lines2))
-
-        # 统计差异
-        added = sum(1 for line in diff if line.startswith("+") and not line.startswith("+++"))
-        removed = sum(1 for line in diff if line.startswith("-") and not line.startswith("---"))
-
-        diff_text = "".join(diff)
-
-        logger.info(f"Compared files: {file1} vs {file2} (+{added}, -{removed})")
-
-        return json.dumps(
-            {
-                "success": True,
-                "file1": file1,
-                "file2": file2,
-                "format": format,
-                "lines_added": added,
-                "lines_removed": removed,
-                "total_changes": added + removed,
-                "diff": diff_text,
-            },
-            ensure_ascii=False,
-        )
+            diff = difflib.ndiff(lines1, lines2)
+
+        added = 0
+        removed = 0
+
+        def iter_diff() -> Iterator[str]:
+            nonlocal added, removed
+            batch: list[str] = []
+            size = 0
+            for line in diff:
+                # 统计差异
+                if line.startswith("+") and not line.startswith("+++"):
+                    added += 1
+                elif line.startswith("-") and not line.startswith("---"):
+                    removed += 1
+                batch.append(line)
+                size += len(line)
+                if size >= CHUNK_SIZE:
+                    yield "".join(batch)
+                    batch, size = [], 0
+            yield "".join(batch)
+
+        def iter_fields() -> Iterator[tuple[str, Any]]:
+            yield "success", True
+            yield "file1", file1
+            yield "file2", file2
+            yield "format", format
+            # The diff is streamed, so the statistics follow it
+            yield "diff", StreamedString(iter_diff())
+            yield "lines_added", added
+            yield "lines_removed", removed
+            yield "total_changes", added + removed
+            logger.info(f"Compared files: {file1} vs {file2} (+{added}, -{removed})")
+
+        for chunk in iter_json_object(iter_fields()):
+            started = True
+            yield chunk
 
     except (ValidationError, FileOperationError) as e:
         logger.error(f"File diff failed: {e}")
-        return json.dumps({"error": str(e), "type": "validation"})
+        yield to_json({"error": str(e), "type": "validation"})
     except Exception as e:
         logger.error(f"Unexpected error in diff_files: {e}")
-        return json.dumps({"error": str(e), "type": "unknown"})
+        # A second JSON object after partial output would be invalid JSON
+        if started:
+            raise
+        yield to_json({"error": str(e), "type": "unknown"})
 
 
 @tool_handler
@@ -532,7 +565,7 @@ def diff_text(text1: str, text2: str, format: str = "unified") -> str:
 
         logger.info(f"Compared text strings (+{added}, -{removed})")
 
-        return json.dumps(
+        return to_json(
             {
                 "success": True,
                 "format": format,
@@ -540,13 +573,12 @@ def diff_text(text1: str, text2: str, format: str = "unified") -> str:
                 "lines_removed": removed,
                 "total_changes": added + removed,
                 "diff": diff_text,
-            },
-            ensure_ascii=False,
+            }
         )
 
     except ValidationError as e:
         logger.error(f"Text diff failed: {e}")
-        return json.dumps({"error": str(e), "type": "validation"})
+        return to_json({"error": str(e), "type": "validation"})
     except Exception as e:
         logger.error(f"Unexpected error in diff_text: {e}")
-        return json.dumps({"error": str(e), "type": "unknown"})
+        return to_json({"error": str(e), "type": "unknown"})
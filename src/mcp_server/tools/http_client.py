@@ -0,0 +1,137 @@
+"""
+Shared HTTP client for outbound requests.
+
+Every plugin sends its HTTP requests through one process-wide requests.Session,
+so connections to a host are kept alive and reused across tool calls instead
+of paying a new TCP and TLS handshake per request. The session keeps a
+keep-alive pool per host and retries failed connection attempts with backoff.
+Requests that reached the server are not retried here.
+
+Cookies are never stored, so one tool's responses cannot leak state into
+another tool's requests.
+
+Pool sizes and retries can be configured with environment variables:
+    MCP_SERVER_HTTP_POOL_HOSTS     - Hosts with a kept-alive pool (default: 32)
+    MCP_SERVER_HTTP_POOL_SIZE      - Connections kept per host (default: 16)
+    MCP_SERVER_HTTP_CONNECT_RETRIES - Retries of failed connection attempts (default: 2)
+"""
+
+import atexit
+import os
+import threading
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from mcp_server.utils import deadline_timeout, logger
+
+DEFAULT_POOL_HOSTS = 32
+DEFAULT_POOL_SIZE = 16
+DEFAULT_CONNECT_RETRIES = 2
+DEFAULT_TIMEOUT = 10.0
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read a non-negative integer from the environment."""
+    try:
+        return max(0, int(os.getenv(name, str(default))))
+    except ValueError:
+        logger.warning(f"Invalid value for {name}, using {default}")
+        return default
+
+
+def create_session() -> requests.Session:
+    """
+    Create a session with pooled keep-alive connections and connection retries.
+
+    Returns:
+        A configured requests.Session
+    """
+    pool_hosts = max(1, _env_int("MCP_SERVER_HTTP_POOL_HOSTS", DEFAULT_POOL_HOSTS))
+    pool_size = max(1, _env_int("MCP_SERVER_HTTP_POOL_SIZE", DEFAULT_POOL_SIZE))
+    retries = Retry(
+        total=None,
+        connect=_env_int("MCP_SERVER_HTTP_CONNECT_RETRIES", DEFAULT_CONNECT_RETRIES),
+        read=0,
+        status=0,
+        redirect=10,
+        other=0,
+        backoff_factor=0.2,
+        raise_on_status=False,
+    )
+
+    session = requests.Session()
+    # pool_block=False: a burst beyond pool_size opens extra connections instead of waiting
+    adapter = HTTPAdapter(pool_connections=pool_hosts, pool_maxsize=pool_size, max_retries=retries)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+
+def get_session() -> requests.Session:
+    """Get the shared HTTP session."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+                logger.info("Started shared HTTP session")
+    return _session
+
+
+def close_session() -> None:
+    """Close the shared session and its pooled connections."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+atexit.register(close_session)
+
+
+def request(
+    method: str, url: str, timeout: float = DEFAULT_TIMEOUT, **kwargs: Any
+) -> requests.Response:
+    """
+    Send a request through the shared session.
+
+    The timeout is clamped to the time left before the tool call's deadline.
+
+    Args:
+        method: HTTP method
+        url: Request URL
+        timeout: Timeout in seconds for connecting and for each read
+        **kwargs: Other arguments of requests.Session.request
+
+    Returns:
+        The response
+
+    Raises:
+        requests.RequestException: If the request fails
+        DeadlineExceededError: If the tool call has no time left
+    """
+    return get_session().request(method, url, timeout=deadline_timeout(timeout), **kwargs)
+
+
+def get(url: str, **kwargs: Any) -> requests.Response:
+    """Send a GET request through the shared session (see request())."""
+    return request("GET", url, **kwargs)
+
+
+def head(url: str, **kwargs: Any) -> requests.Response:
+    """Send a HEAD request through the shared session (see request())."""
+    return request("HEAD", url, **kwargs)
+
+
+def post(url: str, **kwargs: Any) -> requests.Response:
+    """Send a POST request through the shared session (see request())."""
+    return request("POST", url, **kwargs)
@@ -0,0 +1,302 @@
+"""
+Tool manifest for lazy plugin loading.
+
+The manifest records plugin metadata (the parsed config.yaml) and the name,
+docstring, call signature and the MCP description and input/output JSON schemas
+of every tool, together with a hash of each plugin's sources. When the hashes
+match, the server registers tools from the manifest without parsing YAML,
+importing the plugin handlers modules or generating schemas from signatures;
+handlers are imported the first time one of their tools is called.
+
+The build script generates the manifest for PyInstaller bundles, where it is
+trusted as-is because plugin sources are not available on disk. In development
+an outdated or missing manifest is rewritten after an eager load.
+
+Usage:
+    python -m mcp_server.tools.manifest            # Write the default manifest
+    python -m mcp_server.tools.manifest -o PATH    # Write the manifest to PATH
+"""
+
+import argparse
+import hashlib
+import inspect
+import json
+import typing
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from mcp_server.utils import logger
+
+MANIFEST_FILENAME = "tool_manifest.json"
+MANIFEST_VERSION = 3
+
+# Names available when turning annotation strings back into types
+_ANNOTATION_NAMESPACE: Dict[str, Any] = {name: getattr(typing, name) for name in typing.__all__}
+_ANNOTATION_NAMESPACE.update(
+    {
+        cls.__name__: cls
+        for cls in (str, int, float, bool, bytes, dict, list, tuple, set, type(None))
+    }
+)
+
+
+def get_manifest_path() -> Path:
+    """Get the default manifest location (next to the tool plugins)."""
+    from mcp_server.tools import _get_tools_dir
+
+    return _get_tools_dir() / MANIFEST_FILENAME
+
+
+def plugin_source_hash(plugin_dir: Path) -> str:
+    """
+    Compute a hash of the plugin files that determine its tool signatures.
+
+    Args:
+        plugin_dir: Path to the plugin directory
+
+    Returns:
+        Hex digest of handlers.py and config.yaml, or "" if handlers.py is not
+        available on disk (e.g. inside a PyInstaller bundle)
+    """
+    handlers_file = plugin_dir / "handlers.py"
+    if not handlers_file.exists():
+        return ""
+
+    digest = hashlib.sha256()
+    for file_path in (handlers_file, plugin_dir / "config.yaml"):
+        if file_path.exists():
+            digest.update(file_path.read_bytes())
+    return digest.hexdigest()
+
+
+def describe_tool(
+    func: Callable[..., Any], options: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Describe a tool handler's name, docstring, signature and MCP tool definition.
+
+    Args:
+        func: Tool handler function
+        options: Options the handler was declared with in @tool_handler(...)
+
+    Returns:
+        JSON-serializable description of the tool
+    """
+    signature = inspect.signature(func)
+    params: List[Dict[str, Any]] = []
+
+    for param in signature.parameters.values():
+        entry: Dict[str, Any] = {
+            "name": param.name,
+            "annotation": _format_annotation(param.annotation),
+        }
+        if param.default is not inspect.Parameter.empty:
+            entry["default"] = param.default
+        params.append(entry)
+
+    from fastmcp.tools import Tool
+
+    # Generated the same way mcp.tool() does, so build_tool() can skip it at startup
+    tool = Tool.from_function(func)
+    return {
+        "name": func.__name__,
+        "doc": inspect.getdoc(func) or "",
+        "params": params,
+        "returns": _format_annotation(signature.return_annotation),
+        "description": tool.description,
+        "schema": tool.parameters,
+        "output_schema": tool.output_schema,
+        "options": options or {},
+    }
+
+
+def build_tool(entry: Dict[str, Any], fn: Callable[..., Any]) -> Any:
+    """
+    Build the MCP tool for a manifest entry from its stored schemas.
+
+    Args:
+        entry: Tool entry produced by describe_tool()
+        fn: Function called with the tool arguments (validated against its signature)
+
+    Returns:
+        fastmcp FunctionTool equivalent to mcp.tool() applied to the original handler
+    """
+    from fastmcp.tools import FunctionTool
+
+    return FunctionTool(
+        fn=fn,
+        name=entry["name"],
+        description=entry["description"],
+        parameters=entry["schema"],
+        output_schema=entry["output_schema"],
+    )
+
+
+def build_signature(entry: Dict[str, Any]) -> inspect.Signature:
+    """
+    Rebuild a function signature from a manifest tool entry.
+
+    Args:
+        entry: Tool entry produced by describe_tool()
+
+    Returns:
+        inspect.Signature equivalent to the original handler signature (annotations
+        that cannot be rebuilt become Any; clients see the stored schema anyway)
+    """
+    parameters = [
+        inspect.Parameter(
+            param["name"],
+            inspect.Parameter.POSITIONAL_OR_KEYWORD,
+            annotation=_parse_annotation(param["annotation"]),
+            default=param.get("default", inspect.Parameter.empty),
+        )
+        for param in entry["params"]
+    ]
+    return inspect.Signature(parameters, return_annotation=_parse_annotation(entry["returns"]))
+
+
+def build_manifest(plugins: List[Any]) -> Dict[str, Any]:
+    """
+    Build a manifest from loaded plugins.
+
+    Args:
+        plugins: List of ToolPlugin instances (eager or lazy)
+
+    Returns:
+        Manifest dictionary
+    """
+    manifest: Dict[str, Any] = {"version": MANIFEST_VERSION, "plugins": {}}
+
+    for plugin in plugins:
+        manifest["plugins"][plugin.name] = {
+            "source_hash": plugin_source_hash(plugin.plugin_dir),
+            "config": plugin.config,
+            "tools": [
+                describe_tool(tool, plugin.handler_options(tool.__name__)) for tool in plugin.tools
+            ],
+        }
+
+    return manifest
+
+
+def is_entry_current(entry: Optional[Dict[str, Any]], plugin_dir: Path) -> bool:
+    """
+    Check whether a manifest entry can be trusted for a plugin directory.
+
+    Args:
+        entry: Plugin entry from the manifest (or None)
+        plugin_dir: Path to the plugin directory
+
+    Returns:
+        True if the entry matches the plugin sources, or the sources are not
+        available to compare against (frozen bundle)
+    """
+    if entry is None:
+        return False
+    current_hash = plugin_source_hash(plugin_dir)
+    return current_hash == "" or entry.get("source_hash") == current_hash
+
+
+def load_manifest(path: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    """
+    Load the tool manifest.
+
+    Args:
+        path: Manifest path (default: tools/tool_manifest.json)
+
+    Returns:
+        Manifest dictionary, or None if it is missing, unreadable or outdated
+    """
+    manifest_path = path or get_manifest_path()
+    if not manifest_path.exists():
+        return None
+
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Failed to read tool manifest {manifest_path}: {e}")
+        return None
+
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        logger.info(f"Ignoring tool manifest with unsupported version: {manifest_path}")
+        return None
+
+    return manifest
+
+
+def write_manifest(manifest: Dict[str, Any], path: Optional[Path] = None) -> Path:
+    """
+    Write the tool manifest to disk.
+
+    Args:
+        manifest: Manifest dictionary
+        path: Output path (default: tools/tool_manifest.json)
+
+    Returns:
+        Path the manifest was written to
+    """
+    manifest_path = path or get_manifest_path()
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, separators=(",", ":"))
+
+    return manifest_path
+
+
+def refresh_manifest(plugins: List[Any], path: Optional[Path] = None) -> None:
+    """
+    Rewrite the manifest from the given plugins, ignoring write failures.
+
+    Used after an eager load so the next start can be lazy. Read-only installs
+    simply keep loading eagerly.
+
+    Args:
+        plugins: List of loaded ToolPlugin instances
+        path: Output path (default: tools/tool_manifest.json)
+    """
+    try:
+        output = write_manifest(build_manifest(plugins), path)
+        logger.info(f"Updated tool manifest: {output}")
+    except Exception as e:
+        logger.debug(f"Could not update tool manifest: {e}")
+
+
+def _format_annotation(annotation: Any) -> str:
+    """Convert an annotation to the string stored in the manifest."""
+    if annotation is inspect.Parameter.empty:
+        return ""
+    return inspect.formatannotation(annotation)
+
+
+def _parse_annotation(text: str) -> Any:
+    """Convert a manifest annotation string back to a type (Any if it cannot be)."""
+    if not text:
+        return inspect.Parameter.empty
+    try:
+        return eval(text, {"__builtins__": {}}, _ANNOTATION_NAMESPACE)
+    except Exception as e:
+        logger.debug(f"Cannot rebuild annotation {text!r} from the tool manifest: {e}")
+        return Any
+
+
+def main() -> int:
+    """Generate the tool manifest from the installed plugins."""
+    from mcp_server.tools import load_all_plugins
+
+    parser = argparse.ArgumentParser(description="Generate the oh-my-mcp tool manifest")
+    parser.add_argument("--output", "-o", type=Path, default=None, help="Output file path")
+    args = parser.parse_args()
+
+    plugins = load_all_plugins(lazy=False)
+    manifest = build_manifest(plugins)
+    output = write_manifest(manifest, args.output)
+
+    tool_count = sum(len(entry["tools"]) for entry in manifest["plugins"].values())
+    print(f"Wrote manifest for {len(plugins)} plugins ({tool_count} tools) to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
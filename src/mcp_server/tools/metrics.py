@@ -0,0 +1,274 @@
+"""
+Per-tool call metrics.
+
+Every tool registered through ToolPlugin.register_to_mcp is instrumented to
+record call counts, latency, input/output sizes and errors by exception type.
+The numbers are exposed by the config://metrics resource as JSON and by
+config://metrics/prometheus in the Prometheus text exposition format.
+
+Caches of plugin modules report their usage through register_cache() when
+their module is first imported, so reading the metrics does not load plugin
+dependencies at server start.
+"""
+
+import functools
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+# Upper bounds (seconds) of the Prometheus latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Number of recent latencies kept per tool for percentile estimates
+RESERVOIR_SIZE = 1024
+
+
+class ToolStats:
+    """Counters for a single tool."""
+
+    def __init__(self, plugin: str):
+        self.plugin = plugin
+        self.calls = 0
+        self.errors: Dict[str, int] = {}
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.input_bytes = 0
+        self.output_bytes = 0
+        self.first_call: Optional[float] = None
+        self.bucket_counts = [0] * len(LATENCY_BUCKETS)
+        self.recent: Deque[float] = deque(maxlen=RESERVOIR_SIZE)
+
+    def percentile(self, fraction: float) -> float:
+        """Estimate a latency percentile from recent calls."""
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        index = min(len(ordered) - 1, round(fraction * (len(ordered) - 1)))
+        return ordered[index]
+
+
+class ToolMetrics:
+    """Thread-safe collection of per-tool statistics."""
+
+    def __init__(self) -> None:
+        self._stats: Dict[str, ToolStats] = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def record(
+        self,
+        tool: str,
+        plugin: str,
+        seconds: float,
+        input_bytes: int,
+        output_bytes: int,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """
+        Record one tool call.
+
+        Args:
+            tool: Tool name
+            plugin: Plugin name
+            seconds: Wall-clock duration of the call
+            input_bytes: Approximate size of the arguments
+            output_bytes: Size of the result
+            error: Exception raised by the call, if any
+        """
+        with self._lock:
+            stats = self._stats.get(tool)
+            if stats is None:
+                stats = self._stats[tool] = ToolStats(plugin)
+
+            stats.calls += 1
+            stats.total_seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            stats.input_bytes += input_bytes
+            stats.output_bytes += output_bytes
+            stats.recent.append(seconds)
+            if stats.first_call is None:
+                stats.first_call = time.time() - seconds
+
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    stats.bucket_counts[i] += 1
+                    break
+
+            if error is not None:
+                name = type(error).__name__
+                stats.errors[name] = stats.errors.get(name, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get a JSON-serializable summary of all tool metrics.
+
+        Returns:
+            Dictionary with per-tool counters and latency percentiles (ms)
+        """
+        now = time.time()
+        tools: Dict[str, Any] = {}
+
+        with self._lock:
+            for name, stats in sorted(self._stats.items()):
+                elapsed = now - (stats.first_call or now)
+                error_count = sum(stats.errors.values())
+                tools[name] = {
+                    "plugin": stats.plugin,
+                    "calls": stats.calls,
+                    "errors": error_count,
+                    "errors_by_type": dict(stats.errors),
+                    "error_rate": round(error_count / stats.calls, 4) if stats.calls else 0.0,
+                    "calls_per_second": round(stats.calls / elapsed, 4) if elapsed > 0 else 0.0,
+                    "latency_ms": {
+                        "avg": round(stats.total_seconds / stats.calls * 1000, 3),
+                        "p50": round(stats.percentile(0.50) * 1000, 3),
+                        "p95": round(stats.percentile(0.95) * 1000, 3),
+                        "p99": round(stats.percentile(0.99) * 1000, 3),
+                        "max": round(stats.max_seconds * 1000, 3),
+                    },
+                    "input_bytes": stats.input_bytes,
+                    "output_bytes": stats.output_bytes,
+                }
+
+        return {
+            "uptime_seconds": round(now - self.started_at, 3),
+            "total_calls": sum(tool["calls"] for tool in tools.values()),
+            "total_errors": sum(tool["errors"] for tool in tools.values()),
+            "tools": tools,
+        }
+
+    def render_prometheus(self) -> str:
+        """
+        Render all tool metrics in the Prometheus text exposition format.
+
+        Returns:
+            Metrics text
+        """
+        lines: List[str] = [
+            "# HELP mcp_tool_calls_total Total tool calls.",
+            "# TYPE mcp_tool_calls_total counter",
+        ]
+        histogram: List[str] = [
+            "# HELP mcp_tool_latency_seconds Tool call latency.",
+            "# TYPE mcp_tool_latency_seconds histogram",
+        ]
+        errors: List[str] = [
+            "# HELP mcp_tool_errors_total Tool call errors by exception type.",
+            "# TYPE mcp_tool_errors_total counter",
+        ]
+        sizes: List[str] = [
+            "# HELP mcp_tool_bytes_total Tool input and output bytes.",
+            "# TYPE mcp_tool_bytes_total counter",
+        ]
+
+        with self._lock:
+            for name, stats in sorted(self._stats.items()):
+                labels = f'tool="{name}",plugin="{stats.plugin}"'
+                lines.append(f"mcp_tool_calls_total{{{labels}}} {stats.calls}")
+
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS, stats.bucket_counts):
+                    cumulative += count
+                    histogram.append(
+                        f'mcp_tool_latency_seconds_bucket{{{labels},le="{bound}"}} {cumulative}'
+                    )
+                histogram.append(
+                    f'mcp_tool_latency_seconds_bucket{{{labels},le="+Inf"}} {stats.calls}'
+                )
+                histogram.append(f"mcp_tool_latency_seconds_sum{{{labels}}} {stats.total_seconds}")
+                histogram.append(f"mcp_tool_latency_seconds_count{{{labels}}} {stats.calls}")
+
+                for error_type, count in sorted(stats.errors.items()):
+                    errors.append(f'mcp_tool_errors_total{{{labels},type="{error_type}"}} {count}')
+
+                sizes.append(f'mcp_tool_bytes_total{{{labels},direction="in"}} {stats.input_bytes}')
+                sizes.append(
+                    f'mcp_tool_bytes_total{{{labels},direction="out"}} {stats.output_bytes}'
+                )
+
+        return "\n".join(lines + histogram + errors + sizes) + "\n"
+
+    def reset(self) -> None:
+        """Clear all recorded metrics."""
+        with self._lock:
+            self._stats.clear()
+            self.started_at = time.time()
+
+
+def _payload_size(value: Any) -> int:
+    """Cheaply approximate the serialized size of a tool argument or result."""
+    if value is None:
+        return 0
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, (list, tuple)):
+        return sum(_payload_size(item) for item in value)
+    if isinstance(value, dict):
+        return sum(len(str(key)) + _payload_size(item) for key, item in value.items())
+    return len(str(value))
+
+
+def instrument(
+    func: Callable[..., Awaitable[Any]], tool_name: str, plugin_name: str
+) -> Callable[..., Awaitable[Any]]:
+    """
+    Wrap an async tool so every call is recorded in the global metrics.
+
+    Args:
+        func: Async tool function
+        tool_name: Tool name used as the metrics key
+        plugin_name: Plugin the tool belongs to
+
+    Returns:
+        Async function with the same signature
+    """
+    metrics = get_metrics()
+
+    @functools.wraps(func)
+    async def instrumented_tool(*args: Any, **kwargs: Any) -> Any:
+        input_bytes = _payload_size(args) + _payload_size(kwargs)
+        start = time.perf_counter()
+        try:
+            result = await func(*args, **kwargs)
+        except BaseException as e:
+            metrics.record(tool_name, plugin_name, time.perf_counter() - start, input_bytes, 0, e)
+            raise
+        metrics.record(
+            tool_name, plugin_name, time.perf_counter() - start, input_bytes, _payload_size(result)
+        )
+        return result
+
+    return instrumented_tool
+
+
+# Global metrics instance
+_metrics: Optional[ToolMetrics] = None
+
+
+def get_metrics() -> ToolMetrics:
+    """Get the global tool metrics instance."""
+    global _metrics
+    if _metrics is None:
+        _metrics = ToolMetrics()
+    return _metrics
+
+
+# Stats functions of registered caches, by name
+_cache_stats: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+
+def register_cache(name: str, stats: Callable[[], Dict[str, Any]]) -> None:
+    """
+    Report a cache's usage in the config://metrics resource.
+
+    Args:
+        name: Key of the cache's statistics in the metrics
+        stats: Function returning the statistics
+    """
+    _cache_stats[name] = stats
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Get the statistics of the registered caches, by name."""
+    return {name: stats() for name, stats in list(_cache_stats.items())}
@@ -4,36 +4,87 @@ Tool plugin registration framework.
 This module provides the infrastructure for automatic tool discovery and registration.
 """
 
+import functools
 import importlib
+import sys
+import threading
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, overload
 
 import yaml
 
-from mcp_server.utils import logger
+from mcp_server.utils import logger, to_json
+
+from .admission import ConcurrencyLimiter, limit_concurrency, limiter_from_options
+from .executor import apply_deadline, get_default_deadline, make_async_handler
+from .metrics import instrument
+from .result_cache import cache_results
+from .streaming import join_chunks, paginate
 
 # Global registry for tool handlers
 _TOOL_REGISTRY: Dict[str, List[Callable[..., Any]]] = {}
 
+# Options passed to @tool_handler(...), by module name and tool name
+_TOOL_OPTIONS: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+
+@overload
+def tool_handler(func: Callable[..., Any]) -> Callable[..., Any]: ...
+
 
-def tool_handler(func: Callable[..., Any]) -> Callable[..., Any]:
+@overload
+def tool_handler(
+    func: None = None, **options: Any
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]: ...
+
+
+def tool_handler(func: Optional[Callable[..., Any]] = None, **options: Any) -> Any:
     """
     Decorator to mark a function as a tool handler.
 
     This decorator registers the function in the global tool registry,
     allowing it to be automatically discovered and registered with MCP.
+    It can be used bare (``@tool_handler``) or with options
+    (``@tool_handler(cpu_bound=True)``). Options can also be set per tool
+    under the ``tools`` key of the plugin's config.yaml, which takes precedence.
+
+    Supported options:
+        cpu_bound: Run the handler on the process pool instead of the thread pool
+        cacheable: Cache results by arguments (only for pure, deterministic tools)
+        streaming: The handler is a generator yielding text chunks; large results
+            are returned in pages (see tools/streaming.py)
+        max_concurrent, max_queue, queue_timeout: Concurrency limit for the tool
+            (see tools/admission.py)
+        deadline: Seconds a call may run before it is cancelled (0 for none;
+            default: MCP_SERVER_TOOL_DEADLINE, see tools/executor.py)
 
     Args:
         func: The tool handler function to register
+        **options: Tool options
 
     Returns:
-        The original function unchanged
+        The original function (streaming handlers return their joined result)
     """
-    module_name = func.__module__
-    if module_name not in _TOOL_REGISTRY:
-        _TOOL_REGISTRY[module_name] = []
-    _TOOL_REGISTRY[module_name].append(func)
-    return func
+
+    def register(handler: Callable[..., Any]) -> Callable[..., Any]:
+        if options.get("streaming"):
+            handler = join_chunks(handler)
+        module_name = handler.__module__
+        handlers = _TOOL_REGISTRY.setdefault(module_name, [])
+        # Re-importing a module (plugin reload) replaces its tools instead of duplicating them
+        for i, existing in enumerate(handlers):
+            if existing.__name__ == handler.__name__:
+                handlers[i] = handler
+                break
+        else:
+            handlers.append(handler)
+        if options:
+            _TOOL_OPTIONS.setdefault(module_name, {})[handler.__name__] = dict(options)
+        return handler
+
+    if func is not None:
+        return register(func)
+    return register
 
 
 class ToolPlugin:
@@ -51,11 +102,20 @@ class ToolPlugin:
         """
         self.plugin_dir = plugin_dir
         self.name = plugin_dir.name
+        self.config = config
         self.category_name = config.get("category_name", "Unknown")
         self.category_description = config.get("category_description", "")
         self.enabled = config.get("enabled", True)
+        self.tool_config: Dict[str, Dict[str, Any]] = config.get("tools") or {}
         self.tools: List[Callable[..., Any]] = []
+        self.loaded = False
         self._handlers_module: Optional[Any] = None
+        self._handlers: Dict[str, Callable[..., Any]] = {}
+        self._handler_options: Dict[str, Dict[str, Any]] = {}
+        self._manifest_entries: Dict[str, Dict[str, Any]] = {}
+        self._load_lock = threading.Lock()
+        self.limiter = limiter_from_options(self.name, config.get("concurrency") or {})
+        self._tool_limiters: Dict[str, ConcurrencyLimiter] = {}
 
     def load_handlers(self) -> None:
         """
@@ -73,10 +133,105 @@ class ToolPlugin:
             else:
                 logger.warning(f"No tools found in {self.name}")
 
+            self._handlers = {tool.__name__: tool for tool in self.tools}
+            self._handler_options = _TOOL_OPTIONS.get(module_path, {})
+            self._manifest_entries = {}
+            self.loaded = True
+
         except ImportError as e:
             logger.error(f"Failed to import handlers for {self.name}: {e}")
             raise
 
+    def reload_handlers(self) -> None:
+        """
+        Re-import the handlers module from disk and extract tool functions.
+
+        The module's registry entries are rebuilt from scratch, so tools removed
+        from handlers.py disappear. If the new source fails to import, the
+        previous entries are restored and the error is raised.
+        """
+        module_path = f"mcp_server.tools.{self.name}.handlers"
+        previous_tools = _TOOL_REGISTRY.pop(module_path, None)
+        previous_options = _TOOL_OPTIONS.pop(module_path, None)
+
+        try:
+            module = sys.modules.get(module_path)
+            if module is not None:
+                importlib.reload(module)
+            self.load_handlers()
+        except Exception:
+            if previous_tools is not None:
+                _TOOL_REGISTRY[module_path] = previous_tools
+            if previous_options is not None:
+                _TOOL_OPTIONS[module_path] = previous_options
+            raise
+
+    def load_stubs(self, entries: List[Dict[str, Any]]) -> None:
+        """
+        Populate tools from manifest entries without importing the handlers module.
+
+        Each tool is replaced by a stub with the same name, docstring and signature
+        that imports the handlers module on its first call. The stubs are registered
+        with the schemas stored in the manifest.
+
+        Args:
+            entries: Tool entries from the tool manifest
+        """
+        self.tools = [_make_lazy_stub(self, entry) for entry in entries]
+        self._handler_options = {entry["name"]: entry.get("options", {}) for entry in entries}
+        self._manifest_entries = {entry["name"]: entry for entry in entries}
+        logger.debug(f"Prepared {len(self.tools)} lazy tools for {self.name}")
+
+    def get_handler(self, tool_name: str) -> Callable[..., Any]:
+        """
+        Get the real handler function for a tool, importing handlers if needed.
+
+        Args:
+            tool_name: Name of the tool
+
+        Returns:
+            The tool handler function
+
+        Raises:
+            KeyError: If the handlers module does not define the tool
+        """
+        if not self.loaded:
+            with self._load_lock:
+                if not self.loaded:
+                    logger.info(f"Importing handlers for lazy plugin: {self.name}")
+                    self.load_handlers()
+
+        return self._handlers[tool_name]
+
+    def handler_options(self, tool_name: str) -> Dict[str, Any]:
+        """
+        Get the options a tool was declared with in @tool_handler(...).
+
+        Args:
+            tool_name: Name of the tool
+
+        Returns:
+            Dictionary of decorator options (empty if none were given)
+        """
+        return dict(self._handler_options.get(tool_name, {}))
+
+    def get_tool_options(self, tool_name: str) -> Dict[str, Any]:
+        """
+        Get the effective options for a tool.
+
+        Options from the ``tools`` section of config.yaml override the
+        options given to @tool_handler(...).
+
+        Args:
+            tool_name: Name of the tool
+
+        Returns:
+            Dictionary of tool options
+        """
+        options = self.handler_options(tool_name)
+        options.update(self.tool_config.get(tool_name) or {})
+        return options
+
     def register_to_mcp(self, mcp: Any) -> None:
         """
         Register all tool handlers to the MCP server instance.
@@ -88,11 +243,223 @@ class ToolPlugin:
             logger.warning(f"No tools to register for {self.name}")
             return
 
+        from .manifest import build_tool
+
         for tool_func in self.tools:
-            # Register the tool with MCP using the decorator
-            _decorated_func = mcp.tool()(tool_func)
+            entry = self._manifest_entries.get(tool_func.__name__)
+            if entry is not None:
+                # Lazy stub: reuse the manifest schemas instead of inspecting the signature
+                mcp.add_tool(build_tool(entry, self._wrap_tool(tool_func)))
+            else:
+                # Register the tool with MCP using the decorator
+                _decorated_func = mcp.tool()(self._wrap_tool(tool_func))
             logger.debug(f"Registered tool: {tool_func.__name__}")
 
+    def unregister_from_mcp(self, mcp: Any) -> None:
+        """
+        Remove this plugin's tools from the MCP server instance.
+
+        Args:
+            mcp: The FastMCP server instance
+        """
+        for tool_func in self.tools:
+            try:
+                _remove_mcp_tool(mcp, tool_func.__name__)
+                logger.debug(f"Unregistered tool: {tool_func.__name__}")
+            except Exception as e:
+                logger.debug(f"Tool {tool_func.__name__} was not registered: {e}")
+
+    def concurrency_stats(self) -> Dict[str, Any]:
+        """
+        Get the usage of this plugin's concurrency limits.
+
+        Returns:
+            Dictionary with the plugin-wide limiter (if any) and per-tool limiters
+        """
+        return {
+            "plugin": self.limiter.stats() if self.limiter else None,
+            "tools": {name: limiter.stats() for name, limiter in self._tool_limiters.items()},
+        }
+
+    def _wrap_tool(self, tool_func: Callable[..., Any]) -> Callable[..., Any]:
+        """
+        Wrap a tool for registration.
+
+        Calls run on the worker pools instead of the event loop and are
+        recorded in the tool metrics. Results of ``cacheable`` tools are served
+        from the result cache, and ``streaming`` tools return large results in pages.
+        Calls beyond the tool's or the plugin's concurrency limit wait in a bounded
+        queue or are rejected, and every call is bounded by the tool's ``deadline``.
+
+        Args:
+            tool_func: Tool handler or lazy stub
+
+        Returns:
+            Async function exposing the same signature
+        """
+        tool_name = tool_func.__name__
+        options = self.get_tool_options(tool_name)
+
+        limiters = []
+        tool_limiter = limiter_from_options(tool_name, options)
+        if tool_limiter is not None:
+            self._tool_limiters[tool_name] = tool_limiter
+            limiters.append(tool_limiter)
+        if self.limiter is not None:
+            limiters.append(self.limiter)
+
+        if options.get("streaming"):
+            # Page through the handler's generator instead of its joined result
+            def tool_chunks(*args: Any, **kwargs: Any) -> Any:
+                handler: Any = self.get_handler(tool_name)
+                return handler.iter_chunks(*args, **kwargs)
+
+            functools.update_wrapper(tool_chunks, tool_func)
+            async_tool = paginate(make_async_handler(tool_chunks), tool_name, limiters)
+        else:
+            mode = "process" if options.get("cpu_bound") else "thread"
+            async_tool = make_async_handler(
+                tool_func, mode, resolve=lambda: self.get_handler(tool_name)
+            )
+
+        async_tool = limit_concurrency(async_tool, limiters)
+
+        # Cache hits are answered without taking a concurrency slot
+        if options.get("cacheable") and not options.get("streaming"):
+            async_tool = cache_results(async_tool, tool_name)
+
+        deadline = options.get("deadline", get_default_deadline())
+        async_tool = apply_deadline(async_tool, float(deadline or 0), tool_name)
+        return instrument(async_tool, tool_name, self.name)
+
+
+class PluginRegistry:
+    """
+    Server-level collection of loaded plugins.
+
+    Built once at startup and shared by everything that needs plugin information,
+    so resources do not rediscover plugins on every read. Rendered resource
+    payloads are cached until a plugin is replaced.
+    """
+
+    def __init__(self, plugins: List[ToolPlugin]):
+        """
+        Initialize the registry.
+
+        Args:
+            plugins: Loaded ToolPlugin instances, in registration order
+        """
+        self._plugins: Dict[str, ToolPlugin] = {plugin.name: plugin for plugin in plugins}
+        self._payloads: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def plugins(self) -> List[ToolPlugin]:
+        """All registered plugins."""
+        return list(self._plugins.values())
+
+    def get(self, name: str) -> Optional[ToolPlugin]:
+        """
+        Get a plugin by name.
+
+        Args:
+            name: Plugin directory name (e.g. "web")
+
+        Returns:
+            The plugin, or None if it is not registered
+        """
+        return self._plugins.get(name)
+
+    def replace(self, plugin: ToolPlugin) -> None:
+        """
+        Add or replace a plugin and drop cached payloads.
+
+        Args:
+            plugin: The new plugin instance
+        """
+        with self._lock:
+            self._plugins[plugin.name] = plugin
+            self._payloads.clear()
+
+    def remove(self, name: str) -> Optional[ToolPlugin]:
+        """
+        Remove a plugin and drop cached payloads.
+
+        Args:
+            name: Plugin directory name
+
+        Returns:
+            The removed plugin, or None if it was not registered
+        """
+        with self._lock:
+            self._payloads.clear()
+            return self._plugins.pop(name, None)
+
+    def invalidate(self) -> None:
+        """Drop all cached payloads."""
+        with self._lock:
+            self._payloads.clear()
+
+    def render(self, key: str, builder: Callable[[], Dict[str, Any]]) -> str:
+        """
+        Get a cached JSON payload, building it on first use.
+
+        Args:
+            key: Cache key (e.g. the resource URI)
+            builder: Function returning the payload dictionary
+
+        Returns:
+            JSON string of the payload
+        """
+        with self._lock:
+            payload = self._payloads.get(key)
+            if payload is None:
+                payload = to_json(builder())
+                self._payloads[key] = payload
+            return payload
+
+
+def _remove_mcp_tool(mcp: Any, name: str) -> None:
+    """Remove a tool by name from a FastMCP server (2.x or newer API)."""
+    if hasattr(mcp, "remove_tool"):
+        mcp.remove_tool(name)
+    else:
+        mcp.local_provider.remove_tool(name)
+
+
+def _make_lazy_stub(plugin: ToolPlugin, entry: Dict[str, Any]) -> Callable[..., Any]:
+    """
+    Create a stand-in for a tool handler described by a manifest entry.
+
+    Args:
+        plugin: Plugin that owns the tool
+        entry: Tool entry from the tool manifest
+
+    Returns:
+        Function exposing the handler's signature that forwards to the real handler
+    """
+    from .manifest import build_signature
+
+    tool_name = entry["name"]
+
+    def lazy_tool(*args: Any, **kwargs: Any) -> Any:
+        return plugin.get_handler(tool_name)(*args, **kwargs)
+
+    signature = build_signature(entry)
+    lazy_tool.__name__ = tool_name
+    lazy_tool.__qualname__ = tool_name
+    lazy_tool.__doc__ = entry.get("doc") or None
+    lazy_tool.__signature__ = signature  # type: ignore[attr-defined]
+    lazy_tool.__annotations__ = {
+        name: param.annotation
+        for name, param in signature.parameters.items()
+        if param.annotation is not param.empty
+    }
+    if signature.return_annotation is not signature.empty:
+        lazy_tool.__annotations__["return"] = signature.return_annotation
+
+    return lazy_tool
+
 
 def load_plugin_config(plugin_dir: Path) -> Dict[str, Any]:
     """
@@ -0,0 +1,166 @@
+"""
+Hot reload of individual tool plugins.
+
+A reload re-reads a plugin's config.yaml, re-imports its handlers module and
+re-registers only that plugin's tools with the running FastMCP server. Other
+modules of the plugin (e.g. session managers and caches) are not re-imported,
+so warm state such as browser sessions survives the reload.
+
+Reloads are triggered by the reload_plugin tool, or automatically by the plugin
+watcher when MCP_SERVER_WATCH_PLUGINS=1:
+    MCP_SERVER_WATCH_PLUGINS    - Watch plugin sources for changes (default: 0)
+    MCP_SERVER_WATCH_INTERVAL   - Seconds between checks (default: 2)
+"""
+
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from mcp_server.utils import logger
+
+from .registry import PluginRegistry, ToolPlugin, load_plugin_config
+from .result_cache import get_result_cache
+
+# Plugin files whose changes trigger a reload in watch mode
+WATCHED_FILES = ("handlers.py", "config.yaml")
+
+# Serializes reloads started by the tool and the watcher
+_reload_lock = threading.Lock()
+
+
+def reload_plugin(registry: PluginRegistry, mcp: Any, name: str) -> Dict[str, Any]:
+    """
+    Reload one plugin and re-register its tools.
+
+    Args:
+        registry: Server plugin registry
+        mcp: The FastMCP server instance
+        name: Plugin directory name (e.g. "web")
+
+    Returns:
+        Summary with the plugin name and the added, removed and reloaded tools
+
+    Raises:
+        ValueError: If no plugin with that name exists
+    """
+    from mcp_server.tools import _get_tools_dir
+
+    with _reload_lock:
+        old_plugin = registry.get(name)
+        plugin_dir = old_plugin.plugin_dir if old_plugin else _get_tools_dir() / name
+        if not (plugin_dir / "config.yaml").exists():
+            raise ValueError(f"Unknown plugin: {name}")
+
+        old_tools = {tool.__name__ for tool in old_plugin.tools} if old_plugin else set()
+        config = load_plugin_config(plugin_dir)
+
+        # Results computed by the old code must not be served by the new code
+        get_result_cache().clear(old_tools)
+
+        if not config.get("enabled", True):
+            if old_plugin is not None:
+                old_plugin.unregister_from_mcp(mcp)
+                registry.remove(name)
+            logger.info(f"Plugin disabled on reload: {name}")
+            return {"plugin": name, "enabled": False, "added": [], "removed": sorted(old_tools)}
+
+        # Import the new code before touching the server so a broken plugin keeps serving
+        plugin = ToolPlugin(plugin_dir, config)
+        plugin.reload_handlers()
+
+        if old_plugin is not None:
+            old_plugin.unregister_from_mcp(mcp)
+        plugin.register_to_mcp(mcp)
+        registry.replace(plugin)
+
+        new_tools = {tool.__name__ for tool in plugin.tools}
+        logger.info(f"Reloaded plugin: {plugin.category_name} ({len(new_tools)} tools)")
+        return {
+            "plugin": name,
+            "enabled": True,
+            "added": sorted(new_tools - old_tools),
+            "removed": sorted(old_tools - new_tools),
+            "reloaded": sorted(new_tools & old_tools),
+        }
+
+
+class PluginWatcher:
+    """
+    Background thread that reloads plugins whose sources change on disk.
+
+    Polls the modification times of each plugin's handlers.py and config.yaml,
+    so it works without platform-specific file notification APIs.
+    """
+
+    def __init__(self, registry: PluginRegistry, mcp: Any, interval: float = 2.0):
+        """
+        Initialize the watcher.
+
+        Args:
+            registry: Server plugin registry
+            mcp: The FastMCP server instance
+            interval: Seconds between checks
+        """
+        self.registry = registry
+        self.mcp = mcp
+        self.interval = interval
+        self._mtimes: Dict[str, Tuple[int, ...]] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Record the current source state and start polling."""
+        from mcp_server.tools import discover_tool_plugins
+
+        self._mtimes = {d.name: _source_mtimes(d) for d in discover_tool_plugins()}
+        self._thread = threading.Thread(target=self._run, name="mcp-plugin-watcher", daemon=True)
+        self._thread.start()
+        logger.info(f"Watching {len(self._mtimes)} plugins for changes")
+
+    def stop(self) -> None:
+        """Stop polling."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+
+    def check(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Reload every plugin whose sources changed since the last check.
+
+        Returns:
+            Reload summaries by plugin name (failed reloads are logged and skipped)
+        """
+        from mcp_server.tools import discover_tool_plugins
+
+        results = {}
+        for plugin_dir in discover_tool_plugins():
+            mtimes = _source_mtimes(plugin_dir)
+            if self._mtimes.get(plugin_dir.name) == mtimes:
+                continue
+            self._mtimes[plugin_dir.name] = mtimes
+
+            try:
+                results[plugin_dir.name] = reload_plugin(self.registry, self.mcp, plugin_dir.name)
+            except Exception as e:
+                logger.error(f"Failed to reload plugin {plugin_dir.name}: {e}")
+
+        return results
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"Plugin watcher error: {e}")
+
+
+def _source_mtimes(plugin_dir: Path) -> Tuple[int, ...]:
+    """Get the modification times of a plugin's watched files (0 if missing)."""
+    mtimes = []
+    for filename in WATCHED_FILES:
+        try:
+            mtimes.append((plugin_dir / filename).stat().st_mtime_ns)
+        except OSError:
+            mtimes.append(0)
+    return tuple(mtimes)
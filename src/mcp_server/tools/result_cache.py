@@ -0,0 +1,221 @@
+"""
+Result cache for pure tools.
+
+Tools declared ``cacheable`` (``@tool_handler(cacheable=True)`` or
+``cacheable: true`` under ``tools:`` in config.yaml) return the same result for
+the same arguments, so their results are kept in a process-wide LRU cache keyed
+on a hash of the tool name and the bound arguments. The cache is bounded by both
+an entry count and an approximate memory budget.
+
+Limits can be configured with environment variables:
+    MCP_SERVER_RESULT_CACHE_BYTES    - Memory budget in bytes (default: 32 MB, 0 disables)
+    MCP_SERVER_RESULT_CACHE_ENTRIES  - Maximum number of entries (default: 1024)
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from mcp_server.utils import logger
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+DEFAULT_MAX_ENTRIES = 1024
+
+# Marks a cache miss (None is a valid tool result)
+_MISSING = object()
+
+
+class ResultCache:
+    """Thread-safe LRU cache with an entry limit and a memory budget."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Approximate memory budget for cached results
+            max_entries: Maximum number of cached results
+        """
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Any, int]]" = OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, tool: str, key: str) -> Any:
+        """
+        Get a cached result and mark it as recently used.
+
+        Args:
+            tool: Tool name
+            key: Argument hash from make_key()
+
+        Returns:
+            The cached result, or _MISSING if it is not cached
+        """
+        with self._lock:
+            entry = self._entries.get((tool, key))
+            if entry is None:
+                self._misses += 1
+                return _MISSING
+            self._entries.move_to_end((tool, key))
+            self._hits += 1
+            return entry[0]
+
+    def put(self, tool: str, key: str, value: Any) -> None:
+        """
+        Cache a result, evicting the least recently used entries to stay in budget.
+
+        Results larger than a quarter of the memory budget are not cached.
+
+        Args:
+            tool: Tool name
+            key: Argument hash from make_key()
+            value: Tool result
+        """
+        size = _result_size(value)
+        if size > self.max_bytes // 4:
+            return
+
+        with self._lock:
+            previous = self._entries.pop((tool, key), None)
+            if previous is not None:
+                self._size -= previous[1]
+
+            self._entries[(tool, key)] = (value, size)
+            self._size += size
+
+            while self._size > self.max_bytes or len(self._entries) > self.max_entries:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+
+    def clear(self, tools: Optional[Iterable[str]] = None) -> None:
+        """
+        Drop cached results.
+
+        Args:
+            tools: Only drop results of these tools (default: all)
+        """
+        with self._lock:
+            if tools is None:
+                self._entries.clear()
+                self._size = 0
+                return
+
+            names = set(tools)
+            for cache_key in [k for k in self._entries if k[0] in names]:
+                self._size -= self._entries.pop(cache_key)[1]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache usage statistics.
+
+        Returns:
+            Dictionary with entry count, size, limits, hits and misses
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+def make_key(signature: inspect.Signature, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> str:
+    """
+    Hash tool arguments, normalizing positional/keyword use and defaults.
+
+    Args:
+        signature: Signature of the tool handler
+        args: Positional arguments of the call
+        kwargs: Keyword arguments of the call
+
+    Returns:
+        Hex digest identifying the arguments
+    """
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    payload = json.dumps(bound.arguments, sort_keys=True, default=repr, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def cache_results(
+    func: Callable[..., Awaitable[Any]], tool_name: str
+) -> Callable[..., Awaitable[Any]]:
+    """
+    Wrap an async tool so results are served from the global result cache.
+
+    Args:
+        func: Async tool function
+        tool_name: Tool name used in the cache key
+
+    Returns:
+        Async function with the same signature
+    """
+    cache = get_result_cache()
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    async def cached_tool(*args: Any, **kwargs: Any) -> Any:
+        if cache.max_bytes <= 0:
+            return await func(*args, **kwargs)
+
+        try:
+            key = make_key(signature, args, kwargs)
+        except TypeError:
+            # Invalid arguments; let the tool report the error
+            return await func(*args, **kwargs)
+
+        result = cache.get(tool_name, key)
+        if result is _MISSING:
+            result = await func(*args, **kwargs)
+            cache.put(tool_name, key, result)
+        return result
+
+    return cached_tool
+
+
+def _result_size(value: Any) -> int:
+    """Approximate the memory held by a cached result."""
+    if isinstance(value, str):
+        # Most results are ASCII JSON, stored at one byte per character
+        return len(value) + 64
+    if isinstance(value, bytes):
+        return len(value) + 64
+    return len(repr(value)) + 64
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read a non-negative integer from the environment."""
+    try:
+        return max(0, int(os.getenv(name, str(default))))
+    except ValueError:
+        logger.warning(f"Invalid value for {name}, using {default}")
+        return default
+
+
+# Global result cache instance
+_result_cache: Optional[ResultCache] = None
+
+
+def get_result_cache() -> ResultCache:
+    """Get the global result cache instance."""
+    global _result_cache
+    if _result_cache is None:
+        _result_cache = ResultCache(
+            max_bytes=_env_int("MCP_SERVER_RESULT_CACHE_BYTES", DEFAULT_MAX_BYTES),
+            max_entries=_env_int("MCP_SERVER_RESULT_CACHE_ENTRIES", DEFAULT_MAX_ENTRIES),
+        )
+    return _result_cache
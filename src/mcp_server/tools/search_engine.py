@@ -9,6 +9,7 @@
 - 结果去重
 """
 
+import contextvars
 import hashlib
 import json
 import time
@@ -18,10 +19,10 @@ from datetime import datetime, timedelta
 from threading import Lock
 from typing import Any, Optional
 
-import requests
 from bs4 import BeautifulSoup
 
-from ..utils import logger
+from ..utils import hot_logger, logger
+from . import http_client
 
 
 class SearchCache:
@@ -59,14 +60,14 @@ class SearchCache:
                 # 检查是否过期
                 if datetime.now() < entry["expires_at"]:
                     self.hits += 1
-                    logger.info(f"Cache hit for {engine}:{query}")
+                    hot_logger.info(f"Cache hit for {engine}:{query}")
                     result_list: list[dict[str, Any]] = entry["results"]
                     return result_list
                 else:
                     # 删除过期条目
                     del self.cache[key]
                     self.misses += 1
-                    logger.info(f"Cache expired for {engine}:{query}")
+                    hot_logger.info(f"Cache expired for {engine}:{query}")
             else:
                 self.misses += 1
 
@@ -90,7 +91,7 @@ class SearchCache:
                 "created_at": datetime.now(),
                 "expires_at": datetime.now() + timedelta(seconds=self.ttl_seconds),
             }
-            logger.info(f"Cached results for {engine}:{query}")
+            hot_logger.info(f"Cached results for {engine}:{query}")
 
     def clear(self) -> None:
         """清空缓存"""
@@ -254,7 +255,7 @@ class BingEngine(SearchEngine):
 
             headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
 
-            response = requests.get(search_url, headers=headers, timeout=15)
+            response = http_client.get(search_url, headers=headers, timeout=15)
             response.raise_for_status()
 
             soup = BeautifulSoup(response.text, "xml")
@@ -318,7 +319,7 @@ class GoogleEngine(SearchEngine):
 
             headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
 
-            response = requests.get(search_url, headers=headers, timeout=15)
+            response = http_client.get(search_url, headers=headers, timeout=15)
             response.raise_for_status()
 
             results = []
@@ -409,7 +410,7 @@ class BaiduEngine(SearchEngine):
                 "Cache-Control": "max-age=0",
             }
 
-            response = requests.get(search_url, headers=headers, timeout=15)
+            response = http_client.get(search_url, headers=headers, timeout=15)
             response.encoding = "utf-8"
             response.raise_for_status()
 
@@ -575,7 +576,7 @@ class SearchManager:
                         results = cached
                         engines_used.append(engine_name)
                         from_cache = True
-                        logger.info(f"Cache hit for {engine_name}:{query}")
+                        hot_logger.info(f"Cache hit for {engine_name}:{query}")
                         break
 
                 # 执行搜索
@@ -668,7 +669,8 @@ class SearchManager:
         # 使用线程池并行执行
         with ThreadPoolExecutor(max_workers=len(engines)) as executor:
             future_to_engine = {
-                executor.submit(search_engine, engine): engine for engine in engines
+                executor.submit(contextvars.copy_context().run, search_engine, engine): engine
+                for engine in engines
             }
 
             for future in as_completed(future_to_engine):
@@ -701,7 +703,7 @@ class SearchManager:
                     seen_titles.add(title)
                     unique_results.append(result)
 
-        logger.info(f"Deduplicated: {len(results)} -> {len(unique_results)} results")
+        hot_logger.info(f"Deduplicated: {len(results)} -> {len(unique_results)} results")
         return unique_results
 
     def get_cache_stats(self) -> dict[str, Any]:
@@ -0,0 +1,438 @@
+"""
+Paged results for tools with large outputs.
+
+A tool declared ``streaming`` (``@tool_handler(streaming=True)``) is a generator
+that yields its result as text chunks instead of building one large string.
+Called directly, such a handler returns the joined result as usual; when
+registered, the registry reads chunks on the worker thread pool until a page is full. If
+the whole result fits in one page it is returned unchanged; otherwise the tool
+returns the first page with a cursor, and the rest is read on demand with the
+read_result_page tool. Later pages are read under the deadline and cancellation
+event of the call that started the result, and hold the tool's concurrency slots
+while they are read. Only one page of a result is held in memory at a time,
+and a progress notification is sent to the client for every page.
+
+Concatenating the ``content`` of all pages gives the complete result.
+
+Limits can be configured with environment variables:
+    MCP_SERVER_PAGE_SIZE          - Characters per page (default: 65536)
+    MCP_SERVER_MAX_OPEN_STREAMS   - Unfinished results kept for paging (default: 32)
+    MCP_SERVER_STREAM_TTL         - Seconds an unread result is kept (default: 300)
+"""
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from mcp_server.utils import json_indent, logger, to_json
+
+from .admission import ConcurrencyLimiter, hold_slots
+from .executor import get_handler_loop, get_thread_pool
+
+DEFAULT_PAGE_SIZE = 64 * 1024
+DEFAULT_MAX_OPEN_STREAMS = 32
+DEFAULT_STREAM_TTL = 300.0
+
+# Size of the chunks streaming handlers read from files and sockets
+CHUNK_SIZE = 64 * 1024
+
+
+class StreamedString:
+    """A JSON string value produced from text chunks, for iter_json_object()."""
+
+    def __init__(self, chunks: Iterable[str]):
+        self.chunks = chunks
+
+
+class StreamedArray:
+    """A JSON array value produced item by item, for iter_json_object()."""
+
+    def __init__(self, items: Iterable[Any]):
+        self.items = items
+
+
+def iter_json_object(
+    fields: Iterable[Tuple[str, Any]], pretty: Optional[bool] = None
+) -> Iterator[str]:
+    """
+    Serialize a JSON object incrementally.
+
+    The output is identical to to_json() of the equivalent dictionary with the
+    json module backend. StreamedString and StreamedArray values are written as
+    they are produced, and ``fields`` may itself be a generator, so values that
+    depend on streamed data (e.g. counts) can be yielded after it.
+
+    Args:
+        fields: (key, value) pairs in output order
+        pretty: Indent the output (default: server-wide MCP_SERVER_JSON_STYLE)
+
+    Yields:
+        Pieces of JSON text
+    """
+    indent = json_indent(pretty)
+    if indent is None:
+        dumps = functools.partial(json.dumps, ensure_ascii=False, separators=(",", ":"))
+    else:
+        dumps = functools.partial(json.dumps, indent=indent, ensure_ascii=False)
+    pad = "" if indent is None else "\n" + " " * indent
+    item_separator = ","
+    key_separator = ":" if indent is None else ": "
+
+    yield "{"
+    empty = True
+    for key, value in fields:
+        yield ("" if empty else item_separator) + pad + dumps(key) + key_separator
+        empty = False
+
+        if isinstance(value, StreamedString):
+            yield '"'
+            for chunk in value.chunks:
+                if chunk:
+                    yield dumps(chunk)[1:-1]
+            yield '"'
+        elif isinstance(value, StreamedArray):
+            inner_pad = "" if indent is None else pad + " " * indent
+            first = True
+            for item in value.items:
+                text = dumps(item)
+                if indent is not None:
+                    text = text.replace("\n", inner_pad)
+                yield ("[" if first else item_separator) + inner_pad + text
+                first = False
+            yield "[]" if first else pad + "]"
+        else:
+            text = dumps(value)
+            yield text.replace("\n", pad) if indent is not None else text
+
+    yield "}" if empty or indent is None else "\n}"
+
+
+class ResultStream:
+    """An unfinished streaming result."""
+
+    def __init__(
+        self,
+        tool: str,
+        chunks: Iterator[str],
+        limiters: Optional[List[ConcurrencyLimiter]] = None,
+    ):
+        self.id = uuid.uuid4().hex
+        self.tool = tool
+        self.page = 0
+        self.sent = 0
+        self.last_access = time.monotonic()
+        # Context of the originating call (deadline, cancellation event, request)
+        self.context = contextvars.copy_context()
+        self.limiters = limiters or []
+        self._chunks = chunks
+        self._pending = ""
+        self._done = False
+        self._lock = threading.Lock()
+
+    def read(self, size: int) -> Tuple[str, bool]:
+        """
+        Read the next page from the handler.
+
+        Args:
+            size: Maximum number of characters
+
+        Returns:
+            (page text, whether the result is complete)
+        """
+        with self._lock:
+            parts: List[str] = [self._pending]
+            length = len(self._pending)
+            while length < size and not self._done:
+                try:
+                    chunk = next(self._chunks)
+                except StopIteration:
+                    self._done = True
+                    break
+                parts.append(chunk)
+                length += len(chunk)
+
+            text = "".join(parts)
+            self._pending = text[size:]
+            text = text[:size]
+
+            self.page += 1
+            self.sent += len(text)
+            self.last_access = time.monotonic()
+            return text, self._done and not self._pending
+
+    def close(self) -> None:
+        """Stop the handler and release its resources."""
+        close = getattr(self._chunks, "close", None)
+        if close is not None:
+            try:
+                close()
+            except Exception as e:
+                logger.debug(f"Error closing result stream for {self.tool}: {e}")
+
+
+class ResultStreamStore:
+    """Unfinished results waiting for read_result_page, bounded in count and age."""
+
+    def __init__(
+        self, max_streams: int = DEFAULT_MAX_OPEN_STREAMS, ttl: float = DEFAULT_STREAM_TTL
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            max_streams: Maximum number of unfinished results kept
+            ttl: Seconds after which an unread result is dropped
+        """
+        self.max_streams = max_streams
+        self.ttl = ttl
+        self._streams: "OrderedDict[str, ResultStream]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, stream: ResultStream) -> None:
+        """Keep a stream, dropping expired and the oldest streams if needed."""
+        with self._lock:
+            self._streams[stream.id] = stream
+            dropped = self._expire()
+            while len(self._streams) > self.max_streams:
+                dropped.append(self._streams.popitem(last=False)[1])
+        for old in dropped:
+            logger.info(f"Dropped unread result of {old.tool} (page {old.page})")
+            old.close()
+
+    def get(self, cursor: str) -> Optional[ResultStream]:
+        """Get a stream by cursor, or None if it is unknown or expired."""
+        with self._lock:
+            dropped = self._expire()
+            stream = self._streams.get(cursor)
+            if stream is not None:
+                self._streams.move_to_end(cursor)
+        for old in dropped:
+            old.close()
+        return stream
+
+    def remove(self, cursor: str) -> None:
+        """Forget a finished stream."""
+        with self._lock:
+            self._streams.pop(cursor, None)
+
+    def _expire(self) -> List[ResultStream]:
+        now = time.monotonic()
+        expired = [s for s in self._streams.values() if now - s.last_access > self.ttl]
+        for stream in expired:
+            del self._streams[stream.id]
+        return expired
+
+
+async def read_page(stream: ResultStream) -> Tuple[str, bool]:
+    """
+    Read the next page of a stream on the worker thread pool.
+
+    The handler runs in a copy of the context the stream was created in, so
+    later pages keep the originating call's deadline and cancellation event.
+
+    Args:
+        stream: The result stream
+
+    Returns:
+        (page text, whether the result is complete)
+    """
+    loop = asyncio.get_running_loop()
+    ctx = stream.context.copy()
+    text, done = await loop.run_in_executor(
+        get_thread_pool(), functools.partial(ctx.run, stream.read, get_page_size())
+    )
+    await _report_progress(stream, done)
+    return text, done
+
+
+async def read_next_page(cursor: str) -> Dict[str, Any]:
+    """
+    Read the next page of an unfinished result.
+
+    The page is read while holding the tool's concurrency slots, like the
+    call that returned the first page.
+
+    Args:
+        cursor: Cursor returned with the previous page
+
+    Returns:
+        Page dictionary (content, next_cursor, page, complete)
+
+    Raises:
+        KeyError: If the cursor is unknown, finished or expired
+        ToolBusyError: If the tool's concurrency limit rejects the read
+    """
+    store = get_stream_store()
+    stream = store.get(cursor)
+    if stream is None:
+        raise KeyError(f"Unknown or expired cursor: {cursor}")
+
+    async with hold_slots(stream.limiters, stream.tool):
+        text, done = await read_page(stream)
+    if done:
+        store.remove(cursor)
+    return _page_payload(stream, text, done)
+
+
+def paginate(
+    func: Callable[..., Awaitable[Any]],
+    tool_name: str,
+    limiters: Optional[List[ConcurrencyLimiter]] = None,
+) -> Callable[..., Awaitable[Any]]:
+    """
+    Wrap an async streaming tool so it returns its result one page at a time.
+
+    Args:
+        func: Async tool function returning an iterator of text chunks
+        tool_name: Tool name
+        limiters: Concurrency limiters the tool's calls hold, acquired again for
+            every later page
+
+    Returns:
+        Async function with the same parameters that returns a string
+    """
+
+    @functools.wraps(func)
+    async def paged_tool(*args: Any, **kwargs: Any) -> Any:
+        chunks = await func(*args, **kwargs)
+        if isinstance(chunks, str):
+            return chunks
+
+        stream = ResultStream(tool_name, iter(chunks), limiters)
+        text, done = await read_page(stream)
+        if done:
+            return text
+
+        get_stream_store().add(stream)
+        logger.info(f"{tool_name} result exceeds one page, returning cursor {stream.id}")
+        return to_json(_page_payload(stream, text, done))
+
+    return paged_tool
+
+
+def join_chunks(func: Callable[..., Iterable[str]]) -> Callable[..., str]:
+    """
+    Turn a streaming handler into a function returning the whole result.
+
+    Used by @tool_handler(streaming=True), so streaming handlers can still be
+    called directly. The generator stays available as ``iter_chunks`` for the
+    registry to page through.
+
+    Args:
+        func: Generator function yielding text chunks
+
+    Returns:
+        Function with the same parameters that returns a string
+    """
+
+    @functools.wraps(func)
+    def joined_tool(*args: Any, **kwargs: Any) -> str:
+        return "".join(func(*args, **kwargs))
+
+    signature = inspect.signature(func)
+    joined_tool.__signature__ = signature.replace(return_annotation=str)  # type: ignore[attr-defined]
+    joined_tool.__annotations__ = {**func.__annotations__, "return": str}
+    joined_tool.iter_chunks = func  # type: ignore[attr-defined]
+    return joined_tool
+
+
+def _page_payload(stream: ResultStream, text: str, done: bool) -> Dict[str, Any]:
+    """Build the page dictionary returned for multi-page results."""
+    return {
+        "content": text,
+        "page": stream.page,
+        "complete": done,
+        "next_cursor": None if done else stream.id,
+        "note": (
+            "Final page"
+            if done
+            else "Result continues; call read_result_page with next_cursor for the next page"
+        ),
+    }
+
+
+async def _report_progress(stream: ResultStream, done: bool) -> None:
+    """Send a progress notification for a page if a client request is active."""
+    ctx = _request_context()
+    if ctx is not None:
+        await _send_progress(
+            ctx,
+            stream.sent,
+            stream.sent if done else None,
+            f"{stream.tool}: page {stream.page}",
+        )
+
+
+def report_progress(progress: float, total: Optional[float] = None, message: str = "") -> None:
+    """
+    Send a progress notification from a tool handler running on a worker thread.
+
+    The notification is queued on the event loop without waiting for it. Does
+    nothing when the handler is called directly, outside a client request.
+
+    Args:
+        progress: Progress so far (e.g. bytes done)
+        total: Progress value when complete, if known
+        message: Description shown by the client
+    """
+    ctx = _request_context()
+    loop = get_handler_loop()
+    if ctx is None or loop is None or loop.is_closed():
+        return
+    asyncio.run_coroutine_threadsafe(_send_progress(ctx, progress, total, message), loop)
+
+
+def _request_context() -> Any:
+    """Get the FastMCP context of the active client request, or None."""
+    try:
+        from fastmcp.server.dependencies import get_context
+
+        return get_context()
+    except (ImportError, RuntimeError):
+        return None
+
+
+async def _send_progress(ctx: Any, progress: float, total: Optional[float], message: str) -> None:
+    """Send a progress notification through a request context."""
+    try:
+        await ctx.report_progress(progress=progress, total=total, message=message)
+    except Exception as e:
+        logger.debug(f"Could not report progress ({message}): {e}")
+
+
+def _env_number(name: str, default: float) -> float:
+    """Read a positive number from the environment."""
+    try:
+        value = float(os.getenv(name, str(default)))
+        return value if value > 0 else default
+    except ValueError:
+        logger.warning(f"Invalid value for {name}, using {default}")
+        return default
+
+
+def get_page_size() -> int:
+    """Get the number of characters per result page."""
+    return int(_env_number("MCP_SERVER_PAGE_SIZE", DEFAULT_PAGE_SIZE))
+
+
+# Global stream store instance
+_stream_store: Optional[ResultStreamStore] = None
+
+
+def get_stream_store() -> ResultStreamStore:
+    """Get the global store of unfinished results."""
+    global _stream_store
+    if _stream_store is None:
+        _stream_store = ResultStreamStore(
+            max_streams=int(_env_number("MCP_SERVER_MAX_OPEN_STREAMS", DEFAULT_MAX_OPEN_STREAMS)),
+            ttl=_env_number("MCP_SERVER_STREAM_TTL", DEFAULT_STREAM_TTL),
+        )
+    return _stream_store
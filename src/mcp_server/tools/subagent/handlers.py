@@ -10,6 +10,7 @@ Subagent AI 编排工具模块
 - 状态跟踪和进度报告
 """
 
+import contextvars
 import json
 import os
 import time
@@ -19,9 +20,18 @@ from typing import Any, Dict, List, Optional
 
 import requests
 
+from mcp_server.tools import http_client
 from mcp_server.tools.registry import tool_handler
 from mcp_server.tools.subagent_config import get_config
-from mcp_server.utils import NetworkError, ValidationError, logger, retry
+from mcp_server.utils import (
+    NetworkError,
+    ValidationError,
+    host_of,
+    logger,
+    retry,
+    retry_after_from,
+    to_json,
+)
 
 # 工具类别信息
 CATEGORY_NAME = "Subagent AI Orchestration"
@@ -56,7 +66,12 @@ class OpenAIClient:
         if not self.api_key:
             raise ValidationError("OPENAI_API_KEY not found in environment or config file")
 
-    @retry(max_attempts=3, delay=2.0)
+    @retry(
+        max_attempts=3,
+        delay=2.0,
+        exceptions=(NetworkError,),
+        budget_key=lambda self, *args, **kwargs: host_of(self.api_base),
+    )
     def call(
         self,
         model: str,
@@ -91,7 +106,7 @@ class OpenAIClient:
 
         try:
             logger.info(f"Calling OpenAI API: model={model}, messages={len(messages)}")
-            response = requests.post(url, headers=headers, json=payload, timeout=timeout)
+            response = http_client.post(url, headers=headers, json=payload, timeout=timeout)
             response.raise_for_status()
 
             data: Dict[str, Any] = response.json()
@@ -101,13 +116,19 @@ class OpenAIClient:
         except requests.exceptions.Timeout:
             raise NetworkError(f"OpenAI API timeout after {timeout}s")
         except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 401:
+            status = e.response.status_code
+            retry_after = retry_after_from(e)
+            if status == 401:
                 raise ValidationError("Invalid OpenAI API key")
-            elif e.response.status_code == 429:
-                raise NetworkError("OpenAI API rate limit exceeded")
+            elif status == 429:
+                raise NetworkError(
+                    "OpenAI API rate limit exceeded", status_code=status, retry_after=retry_after
+                )
             else:
                 raise NetworkError(
-                    f"OpenAI API error: {e.response.status_code} - {e.response.text}"
+                    f"OpenAI API error: {status} - {e.response.text}",
+                    status_code=status,
+                    retry_after=retry_after,
                 )
         except Exception as e:
             raise NetworkError(f"OpenAI API call failed: {str(e)}")
@@ -131,7 +152,12 @@ class AnthropicClient:
         if not self.api_key:
             raise ValidationError("ANTHROPIC_API_KEY not found in environment or config file")
 
-    @retry(max_attempts=3, delay=2.0)
+    @retry(
+        max_attempts=3,
+        delay=2.0,
+        exceptions=(NetworkError,),
+        budget_key=lambda self, *args, **kwargs: host_of(self.api_base),
+    )
     def call(
         self,
         model: str,
@@ -185,7 +211,7 @@ class AnthropicClient:
 
         try:
             logger.info(f"Calling Anthropic API: model={model}, messages={len(messages)}")
-            response = requests.post(url, headers=headers, json=payload, timeout=timeout)
+            response = http_client.post(url, headers=headers, json=payload, timeout=timeout)
             response.raise_for_status()
 
             data = response.json()
@@ -211,13 +237,19 @@ class AnthropicClient:
         except requests.exceptions.Timeout:
             raise NetworkError(f"Anthropic API timeout after {timeout}s")
         except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 401:
+            status = e.response.status_code
+            retry_after = retry_after_from(e)
+            if status == 401:
                 raise ValidationError("Invalid Anthropic API key")
-            elif e.response.status_code == 429:
-                raise NetworkError("Anthropic API rate limit exceeded")
+            elif status == 429:
+                raise NetworkError(
+                    "Anthropic API rate limit exceeded", status_code=status, retry_after=retry_after
+                )
             else:
                 raise NetworkError(
-                    f"Anthropic API error: {e.response.status_code} - {e.response.text}"
+                    f"Anthropic API error: {status} - {e.response.text}",
+                    status_code=status,
+                    retry_after=retry_after,
                 )
         except Exception as e:
             raise NetworkError(f"Anthropic API call failed: {str(e)}")
@@ -379,7 +411,9 @@ class SubagentOrchestrator:
             future_to_task = {}
             for i, task in enumerate(tasks):
                 task_name = task.get("name", f"task_{i + 1}")
+                # Copy the context so each task sees the call's deadline
                 future = executor.submit(
+                    contextvars.copy_context().run,
                     self.manager.call_ai,
                     provider=task.get("provider", "openai"),
                     model=task.get("model", "gpt-3.5-turbo"),
@@ -486,7 +520,7 @@ def subagent_call(
         try:
             messages_list = json.loads(messages)
         except json.JSONDecodeError as e:
-            return json.dumps(
+            return to_json(
                 {"error": f"Invalid JSON in messages parameter: {str(e)}", "status": "failed"}
             )
 
@@ -499,11 +533,11 @@ def subagent_call(
             temperature=temperature,
         )
 
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        return to_json(result)
 
     except Exception as e:
         logger.error(f"subagent_call error: {e}")
-        return json.dumps({"error": str(e), "status": "failed"})
+        return to_json({"error": str(e), "status": "failed"})
 
 
 @tool_handler
@@ -535,23 +569,23 @@ def subagent_parallel(tasks: str, max_workers: int = 3) -> str:
         try:
             tasks_list = json.loads(tasks)
         except json.JSONDecodeError as e:
-            return json.dumps(
+            return to_json(
                 {"error": f"Invalid JSON in tasks parameter: {str(e)}", "status": "failed"}
             )
 
         if not isinstance(tasks_list, list):
-            return json.dumps({"error": "tasks must be a JSON array", "status": "failed"})
+            return to_json({"error": "tasks must be a JSON array", "status": "failed"})
 
         manager = get_subagent_manager()
         orchestrator = SubagentOrchestrator(manager)
 
         result = orchestrator.execute_parallel(tasks_list, max_workers)
 
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        return to_json(result)
 
     except Exception as e:
         logger.error(f"subagent_parallel error: {e}")
-        return json.dumps({"error": str(e), "status": "failed"})
+        return to_json({"error": str(e), "status": "failed"})
 
 
 @tool_handler
@@ -587,7 +621,7 @@ def subagent_conditional(condition_task: str, true_task: str, false_task: str) -
             t_task = json.loads(true_task)
             f_task = json.loads(false_task)
         except json.JSONDecodeError as e:
-            return json.dumps(
+            return to_json(
                 {"error": f"Invalid JSON in task parameters: {str(e)}", "status": "failed"}
             )
 
@@ -604,7 +638,7 @@ def subagent_conditional(condition_task: str, true_task: str, false_task: str) -
         )
 
         if condition_result["status"] != "success":
-            return json.dumps(
+            return to_json(
                 {
                     "error": "Condition evaluation failed",
                     "condition_result": condition_result,
@@ -643,7 +677,7 @@ def subagent_conditional(condition_task: str, true_task: str, false_task: str) -
             total_input_tokens += branch_result["usage"]["prompt_tokens"]
             total_output_tokens += branch_result["usage"]["completion_tokens"]
 
-        return json.dumps(
+        return to_json(
             {
                 "condition_result": {
                     "text": condition_result["result"],
@@ -658,14 +692,12 @@ def subagent_conditional(condition_task: str, true_task: str, false_task: str) -
                     "total_tokens": total_input_tokens + total_output_tokens,
                 },
                 "status": "success",
-            },
-            ensure_ascii=False,
-            indent=2,
+            }
         )
 
     except Exception as e:
         logger.error(f"subagent_conditional error: {e}")
-        return json.dumps({"error": str(e), "status": "failed"})
+        return to_json({"error": str(e), "status": "failed"})
 
 
 @tool_handler
@@ -697,7 +729,7 @@ def subagent_config_set(provider: str, api_key: str, api_base: Optional[str] = N
         # 验证 provider
         valid_providers = ["openai", "anthropic"]
         if provider.lower() not in valid_providers:
-            return json.dumps(
+            return to_json(
                 {
                     "error": f"Invalid provider. Must be one of: {', '.join(valid_providers)}",
                     "status": "failed",
@@ -727,11 +759,11 @@ def subagent_config_set(provider: str, api_key: str, api_base: Optional[str] = N
             f"Configured {provider}: key={result['api_key_preview']}, base={api_base or 'default'}"
         )
 
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        return to_json(result)
 
     except Exception as e:
         logger.error(f"subagent_config_set error: {e}")
-        return json.dumps({"error": str(e), "status": "failed"})
+        return to_json({"error": str(e), "status": "failed"})
 
 
 @tool_handler
@@ -754,7 +786,7 @@ def subagent_config_get(provider: str) -> str:
         # 验证 provider
         valid_providers = ["openai", "anthropic"]
         if provider.lower() not in valid_providers:
-            return json.dumps(
+            return to_json(
                 {
                     "error": f"Invalid provider. Must be one of: {', '.join(valid_providers)}",
                     "status": "failed",
@@ -765,7 +797,7 @@ def subagent_config_get(provider: str) -> str:
         api_base = config.get_api_base(provider)
 
         if not api_key:
-            return json.dumps(
+            return to_json(
                 {
                     "provider": provider,
                     "configured": False,
@@ -781,7 +813,7 @@ def subagent_config_get(provider: str) -> str:
         env_var = f"{provider.upper()}_API_KEY"
         source = "environment" if os.getenv(env_var) else "config_file"
 
-        return json.dumps(
+        return to_json(
             {
                 "provider": provider,
                 "configured": True,
@@ -790,14 +822,12 @@ def subagent_config_get(provider: str) -> str:
                 "source": source,
                 "config_file": config.get_config_path(),
                 "status": "success",
-            },
-            ensure_ascii=False,
-            indent=2,
+            }
         )
 
     except Exception as e:
         logger.error(f"subagent_config_get error: {e}")
-        return json.dumps({"error": str(e), "status": "failed"})
+        return to_json({"error": str(e), "status": "failed"})
 
 
 @tool_handler
@@ -818,7 +848,7 @@ def subagent_config_list() -> str:
         providers_info = config.list_providers()
 
         if not providers_info:
-            return json.dumps(
+            return to_json(
                 {
                     "providers": [],
                     "message": "No providers configured",
@@ -828,17 +858,15 @@ def subagent_config_list() -> str:
                 }
             )
 
-        return json.dumps(
+        return to_json(
             {
                 "providers": providers_info,
                 "total_configured": len(providers_info),
                 "config_file": config.get_config_path(),
                 "status": "success",
-            },
-            ensure_ascii=False,
-            indent=2,
+            }
         )
 
     except Exception as e:
         logger.error(f"subagent_config_list error: {e}")
-        return json.dumps({"error": str(e), "status": "failed"})
+        return to_json({"error": str(e), "status": "failed"})
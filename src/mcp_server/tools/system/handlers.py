@@ -9,7 +9,6 @@ Provides tools for:
 - Time and timezone utilities
 """
 
-import json
 import os
 import platform
 import sys
@@ -19,7 +18,7 @@ from typing import Any, Dict
 import psutil
 
 from mcp_server.tools.registry import tool_handler
-from mcp_server.utils import format_bytes, logger
+from mcp_server.utils import format_bytes, logger, to_json
 
 
 @tool_handler
@@ -58,7 +57,7 @@ def get_system_info() -> str:
             },
         }
 
-        return json.dumps(info, indent=2)
+        return to_json(info)
 
     except Exception as e:
         logger.error(f"Failed to get system info: {e}")
@@ -93,7 +92,7 @@ def get_cpu_info() -> str:
                 "max_mhz": cpu_freq.max,
             }
 
-        return json.dumps(info, indent=2)
+        return to_json(info)
 
     except Exception as e:
         logger.error(f"Failed to get CPU info: {e}")
@@ -132,7 +131,7 @@ def get_memory_info() -> str:
             },
         }
 
-        return json.dumps(info, indent=2)
+        return to_json(info)
 
     except Exception as e:
         logger.error(f"Failed to get memory info: {e}")
@@ -187,7 +186,7 @@ def get_disk_info(path: str = "/") -> str:
 
         info["partitions"] = partitions
 
-        return json.dumps(info, indent=2)
+        return to_json(info)
 
     except Exception as e:
         logger.error(f"Failed to get disk info: {e}")
@@ -209,7 +208,7 @@ def get_env_variable(name: str, default: str = "") -> str:
     try:
         value = os.getenv(name, default)
 
-        return json.dumps({"name": name, "value": value, "exists": name in os.environ}, indent=2)
+        return to_json({"name": name, "value": value, "exists": name in os.environ})
 
     except Exception as e:
         logger.error(f"Failed to get env variable: {e}")
@@ -246,13 +245,12 @@ def list_env_variables(filter_pattern: str = "") -> str:
                 else:
                     env_vars[key] = value
 
-        return json.dumps(
+        return to_json(
             {
                 "count": len(env_vars),
                 "filter": filter_pattern,
                 "variables": env_vars,
-            },
-            indent=2,
+            }
         )
 
     except Exception as e:
@@ -299,7 +297,7 @@ def get_current_time(timezone: str = "local", format: str = "iso") -> str:
             "time": now.strftime("%H:%M:%S"),
         }
 
-        return json.dumps(result, indent=2)
+        return to_json(result)
 
     except Exception as e:
         logger.error(f"Failed to get current time: {e}")
@@ -335,7 +333,7 @@ def get_process_info() -> str:
                 "cwd": process.cwd(),
             }
 
-        return json.dumps(info, indent=2)
+        return to_json(info)
 
     except Exception as e:
         logger.error(f"Failed to get process info: {e}")
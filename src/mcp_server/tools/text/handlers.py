@@ -10,12 +10,11 @@ Provides tools for:
 """
 
 import base64
-import json
 import re
 from typing import Any, Dict
 
 from mcp_server.tools.registry import tool_handler
-from mcp_server.utils import ValidationError, extract_text_by_regex, logger, truncate_text
+from mcp_server.utils import ValidationError, extract_text_by_regex, logger, to_json, truncate_text
 
 
 @tool_handler
@@ -68,7 +67,7 @@ def count_words(text: str, detailed: bool = True) -> str:
                 }
             )
 
-        return json.dumps(result, indent=2)
+        return to_json(result)
 
     except Exception as e:
         logger.error(f"Word count failed: {e}")
@@ -100,7 +99,7 @@ def extract_emails(text: str) -> str:
                 seen.add(email_lower)
                 unique_emails.append(email)
 
-        return json.dumps({"count": len(unique_emails), "emails": unique_emails}, indent=2)
+        return to_json({"count": len(unique_emails), "emails": unique_emails})
 
     except Exception as e:
         logger.error(f"Email extraction failed: {e}")
@@ -131,7 +130,7 @@ def extract_urls(text: str) -> str:
                 seen.add(url)
                 unique_urls.append(url)
 
-        return json.dumps({"count": len(unique_urls), "urls": unique_urls}, indent=2)
+        return to_json({"count": len(unique_urls), "urls": unique_urls})
 
     except Exception as e:
         logger.error(f"URL extraction failed: {e}")
@@ -163,15 +162,13 @@ def regex_match(text: str, pattern: str, flags: str = "") -> str:
 
         matches = re.findall(pattern, text, regex_flags)
 
-        return json.dumps(
+        return to_json(
             {
                 "pattern": pattern,
                 "flags": flags,
                 "count": len(matches),
                 "matches": matches,
-            },
-            indent=2,
-            ensure_ascii=False,
+            }
         )
 
     except re.error as e:
@@ -301,7 +298,7 @@ def decode_base64(encoded: str, encoding: str = "utf-8") -> str:
         return f"Error: Decoding failed: {str(e)}"
 
 
-@tool_handler
+@tool_handler(cpu_bound=True, cacheable=True)
 def calculate_text_similarity(text1: str, text2: str, method: str = "levenshtein") -> str:
     """
     Calculate similarity between two text strings.
@@ -355,7 +352,7 @@ def calculate_text_similarity(text1: str, text2: str, method: str = "levenshtein
 
             logger.info(f"Levenshtein similarity: {similarity:.3f} (distance: {distance})")
 
-            return json.dumps(
+            return to_json(
                 {
                     "success": True,
                     "method": "levenshtein",
@@ -363,8 +360,7 @@ def calculate_text_similarity(text1: str, text2: str, method: str = "levenshtein
                     "distance": distance,
                     "text1_length": len(text1),
                     "text2_length": len(text2),
-                },
-                indent=2,
+                }
             )
 
         else:  # jaccard
@@ -388,20 +384,19 @@ def calculate_text_similarity(text1: str, text2: str, method: str = "levenshtein
 
             logger.info(f"Jaccard similarity: {similarity:.3f}")
 
-            return json.dumps(
+            return to_json(
                 {
                     "success": True,
                     "method": "jaccard",
                     "similarity": round(similarity, 4),
                     "text1_length": len(text1),
                     "text2_length": len(text2),
-                },
-                indent=2,
+                }
             )
 
     except ValidationError as e:
         logger.error(f"Text similarity calculation failed: {e}")
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
     except Exception as e:
         logger.error(f"Unexpected error in calculate_text_similarity: {e}")
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
@@ -11,7 +11,6 @@ Provides tools for:
 """
 
 import hashlib
-import json
 import random
 import secrets
 import string
@@ -22,7 +21,7 @@ from typing import Any, Dict
 from dateutil import parser as date_parser
 
 from mcp_server.tools.registry import tool_handler
-from mcp_server.utils import logger
+from mcp_server.utils import logger, to_json
 
 
 @tool_handler
@@ -52,7 +51,7 @@ def generate_uuid(version: int = 4, uppercase: bool = False) -> str:
         return f"Error: UUID generation failed: {str(e)}"
 
 
-@tool_handler
+@tool_handler(cacheable=True)
 def generate_hash(text: str, algorithm: str = "sha256", encoding: str = "utf-8") -> str:
     """
     Generate hash of text using specified algorithm.
@@ -81,13 +80,12 @@ def generate_hash(text: str, algorithm: str = "sha256", encoding: str = "utf-8")
 
         hasher.update(text.encode(encoding))
 
-        return json.dumps(
+        return to_json(
             {
                 "algorithm": algorithm,
                 "hash": hasher.hexdigest(),
                 "length": len(hasher.hexdigest()),
-            },
-            indent=2,
+            }
         )
 
     except Exception as e:
@@ -124,15 +122,14 @@ def timestamp_to_date(timestamp: float, format: str = "iso", timezone: str = "lo
             # Custom format
             result = dt.strftime(format)
 
-        return json.dumps(
+        return to_json(
             {
                 "timestamp": timestamp,
                 "formatted": result,
                 "timezone": timezone,
                 "iso": dt.isoformat(),
                 "readable": dt.strftime("%Y-%m-%d %H:%M:%S"),
-            },
-            indent=2,
+            }
         )
 
     except Exception as e:
@@ -159,7 +156,7 @@ def date_to_timestamp(date_string: str, timezone: str = "local") -> str:
         # Convert to timestamp
         timestamp = dt.timestamp()
 
-        return json.dumps(
+        return to_json(
             {
                 "input": date_string,
                 "timestamp": timestamp,
@@ -171,8 +168,7 @@ def date_to_timestamp(date_string: str, timezone: str = "local") -> str:
                 "hour": dt.hour,
                 "minute": dt.minute,
                 "second": dt.second,
-            },
-            indent=2,
+            }
         )
 
     except Exception as e:
@@ -230,7 +226,7 @@ def calculate_date_diff(date1: str, date2: str, unit: str = "days") -> str:
 
         result["unit"] = unit
 
-        return json.dumps(result, indent=2)
+        return to_json(result)
 
     except Exception as e:
         logger.error(f"Date difference calculation failed: {e}")
@@ -253,7 +249,7 @@ def format_date(date_string: str, format: str = "%Y-%m-%d %H:%M:%S") -> str:
         dt = date_parser.parse(date_string)
         formatted = dt.strftime(format)
 
-        return json.dumps(
+        return to_json(
             {
                 "input": date_string,
                 "format": format,
@@ -265,8 +261,7 @@ def format_date(date_string: str, format: str = "%Y-%m-%d %H:%M:%S") -> str:
                     "time_12h": dt.strftime("%I:%M:%S %p"),
                     "time_24h": dt.strftime("%H:%M:%S"),
                 },
-            },
-            indent=2,
+            }
         )
 
     except Exception as e:
@@ -313,13 +308,12 @@ def calculate_expression(expression: str) -> str:
 
         result = eval(safe_expr, {"__builtins__": {}}, safe_dict)
 
-        return json.dumps(
+        return to_json(
             {
                 "expression": expression,
                 "result": result,
                 "type": type(result).__name__,
-            },
-            indent=2,
+            }
         )
 
     except Exception as e:
@@ -363,7 +357,7 @@ def generate_random_string(length: int = 16, charset: str = "alphanumeric") -> s
 
         result = "".join(random.choice(chars) for _ in range(length))
 
-        return json.dumps({"string": result, "length": len(result), "charset": charset}, indent=2)
+        return to_json({"string": result, "length": len(result), "charset": charset})
 
     except Exception as e:
         logger.error(f"Random string generation failed: {e}")
@@ -392,9 +386,9 @@ def generate_password(
     try:
         # 验证长度
         if length < 8:
-            return json.dumps({"error": "Password length must be at least 8"})
+            return to_json({"error": "Password length must be at least 8"})
         if length > 128:
-            return json.dumps({"error": "Password length must be at most 128"})
+            return to_json({"error": "Password length must be at most 128"})
 
         # 构建字符集
         chars = ""
@@ -422,7 +416,7 @@ def generate_password(
             char_types.append("symbols")
 
         if not chars:
-            return json.dumps({"error": "No character types selected"})
+            return to_json({"error": "No character types selected"})
 
         # 生成密码（使用 secrets 模块确保加密安全）
         password = "".join(secrets.choice(chars) for _ in range(length))
@@ -437,20 +431,19 @@ def generate_password(
 
         logger.info(f"Generated password (length: {length}, strength: {strength_score})")
 
-        return json.dumps(
+        return to_json(
             {
                 "success": True,
                 "password": password,
                 "length": length,
                 "strength_score": strength_score,
                 "character_types": char_types,
-            },
-            indent=2,
+            }
         )
 
     except Exception as e:
         logger.error(f"Password generation failed: {e}")
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
 
 
 @tool_handler
@@ -562,7 +555,7 @@ def check_password_strength(password: str) -> str:
 
         logger.info(f"Password strength check: {strength_level} (score: {score})")
 
-        return json.dumps(
+        return to_json(
             {
                 "success": True,
                 "strength_score": score,
@@ -574,10 +567,9 @@ def check_password_strength(password: str) -> str:
                 "has_symbols": has_symbol,
                 "issues": issues,
                 "strengths": strengths,
-            },
-            indent=2,
+            }
         )
 
     except Exception as e:
         logger.error(f"Password strength check failed: {e}")
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
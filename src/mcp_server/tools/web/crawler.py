@@ -0,0 +1,512 @@
+"""
+Bounded site crawler for the crawl_site tool.
+
+A crawl starts from one URL and follows links breadth-first: the frontier is a
+priority queue ordered by depth, with links matching the caller's keywords
+moved ahead. Every URL is normalized before it is queued (lowercase scheme and
+host, default ports, fragments and tracking parameters dropped, query
+parameters sorted), so the same page is not fetched twice under different
+spellings. Seen URLs are kept in a set, which turns into a Bloom filter once
+it grows large.
+
+Pages are fetched on the I/O thread pool, a few at a time. robots.txt is read
+once per host (through the HTTP cache) and kept for an hour; its Crawl-delay
+and the caller's delay space out requests to each host. The crawl stops at a
+page or depth budget, or at its deadline.
+
+With a checkpoint file, the frontier and seen URLs are saved as the crawl
+goes; calling again with the same start URL and checkpoint continues where
+the previous call stopped.
+"""
+
+import base64
+import contextvars
+import functools
+import hashlib
+import heapq
+import json
+import math
+import os
+import re
+import threading
+import time
+import urllib.robotparser
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+import requests
+from requests.utils import requote_uri
+
+from mcp_server.utils import host_of, logger, sleep_until_deadline, time_remaining
+
+from . import fetcher
+
+# Seen URLs kept exactly before switching to a Bloom filter
+EXACT_SEEN_LIMIT = 100_000
+BLOOM_CAPACITY = 10 * EXACT_SEEN_LIMIT
+BLOOM_ERROR_RATE = 0.001
+
+# Seconds a robots.txt is kept (failed fetches are retried sooner)
+ROBOTS_TTL = 3600.0
+ROBOTS_ERROR_TTL = 60.0
+MAX_ROBOTS_HOSTS = 256
+# Product token matched against robots.txt User-agent lines
+ROBOTS_AGENT = "oh-my-mcp"
+# Rules standing in for a robots.txt that could not be fetched
+_DISALLOW_ALL = ["User-agent: *", "Disallow: /"]
+# Longest Crawl-delay honoured, in seconds
+MAX_CRAWL_DELAY = 30.0
+
+# Pages crawled between checkpoint saves
+CHECKPOINT_INTERVAL = 10
+
+# Query parameters that only track visitors
+_TRACKING_PARAMS = re.compile(r"(utm_[a-z]+|fbclid|gclid|mc_cid|mc_eid)(=|$)", re.IGNORECASE)
+
+# Links to files that are not web pages
+_NON_PAGE_EXTENSIONS = re.compile(
+    r"\.(pdf|zip|gz|tgz|bz2|xz|7z|rar|tar|exe|msi|dmg|iso|apk|jpg|jpeg|png|gif|webp|svg|ico|"
+    r"bmp|tiff?|mp3|mp4|m4a|avi|mov|mkv|webm|wav|ogg|woff2?|ttf|eot|css|js|json|xml|rss)$",
+    re.IGNORECASE,
+)
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> Optional[str]:
+    """
+    Normalize a URL so different spellings of one page compare equal.
+
+    Args:
+        url: Absolute URL
+
+    Returns:
+        The normalized URL, or None if it is not an http(s) URL
+    """
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return None
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if scheme not in _DEFAULT_PORTS or not host:
+        return None
+
+    netloc = f"[{host}]" if ":" in host else host
+    if port is not None and port != _DEFAULT_PORTS[scheme]:
+        netloc = f"{netloc}:{port}"
+    # urljoin removes "." and ".." segments
+    path = urljoin("/", parts.path) if parts.path else "/"
+    query = "&".join(
+        sorted(p for p in parts.query.split("&") if p and not _TRACKING_PARAMS.match(p))
+    )
+    return requote_uri(urlunsplit((scheme, netloc, path, query, "")))
+
+
+class BloomFilter:
+    """Fixed-size set of strings with a small false positive rate."""
+
+    def __init__(self, capacity: int, error_rate: float, bits: Optional[bytes] = None):
+        """
+        Initialize the filter.
+
+        Args:
+            capacity: Items the filter is sized for
+            error_rate: False positive rate at capacity
+            bits: Saved bit array (from to_dict())
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray(bits) if bits is not None else bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterator[int]:
+        # Double hashing over one 128-bit digest
+        digest = hashlib.blake2b(item.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little")
+        for i in range(self.hashes):
+            yield (first + i * second) % self.size
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(item))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "error_rate": self.error_rate,
+            "bits": base64.b64encode(bytes(self.bits)).decode("ascii"),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BloomFilter":
+        return cls(data["capacity"], data["error_rate"], base64.b64decode(data["bits"]))
+
+
+class SeenUrls:
+    """URLs already queued or crawled: an exact set, then a Bloom filter for large crawls."""
+
+    def __init__(self, exact_limit: int = EXACT_SEEN_LIMIT):
+        self.exact_limit = exact_limit
+        self.urls: Set[str] = set()
+        self.bloom: Optional[BloomFilter] = None
+        self.count = 0
+
+    def add(self, url: str) -> bool:
+        """Record a URL; returns False if it was already seen."""
+        if url in self:
+            return False
+        self.count += 1
+        if self.bloom is not None:
+            self.bloom.add(url)
+            return True
+        self.urls.add(url)
+        if len(self.urls) > self.exact_limit:
+            self.bloom = BloomFilter(max(BLOOM_CAPACITY, 10 * self.exact_limit), BLOOM_ERROR_RATE)
+            for seen in self.urls:
+                self.bloom.add(seen)
+            self.urls = set()
+        return True
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.urls or (self.bloom is not None and url in self.bloom)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "urls": sorted(self.urls),
+            "bloom": self.bloom.to_dict() if self.bloom is not None else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], exact_limit: int = EXACT_SEEN_LIMIT) -> "SeenUrls":
+        seen = cls(exact_limit)
+        seen.urls = set(data.get("urls", []))
+        seen.count = int(data.get("count", len(seen.urls)))
+        if data.get("bloom"):
+            seen.bloom = BloomFilter.from_dict(data["bloom"])
+        return seen
+
+
+class RobotsCache:
+    """Parsed robots.txt files by origin, shared by all crawls."""
+
+    def __init__(self, ttl: float = ROBOTS_TTL, max_hosts: int = MAX_ROBOTS_HOSTS):
+        self.ttl = ttl
+        self.max_hosts = max_hosts
+        # origin -> (expires_at, parser)
+        self._entries: Dict[str, Tuple[float, urllib.robotparser.RobotFileParser]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str, timeout: float = 10) -> urllib.robotparser.RobotFileParser:
+        """
+        Get the robots.txt rules for a URL's site, fetching them if needed.
+
+        Missing files (4xx) allow everything; unreachable ones (5xx, network
+        errors) disallow everything until they are fetched again.
+        """
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(origin)
+            if entry is not None and entry[0] > now:
+                return entry[1]
+
+        parser = urllib.robotparser.RobotFileParser(f"{origin}/robots.txt")
+        ttl = self.ttl
+        try:
+            response = fetcher.get_cached(f"{origin}/robots.txt", timeout=timeout)
+            if response.status_code >= 500:
+                parser.parse(_DISALLOW_ALL)
+                ttl = ROBOTS_ERROR_TTL
+            elif response.status_code >= 400:
+                parser.parse([])
+            else:
+                parser.parse(response.text.splitlines())
+        except requests.RequestException as e:
+            logger.info(f"Could not fetch {origin}/robots.txt: {e}")
+            parser.parse(_DISALLOW_ALL)
+            ttl = ROBOTS_ERROR_TTL
+
+        with self._lock:
+            if len(self._entries) >= self.max_hosts:
+                expired = [key for key, (expires, _) in self._entries.items() if expires <= now]
+                for key in expired or [next(iter(self._entries))]:
+                    del self._entries[key]
+            self._entries[origin] = (now + ttl, parser)
+        return parser
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+robots_cache = RobotsCache()
+
+
+class HostPacer:
+    """Spaces out requests to each host by a minimum delay."""
+
+    def __init__(self) -> None:
+        self._next: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url: str, delay: float) -> None:
+        """Wait for the URL's host's next turn (turns are handed out in call order)."""
+        if delay <= 0:
+            return
+        host = host_of(url)
+        with self._lock:
+            now = time.monotonic()
+            turn = max(now, self._next.get(host, now))
+            self._next[host] = turn + delay
+        if turn > now:
+            sleep_until_deadline(turn - now)
+
+
+# A queued URL: (keyword rank, depth, sequence number, URL)
+FrontierEntry = Tuple[int, int, int, str]
+
+
+class Crawler:
+    """A breadth-first crawl from one start URL within page, depth and time budgets."""
+
+    def __init__(
+        self,
+        start_url: str,
+        fetch_page: Callable[[str], Dict[str, Any]],
+        max_pages: int = 50,
+        max_depth: int = 2,
+        max_concurrent: int = 4,
+        delay: float = 0.5,
+        same_host: bool = True,
+        url_pattern: Optional[str] = None,
+        priority_keywords: Optional[List[str]] = None,
+        respect_robots: bool = True,
+        checkpoint: Optional[Path] = None,
+        timeout: float = 10,
+    ):
+        """
+        Initialize the crawl, resuming it from the checkpoint file if there is one.
+
+        Args:
+            start_url: First page
+            fetch_page: Fetches one page; returns a dictionary with url, final_url,
+                status_code and links (list of {"url", "text"}), or url and error
+            max_pages: Pages to crawl in total, including earlier calls
+            max_depth: Link hops from the start page
+            max_concurrent: Pages fetched at once
+            delay: Minimum seconds between requests to one host (robots.txt
+                Crawl-delay can make it longer)
+            same_host: Only follow links to the start page's host
+            url_pattern: Regular expression that followed URLs must match
+            priority_keywords: Links whose URL or text contains one of these are
+                crawled before other links
+            respect_robots: Skip URLs disallowed by robots.txt
+            checkpoint: File saving the crawl state, for resuming
+            timeout: Request timeout in seconds
+
+        Raises:
+            ValueError: If the start URL is invalid
+            re.error: If the URL pattern is invalid
+        """
+        normalized = normalize_url(start_url)
+        if normalized is None:
+            raise ValueError(f"Invalid start URL: {start_url}")
+        self.start_url = normalized
+        self.fetch_page = fetch_page
+        self.max_pages = max_pages
+        self.max_depth = max_depth
+        self.max_concurrent = max_concurrent
+        self.delay = delay
+        self.host = host_of(normalized) if same_host else None
+        self.url_pattern = re.compile(url_pattern) if url_pattern else None
+        self.keywords = [k.lower() for k in priority_keywords or [] if k]
+        self.respect_robots = respect_robots
+        self.checkpoint = checkpoint
+        self.timeout = timeout
+
+        self.frontier: List[FrontierEntry] = []
+        self.seen = SeenUrls()
+        self.crawled = 0  # pages fetched, including earlier calls
+        self.resumed = False
+        self.stats = {"pages": 0, "failed": 0, "skipped": 0}
+        self.stopped = "done"  # or max_pages, deadline
+        self._sequence = 0
+        self._pacer = HostPacer()
+
+        if not self._load_checkpoint():
+            self._enqueue(self.start_url, 0)
+
+    def run(self, deadline: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Crawl until the frontier is empty, a budget is used up or time runs out.
+
+        Args:
+            deadline: Seconds for this call (default: no limit besides the tool call's)
+
+        Yields:
+            One result per crawled or skipped page, in completion order: the
+            fetch_page() result without its links, plus depth and new_links
+        """
+        pool = fetcher.get_io_pool()
+        running: Dict["Future[Dict[str, Any]]", FrontierEntry] = {}
+        end_time = None if deadline is None else time.monotonic() + deadline
+        since_checkpoint = 0
+
+        def remaining_time() -> Optional[float]:
+            remaining = time_remaining()
+            if end_time is not None:
+                left = end_time - time.monotonic()
+                remaining = left if remaining is None else min(remaining, left)
+            return remaining
+
+        try:
+            while True:
+                while (
+                    self.frontier
+                    and len(running) < self.max_concurrent
+                    and self.crawled + len(running) < self.max_pages
+                ):
+                    entry = heapq.heappop(self.frontier)
+                    # Carry the tool call's deadline into the I/O thread
+                    ctx = contextvars.copy_context()
+                    call = functools.partial(ctx.run, self._visit, entry[3])
+                    running[pool.submit(call)] = entry
+                if not running:
+                    if self.frontier:
+                        self.stopped = "max_pages"
+                    break
+
+                remaining = remaining_time()
+                done, _ = wait(
+                    running,
+                    timeout=None if remaining is None else max(0.0, remaining),
+                    return_when=FIRST_COMPLETED,
+                )
+                if not done:
+                    self.stopped = "deadline"
+                    break
+                for future in done:
+                    entry = running.pop(future)
+                    yield self._record(entry, future.result())
+                    since_checkpoint += 1
+                if since_checkpoint >= CHECKPOINT_INTERVAL:
+                    self._save_checkpoint(running.values())
+                    since_checkpoint = 0
+        finally:
+            for future in running:
+                future.cancel()
+            # Unfinished pages are crawled again on resume
+            self._save_checkpoint(running.values())
+
+    def _visit(self, url: str) -> Dict[str, Any]:
+        """Fetch one page on an I/O thread, honouring robots.txt and the host's delay."""
+        delay = self.delay
+        if self.respect_robots:
+            try:
+                robots = robots_cache.get(url, self.timeout)
+            except Exception as e:
+                return {"url": url, "error": f"robots.txt: {e}"}
+            if not robots.can_fetch(ROBOTS_AGENT, url):
+                return {"url": url, "skipped": "Disallowed by robots.txt"}
+            crawl_delay = robots.crawl_delay(ROBOTS_AGENT)
+            if crawl_delay:
+                delay = max(delay, min(float(crawl_delay), MAX_CRAWL_DELAY))
+        self._pacer.wait(url, delay)
+        return self.fetch_page(url)
+
+    def _record(self, entry: FrontierEntry, page: Dict[str, Any]) -> Dict[str, Any]:
+        """Count a finished page and queue its links."""
+        depth = entry[1]
+        links = page.pop("links", None) or []
+        result = {**page, "depth": depth}
+        if "skipped" in page:
+            self.stats["skipped"] += 1
+            return result
+
+        self.crawled += 1
+        if "error" in page:
+            self.stats["failed"] += 1
+            return result
+        self.stats["pages"] += 1
+
+        final_url = normalize_url(page.get("final_url") or "")
+        if final_url is not None:
+            self.seen.add(final_url)
+        new_links = 0
+        if depth < self.max_depth:
+            for link in links:
+                url = normalize_url(link.get("url", ""))
+                if (
+                    url is not None
+                    and self._in_scope(url)
+                    and self._enqueue(url, depth + 1, link.get("text", ""))
+                ):
+                    new_links += 1
+        result["new_links"] = new_links
+        return result
+
+    def _in_scope(self, url: str) -> bool:
+        if self.host is not None and host_of(url) != self.host:
+            return False
+        if _NON_PAGE_EXTENSIONS.search(urlsplit(url).path):
+            return False
+        return self.url_pattern is None or self.url_pattern.search(url) is not None
+
+    def _enqueue(self, url: str, depth: int, text: str = "") -> bool:
+        """Queue a URL not seen before; returns whether it was queued."""
+        if not self.seen.add(url):
+            return False
+        haystack = f"{url} {text}".lower()
+        rank = 0 if any(keyword in haystack for keyword in self.keywords) else 1
+        self._sequence += 1
+        heapq.heappush(self.frontier, (rank, depth, self._sequence, url))
+        return True
+
+    def _save_checkpoint(self, unfinished: Any) -> None:
+        """Write the crawl state to the checkpoint file (atomically)."""
+        if self.checkpoint is None:
+            return
+        state = {
+            "start_url": self.start_url,
+            "crawled": self.crawled,
+            "frontier": [list(entry) for entry in [*self.frontier, *unfinished]],
+            "seen": self.seen.to_dict(),
+        }
+        temp_path = self.checkpoint.with_name(self.checkpoint.name + ".tmp")
+        try:
+            self.checkpoint.parent.mkdir(parents=True, exist_ok=True)
+            temp_path.write_text(json.dumps(state), encoding="utf-8")
+            os.replace(temp_path, self.checkpoint)
+        except OSError as e:
+            logger.warning(f"Could not save crawl checkpoint {self.checkpoint}: {e}")
+
+    def _load_checkpoint(self) -> bool:
+        """Restore the state of an earlier crawl from the same start URL."""
+        if self.checkpoint is None or not self.checkpoint.exists():
+            return False
+        try:
+            state = json.loads(self.checkpoint.read_text(encoding="utf-8"))
+            if state.get("start_url") != self.start_url:
+                logger.info(f"Checkpoint {self.checkpoint} is for another crawl, starting over")
+                return False
+            self.frontier = [(int(r), int(d), int(s), str(u)) for r, d, s, u in state["frontier"]]
+            heapq.heapify(self.frontier)
+            self.seen = SeenUrls.from_dict(state["seen"])
+            self.crawled = int(state["crawled"])
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable crawl checkpoint {self.checkpoint}: {e}")
+            self.frontier, self.seen, self.crawled = [], SeenUrls(), 0
+            return False
+        self._sequence = max((entry[2] for entry in self.frontier), default=0)
+        self.resumed = True
+        return True
@@ -0,0 +1,808 @@
+"""
+DNS resolver for the web tools.
+
+Queries are built and parsed in pure Python (the RFC 1035 wire format) and
+sent over UDP to the system's nameservers, repeating a query over TCP when its
+answer is truncated, so every record type can be looked up without extra
+dependencies. Answers are cached for their TTL, and negative answers (no such
+name, no records of the type) for the zone's SOA minimum.
+
+resolve_many() looks up many names from one non-blocking socket, keeping a
+bounded number of queries in flight and retransmitting to the next nameserver
+when one does not answer in time, so a batch costs about as long as its
+slowest lookup instead of the sum of all of them.
+
+A and AAAA lookups honour the operating system's name sources: names in the
+hosts file are answered from it without a query, and names the nameservers do
+not know (NXDOMAIN or no records) are tried with the operating system resolver
+(getaddrinfo, which also covers nsswitch sources such as mDNS), so localhost,
+hosts-file and container names resolve as they do for other programs. Without
+configured nameservers (e.g. on Windows), A and AAAA lookups only use the
+operating system resolver.
+
+Limits can be configured with environment variables:
+    MCP_SERVER_DNS_SERVERS     - Comma-separated nameservers, "host", "host:port" or
+                                 "[ipv6]:port" (default: from /etc/resolv.conf)
+    MCP_SERVER_DNS_TIMEOUT     - Seconds before a query is sent again (default: 2)
+    MCP_SERVER_DNS_CACHE_SIZE  - Cached answers (default: 4096)
+"""
+
+import functools
+import ipaddress
+import os
+import random
+import selectors
+import socket
+import struct
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from mcp_server.tools.metrics import register_cache
+from mcp_server.utils import NetworkError, ValidationError, check_deadline, logger, time_remaining
+
+DEFAULT_TIMEOUT = 2.0
+DEFAULT_CACHE_SIZE = 4096
+DEFAULT_CONCURRENCY = 64
+
+# Rounds of queries over all nameservers before a lookup times out
+ATTEMPTS = 2
+
+# TTL bounds for cached answers; negative answers without an SOA record use NEGATIVE_TTL
+MAX_TTL = 86400
+NEGATIVE_TTL = 60
+
+# UDP payload size advertised with EDNS0
+UDP_PAYLOAD_SIZE = 1232
+
+RESOLV_CONF = "/etc/resolv.conf"
+HOSTS_FILE = "/etc/hosts"
+
+# Record types also looked up in the hosts file and with the operating system resolver
+ADDRESS_TYPES = ("A", "AAAA")
+
+# Concurrent operating system lookups in resolve_many()
+SYSTEM_LOOKUP_THREADS = 16
+
+RECORD_TYPES = {
+    "A": 1,
+    "NS": 2,
+    "CNAME": 5,
+    "SOA": 6,
+    "PTR": 12,
+    "MX": 15,
+    "TXT": 16,
+    "AAAA": 28,
+    "SRV": 33,
+    "CAA": 257,
+}
+
+RCODES = {0: "NOERROR", 1: "FORMERR", 2: "SERVFAIL", 3: "NXDOMAIN", 4: "NOTIMP", 5: "REFUSED"}
+
+_OPT = 41
+_HEADER = struct.Struct(">HHHHHH")
+_RECORD = struct.Struct(">HHIH")
+
+Server = Tuple[str, int]
+
+
+class DnsAnswer:
+    """The outcome of one lookup."""
+
+    def __init__(
+        self,
+        name: str,
+        record_type: str,
+        rcode: str,
+        records: Optional[List[Any]] = None,
+        ttl: int = 0,
+        aliases: Optional[List[str]] = None,
+        error: Optional[str] = None,
+    ):
+        """
+        Initialize the answer.
+
+        Args:
+            name: Queried name (lowercase, without the trailing dot)
+            record_type: Queried record type
+            rcode: Response code ("NOERROR", "NXDOMAIN", ...) or "" if no server answered
+            records: Record values (addresses and names as strings, other types as dictionaries)
+            ttl: Seconds the answer may be cached
+            aliases: Names of the CNAME chain leading to the records
+            error: Why the lookup failed, if it did (a missing name is not a failure)
+        """
+        self.name = name
+        self.record_type = record_type
+        self.rcode = rcode
+        self.records = records or []
+        self.ttl = ttl
+        self.aliases = aliases or []
+        self.error = error
+        self.from_cache = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Describe the answer for a tool result."""
+        result: Dict[str, Any] = {
+            "hostname": self.name,
+            "record_type": self.record_type,
+            "rcode": self.rcode,
+            "records": self.records,
+            "count": len(self.records),
+            "ttl": self.ttl,
+            "cached": self.from_cache,
+        }
+        if self.aliases:
+            result["aliases"] = self.aliases
+        if self.error:
+            result["error"] = self.error
+        return result
+
+
+def normalize_name(name: str, record_type: str = "A") -> str:
+    """
+    Validate a domain name and convert it to its lowercase ASCII form.
+
+    IP addresses looked up as PTR records become their reverse-lookup name.
+
+    Raises:
+        ValidationError: If the name is not a valid domain name
+    """
+    name = name.strip().rstrip(".").lower()
+    if record_type == "PTR":
+        try:
+            return ipaddress.ip_address(name).reverse_pointer
+        except ValueError:
+            pass
+    try:
+        ascii_name = name.encode("idna").decode("ascii")
+    except UnicodeError as e:
+        raise ValidationError(f"Invalid domain name: {name}") from e
+    labels = ascii_name.split(".")
+    if not ascii_name or len(ascii_name) > 253 or any(len(label) > 63 for label in labels):
+        raise ValidationError(f"Invalid domain name: {name}")
+    return ascii_name
+
+
+def record_type_code(record_type: str) -> int:
+    """
+    Get the numeric code of a record type name.
+
+    Raises:
+        ValidationError: If the record type is not supported
+    """
+    code = RECORD_TYPES.get(record_type.upper())
+    if code is None:
+        raise ValidationError(
+            f"Record type {record_type} not supported. Use one of: {', '.join(RECORD_TYPES)}"
+        )
+    return code
+
+
+def encode_name(name: str) -> bytes:
+    """Encode a normalized domain name as DNS labels."""
+    if not name:
+        return b"\0"
+    return (
+        b"".join(bytes([len(label)]) + label.encode("ascii") for label in name.split(".")) + b"\0"
+    )
+
+
+def build_query(query_id: int, name: str, qtype: int) -> bytes:
+    """
+    Build a recursive query with an EDNS0 record advertising a larger UDP payload.
+
+    Args:
+        query_id: Message ID
+        name: Normalized domain name
+        qtype: Record type code
+
+    Returns:
+        The query message
+    """
+    header = _HEADER.pack(query_id, 0x0100, 1, 0, 0, 1)  # recursion desired
+    question = encode_name(name) + struct.pack(">HH", qtype, 1)
+    opt = b"\0" + _RECORD.pack(_OPT, UDP_PAYLOAD_SIZE, 0, 0)
+    return header + question + opt
+
+
+def _read_name(data: bytes, offset: int) -> Tuple[str, int]:
+    """Read a possibly compressed name; returns (name, offset after it)."""
+    labels = []
+    end = None
+    jumps = 0
+    while True:
+        if offset >= len(data):
+            raise ValueError("Name runs past the end of the message")
+        length = data[offset]
+        if length & 0xC0 == 0xC0:
+            if end is None:
+                end = offset + 2
+            jumps += 1
+            if jumps > 64:
+                raise ValueError("Compression pointer loop")
+            offset = struct.unpack_from(">H", data, offset)[0] & 0x3FFF
+            continue
+        if length & 0xC0:
+            raise ValueError(f"Unsupported label type {length:#x}")
+        offset += 1
+        if length == 0:
+            break
+        label = data[offset : offset + length]
+        if len(label) < length:
+            raise ValueError("Label runs past the end of the message")
+        labels.append(label.decode("ascii", "backslashreplace").lower())
+        offset += length
+    return ".".join(labels), offset if end is None else end
+
+
+def _character_strings(rdata: bytes) -> List[bytes]:
+    """Split RDATA into <length><bytes> character strings."""
+    strings = []
+    offset = 0
+    while offset < len(rdata):
+        length = rdata[offset]
+        strings.append(rdata[offset + 1 : offset + 1 + length])
+        offset += 1 + length
+    return strings
+
+
+def _decode_rdata(data: bytes, rtype: int, offset: int, length: int) -> Any:
+    """Decode the RDATA of a record into a JSON-friendly value."""
+    rdata = data[offset : offset + length]
+    if rtype == 1 and length == 4:
+        return socket.inet_ntop(socket.AF_INET, rdata)
+    if rtype == 28 and length == 16:
+        return socket.inet_ntop(socket.AF_INET6, rdata)
+    if rtype in (2, 5, 12):
+        return _read_name(data, offset)[0]
+    if rtype == 15:
+        return {
+            "preference": struct.unpack_from(">H", data, offset)[0],
+            "exchange": _read_name(data, offset + 2)[0],
+        }
+    if rtype == 16:
+        return b"".join(_character_strings(rdata)).decode("utf-8", "replace")
+    if rtype == 6:
+        mname, position = _read_name(data, offset)
+        rname, position = _read_name(data, position)
+        serial, refresh, retry, expire, minimum = struct.unpack_from(">IIIII", data, position)
+        return {
+            "mname": mname,
+            "rname": rname,
+            "serial": serial,
+            "refresh": refresh,
+            "retry": retry,
+            "expire": expire,
+            "minimum": minimum,
+        }
+    if rtype == 33:
+        priority, weight, port = struct.unpack_from(">HHH", data, offset)
+        return {
+            "priority": priority,
+            "weight": weight,
+            "port": port,
+            "target": _read_name(data, offset + 6)[0],
+        }
+    if rtype == 257 and length >= 2:
+        tag_length = rdata[1]
+        return {
+            "flags": rdata[0],
+            "tag": rdata[2 : 2 + tag_length].decode("ascii", "replace"),
+            "value": rdata[2 + tag_length :].decode("utf-8", "replace"),
+        }
+    return rdata.hex()
+
+
+class DnsMessage:
+    """A parsed DNS response."""
+
+    def __init__(self, data: bytes):
+        """
+        Parse a response message.
+
+        Args:
+            data: The message
+
+        Raises:
+            ValueError: If the message is malformed
+        """
+        try:
+            self.id, flags, qdcount, ancount, nscount, _ = _HEADER.unpack_from(data)
+            self.truncated = bool(flags & 0x0200)
+            self.is_response = bool(flags & 0x8000)
+            self.rcode = RCODES.get(flags & 0x000F, str(flags & 0x000F))
+            offset = _HEADER.size
+            self.questions: List[Tuple[str, int]] = []
+            for _ in range(qdcount):
+                name, offset = _read_name(data, offset)
+                qtype, _ = struct.unpack_from(">HH", data, offset)
+                self.questions.append((name, qtype))
+                offset += 4
+            # Answer and authority records: (name, type, ttl, value)
+            self.answers, offset = self._read_records(data, offset, ancount)
+            self.authority, offset = self._read_records(data, offset, nscount)
+        except (struct.error, IndexError) as e:
+            raise ValueError(f"Malformed DNS message: {e}") from e
+
+    @staticmethod
+    def _read_records(
+        data: bytes, offset: int, count: int
+    ) -> Tuple[List[Tuple[str, int, int, Any]], int]:
+        records = []
+        for _ in range(count):
+            name, offset = _read_name(data, offset)
+            rtype, _, ttl, length = _RECORD.unpack_from(data, offset)
+            offset += _RECORD.size
+            if offset + length > len(data):
+                raise ValueError("Record runs past the end of the message")
+            records.append((name, rtype, ttl, _decode_rdata(data, rtype, offset, length)))
+            offset += length
+        return records, offset
+
+    def answer(self, name: str, record_type: str) -> DnsAnswer:
+        """
+        Build the answer to a question from this response.
+
+        Follows the CNAME chain from ``name`` to the records of the requested type.
+        """
+        qtype = RECORD_TYPES[record_type]
+        aliases: List[str] = []
+        target = name
+        chain = {n: value for n, rtype, _, value in self.answers if rtype == 5}
+        if qtype != 5:
+            while target in chain and target not in aliases and len(aliases) < 16:
+                aliases.append(chain[target])
+                target = chain[target]
+
+        matching = [(ttl, value) for n, rtype, ttl, value in self.answers if rtype == qtype]
+        chain_ttls = [ttl for n, rtype, ttl, _ in self.answers if rtype == 5 and n != target]
+        if matching:
+            ttl = min([ttl for ttl, _ in matching] + chain_ttls)
+        else:
+            # Negative answer: cached for the SOA minimum (RFC 2308)
+            soa = [(ttl, value) for _, rtype, ttl, value in self.authority if rtype == 6]
+            ttl = min(soa[0][0], soa[0][1]["minimum"]) if soa else NEGATIVE_TTL
+        error = None if self.rcode in ("NOERROR", "NXDOMAIN") else f"Server returned {self.rcode}"
+        return DnsAnswer(
+            name,
+            record_type,
+            self.rcode,
+            [value for _, value in matching],
+            min(ttl, MAX_TTL),
+            aliases,
+            error,
+        )
+
+
+def parse_server(value: str) -> Server:
+    """Parse "host", "host:port" or "[ipv6]:port" into (host, port)."""
+    value = value.strip()
+    if value.startswith("["):
+        host, _, port = value[1:].partition("]")
+        return host, int(port.lstrip(":") or 53)
+    if value.count(":") == 1:
+        host, port = value.split(":")
+        return host, int(port)
+    return value, 53
+
+
+def system_nameservers() -> List[Server]:
+    """Get the nameservers from MCP_SERVER_DNS_SERVERS or /etc/resolv.conf."""
+    configured = os.getenv("MCP_SERVER_DNS_SERVERS")
+    if configured:
+        try:
+            return [parse_server(server) for server in configured.split(",") if server.strip()]
+        except ValueError:
+            logger.warning("Invalid MCP_SERVER_DNS_SERVERS, using the system nameservers")
+
+    servers = []
+    try:
+        with open(RESOLV_CONF, encoding="utf-8") as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) >= 2 and fields[0] == "nameserver":
+                    # Drop an IPv6 zone index such as fe80::1%eth0
+                    servers.append((fields[1].split("%")[0], 53))
+    except OSError:
+        pass
+    return servers
+
+
+class HostsFile:
+    """Addresses of the hosts file, re-read when the file changes."""
+
+    def __init__(self, path: str = HOSTS_FILE):
+        self.path = path
+        self._mtime: Optional[float] = None
+        # (name, record type) -> addresses
+        self._addresses: Dict[Tuple[str, str], List[str]] = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, name: str, record_type: str) -> List[str]:
+        """Get the addresses of a name (lowercase ASCII) for A or AAAA records."""
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            return []
+        with self._lock:
+            if mtime != self._mtime:
+                self._addresses = self._read()
+                self._mtime = mtime
+            return list(self._addresses.get((name, record_type), []))
+
+    def _read(self) -> Dict[Tuple[str, str], List[str]]:
+        addresses: Dict[Tuple[str, str], List[str]] = {}
+        try:
+            with open(self.path, encoding="utf-8", errors="replace") as f:
+                lines = f.readlines()
+        except OSError as e:
+            logger.debug(f"Could not read {self.path}: {e}")
+            return addresses
+        for line in lines:
+            fields = line.split("#", 1)[0].split()
+            if len(fields) < 2:
+                continue
+            try:
+                address = ipaddress.ip_address(fields[0].split("%", 1)[0])
+            except ValueError:
+                continue
+            record_type = "A" if address.version == 4 else "AAAA"
+            for name in fields[1:]:
+                records = addresses.setdefault((name.rstrip(".").lower(), record_type), [])
+                if fields[0] not in records:
+                    records.append(fields[0])
+        return addresses
+
+
+class _Query:
+    """A query in flight in resolve_many()."""
+
+    def __init__(self, name: str, record_type: str, message: bytes):
+        self.name = name
+        self.record_type = record_type
+        self.message = message
+        self.sends = 0
+        self.sent_at = 0.0
+
+
+class DnsResolver:
+    """Stub resolver with an answer cache, shared by all web tools."""
+
+    def __init__(
+        self,
+        servers: Optional[List[Server]] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ):
+        """
+        Initialize the resolver.
+
+        Args:
+            servers: Nameservers as (host, port) (default: system_nameservers())
+            timeout: Seconds before an unanswered query is sent to the next nameserver
+            cache_size: Maximum cached answers (0 disables caching)
+        """
+        self.servers = system_nameservers() if servers is None else servers
+        self.hosts = HostsFile()
+        self.timeout = timeout
+        self.cache_size = cache_size
+        # (name, record type) -> (expires_at, answer)
+        self._cache: "OrderedDict[Tuple[str, str], Tuple[float, DnsAnswer]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def resolve(self, name: str, record_type: str = "A") -> DnsAnswer:
+        """
+        Look up the records of one name.
+
+        Args:
+            name: Domain name (or an IP address for PTR lookups)
+            record_type: Record type name (see RECORD_TYPES)
+
+        Returns:
+            The answer; its rcode is "NXDOMAIN" if the name does not exist
+
+        Raises:
+            ValidationError: If the name or record type is invalid
+            NetworkError: If no nameserver gives a usable answer
+        """
+        answer = self.resolve_many([name], record_type)[0]
+        if answer.error:
+            raise NetworkError(answer.error)
+        return answer
+
+    def resolve_many(
+        self,
+        names: Iterable[str],
+        record_type: str = "A",
+        max_concurrent: int = DEFAULT_CONCURRENCY,
+    ) -> List[DnsAnswer]:
+        """
+        Look up the records of many names concurrently.
+
+        Args:
+            names: Domain names (or IP addresses for PTR lookups)
+            record_type: Record type name (see RECORD_TYPES)
+            max_concurrent: Maximum queries in flight
+
+        Returns:
+            One answer per name, in order; failed lookups have ``error`` set
+
+        Raises:
+            ValidationError: If a name or the record type is invalid
+            DeadlineExceededError: If the tool call runs out of time
+        """
+        record_type = record_type.upper()
+        qtype = record_type_code(record_type)
+        keys = [normalize_name(name, record_type) for name in names]
+
+        answers: Dict[str, DnsAnswer] = {}
+        missing = []
+        for name in dict.fromkeys(keys):
+            hosts = self.hosts.lookup(name, record_type) if record_type in ADDRESS_TYPES else []
+            if hosts:
+                answers[name] = DnsAnswer(name, record_type, "NOERROR", hosts)
+                continue
+            cached = self._cached(name, record_type)
+            if cached is not None:
+                answers[name] = cached
+            else:
+                missing.append(name)
+
+        if missing:
+            if not self.servers:
+                fetched = self._system_lookup_many(missing, record_type)
+            else:
+                fetched = self._query_all(missing, record_type, qtype, max(1, max_concurrent))
+                if record_type in ADDRESS_TYPES:
+                    # Names only the operating system knows (nsswitch sources besides DNS)
+                    unknown = [name for name, answer in fetched.items() if not answer.records]
+                    for name, answer in self._system_lookup_many(unknown, record_type).items():
+                        if answer.records:
+                            fetched[name] = answer
+            for name, answer in fetched.items():
+                self._store(answer)
+                answers[name] = answer
+        return [answers[name] for name in keys]
+
+    def clear(self) -> None:
+        """Drop all cached answers."""
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache usage statistics."""
+        with self._lock:
+            return {
+                "entries": len(self._cache),
+                "max_entries": self.cache_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "servers": [f"{host}:{port}" for host, port in self.servers],
+            }
+
+    def _cached(self, name: str, record_type: str) -> Optional[DnsAnswer]:
+        """Get a copy of a cached answer with its remaining TTL."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._cache.get((name, record_type))
+            if entry is None or entry[0] <= now:
+                self.misses += 1
+                return None
+            self._cache.move_to_end((name, record_type))
+            self.hits += 1
+        expires_at, answer = entry
+        copy = DnsAnswer(
+            answer.name,
+            answer.record_type,
+            answer.rcode,
+            answer.records,
+            int(expires_at - now),
+            answer.aliases,
+        )
+        copy.from_cache = True
+        return copy
+
+    def _store(self, answer: DnsAnswer) -> None:
+        if answer.error or answer.ttl <= 0 or self.cache_size <= 0:
+            return
+        with self._lock:
+            key = (answer.name, answer.record_type)
+            self._cache[key] = (time.monotonic() + answer.ttl, answer)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _query_all(
+        self, names: List[str], record_type: str, qtype: int, max_concurrent: int
+    ) -> Dict[str, DnsAnswer]:
+        """Send the queries from non-blocking UDP sockets and collect the answers."""
+        answers: Dict[str, DnsAnswer] = {}
+        pending = list(reversed(names))
+        in_flight: Dict[int, _Query] = {}
+        sockets: Dict[int, socket.socket] = {}
+        selector = selectors.DefaultSelector()
+        addresses = [self._address(server) for server in self.servers]
+        max_sends = ATTEMPTS * len(addresses)
+
+        def send(query: _Query) -> None:
+            family, address = addresses[query.sends % len(addresses)]
+            sock = sockets.get(family)
+            if sock is None:
+                sock = sockets[family] = socket.socket(family, socket.SOCK_DGRAM)
+                sock.setblocking(False)
+                selector.register(sock, selectors.EVENT_READ)
+            query.sends += 1
+            query.sent_at = time.monotonic()
+            try:
+                sock.sendto(query.message, address)
+            except OSError as e:
+                logger.debug(f"DNS query to {address} failed: {e}")
+
+        try:
+            while pending or in_flight:
+                check_deadline()
+                while pending and len(in_flight) < max_concurrent:
+                    name = pending.pop()
+                    query_id = random.getrandbits(16)
+                    while query_id in in_flight:
+                        query_id = random.getrandbits(16)
+                    query = _Query(name, record_type, build_query(query_id, name, qtype))
+                    in_flight[query_id] = query
+                    send(query)
+
+                now = time.monotonic()
+                wait = min(q.sent_at + self.timeout for q in in_flight.values()) - now
+                remaining = time_remaining()
+                if remaining is not None:
+                    wait = min(wait, max(0.0, remaining))
+                for key, _ in selector.select(max(0.0, wait)):
+                    self._receive(key.fileobj, in_flight, answers)  # type: ignore[arg-type]
+
+                now = time.monotonic()
+                for query_id, query in list(in_flight.items()):
+                    if now - query.sent_at < self.timeout:
+                        continue
+                    if query.sends >= max_sends:
+                        del in_flight[query_id]
+                        answers[query.name] = DnsAnswer(
+                            query.name, record_type, "", error="DNS query timed out"
+                        )
+                    else:
+                        send(query)
+        finally:
+            selector.close()
+            for sock in sockets.values():
+                sock.close()
+        return answers
+
+    def _receive(
+        self, sock: socket.socket, in_flight: Dict[int, _Query], answers: Dict[str, DnsAnswer]
+    ) -> None:
+        """Read the datagrams waiting on a socket and settle the queries they answer."""
+        servers = {(host, port) for _, (host, port, *_) in map(self._address, self.servers)}
+        while True:
+            try:
+                data, source = sock.recvfrom(65535)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:  # e.g. ICMP port unreachable
+                logger.debug(f"DNS receive failed: {e}")
+                return
+            if (source[0], source[1]) not in servers:
+                continue
+            try:
+                message = DnsMessage(data)
+            except ValueError as e:
+                logger.debug(f"Ignoring DNS response from {source[0]}: {e}")
+                continue
+            query = in_flight.get(message.id)
+            if (
+                query is None
+                or not message.is_response
+                or message.questions != [(query.name, RECORD_TYPES[query.record_type])]
+            ):
+                continue
+
+            if message.truncated:
+                try:
+                    message = self._query_tcp(query.message, (source[0], source[1]))
+                except (OSError, ValueError) as e:
+                    logger.debug(f"DNS query over TCP failed: {e}")
+                    continue  # resent over UDP on timeout
+            answer = message.answer(query.name, query.record_type)
+            if answer.error and query.sends < ATTEMPTS * len(self.servers):
+                query.sent_at = 0.0  # ask the next nameserver right away
+                continue
+            del in_flight[message.id]
+            answers[query.name] = answer
+
+    def _query_tcp(self, message: bytes, server: Server) -> DnsMessage:
+        """Send a query over TCP (for answers too large for UDP)."""
+        remaining = time_remaining()
+        timeout = self.timeout if remaining is None else max(0.001, min(self.timeout, remaining))
+        with socket.create_connection(server, timeout=timeout) as sock:
+            sock.sendall(struct.pack(">H", len(message)) + message)
+            length = struct.unpack(">H", self._recv_exact(sock, 2))[0]
+            return DnsMessage(self._recv_exact(sock, length))
+
+    @staticmethod
+    def _recv_exact(sock: socket.socket, size: int) -> bytes:
+        data = b""
+        while len(data) < size:
+            chunk = sock.recv(size - len(data))
+            if not chunk:
+                raise ValueError("Connection closed by the nameserver")
+            data += chunk
+        return data
+
+    @staticmethod
+    def _address(server: Server) -> Tuple[int, Any]:
+        """Get the socket family and address of a nameserver."""
+        family = socket.AF_INET6 if ":" in server[0] else socket.AF_INET
+        address = (server[0], server[1], 0, 0) if family == socket.AF_INET6 else server
+        return family, address
+
+    def _system_lookup_many(self, names: List[str], record_type: str) -> Dict[str, DnsAnswer]:
+        """Resolve names with the operating system resolver, a few at a time."""
+        if len(names) <= 1:
+            return {name: self._system_lookup(name, record_type) for name in names}
+        with ThreadPoolExecutor(min(len(names), SYSTEM_LOOKUP_THREADS)) as pool:
+            lookups = pool.map(
+                functools.partial(self._system_lookup, record_type=record_type), names
+            )
+            return dict(zip(names, lookups))
+
+    @staticmethod
+    def _system_lookup(name: str, record_type: str) -> DnsAnswer:
+        """Resolve A/AAAA records with the operating system resolver (no TTLs)."""
+        if record_type not in ("A", "AAAA"):
+            return DnsAnswer(
+                name,
+                record_type,
+                "",
+                error="No DNS servers configured (set MCP_SERVER_DNS_SERVERS)",
+            )
+        family = socket.AF_INET if record_type == "A" else socket.AF_INET6
+        try:
+            infos = socket.getaddrinfo(name, None, family)
+        except socket.gaierror as e:
+            if e.errno in (socket.EAI_NONAME, getattr(socket, "EAI_NODATA", None)):
+                return DnsAnswer(name, record_type, "NXDOMAIN")
+            return DnsAnswer(name, record_type, "", error=str(e))
+        records = list(dict.fromkeys(str(info[4][0]) for info in infos))
+        return DnsAnswer(name, record_type, "NOERROR", records)
+
+
+def _env_number(name: str, default: float) -> float:
+    """Read a non-negative number from the environment."""
+    try:
+        return max(0.0, float(os.getenv(name, str(default))))
+    except ValueError:
+        logger.warning(f"Invalid value for {name}, using {default}")
+        return default
+
+
+# Global resolver instance
+_resolver: Optional[DnsResolver] = None
+_resolver_lock = threading.Lock()
+
+
+def get_resolver() -> DnsResolver:
+    """Get the global DNS resolver instance."""
+    global _resolver
+    if _resolver is None:
+        with _resolver_lock:
+            if _resolver is None:
+                _resolver = DnsResolver(
+                    timeout=_env_number("MCP_SERVER_DNS_TIMEOUT", DEFAULT_TIMEOUT)
+                    or DEFAULT_TIMEOUT,
+                    cache_size=int(_env_number("MCP_SERVER_DNS_CACHE_SIZE", DEFAULT_CACHE_SIZE)),
+                )
+    return _resolver
+
+
+register_cache("dns_cache", lambda: get_resolver().stats())
@@ -0,0 +1,163 @@
+"""
+Short-lived cache of parsed HTML documents for the web tools.
+
+Parsing is the dominant CPU cost of the extraction tools: a 2-5 MB page takes
+hundreds of milliseconds to turn into a tree. Tools that extract
+from the same page one after another (get_page_title, then get_page_links, then
+fetch_webpage_text) share one parse through this cache, keyed by a hash of the
+HTML and the parser engine ("lxml" for lxml.html documents, "bs4" for
+BeautifulSoup). Entries expire after a short time and the total size of the
+cached source HTML is bounded, evicting the least recently used documents.
+
+Cached trees are shared between threads and must not be modified; extraction
+helpers only read them.
+
+Limits can be configured with environment variables:
+    MCP_SERVER_DOM_CACHE_BYTES  - Total HTML size of cached documents
+                                  (default: 32 MB, 0 disables the cache)
+    MCP_SERVER_DOM_CACHE_TTL    - Seconds a parsed document is kept (default: 60)
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+from mcp_server.tools.metrics import register_cache
+from mcp_server.utils import ValidationError, logger
+
+from . import lxml_extract
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+DEFAULT_TTL = 60.0
+
+# Parser for each engine name
+_PARSERS: Dict[str, Callable[[str], Any]] = {
+    "bs4": lambda html: BeautifulSoup(html, "lxml"),
+    "lxml": lxml_extract.parse,
+}
+
+
+class DomCache:
+    """LRU cache of parsed documents keyed by content hash."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, ttl: float = DEFAULT_TTL):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Total size of the source HTML of cached documents (0 disables caching)
+            ttl: Seconds a parsed document is kept
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        # key -> (expires_at, html size, tree)
+        self._entries: "OrderedDict[str, Tuple[float, int, Any]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def parse(self, html: str, engine: str = "bs4") -> Any:
+        """
+        Parse HTML, reusing the tree of an identical document parsed recently.
+
+        Args:
+            html: HTML content
+            engine: "bs4" for a BeautifulSoup tree, "lxml" for an lxml.html document
+
+        Returns:
+            The parsed document (read-only)
+
+        Raises:
+            ValidationError: If the engine is unknown
+        """
+        parser = _PARSERS.get(engine)
+        if parser is None:
+            raise ValidationError(
+                f"Unknown HTML engine: {engine} (use one of {', '.join(_PARSERS)})"
+            )
+
+        size = len(html)
+        if size > self.max_bytes:
+            return parser(html)
+
+        digest = hashlib.sha256(html.encode("utf-8", "surrogatepass")).hexdigest()
+        key = f"{engine}:{digest}"
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+
+        doc = parser(html)
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous[1]
+            self._entries[key] = (now + self.ttl, size, doc)
+            self._size += size
+            while self._size > self.max_bytes and self._entries:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+        return doc
+
+    def clear(self) -> None:
+        """Drop all cached documents."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache usage statistics."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+def _env_number(name: str, default: float) -> float:
+    """Read a non-negative number from the environment."""
+    try:
+        return max(0.0, float(os.getenv(name, str(default))))
+    except ValueError:
+        logger.warning(f"Invalid value for {name}, using {default}")
+        return default
+
+
+# Global DOM cache instance
+_dom_cache: Optional[DomCache] = None
+_dom_cache_lock = threading.Lock()
+
+
+def get_dom_cache() -> DomCache:
+    """Get the global DOM cache instance."""
+    global _dom_cache
+    if _dom_cache is None:
+        with _dom_cache_lock:
+            if _dom_cache is None:
+                _dom_cache = DomCache(
+                    max_bytes=int(_env_number("MCP_SERVER_DOM_CACHE_BYTES", DEFAULT_MAX_BYTES)),
+                    ttl=_env_number("MCP_SERVER_DOM_CACHE_TTL", DEFAULT_TTL),
+                )
+    return _dom_cache
+
+
+register_cache("dom_cache", lambda: get_dom_cache().stats())
+
+
+def parse_document(html: str, engine: str = "bs4") -> Any:
+    """Parse HTML through the global DOM cache (see DomCache.parse())."""
+    return get_dom_cache().parse(html, engine)
@@ -0,0 +1,519 @@
+"""
+Download engine for download_file.
+
+When the server supports range requests, a file is downloaded as byte ranges
+over several connections at once, each written at its offset in
+``<path>.part``. The completed ranges are recorded next to it in
+``<path>.part.json`` together with the file size and the server's validators
+(ETag, Last-Modified), so an interrupted or failed download resumes where it
+stopped: the next call requests only the missing ranges, with If-Range so a
+file that changed on the server is not stitched together from two versions.
+A range whose connection drops is retried from its last written byte.
+
+Servers without range support get one streamed request. Reads start at 64 KB
+and grow up to 1 MB while the connection keeps up. The finished file can be
+checked against an expected hash before it replaces the destination.
+"""
+
+import contextvars
+import functools
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import requests
+import urllib3
+
+from mcp_server.utils import (
+    NetworkError,
+    ValidationError,
+    backoff_delay,
+    check_deadline,
+    logger,
+    sleep_until_deadline,
+    time_remaining,
+)
+
+from . import fetcher
+
+DEFAULT_CONNECTIONS = 4
+MAX_CONNECTIONS = 16
+
+# Smallest byte range given to one connection
+MIN_SEGMENT_SIZE = 1024 * 1024
+
+# Read sizes grow while a read takes less than TARGET_READ_TIME and shrink
+# when it takes more than four times as long
+MIN_CHUNK_SIZE = 64 * 1024
+MAX_CHUNK_SIZE = 1024 * 1024
+TARGET_READ_TIME = 0.25
+
+# Attempts per byte range without progress before the download fails
+SEGMENT_ATTEMPTS = 3
+
+# Seconds between saves of the resume state and between progress reports
+STATE_SAVE_INTERVAL = 1.0
+PROGRESS_INTERVAL = 0.5
+
+# Hash algorithm guessed from the length of a bare hex digest
+_DIGEST_ALGORITHMS = {32: "md5", 40: "sha1", 64: "sha256", 128: "sha512"}
+
+_CONTENT_RANGE = re.compile(r"bytes\s+(\d+)-(\d+)/(\d+|\*)", re.IGNORECASE)
+
+# Errors of a transfer that is worth retrying from the last written byte
+_TRANSFER_ERRORS = (requests.RequestException, urllib3.exceptions.HTTPError, ConnectionError)
+
+ProgressCallback = Callable[[int, Optional[int]], None]
+
+
+def parse_checksum(checksum: str) -> Tuple[str, str]:
+    """
+    Parse an expected file hash.
+
+    Args:
+        checksum: "<algorithm>:<hex digest>" (e.g. "sha256:9f86d0..."), or a bare
+            hex digest of an MD5, SHA-1, SHA-256 or SHA-512 hash
+
+    Returns:
+        (hashlib algorithm name, lowercase hex digest)
+
+    Raises:
+        ValidationError: If the algorithm is unknown or the digest is malformed
+    """
+    algorithm, _, digest = checksum.strip().rpartition(":")
+    digest = digest.lower()
+    algorithm = algorithm.lower().replace("-", "") or _DIGEST_ALGORITHMS.get(len(digest), "")
+    if algorithm not in hashlib.algorithms_available or algorithm.startswith("shake"):
+        raise ValidationError(f"Unsupported checksum: {checksum} (use e.g. sha256:<hex digest>)")
+    if (
+        not re.fullmatch(r"[0-9a-f]+", digest)
+        or len(digest) != 2 * hashlib.new(algorithm).digest_size
+    ):
+        raise ValidationError(f"Malformed {algorithm} digest: {digest}")
+    return algorithm, digest
+
+
+def file_digest(path: Path, algorithm: str) -> str:
+    """Hash a file in chunks, stopping if the tool call runs out of time."""
+    digest = hashlib.new(algorithm)
+    with open(path, "rb") as f:
+        while True:
+            check_deadline()
+            chunk = f.read(MAX_CHUNK_SIZE)
+            if not chunk:
+                return digest.hexdigest()
+            digest.update(chunk)
+
+
+def merge_ranges(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Merge overlapping and adjacent [start, end) byte ranges."""
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(r for r in ranges if r[1] > r[0]):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def plan_segments(
+    done: List[Tuple[int, int]], size: int, connections: int
+) -> List[Tuple[int, int]]:
+    """
+    Split the bytes of a file not yet downloaded into ranges for the connections.
+
+    Args:
+        done: Merged [start, end) ranges already downloaded
+        size: File size
+        connections: Parallel connections
+
+    Returns:
+        [start, end) ranges of at least MIN_SEGMENT_SIZE bytes (except the last
+        range of a gap), in file order
+    """
+    gaps = []
+    position = 0
+    for start, end in done:
+        if start > position:
+            gaps.append((position, start))
+        position = max(position, end)
+    if position < size:
+        gaps.append((position, size))
+
+    missing = sum(end - start for start, end in gaps)
+    segment_size = max(MIN_SEGMENT_SIZE, math.ceil(missing / max(1, connections)))
+    return [
+        (offset, min(offset + segment_size, end))
+        for start, end in gaps
+        for offset in range(start, end, segment_size)
+    ]
+
+
+def _content_range(response: requests.Response) -> Optional[Tuple[int, int, Optional[int]]]:
+    """Parse the Content-Range header of a 206 response into (first, last, size or None)."""
+    match = _CONTENT_RANGE.match(response.headers.get("Content-Range", ""))
+    if match is None:
+        return None
+    first, last, size = match.groups()
+    return int(first), int(last), None if size == "*" else int(size)
+
+
+def _read_chunks(response: requests.Response, length: Optional[int] = None) -> Iterator[bytes]:
+    """
+    Read a streamed response body with adaptive read sizes.
+
+    Args:
+        response: Response from a request with stream=True
+        length: Bytes to read (default: until the body ends)
+
+    Yields:
+        Body chunks
+    """
+    chunk_size = MIN_CHUNK_SIZE
+    remaining = length
+    while remaining is None or remaining > 0:
+        check_deadline()
+        wanted = chunk_size if remaining is None else min(chunk_size, remaining)
+        started = time.monotonic()
+        chunk = response.raw.read(wanted, decode_content=True)
+        if not chunk:
+            return
+        elapsed = time.monotonic() - started
+        if remaining is not None:
+            remaining -= len(chunk)
+        yield chunk
+
+        if len(chunk) == wanted and elapsed < TARGET_READ_TIME:
+            chunk_size = min(MAX_CHUNK_SIZE, chunk_size * 2)
+        elif elapsed > 4 * TARGET_READ_TIME:
+            chunk_size = max(MIN_CHUNK_SIZE, chunk_size // 2)
+
+
+class RangedDownload:
+    """A file downloaded as byte ranges into a .part file, with resumable state."""
+
+    def __init__(
+        self,
+        url: str,
+        part_path: Path,
+        size: int,
+        validators: Dict[str, Optional[str]],
+        timeout: float,
+        progress: Optional[ProgressCallback] = None,
+    ):
+        """
+        Initialize the download.
+
+        Args:
+            url: URL of the file
+            part_path: Path of the .part file the ranges are written to
+            size: File size reported by the server
+            validators: ``etag`` and ``last_modified`` of the file on the server
+            timeout: Timeout in seconds for each request
+            progress: Called with (bytes on disk, file size) as ranges arrive
+        """
+        self.url = url
+        self.part_path = part_path
+        self.state_path = part_path.with_name(part_path.name + ".json")
+        self.size = size
+        self.validators = validators
+        self.timeout = timeout
+        self.progress = progress
+        self.done: List[Tuple[int, int]] = []
+        # range start -> bytes of the range written so far
+        self._active: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._last_save = 0.0
+        self._last_progress = 0.0
+
+    @property
+    def if_range(self) -> Optional[str]:
+        """The If-Range value that keeps ranges from one version of the file."""
+        etag = self.validators.get("etag")
+        if etag and not etag.startswith("W/"):
+            return etag
+        return self.validators.get("last_modified")
+
+    def load_state(self) -> int:
+        """
+        Pick up the ranges of an earlier attempt on the same version of the file.
+
+        Returns:
+            Bytes already downloaded (0 when starting over)
+        """
+        try:
+            state = json.loads(self.state_path.read_text(encoding="utf-8"))
+            same_file = (
+                self.if_range is not None
+                and state.get("url") == self.url
+                and state.get("size") == self.size
+                and state.get("validators") == self.validators
+                and self.part_path.stat().st_size == self.size
+            )
+            if same_file:
+                self.done = merge_ranges([(int(s), int(e)) for s, e in state.get("done", [])])
+                return self.bytes_done()
+        except (OSError, ValueError, TypeError, AttributeError):
+            pass
+
+        with open(self.part_path, "wb") as f:
+            f.truncate(self.size)
+        self.done = []
+        return 0
+
+    def bytes_done(self) -> int:
+        """Bytes written to the .part file so far."""
+        with self._lock:
+            ranges = self.done + [(s, s + n) for s, n in self._active.items()]
+        return sum(end - start for start, end in merge_ranges(ranges))
+
+    def save_state(self) -> None:
+        """Record the completed ranges so a later call can resume."""
+        with self._lock:
+            ranges = merge_ranges(self.done + [(s, s + n) for s, n in self._active.items()])
+            self._last_save = time.monotonic()
+        state = {
+            "url": self.url,
+            "size": self.size,
+            "validators": self.validators,
+            "done": ranges,
+        }
+        temp_path = self.state_path.with_name(self.state_path.name + ".tmp")
+        try:
+            temp_path.write_text(json.dumps(state), encoding="utf-8")
+            os.replace(temp_path, self.state_path)
+        except OSError as e:
+            logger.warning(f"Could not save download state {self.state_path}: {e}")
+
+    def run(self, connections: int) -> None:
+        """
+        Download the missing ranges over up to ``connections`` connections.
+
+        Raises:
+            NetworkError: If a range cannot be downloaded
+            DeadlineExceededError: If the tool call runs out of time
+        """
+        pending = iter(plan_segments(self.done, self.size, connections))
+        running: Dict["Future[None]", Tuple[int, int]] = {}
+        pool = fetcher.get_io_pool()
+
+        def submit_next() -> bool:
+            segment = next(pending, None)
+            if segment is None:
+                return False
+            # Carry the tool call's deadline into the I/O thread
+            ctx = contextvars.copy_context()
+            running[pool.submit(functools.partial(ctx.run, self._fetch_range, *segment))] = segment
+            return True
+
+        try:
+            while len(running) < connections and submit_next():
+                pass
+            while running:
+                remaining = time_remaining()
+                finished, _ = wait(
+                    running,
+                    timeout=None if remaining is None else max(0.0, remaining),
+                    return_when=FIRST_COMPLETED,
+                )
+                if not finished:
+                    check_deadline()
+                for future in finished:
+                    start, end = running.pop(future)
+                    future.result()
+                    with self._lock:
+                        self._active.pop(start, None)
+                        self.done = merge_ranges(self.done + [(start, end)])
+                    submit_next()
+        finally:
+            self._stop.set()
+            for future in running:
+                future.cancel()
+            wait(running)
+            self.save_state()
+
+    def _fetch_range(self, start: int, end: int) -> None:
+        """Download the bytes [start, end), retrying from the last byte written."""
+        position = start
+        failures = 0
+        while position < end and not self._stop.is_set():
+            check_deadline()
+            resumed_at = position
+            headers = {
+                **fetcher.DEFAULT_HEADERS,
+                "Accept-Encoding": "identity",
+                "Range": f"bytes={position}-{end - 1}",
+            }
+            if self.if_range is not None:
+                headers["If-Range"] = self.if_range
+            try:
+                response = fetcher.request(
+                    "GET", self.url, timeout=self.timeout, headers=headers, stream=True
+                )
+                try:
+                    content_range = _content_range(response)
+                    if response.status_code != 206 or content_range is None:
+                        response.raise_for_status()
+                        raise NetworkError("File changed on the server during the download")
+                    if content_range[0] != position:
+                        raise NetworkError(f"Server returned the wrong range ({content_range})")
+                    with open(self.part_path, "r+b") as f:
+                        f.seek(position)
+                        for chunk in _read_chunks(response, end - position):
+                            if self._stop.is_set():
+                                return
+                            f.write(chunk)
+                            position += len(chunk)
+                            self._advance(start, position - start)
+                finally:
+                    response.close()
+                if position < end:
+                    raise requests.ConnectionError(
+                        "Connection closed before the range was complete"
+                    )
+            except _TRANSFER_ERRORS as e:
+                failures = 0 if position > resumed_at else failures + 1
+                if failures >= SEGMENT_ATTEMPTS:
+                    raise NetworkError(f"Range {start}-{end - 1} failed: {e}") from e
+                logger.info(f"Retrying range {position}-{end - 1} of {self.url}: {e}")
+                sleep_until_deadline(backoff_delay(failures, 0.5, 5.0))
+
+    def _advance(self, start: int, written: int) -> None:
+        """Record progress of the range starting at ``start``."""
+        now = time.monotonic()
+        with self._lock:
+            self._active[start] = written
+            save = now - self._last_save >= STATE_SAVE_INTERVAL
+            report = self.progress is not None and now - self._last_progress >= PROGRESS_INTERVAL
+            if report:
+                self._last_progress = now
+        if save:
+            self.save_state()
+        if report and self.progress is not None:
+            self.progress(self.bytes_done(), self.size)
+
+
+def download(
+    url: str,
+    path: Path,
+    timeout: float = 30,
+    connections: int = DEFAULT_CONNECTIONS,
+    resume: bool = True,
+    checksum: Optional[Tuple[str, str]] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> Dict[str, Any]:
+    """
+    Download a file, in parallel ranges when the server supports them.
+
+    Args:
+        url: URL of the file
+        path: Destination path (its directory must exist)
+        timeout: Timeout in seconds for each request
+        connections: Parallel connections for range downloads
+        resume: Continue from the .part file of an earlier attempt
+        checksum: Expected (algorithm, hex digest) from parse_checksum()
+        progress: Called with (bytes on disk, file size or None) during the download
+
+    Returns:
+        Dictionary with size, resumed_bytes (bytes kept from an earlier attempt),
+        connections (used) and checksum ("<algorithm>:<digest>" if verified)
+
+    Raises:
+        requests.RequestException: If the server cannot be reached or returns an error
+        NetworkError: If the transfer fails or the checksum does not match
+    """
+    part_path = path.with_name(path.name + ".part")
+    state_path = part_path.with_name(part_path.name + ".json")
+    if not resume:
+        part_path.unlink(missing_ok=True)
+        state_path.unlink(missing_ok=True)
+
+    headers = {**fetcher.DEFAULT_HEADERS, "Accept-Encoding": "identity", "Range": "bytes=0-0"}
+    probe = fetcher.request("GET", url, timeout=timeout, headers=headers, stream=True)
+    content_range = _content_range(probe) if probe.status_code == 206 else None
+    resumed = 0
+    used = 1
+
+    if content_range is not None and content_range[2] is not None:
+        probe.close()
+        ranged = RangedDownload(
+            probe.url,
+            part_path,
+            content_range[2],
+            {
+                "etag": probe.headers.get("ETag"),
+                "last_modified": probe.headers.get("Last-Modified"),
+            },
+            timeout,
+            progress,
+        )
+        resumed = ranged.load_state()
+        if resumed:
+            logger.info(f"Resuming download of {url} at {resumed} of {ranged.size} bytes")
+        used = max(1, min(connections, len(plan_segments(ranged.done, ranged.size, connections))))
+        ranged.run(used)
+        size = ranged.size
+    elif probe.status_code == 416 and probe.headers.get("Content-Range", "").endswith("/0"):
+        probe.close()
+        part_path.write_bytes(b"")
+        size = 0
+    else:
+        if probe.status_code == 206:
+            # Size unknown: download the whole file in one request
+            probe.close()
+            del headers["Range"]
+            probe = fetcher.request("GET", url, timeout=timeout, headers=headers, stream=True)
+        size = _download_stream(probe, part_path, progress)
+
+    if checksum is not None:
+        algorithm, expected = checksum
+        actual = file_digest(part_path, algorithm)
+        if actual != expected:
+            part_path.unlink(missing_ok=True)
+            state_path.unlink(missing_ok=True)
+            raise NetworkError(f"Checksum mismatch: expected {algorithm}:{expected}, got {actual}")
+
+    os.replace(part_path, path)
+    state_path.unlink(missing_ok=True)
+    if progress is not None:
+        progress(size, size)
+    return {
+        "size": size,
+        "resumed_bytes": resumed,
+        "connections": used,
+        "checksum": f"{checksum[0]}:{checksum[1]}" if checksum is not None else None,
+    }
+
+
+def _download_stream(
+    response: requests.Response, part_path: Path, progress: Optional[ProgressCallback]
+) -> int:
+    """Write a whole response body to the .part file; returns its size."""
+    if not response.ok:
+        response.close()
+        response.raise_for_status()
+    try:
+        length = response.headers.get("Content-Length")
+        total = int(length) if length and length.isdigit() else None
+        size = 0
+        last_progress = time.monotonic()
+        with open(part_path, "wb") as f:
+            for chunk in _read_chunks(response):
+                f.write(chunk)
+                size += len(chunk)
+                if progress is not None and time.monotonic() - last_progress >= PROGRESS_INTERVAL:
+                    last_progress = time.monotonic()
+                    progress(size, total)
+        return size
+    except _TRANSFER_ERRORS as e:
+        raise NetworkError(f"Transfer interrupted (server does not support resuming): {e}") from e
+    finally:
+        response.close()
@@ -0,0 +1,362 @@
+"""
+Concurrent fetching engine for the web tools.
+
+All web tools send their requests through request(), which holds a per-host
+slot while the request runs, so one tool call (or many) cannot open an
+unbounded number of connections to the same server. Batch tools fan requests
+out over a dedicated I/O thread pool with fetch_all(), which yields each
+result as soon as it completes.
+
+Requests go through the shared keep-alive session (tools/http_client.py) and
+respect the calling tool's deadline. Page fetches use get_cached(), which serves
+and revalidates responses from the shared HTTP cache (web/http_cache.py).
+
+Limits can be configured with environment variables:
+    MCP_SERVER_HTTP_WORKERS    - I/O threads for concurrent fetches (default: 32)
+    MCP_SERVER_HTTP_PER_HOST   - Requests in flight per host (default: 6)
+"""
+
+import contextvars
+import functools
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+)
+
+import requests
+
+from mcp_server.utils import NetworkError, check_deadline, host_of, logger, time_remaining
+
+from .. import http_client
+from .http_cache import get_http_cache
+
+DEFAULT_WORKERS = 32
+DEFAULT_PER_HOST = 6
+DEFAULT_BATCH_CONCURRENCY = 16
+
+# Seconds a request waits for a free per-host slot
+HOST_SLOT_TIMEOUT = 30.0
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+
+_io_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read a positive integer from the environment."""
+    try:
+        return max(1, int(os.getenv(name, str(default))))
+    except ValueError:
+        logger.warning(f"Invalid value for {name}, using {default}")
+        return default
+
+
+def get_io_pool() -> ThreadPoolExecutor:
+    """Get the thread pool that runs concurrent fetches."""
+    global _io_pool
+    if _io_pool is None:
+        with _pool_lock:
+            if _io_pool is None:
+                workers = _env_int("MCP_SERVER_HTTP_WORKERS", DEFAULT_WORKERS)
+                _io_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mcp-http")
+    return _io_pool
+
+
+class HostLimits:
+    """Per-host caps on requests in flight, shared by all web tools."""
+
+    def __init__(self, per_host: int = DEFAULT_PER_HOST):
+        """
+        Initialize the limits.
+
+        Args:
+            per_host: Maximum requests in flight to one host
+        """
+        self.per_host = per_host
+        # Semaphores exist only while a request holds or waits for a slot
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._users: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def slot(self, url: str, timeout: float = HOST_SLOT_TIMEOUT) -> Iterator[None]:
+        """
+        Hold a slot for the URL's host while the block runs.
+
+        Args:
+            url: URL whose host is limited
+            timeout: Seconds to wait for a free slot
+
+        Raises:
+            NetworkError: If no slot frees up in time
+            DeadlineExceededError: If the tool call runs out of time while waiting
+        """
+        host = host_of(url)
+        with self._lock:
+            semaphore = self._slots.get(host)
+            if semaphore is None:
+                semaphore = self._slots[host] = threading.BoundedSemaphore(self.per_host)
+            self._users[host] = self._users.get(host, 0) + 1
+
+        try:
+            remaining = time_remaining()
+            if remaining is not None:
+                timeout = max(0.0, min(timeout, remaining))
+            if not semaphore.acquire(timeout=timeout):
+                check_deadline()
+                raise NetworkError(f"Too many concurrent requests to {host}")
+            try:
+                yield
+            finally:
+                semaphore.release()
+        finally:
+            with self._lock:
+                self._users[host] -= 1
+                if not self._users[host]:
+                    # Fully released: drop it so one-off hosts do not accumulate
+                    del self._users[host]
+                    del self._slots[host]
+
+
+host_limits = HostLimits(_env_int("MCP_SERVER_HTTP_PER_HOST", DEFAULT_PER_HOST))
+
+
+def request(
+    method: str, url: str, timeout: float = 10, stream: bool = False, **kwargs: Any
+) -> requests.Response:
+    """
+    Send a request through the shared session, within the host's limit.
+
+    The host slot is held until the response headers arrive; bodies of streamed
+    responses are read after it is released.
+
+    Args:
+        method: HTTP method
+        url: Request URL
+        timeout: Request timeout in seconds
+        stream: Defer reading the body
+        **kwargs: Other arguments of requests.Session.request (headers default to
+            a browser User-Agent)
+
+    Returns:
+        The response
+
+    Raises:
+        requests.RequestException: If the request fails
+        NetworkError: If the host's limit stays reached
+    """
+    kwargs.setdefault("headers", DEFAULT_HEADERS)
+    with host_limits.slot(url):
+        return http_client.request(method, url, timeout=timeout, stream=stream, **kwargs)
+
+
+def get_cached(
+    url: str,
+    timeout: float = 10,
+    headers: Optional[Mapping[str, str]] = None,
+    stream: bool = False,
+) -> requests.Response:
+    """
+    Send a GET request through the shared HTTP cache.
+
+    Fresh cached responses are returned without a request, stale ones are
+    revalidated with a conditional request. With ``stream=True`` the body of a
+    network response is not read; pass the response to iter_body() so it is
+    cached once read.
+
+    Args:
+        url: Request URL
+        timeout: Request timeout in seconds
+        headers: Request headers (default: a browser User-Agent)
+        stream: Defer reading the body of network responses
+
+    Returns:
+        The response; cached responses have a ``from_cache`` attribute set to True
+
+    Raises:
+        requests.RequestException: If the request fails
+    """
+    cache = get_http_cache()
+    request_headers = dict(headers or DEFAULT_HEADERS)
+    entry = cache.lookup(url, request_headers)
+    if entry is not None and entry.is_fresh():
+        cache.record("hits")
+        return entry.to_response()
+
+    conditional = dict(request_headers)
+    if entry is not None:
+        conditional.update(entry.validators())
+    response = request("GET", url, timeout=timeout, headers=conditional, stream=stream)
+
+    if entry is not None and response.status_code == 304:
+        response.close()
+        cache.record("revalidated")
+        return cache.refresh(entry, response).to_response()
+
+    cache.record("misses")
+    if not stream:
+        cache.store(url, request_headers, response)
+    return response
+
+
+def iter_body(
+    url: str,
+    response: requests.Response,
+    chunk_size: int,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Iterator[bytes]:
+    """
+    Read the body of a response from get_cached(stream=True) in chunks, caching it.
+
+    Args:
+        url: Request URL
+        response: The response
+        chunk_size: Bytes per chunk
+        headers: Request headers passed to get_cached()
+
+    Yields:
+        Body chunks
+    """
+    if getattr(response, "from_cache", False):
+        yield from response.iter_content(chunk_size)
+        return
+
+    cache = get_http_cache()
+    limit = cache.max_entry_bytes()
+    parts: Optional[List[bytes]] = []
+    size = 0
+    for chunk in response.iter_content(chunk_size):
+        if parts is not None:
+            size += len(chunk)
+            if size > limit:
+                parts = None  # too large to cache, keep streaming
+            else:
+                parts.append(chunk)
+        yield chunk
+
+    if parts is not None:
+        cache.store(url, dict(headers or DEFAULT_HEADERS), response, body=b"".join(parts))
+
+
+def fetch(
+    url: str, method: str = "GET", timeout: float = 10, read_body: bool = True
+) -> Dict[str, Any]:
+    """
+    Fetch a URL and describe the outcome; errors are reported, not raised.
+
+    Args:
+        url: URL to fetch
+        method: HTTP method (GET or HEAD)
+        timeout: Request timeout in seconds
+        read_body: Include the decoded body as ``text``
+
+    Returns:
+        Dictionary with url, final_url, status_code, reason, headers, elapsed and
+        text (if read), or url, error and elapsed on failure
+    """
+    start = time.monotonic()
+    try:
+        response = request(method, url, timeout=timeout, allow_redirects=True)
+        result: Dict[str, Any] = {
+            "url": url,
+            "final_url": response.url,
+            "status_code": response.status_code,
+            "reason": response.reason,
+            "headers": dict(response.headers),
+        }
+        if read_body:
+            result["text"] = response.text
+    except Exception as e:
+        result = {"url": url, "error": str(e)}
+    result["elapsed"] = round(time.monotonic() - start, 3)
+    return result
+
+
+def fetch_all(
+    urls: Iterable[str],
+    max_concurrent: int = DEFAULT_BATCH_CONCURRENCY,
+    deadline: Optional[float] = None,
+    fetch_func: Callable[..., Dict[str, Any]] = fetch,
+    **kwargs: Any,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Fetch URLs concurrently, yielding each result as soon as it completes.
+
+    At most ``max_concurrent`` requests are in flight, and each host's limit
+    still applies. Closing the iterator cancels the fetches that have not started.
+
+    Args:
+        urls: URLs to fetch
+        max_concurrent: Maximum requests in flight for this batch
+        deadline: Seconds for the whole batch; URLs not fetched by then are
+            reported with an error (default: no limit besides the tool call's)
+        fetch_func: Function fetching one URL, called as fetch_func(url, **kwargs)
+            and returning a dictionary with ``url`` (default: fetch())
+        **kwargs: Arguments of fetch_func; a ``timeout`` is clamped to the time
+            left in the batch
+
+    Yields:
+        fetch_func() results in completion order
+    """
+    pool = get_io_pool()
+    pending_urls = iter(urls)
+    running: Dict["Future[Dict[str, Any]]", str] = {}
+    end_time = None if deadline is None else time.monotonic() + deadline
+
+    def batch_remaining() -> Optional[float]:
+        remaining = time_remaining()
+        if end_time is not None:
+            left = end_time - time.monotonic()
+            remaining = left if remaining is None else min(remaining, left)
+        return remaining
+
+    def submit_next() -> bool:
+        url = next(pending_urls, None)
+        if url is None:
+            return False
+        call_kwargs = kwargs
+        remaining = batch_remaining()
+        if remaining is not None and "timeout" in kwargs:
+            call_kwargs = {**kwargs, "timeout": max(0.001, min(kwargs["timeout"], remaining))}
+        # Carry the tool call's deadline into the I/O thread
+        ctx = contextvars.copy_context()
+        running[pool.submit(functools.partial(ctx.run, fetch_func, url, **call_kwargs))] = url
+        return True
+
+    try:
+        while len(running) < max(1, max_concurrent) and submit_next():
+            pass
+        while running:
+            remaining = batch_remaining()
+            done, _ = wait(
+                running,
+                timeout=None if remaining is None else max(0.0, remaining),
+                return_when=FIRST_COMPLETED,
+            )
+            if not done:
+                # Out of time: report what is left instead of waiting for it
+                check_deadline()
+                for url in [*running.values(), *pending_urls]:
+                    yield {"url": url, "error": "Batch deadline exceeded"}
+                return
+            for future in done:
+                del running[future]
+                submit_next()
+                yield future.result()
+    finally:
+        for future in running:
+            future.cancel()
@@ -4,49 +4,105 @@ Web and network tools for the MCP server.
 Provides tools for:
 - Multi-engine web search (DuckDuckGo, Bing, Google, Baidu)
 - Advanced search with caching and rate limiting
-- Webpage fetching and parsing
+- Webpage fetching (single and concurrent batches) and parsing (parsed pages are
+  cached, so several extractions from one page share a parse)
 - URL validation and parsing
 - HTTP operations
 - Link extraction
+- DNS lookups (all common record types, cached, concurrent batches)
 """
 
+import codecs
 import json
-from typing import Any, Optional
+import re
+import tempfile
+import time
+from itertools import zip_longest
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from urllib.parse import urljoin, urlparse
 
 import requests
 from bs4 import BeautifulSoup
+from bs4.element import CData, NavigableString, PageElement, Tag
 
 from ...utils import (
     NetworkError,
     ValidationError,
+    check_deadline,
     format_bytes,
+    host_of,
+    hot_logger,
     logger,
     retry,
     sanitize_path,
+    to_json,
 )
 from ...utils import validate_url as _validate_url
 from ..registry import tool_handler
 from ..search_engine import get_search_manager
+from ..streaming import CHUNK_SIZE, StreamedArray, iter_json_object, report_progress
+from . import crawler, downloader, fetcher, lxml_extract
+from .dns_resolver import get_resolver, normalize_name, record_type_code
+from .dom_cache import parse_document
 
 # 获取搜索管理器实例
 search_manager = get_search_manager()
 
 
-# Helper function for fetching webpages (not a tool itself)
-@retry(max_attempts=3, delay=1.0, exceptions=(requests.RequestException,))
+_FETCH_HEADERS = fetcher.DEFAULT_HEADERS
+
+# Maximum URLs per batch tool call
+MAX_BATCH_URLS = 500
+
+# HEAD responses that check_urls_batch confirms with a GET (HEAD often unsupported or blocked)
+_HEAD_REJECTED_STATUSES = frozenset({400, 403, 404, 405, 406, 500, 501, 503})
+
+# Maximum hostnames per dns_lookup_batch call
+MAX_BATCH_HOSTNAMES = 1000
+
+# Maximum pages per crawl_site crawl
+MAX_CRAWL_PAGES = 1000
+
+# Elements whose content is not part of a page's clean text
+_NON_TEXT_TAGS = frozenset({"script", "style", "nav", "footer", "header"})
+
+# Runs of spaces that separate chunks of clean text
+_PHRASE_BREAK = re.compile(" {2,}")
+
+# Largest http_request body returned inline, and saved to a file with save_to_file
+MAX_RESPONSE_SIZE = 10 * 1024 * 1024
+MAX_SPOOL_SIZE = 1024 * 1024 * 1024
+
+# Directory of bodies saved by http_request; files older than SPOOL_TTL seconds are removed
+SPOOL_DIR = Path(tempfile.gettempdir()) / "mcp_server_http"
+SPOOL_TTL = 3600
+
+# Value of an HTTP Range header after "bytes=": "0-1023", "1024-" or "-1024"
+_BYTE_RANGE = re.compile(r"\d+-\d*|-\d+")
+
+
+# Helper functions for fetching webpages (not tools themselves)
+@retry(
+    max_attempts=3,
+    delay=1.0,
+    exceptions=(requests.RequestException,),
+    budget_key=lambda url, *args, **kwargs: host_of(url),
+)
+def _fetch_webpage_response(url: str, timeout: float = 10) -> requests.Response:
+    """Helper function to fetch a webpage (through the HTTP cache), raising for error statuses."""
+    response = fetcher.get_cached(url, headers=_FETCH_HEADERS, timeout=timeout)
+    response.raise_for_status()
+    return response
+
+
 def _fetch_webpage_helper(url: str, timeout: int = 10) -> str:
     """Helper function to fetch webpage HTML."""
     if not _validate_url(url):
         raise ValidationError(f"Invalid URL: {url}")
 
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        response = requests.get(url, headers=headers, timeout=timeout)
-        response.raise_for_status()
-        result: str = response.text
+        result: str = _fetch_webpage_response(url, timeout).text
         return result
 
     except requests.RequestException as e:
@@ -54,6 +110,163 @@ def _fetch_webpage_helper(url: str, timeout: int = 10) -> str:
         raise NetworkError(f"Failed to fetch webpage: {e}") from e
 
 
+def _html_to_text(html: str, engine: str = "auto") -> str:
+    """Helper function to extract clean text from HTML."""
+    return _page_text(parse_document(html, _resolve_engine(engine)))
+
+
+def _resolve_engine(engine: str, selectors: bool = False) -> str:
+    """
+    Helper function to pick the HTML engine ("lxml" or "bs4") for an engine option.
+
+    "auto" uses lxml, or BeautifulSoup when CSS selectors are needed and cssselect
+    is not installed.
+    """
+    if engine == "auto":
+        return "bs4" if selectors and not lxml_extract.HAS_CSSSELECT else "lxml"
+    if engine not in ("lxml", "bs4"):
+        raise ValidationError(f"Unknown HTML engine: {engine} (use auto, lxml or bs4)")
+    if engine == "lxml" and selectors and not lxml_extract.HAS_CSSSELECT:
+        raise ValidationError("The lxml engine needs cssselect for CSS selectors")
+    return engine
+
+
+def _page_text(doc: Any) -> str:
+    """Helper function to extract clean text from a parsed page (without modifying it)."""
+    # Collect text outside script, style and page chrome elements
+    if not isinstance(doc, BeautifulSoup):
+        text = lxml_extract.page_text(doc, _NON_TEXT_TAGS)
+    else:
+        parts: List[str] = []
+        stack: List[PageElement] = list(reversed(doc.contents))
+        while stack:
+            node = stack.pop()
+            if isinstance(node, Tag):
+                if node.name not in _NON_TEXT_TAGS:
+                    stack.extend(reversed(node.contents))
+            elif type(node) in (NavigableString, CData):
+                parts.append(str(node))
+        text = "".join(parts)
+
+    return "\n".join(_clean_text_chunks(text.splitlines()))
+
+
+def _clean_text_chunks(lines: Iterable[str]) -> Iterator[str]:
+    """Helper function to turn raw text lines into the non-empty chunks of clean text."""
+    for line in lines:
+        for phrase in _PHRASE_BREAK.split(line):
+            chunk = phrase.strip()
+            if chunk:
+                yield chunk
+
+
+def _decode_chunks(chunks: Iterable[bytes], encoding: str) -> Iterator[str]:
+    """Helper function to decode a byte stream, like response.text does for a whole body."""
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    for chunk in chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def _stream_page_text(url: str, timeout: int, max_chars: int) -> str:
+    """Helper function to extract clean text from a page's stream, reading only what is needed."""
+    with _open_webpage(url, timeout) as response:
+        raw_body = fetcher.iter_body(url, response, CHUNK_SIZE, headers=_FETCH_HEADERS)
+        # Without a declared encoding the parser detects it from the bytes
+        body: Iterable[Union[str, bytes]] = raw_body
+        if response.encoding is not None:
+            body = _decode_chunks(raw_body, response.encoding)
+
+        chunks: List[str] = []
+        size = -1  # length of "\n".join(chunks)
+        line: List[str] = []  # raw text of the current, unfinished line
+        line_size = checked_size = 0
+        for piece in lxml_extract.iter_text(body, _NON_TEXT_TAGS):
+            for raw in piece.splitlines(keepends=True):
+                line.append(raw)
+                line_size += len(raw)
+                if raw.splitlines()[0] != raw:  # ends with a line break
+                    for chunk in _clean_text_chunks(["".join(line)]):
+                        chunks.append(chunk)
+                        size += len(chunk) + 1
+                    line, line_size, checked_size = [], 0, 0
+                    if size >= max_chars:
+                        return "\n".join(chunks)[:max_chars]
+
+            if line_size > 2 * checked_size + CHUNK_SIZE:
+                # A long line (minified pages): its clean text so far is final
+                checked_size = line_size
+                partial = list(_clean_text_chunks(["".join(line)]))
+                if size + sum(len(chunk) + 1 for chunk in partial) >= max_chars:
+                    return "\n".join(chunks + partial)[:max_chars]
+
+        chunks.extend(_clean_text_chunks(["".join(line)]))
+        return "\n".join(chunks)[:max_chars]
+
+
+def _page_title(doc: Any) -> Optional[str]:
+    """Helper function to get the title of a parsed page."""
+    if not isinstance(doc, BeautifulSoup):
+        return lxml_extract.page_title(doc)
+    title = doc.find("title")
+    return title.get_text(strip=True) if title else None
+
+
+def _page_links(doc: Any, url: str, absolute: bool = True) -> List[Dict[str, str]]:
+    """Helper function to list the links of a parsed page."""
+    if not isinstance(doc, BeautifulSoup):
+        return lxml_extract.page_links(doc, url, absolute)
+
+    links = []
+    for a_tag in doc.find_all("a", href=True):
+        href = a_tag["href"]
+
+        if (
+            absolute
+            and isinstance(href, str)
+            and not href.startswith(("http://", "https://", "//"))
+        ):
+            href = urljoin(url, href)
+
+        links.append({"url": str(href), "text": a_tag.get_text(strip=True)})
+    return links
+
+
+def _select_elements(doc: Any, selector: str) -> List[Dict[str, Any]]:
+    """Helper function to describe the elements of a parsed page matching a CSS selector."""
+    if not isinstance(doc, BeautifulSoup):
+        return lxml_extract.select_elements(doc, selector)
+    return [
+        {
+            "tag": elem.name,
+            "text": elem.get_text(strip=True),
+            "attributes": dict(elem.attrs),
+        }
+        for elem in doc.select(selector)
+    ]
+
+
+@retry(
+    max_attempts=3,
+    delay=1.0,
+    exceptions=(requests.RequestException,),
+    budget_key=lambda url, *args, **kwargs: host_of(url),
+)
+def _open_webpage(url: str, timeout: int = 10) -> requests.Response:
+    """Helper function to open a webpage response; bodies not served from the cache are not yet read."""
+    response = fetcher.get_cached(url, headers=_FETCH_HEADERS, timeout=timeout, stream=True)
+    try:
+        response.raise_for_status()
+    except requests.RequestException:
+        response.close()
+        raise
+    return response
+
+
 @tool_handler
 def web_search(query: str, max_results: int = 10) -> str:
     """
@@ -86,7 +299,7 @@ def web_search(query: str, max_results: int = 10) -> str:
 
     # 格式化返回结果
     if result["success"]:
-        return json.dumps(
+        return to_json(
             {
                 "results": result["results"],
                 "count": result["count"],
@@ -95,19 +308,16 @@ def web_search(query: str, max_results: int = 10) -> str:
                     result["engines_used"][0] if result["engines_used"] else "Unknown"
                 ),
                 "cached": result.get("cached", False),
-            },
-            ensure_ascii=False,
-            indent=2,
+            }
         )
     else:
-        return json.dumps(
+        return to_json(
             {
                 "results": [],
                 "message": "No results found",
                 "error": result.get("error"),
                 "errors": result.get("errors"),
-            },
-            ensure_ascii=False,
+            }
         )
 
 
@@ -156,7 +366,7 @@ def web_search_advanced(
         is_news=False,
     )
 
-    return json.dumps(
+    return to_json(
         {
             "success": result["success"],
             "results": result["results"],
@@ -166,9 +376,7 @@ def web_search_advanced(
             "parallel": parallel,
             "cached": result.get("cached", False),
             "errors": result.get("errors"),
-        },
-        ensure_ascii=False,
-        indent=2,
+        }
     )
 
 
@@ -204,7 +412,7 @@ def web_search_news(query: str, max_results: int = 10) -> str:
 
     # 格式化返回结果
     if result["success"]:
-        return json.dumps(
+        return to_json(
             {
                 "results": result["results"],
                 "count": result["count"],
@@ -214,19 +422,16 @@ def web_search_news(query: str, max_results: int = 10) -> str:
                     result["engines_used"][0] if result["engines_used"] else "Unknown"
                 ),
                 "cached": result.get("cached", False),
-            },
-            ensure_ascii=False,
-            indent=2,
+            }
         )
     else:
-        return json.dumps(
+        return to_json(
             {
                 "results": [],
                 "message": "No news results found",
                 "error": result.get("error"),
                 "errors": result.get("errors"),
-            },
-            ensure_ascii=False,
+            }
         )
 
 
@@ -242,12 +447,9 @@ def clear_search_cache() -> str:
     """
     try:
         search_manager.cache.clear()
-        return json.dumps(
-            {"success": True, "message": "Search cache cleared successfully"},
-            indent=2,
-        )
+        return to_json({"success": True, "message": "Search cache cleared successfully"})
     except Exception as e:
-        return json.dumps({"success": False, "error": str(e)})
+        return to_json({"success": False, "error": str(e)})
 
 
 @tool_handler
@@ -260,7 +462,7 @@ def get_search_stats() -> str:
     """
     try:
         cache_stats = search_manager.cache.get_stats()
-        return json.dumps(
+        return to_json(
             {
                 "success": True,
                 "cache": cache_stats,
@@ -268,15 +470,14 @@ def get_search_stats() -> str:
                     "max_requests": search_manager.rate_limiter.max_requests,
                     "window_seconds": search_manager.rate_limiter.window_seconds,
                 },
-            },
-            indent=2,
+            }
         )
     except Exception as e:
-        return json.dumps({"success": False, "error": str(e)})
+        return to_json({"success": False, "error": str(e)})
 
 
-@tool_handler
-def fetch_webpage(url: str, timeout: int = 10) -> str:
+@tool_handler(streaming=True)
+def fetch_webpage(url: str, timeout: int = 10) -> Iterator[str]:
     """
     Fetch the HTML content of a webpage.
 
@@ -285,82 +486,169 @@ def fetch_webpage(url: str, timeout: int = 10) -> str:
         timeout: Request timeout in seconds (default: 10)
 
     Returns:
-        HTML content of the webpage
+        HTML content of the webpage (large pages are returned in pages)
     """
+    if not _validate_url(url):
+        raise ValidationError(f"Invalid URL: {url}")
+
     try:
-        result: str = _fetch_webpage_helper(url, timeout)
-        return result
-    except Exception as e:
+        with _open_webpage(url, timeout) as response:
+            if response.encoding is None:
+                # Same fallback as response.text
+                response.encoding = response.apparent_encoding
+            body = fetcher.iter_body(url, response, CHUNK_SIZE, headers=_FETCH_HEADERS)
+            yield from _decode_chunks(body, response.encoding)
+
+    except requests.RequestException as e:
         logger.error(f"fetch_webpage tool failed: {e}")
-        raise
+        raise NetworkError(f"Failed to fetch webpage: {e}") from e
 
 
 @tool_handler
-def fetch_webpage_text(url: str, timeout: int = 10) -> str:
+def fetch_webpage_text(url: str, timeout: int = 10, max_chars: Optional[int] = None) -> str:
     """
     Fetch and extract clean text content from a webpage.
 
+    With max_chars, the page is parsed as it downloads and the download stops
+    once enough text has been extracted.
+
     Args:
         url: URL of the webpage to fetch
         timeout: Request timeout in seconds (default: 10)
+        max_chars: Return at most this many characters (default: the whole text)
 
     Returns:
         Clean text content extracted from the webpage
     """
+    if max_chars is not None:
+        if max_chars <= 0:
+            raise ValidationError("max_chars must be positive")
+        if not _validate_url(url):
+            raise ValidationError(f"Invalid URL: {url}")
+
     try:
+        if max_chars is not None:
+            return _stream_page_text(url, timeout, max_chars)
         html = _fetch_webpage_helper(url, timeout)
-        soup = BeautifulSoup(html, "lxml")
+        return _html_to_text(html)
 
-        # Remove script and style elements
-        for script in soup(["script", "style", "nav", "footer", "header"]):
-            script.decompose()
+    except Exception as e:
+        logger.error(f"Failed to extract text from {url}: {e}")
+        raise NetworkError(f"Failed to extract text: {e}") from e
 
-        # Get text
-        text = soup.get_text()
 
-        # Clean up whitespace
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        text = "\n".join(chunk for chunk in chunks if chunk)
+@tool_handler(streaming=True)
+def fetch_webpages_batch(
+    urls: List[str],
+    timeout: int = 10,
+    max_concurrent: int = 8,
+    extract_text: bool = True,
+    deadline: int = 120,
+) -> Iterator[str]:
+    """
+    Fetch many webpages concurrently, reporting each page as soon as it is fetched.
 
-        return text
+    Duplicate URLs are fetched once, and pages that redirect to an already
+    fetched page are reported as duplicates instead of repeating their content.
 
+    Args:
+        urls: URLs of the webpages to fetch (max: 500)
+        timeout: Request timeout in seconds for each page (default: 10)
+        max_concurrent: Maximum pages fetched at once (default: 8, max: 32)
+        extract_text: Return clean text instead of HTML (default: True)
+        deadline: Seconds for the whole batch; pages not fetched by then are
+            reported as timed out (default: 120)
+
+    Returns:
+        JSON string with ``results`` in completion order (url, final_url,
+        status_code and content, duplicate_of, or error), then count,
+        succeeded, duplicates and failed (large results are returned in pages)
+    """
+    if len(urls) > MAX_BATCH_URLS:
+        raise ValidationError(f"Too many URLs: {len(urls)} (max: {MAX_BATCH_URLS})")
+    max_concurrent = max(1, min(max_concurrent, 32))
+
+    unique_urls = list(dict.fromkeys(urls))
+    valid_urls = [url for url in unique_urls if _validate_url(url)]
+    invalid_urls = set(unique_urls).difference(valid_urls)
+    stats = {"count": len(unique_urls), "succeeded": 0, "duplicates": 0, "failed": 0}
+
+    def results() -> Iterator[Dict[str, Any]]:
+        for url in unique_urls:
+            if url in invalid_urls:
+                stats["failed"] += 1
+                yield {"url": url, "error": f"Invalid URL: {url}"}
+
+        seen: Dict[str, str] = {}
+        pages = fetcher.fetch_all(
+            valid_urls,
+            max_concurrent,
+            deadline=max(1, deadline),
+            fetch_func=_fetch_batch_page,
+            timeout=timeout,
+            extract_text=extract_text,
+        )
+        for page in pages:
+            final_url = page.get("final_url")
+            if final_url is not None and final_url in seen:
+                stats["duplicates"] += 1
+                page.pop("content", None)
+                page["duplicate_of"] = seen[final_url]
+            elif "error" in page:
+                stats["failed"] += 1
+            else:
+                stats["succeeded"] += 1
+                if final_url is not None:
+                    seen[final_url] = page["url"]
+            yield page
+
+    def fields() -> Iterator[Tuple[str, Any]]:
+        yield "results", StreamedArray(results())
+        yield from stats.items()
+
+    yield from iter_json_object(fields())
+
+
+def _fetch_batch_page(url: str, timeout: float, extract_text: bool) -> Dict[str, Any]:
+    """Fetch one page of a batch; errors are reported in the result."""
+    try:
+        response = _fetch_webpage_response(url, timeout)
+        content = _html_to_text(response.text) if extract_text else response.text
+        return {
+            "url": url,
+            "final_url": response.url,
+            "status_code": response.status_code,
+            "content": content,
+        }
+    except requests.HTTPError as e:
+        return {
+            "url": url,
+            "final_url": e.response.url,
+            "status_code": e.response.status_code,
+            "error": f"HTTP {e.response.status_code} {e.response.reason}",
+        }
     except Exception as e:
-        logger.error(f"Failed to extract text from {url}: {e}")
-        raise NetworkError(f"Failed to extract text: {e}") from e
+        return {"url": url, "error": str(e)}
 
 
 @tool_handler
-def parse_html(html: str, selector: str) -> str:
+def parse_html(html: str, selector: str, engine: str = "auto") -> str:
     """
     Parse HTML and extract elements using CSS selector.
 
     Args:
         html: HTML content to parse
         selector: CSS selector to find elements
+        engine: HTML engine: "lxml" (fast, needs cssselect for selectors), "bs4"
+            (BeautifulSoup) or "auto" (lxml when available; default)
 
     Returns:
         JSON string containing matched elements' text content
     """
     try:
-        soup = BeautifulSoup(html, "lxml")
-        elements = soup.select(selector)
-
-        results = []
-        for elem in elements:
-            results.append(
-                {
-                    "tag": elem.name,
-                    "text": elem.get_text(strip=True),
-                    "attributes": dict(elem.attrs),
-                }
-            )
-
-        return json.dumps(
-            {"selector": selector, "count": len(results), "elements": results},
-            ensure_ascii=False,
-            indent=2,
-        )
+        doc = parse_document(html, _resolve_engine(engine, selectors=True))
+        results = _select_elements(doc, selector)
+        return to_json({"selector": selector, "count": len(results), "elements": results})
 
     except Exception as e:
         logger.error(f"HTML parsing failed: {e}")
@@ -368,38 +656,61 @@ def parse_html(html: str, selector: str) -> str:
 
 
 @tool_handler
-def download_file(url: str, save_path: str, timeout: int = 30) -> str:
+def download_file(
+    url: str,
+    save_path: str,
+    timeout: int = 30,
+    connections: int = downloader.DEFAULT_CONNECTIONS,
+    resume: bool = True,
+    checksum: Optional[str] = None,
+) -> str:
     """
     Download a file from URL and save to disk.
 
+    Large files are downloaded over several connections when the server supports
+    range requests. A failed or interrupted download leaves ``<save_path>.part``
+    behind, and calling the tool again with the same save_path resumes it.
+
     Args:
         url: URL of the file to download
         save_path: Local path where file should be saved
         timeout: Request timeout in seconds (default: 30)
+        connections: Parallel connections for large files (1-16, default: 4)
+        resume: Continue an earlier partial download of save_path (default: True)
+        checksum: Expected hash, as "sha256:<hex digest>" (other hashlib algorithms
+            work too; a bare hex digest is matched to MD5/SHA-1/SHA-256/SHA-512 by length)
 
     Returns:
         Success message with file path and size
     """
     if not _validate_url(url):
         raise ValidationError(f"Invalid URL: {url}")
+    if not 1 <= connections <= downloader.MAX_CONNECTIONS:
+        raise ValidationError(f"connections must be between 1 and {downloader.MAX_CONNECTIONS}")
+    expected = downloader.parse_checksum(checksum) if checksum else None
 
     try:
         path = sanitize_path(save_path)
         path.parent.mkdir(parents=True, exist_ok=True)
 
-        headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
-
-        response = requests.get(url, headers=headers, timeout=timeout, stream=True)
-        response.raise_for_status()
-
-        with open(path, "wb") as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
-
-        file_size = path.stat().st_size
+        result = downloader.download(
+            url,
+            path,
+            timeout=timeout,
+            connections=connections,
+            resume=resume,
+            checksum=expected,
+            progress=lambda done, total: report_progress(
+                done, total, f"download_file: {format_bytes(done)}"
+            ),
+        )
 
-        return f"File downloaded successfully to {save_path} ({format_bytes(file_size)})"
+        details = [format_bytes(result["size"])]
+        if result["resumed_bytes"]:
+            details.append(f"resumed after {format_bytes(result['resumed_bytes'])}")
+        if result["checksum"]:
+            details.append(f"{result['checksum'].split(':')[0]} verified")
+        return f"File downloaded successfully to {save_path} ({', '.join(details)})"
 
     except Exception as e:
         logger.error(f"File download failed: {e}")
@@ -420,14 +731,8 @@ def get_page_title(url: str, timeout: int = 10) -> str:
     """
     try:
         html = _fetch_webpage_helper(url, timeout)
-        soup = BeautifulSoup(html, "lxml")
-
-        title = soup.find("title")
-        if title:
-            text: str = title.get_text(strip=True)
-            return text
-
-        return "No title found"
+        title = _page_title(parse_document(html, _resolve_engine("auto")))
+        return title if title is not None else "No title found"
 
     except Exception as e:
         logger.error(f"Failed to get page title: {e}")
@@ -435,7 +740,7 @@ def get_page_title(url: str, timeout: int = 10) -> str:
 
 
 @tool_handler
-def get_page_links(url: str, timeout: int = 10, absolute: bool = True) -> str:
+def get_page_links(url: str, timeout: int = 10, absolute: bool = True, engine: str = "auto") -> str:
     """
     Extract all links from a webpage.
 
@@ -443,36 +748,71 @@ def get_page_links(url: str, timeout: int = 10, absolute: bool = True) -> str:
         url: URL of the webpage
         timeout: Request timeout in seconds (default: 10)
         absolute: Convert relative URLs to absolute (default: True)
+        engine: HTML engine: "lxml" (fast), "bs4" (BeautifulSoup) or "auto" (default)
 
     Returns:
         JSON string containing list of links
     """
     try:
         html = _fetch_webpage_helper(url, timeout)
-        soup = BeautifulSoup(html, "lxml")
+        links = _page_links(parse_document(html, _resolve_engine(engine)), url, absolute)
+        return to_json({"source_url": url, "count": len(links), "links": links})
 
-        links = []
-        for a_tag in soup.find_all("a", href=True):
-            href = a_tag["href"]
+    except Exception as e:
+        logger.error(f"Failed to extract links: {e}")
+        return f'{{"error": "Failed to extract links: {str(e)}"}}'
 
-            if (
-                absolute
-                and isinstance(href, str)
-                and not href.startswith(("http://", "https://", "//"))
-            ):
-                href = urljoin(url, href)
 
-            links.append({"url": str(href), "text": a_tag.get_text(strip=True)})
+@tool_handler
+def extract_page(
+    url: str,
+    selectors: Optional[List[str]] = None,
+    include_text: bool = True,
+    absolute: bool = True,
+    timeout: int = 10,
+    engine: str = "auto",
+) -> str:
+    """
+    Extract title, links, clean text and CSS selector matches from a webpage in one pass.
 
-        return json.dumps(
-            {"source_url": url, "count": len(links), "links": links},
-            ensure_ascii=False,
-            indent=2,
-        )
+    The page is fetched and parsed once; prefer this over calling get_page_title,
+    get_page_links, fetch_webpage_text and parse_html on the same page.
 
-    except Exception as e:
-        logger.error(f"Failed to extract links: {e}")
-        return f'{{"error": "Failed to extract links: {str(e)}"}}'
+    Args:
+        url: URL of the webpage
+        selectors: CSS selectors whose matching elements to extract (default: none)
+        include_text: Include the clean text content (default: True)
+        absolute: Convert relative link URLs to absolute (default: True)
+        timeout: Request timeout in seconds (default: 10)
+        engine: HTML engine: "lxml" (fast, needs cssselect for selectors), "bs4"
+            (BeautifulSoup) or "auto" (lxml when available; default)
+
+    Returns:
+        JSON string with title, links, text and, per selector, the matched elements
+    """
+    doc_engine = _resolve_engine(engine, selectors=bool(selectors))
+    html = _fetch_webpage_helper(url, timeout)
+    doc = parse_document(html, doc_engine)
+
+    links = _page_links(doc, url, absolute)
+    result: Dict[str, Any] = {
+        "url": url,
+        "title": _page_title(doc),
+        "link_count": len(links),
+        "links": links,
+    }
+    if include_text:
+        result["text"] = _page_text(doc)
+    if selectors:
+        matches: Dict[str, Any] = {}
+        for selector in selectors:
+            try:
+                elements = _select_elements(doc, selector)
+                matches[selector] = {"count": len(elements), "elements": elements}
+            except Exception as e:
+                matches[selector] = {"error": f"Invalid selector: {e}"}
+        result["selectors"] = matches
+    return to_json(result)
 
 
 @tool_handler
@@ -492,17 +832,18 @@ def check_url_status(url: str, timeout: int = 10) -> str:
 
     try:
         headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
-        response = requests.head(url, headers=headers, timeout=timeout, allow_redirects=True)
+        response = fetcher.request(
+            "HEAD", url, headers=headers, timeout=timeout, allow_redirects=True
+        )
 
-        return json.dumps(
+        return to_json(
             {
                 "url": url,
                 "status_code": response.status_code,
                 "status_text": response.reason,
                 "accessible": response.status_code < 400,
                 "final_url": response.url if response.url != url else None,
-            },
-            indent=2,
+            }
         )
 
     except requests.RequestException as e:
@@ -510,6 +851,270 @@ def check_url_status(url: str, timeout: int = 10) -> str:
         return f'{{"error": "Status check failed: {str(e)}"}}'
 
 
+@tool_handler(streaming=True)
+def check_urls_batch(
+    urls: Union[List[str], str],
+    timeout: int = 10,
+    max_concurrent: int = 16,
+    per_host: int = 2,
+    deadline: int = 120,
+) -> Iterator[str]:
+    """
+    Check the HTTP status of many URLs concurrently, reporting each as soon as it is checked.
+
+    Each URL gets a HEAD request; if the server rejects HEAD, a GET for the first
+    byte is sent instead. Requests are spread across hosts, with at most
+    per_host requests to one host at a time.
+
+    Args:
+        urls: URLs to check (max: 500), or the JSON returned by get_page_links
+            (its links are checked)
+        timeout: Request timeout in seconds for each URL (default: 10)
+        max_concurrent: Maximum URLs checked at once (default: 16, max: 64)
+        per_host: Maximum URLs of one host checked at once (default: 2, max: 6)
+        deadline: Seconds for the whole batch; URLs not checked by then are
+            reported as timed out (default: 120)
+
+    Returns:
+        JSON string with ``results`` in completion order (url, status_code,
+        status_text, accessible, method, final_url if redirected, or error),
+        then count, accessible, broken and failed (large results are returned in pages)
+    """
+    if isinstance(urls, str):
+        urls = _parse_url_list(urls)
+    if len(urls) > MAX_BATCH_URLS:
+        raise ValidationError(f"Too many URLs: {len(urls)} (max: {MAX_BATCH_URLS})")
+    max_concurrent = max(1, min(max_concurrent, 64))
+    limits = fetcher.HostLimits(max(1, min(per_host, fetcher.host_limits.per_host)))
+
+    unique_urls = list(dict.fromkeys(urls))
+    valid_urls = [url for url in unique_urls if _validate_url(url)]
+    invalid_urls = set(unique_urls).difference(valid_urls)
+    stats = {"count": len(unique_urls), "accessible": 0, "broken": 0, "failed": 0}
+
+    def results() -> Iterator[Dict[str, Any]]:
+        for url in unique_urls:
+            if url in invalid_urls:
+                stats["failed"] += 1
+                yield {"url": url, "error": f"Invalid URL: {url}"}
+
+        checks = fetcher.fetch_all(
+            _interleave_hosts(valid_urls),
+            max_concurrent,
+            deadline=max(1, deadline),
+            fetch_func=_check_batch_url,
+            timeout=timeout,
+            limits=limits,
+            slot_timeout=max(1, deadline),
+        )
+        for check in checks:
+            if "error" in check:
+                stats["failed"] += 1
+            elif check["accessible"]:
+                stats["accessible"] += 1
+            else:
+                stats["broken"] += 1
+            yield check
+
+    def fields() -> Iterator[Tuple[str, Any]]:
+        yield "results", StreamedArray(results())
+        yield from stats.items()
+
+    yield from iter_json_object(fields())
+
+
+def _parse_url_list(text: str) -> List[str]:
+    """Helper function to read URLs from get_page_links output, a JSON list or one URL per line."""
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        return [line.strip() for line in text.splitlines() if line.strip()]
+    if isinstance(data, dict):
+        if "links" not in data:
+            raise ValidationError("Expected a list of URLs or the output of get_page_links")
+        data = data["links"]
+    if not isinstance(data, list):
+        raise ValidationError("Expected a list of URLs or the output of get_page_links")
+    return [str(item["url"]) if isinstance(item, dict) else str(item) for item in data]
+
+
+def _interleave_hosts(urls: List[str]) -> List[str]:
+    """Helper function to order URLs round-robin by host, so one host does not hold up a batch."""
+    by_host: Dict[str, List[str]] = {}
+    for url in urls:
+        by_host.setdefault(host_of(url), []).append(url)
+    return [url for group in zip_longest(*by_host.values()) for url in group if url is not None]
+
+
+def _check_batch_url(
+    url: str, timeout: float, limits: fetcher.HostLimits, slot_timeout: float
+) -> Dict[str, Any]:
+    """Check one URL of a batch with HEAD, then a ranged GET if HEAD is rejected."""
+    start = time.monotonic()
+    method = "HEAD"
+    try:
+        with limits.slot(url, timeout=slot_timeout):
+            try:
+                response = fetcher.request("HEAD", url, timeout=timeout, allow_redirects=True)
+                fallback = response.status_code in _HEAD_REJECTED_STATUSES
+            except (requests.ConnectionError, requests.exceptions.ChunkedEncodingError):
+                fallback = True  # some servers drop HEAD requests
+            if fallback:
+                method = "GET"
+                headers = {**_FETCH_HEADERS, "Range": "bytes=0-0"}
+                with fetcher.request(
+                    "GET", url, timeout=timeout, headers=headers, stream=True, allow_redirects=True
+                ) as response:
+                    if response.status_code == 206:
+                        _ = response.content  # one byte; keeps the connection reusable
+
+        result: Dict[str, Any] = {
+            "url": url,
+            "status_code": response.status_code,
+            "status_text": response.reason,
+            "accessible": response.status_code < 400,
+            "method": method,
+        }
+        if response.url != url:
+            result["final_url"] = response.url
+    except Exception as e:
+        result = {"url": url, "method": method, "error": str(e)}
+    result["elapsed"] = round(time.monotonic() - start, 3)
+    return result
+
+
+@tool_handler(streaming=True)
+def crawl_site(
+    start_url: str,
+    max_pages: int = 50,
+    max_depth: int = 2,
+    max_concurrent: int = 4,
+    delay: float = 0.5,
+    same_host: bool = True,
+    url_pattern: Optional[str] = None,
+    priority_keywords: Optional[List[str]] = None,
+    include_text: bool = False,
+    max_chars: int = 2000,
+    respect_robots: bool = True,
+    checkpoint: Optional[str] = None,
+    timeout: int = 10,
+    deadline: int = 300,
+) -> Iterator[str]:
+    """
+    Crawl a website breadth-first from a start page, reporting each page as soon as it is fetched.
+
+    Links are followed up to max_depth hops and max_pages pages. URLs are
+    normalized so each page is fetched once, robots.txt is honoured, and
+    requests to one host are spaced by delay seconds (or the site's
+    Crawl-delay). With a checkpoint file, a crawl that stops at its deadline or
+    page budget can be continued by calling again with the same start_url and
+    checkpoint (and a larger max_pages).
+
+    Args:
+        start_url: URL of the first page
+        max_pages: Pages to crawl, including those of earlier calls with the
+            same checkpoint (default: 50, max: 1000)
+        max_depth: Link hops from the start page (default: 2)
+        max_concurrent: Maximum pages fetched at once (default: 4, max: 16)
+        delay: Minimum seconds between requests to one host (default: 0.5)
+        same_host: Only follow links to the start page's host (default: True)
+        url_pattern: Regular expression that followed URLs must match (default: none)
+        priority_keywords: Words that move links whose URL or text contains them
+            ahead in the queue (default: none)
+        include_text: Include each page's clean text (default: False)
+        max_chars: Maximum characters of text per page (default: 2000)
+        respect_robots: Skip pages disallowed by robots.txt (default: True)
+        checkpoint: File saving the crawl state, for resuming (default: none)
+        timeout: Request timeout in seconds for each page (default: 10)
+        deadline: Seconds for this call (default: 300)
+
+    Returns:
+        JSON string with ``results`` in completion order (url, final_url,
+        status_code, title, depth, link_count, new_links and text, or error, or
+        skipped), then pages, failed, skipped, queued, crawled (including
+        earlier calls), resumed and stopped ("done", "max_pages" or "deadline")
+    """
+    if not _validate_url(start_url):
+        raise ValidationError(f"Invalid URL: {start_url}")
+    if not 1 <= max_pages <= MAX_CRAWL_PAGES:
+        raise ValidationError(f"max_pages must be between 1 and {MAX_CRAWL_PAGES}")
+    if max_depth < 0:
+        raise ValidationError("max_depth must not be negative")
+
+    def fetch_page(url: str) -> Dict[str, Any]:
+        return _fetch_crawl_page(url, timeout, include_text, max_chars)
+
+    try:
+        site_crawler = crawler.Crawler(
+            start_url,
+            fetch_page,
+            max_pages=max_pages,
+            max_depth=max_depth,
+            max_concurrent=max(1, min(max_concurrent, 16)),
+            delay=max(0.0, delay),
+            same_host=same_host,
+            url_pattern=url_pattern,
+            priority_keywords=priority_keywords,
+            respect_robots=respect_robots,
+            checkpoint=sanitize_path(checkpoint) if checkpoint else None,
+            timeout=timeout,
+        )
+    except ValueError as e:
+        raise ValidationError(str(e)) from e
+    except re.error as e:
+        raise ValidationError(f"Invalid url_pattern: {e}") from e
+
+    def results() -> Iterator[Dict[str, Any]]:
+        for page in site_crawler.run(deadline=max(1, deadline)):
+            report_progress(site_crawler.crawled, max_pages, page["url"])
+            yield page
+
+    def fields() -> Iterator[Tuple[str, Any]]:
+        yield "results", StreamedArray(results())
+        yield from site_crawler.stats.items()
+        yield "queued", len(site_crawler.frontier)
+        yield "crawled", site_crawler.crawled
+        yield "resumed", site_crawler.resumed
+        yield "stopped", site_crawler.stopped
+
+    yield from iter_json_object(fields())
+
+
+def _fetch_crawl_page(
+    url: str, timeout: float, include_text: bool, max_chars: int
+) -> Dict[str, Any]:
+    """Fetch and parse one page of a crawl; errors are reported in the result."""
+    try:
+        response = _fetch_webpage_response(url, timeout)
+    except requests.HTTPError as e:
+        return {
+            "url": url,
+            "final_url": e.response.url,
+            "status_code": e.response.status_code,
+            "error": f"HTTP {e.response.status_code} {e.response.reason}",
+        }
+    except Exception as e:
+        return {"url": url, "error": str(e)}
+
+    page: Dict[str, Any] = {
+        "url": url,
+        "final_url": response.url,
+        "status_code": response.status_code,
+    }
+    content_type = response.headers.get("Content-Type", "text/html")
+    if "html" not in content_type:
+        page["content_type"] = content_type
+        return page
+
+    doc = parse_document(response.text, _resolve_engine("auto"))
+    # Relative links resolve against the page's URL after redirects
+    links = _page_links(doc, response.url)
+    page.update(title=_page_title(doc), link_count=len(links), links=links)
+    if include_text:
+        page["text"] = _page_text(doc)[:max_chars]
+    return page
+
+
 @tool_handler
 def get_headers(url: str, timeout: int = 10) -> str:
     """
@@ -527,15 +1132,16 @@ def get_headers(url: str, timeout: int = 10) -> str:
 
     try:
         headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
-        response = requests.head(url, headers=headers, timeout=timeout, allow_redirects=True)
+        response = fetcher.request(
+            "HEAD", url, headers=headers, timeout=timeout, allow_redirects=True
+        )
 
-        return json.dumps(
+        return to_json(
             {
                 "url": url,
                 "status_code": response.status_code,
                 "headers": dict(response.headers),
-            },
-            indent=2,
+            }
         )
 
     except requests.RequestException as e:
@@ -570,10 +1176,10 @@ def validate_url_format(url: str) -> str:
     else:
         result["error"] = "Invalid URL format"
 
-    return json.dumps(result, indent=2)
+    return to_json(result)
 
 
-@tool_handler
+@tool_handler(cacheable=True)
 def parse_url_components(url: str) -> str:
     """
     Parse a URL and extract its components.
@@ -587,7 +1193,7 @@ def parse_url_components(url: str) -> str:
     try:
         parsed = urlparse(url)
 
-        return json.dumps(
+        return to_json(
             {
                 "original": url,
                 "scheme": parsed.scheme,
@@ -600,14 +1206,73 @@ def parse_url_components(url: str) -> str:
                 "fragment": parsed.fragment,
                 "username": parsed.username,
                 "password": "***" if parsed.password else None,
-            },
-            indent=2,
+            }
         )
 
     except Exception as e:
         return f'{{"error": "Failed to parse URL: {str(e)}"}}'
 
 
+def _read_limited(
+    response: requests.Response, max_bytes: int, out: Optional[IO[bytes]] = None
+) -> Tuple[bytes, int]:
+    """
+    Helper function to read a streamed response body, stopping at a size limit.
+
+    Args:
+        response: Response from a request with stream=True
+        max_bytes: Largest body accepted
+        out: File the body is written to instead of being returned
+
+    Returns:
+        (body, or b"" if written to out; body size)
+
+    Raises:
+        ValidationError: If the body is larger than max_bytes
+    """
+    length = response.headers.get("Content-Length", "")
+    if length.isdigit() and int(length) > max_bytes:
+        raise ValidationError(f"Response too large: {length} bytes (limit: {max_bytes})")
+
+    parts: List[bytes] = []
+    size = 0
+    for chunk in response.iter_content(CHUNK_SIZE):
+        check_deadline()
+        size += len(chunk)
+        if size > max_bytes:
+            raise ValidationError(f"Response too large: over {max_bytes} bytes")
+        if out is None:
+            parts.append(chunk)
+        else:
+            out.write(chunk)
+    return b"".join(parts), size
+
+
+def _decode_body(body: bytes, encoding: Optional[str]) -> str:
+    """Helper function to decode a response body, like response.text does."""
+    if encoding is None:
+        # The detector response.apparent_encoding uses
+        detect = requests.compat.chardet.detect  # type: ignore[attr-defined]
+        encoding = detect(body)["encoding"] or "utf-8"
+    try:
+        return str(body, encoding, errors="replace")
+    except LookupError:
+        return str(body, errors="replace")
+
+
+def _spool_file() -> IO[bytes]:
+    """Helper function to open a new file for a response body, removing expired ones."""
+    SPOOL_DIR.mkdir(parents=True, exist_ok=True)
+    expired = time.time() - SPOOL_TTL
+    for old in SPOOL_DIR.glob("response-*"):
+        try:
+            if old.stat().st_mtime < expired:
+                old.unlink()
+        except OSError:
+            pass
+    return tempfile.NamedTemporaryFile(dir=SPOOL_DIR, prefix="response-", delete=False)
+
+
 @tool_handler
 def http_request(
     url: str,
@@ -615,16 +1280,29 @@ def http_request(
     headers: str = "{}",
     body: Optional[str] = None,
     timeout: int = 10,
+    max_bytes: Optional[int] = None,
+    save_to_file: bool = False,
+    byte_range: Optional[str] = None,
 ) -> str:
     """
     Make HTTP request with custom headers and body.
 
+    The response body is read as it arrives and the request fails as soon as it
+    exceeds max_bytes. Large bodies can be saved to a temporary file instead of
+    being returned (files are removed after an hour).
+
     Args:
         url: Target URL
         method: HTTP method (GET, POST, PUT, DELETE, PATCH)
         headers: JSON string of headers
         body: Request body (for POST/PUT/PATCH)
         timeout: Request timeout in seconds (default: 10)
+        max_bytes: Largest response body to read (default and maximum: 10 MB, or
+            1 GB with save_to_file)
+        save_to_file: Save the body to a temporary file and return its path as
+            body_file instead of returning the body
+        byte_range: Request part of the body, as bytes in a Range header: "0-1023"
+            (first KB), "1024-" (from byte 1024) or "-1024" (last KB)
 
     Returns:
         JSON string with status, headers, and body
@@ -645,53 +1323,74 @@ def http_request(
         if method not in ["GET", "POST", "PUT", "DELETE", "PATCH", "HEAD"]:
             raise ValidationError(f"Unsupported method: {method}")
 
-        # 发送请求
-        response = requests.request(
+        # 限制响应大小
+        size_limit = MAX_SPOOL_SIZE if save_to_file else MAX_RESPONSE_SIZE
+        if max_bytes is None:
+            max_bytes = size_limit
+        elif not 0 < max_bytes <= size_limit:
+            raise ValidationError(
+                f"max_bytes must be between 1 and {size_limit}"
+                + ("" if save_to_file else " (use save_to_file for larger bodies)")
+            )
+
+        if byte_range is not None:
+            byte_range = byte_range.strip().removeprefix("bytes=")
+            if not _BYTE_RANGE.fullmatch(byte_range):
+                raise ValidationError(f"Invalid byte range: {byte_range}")
+            headers_dict["Range"] = f"bytes={byte_range}"
+
+        # 发送请求，边读边检查大小
+        with fetcher.request(
             method=method,
             url=url,
             headers=headers_dict,
             data=body,
             timeout=timeout,
             allow_redirects=True,
-        )
-
-        # 限制响应大小
-        MAX_RESPONSE_SIZE = 10 * 1024 * 1024  # 10MB
-        if len(response.content) > MAX_RESPONSE_SIZE:
-            return json.dumps({"error": f"Response too large: {len(response.content)} bytes"})
-
-        # 过滤敏感头
-        safe_headers = {
-            k: v
-            for k, v in response.headers.items()
-            if k.lower() not in ["authorization", "cookie", "set-cookie"]
-        }
-
-        logger.info(f"HTTP {method} request to {url}: {response.status_code}")
-
-        return json.dumps(
-            {
+            stream=True,
+        ) as response:
+            result: Dict[str, Any] = {
                 "success": True,
                 "status_code": response.status_code,
                 "status_text": response.reason,
-                "headers": dict(safe_headers),
-                "body": response.text,
-                "size": len(response.content),
-                "url": response.url,  # 最终 URL（处理重定向）
-            },
-            indent=2,
-            ensure_ascii=False,
-        )
+                # 过滤敏感头
+                "headers": {
+                    k: v
+                    for k, v in response.headers.items()
+                    if k.lower() not in ["authorization", "cookie", "set-cookie"]
+                },
+            }
+            if response.status_code == 206:
+                result["content_range"] = response.headers.get("Content-Range")
+
+            if save_to_file:
+                with _spool_file() as out:
+                    try:
+                        _, size = _read_limited(response, max_bytes, out)
+                    except Exception:
+                        out.close()
+                        Path(out.name).unlink(missing_ok=True)
+                        raise
+                result["body_file"] = out.name
+            else:
+                content, size = _read_limited(response, max_bytes)
+                result["body"] = _decode_body(content, response.encoding)
+
+        hot_logger.info(f"HTTP {method} request to {url}: {response.status_code}")
+
+        result["size"] = size
+        result["url"] = response.url  # 最终 URL（处理重定向）
+        return to_json(result)
 
     except requests.RequestException as e:
         logger.error(f"HTTP request failed: {e}")
-        return json.dumps({"error": f"Request failed: {str(e)}"})
+        return to_json({"error": f"Request failed: {str(e)}"})
     except ValidationError as e:
         logger.error(f"Validation error: {e}")
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
 
 
 @tool_handler
@@ -736,14 +1435,11 @@ def get_network_info() -> str:
 
         logger.info(f"Retrieved network info for {len(interfaces)} interfaces")
 
-        return json.dumps(
-            {"success": True, "interfaces": interfaces, "count": len(interfaces)},
-            indent=2,
-        )
+        return to_json({"success": True, "interfaces": interfaces, "count": len(interfaces)})
 
     except Exception as e:
         logger.error(f"Failed to get network info: {e}")
-        return json.dumps({"error": str(e)})
+        return to_json({"error": str(e)})
 
 
 @tool_handler
@@ -751,55 +1447,87 @@ def dns_lookup(hostname: str, record_type: str = "A") -> str:
     """
     Perform DNS lookup.
 
+    Answers are cached for their TTL.
+
     Args:
-        hostname: Hostname or domain name
-        record_type: DNS record type - A, AAAA, MX, NS, TXT (default: A)
+        hostname: Hostname or domain name (or an IP address for PTR lookups)
+        record_type: DNS record type - A, AAAA, CNAME, MX, NS, TXT, SOA, SRV, CAA,
+            PTR (default: A)
 
     Returns:
         JSON string with DNS records
     """
-    import socket
-
     try:
-        record_type = record_type.upper()
-        results = []
+        answer = get_resolver().resolve(hostname, record_type)
+        if answer.rcode == "NXDOMAIN":
+            return to_json({"error": f"DNS lookup failed: {hostname} does not exist (NXDOMAIN)"})
 
-        if record_type == "A":
-            # IPv4 addresses
-            try:
-                addrs = socket.getaddrinfo(hostname, None, socket.AF_INET)
-                results = list(set(addr[4][0] for addr in addrs))
-            except socket.gaierror as e:
-                return json.dumps({"error": f"DNS lookup failed: {e}"})
+        hot_logger.info(
+            f"DNS lookup for {hostname} ({answer.record_type}): {len(answer.records)} records"
+        )
 
-        elif record_type == "AAAA":
-            # IPv6 addresses
-            try:
-                addrs = socket.getaddrinfo(hostname, None, socket.AF_INET6)
-                results = list(set(addr[4][0] for addr in addrs))
-            except socket.gaierror as e:
-                return json.dumps({"error": f"DNS lookup failed: {e}"})
+        return to_json({"success": True, **answer.to_dict(), "hostname": hostname})
 
-        else:
-            return json.dumps(
-                {
-                    "error": f"Record type {record_type} not supported. Use A or AAAA. For MX/NS/TXT, use specialized DNS tools."
-                }
-            )
+    except ValidationError as e:
+        return to_json({"error": str(e)})
+    except NetworkError as e:
+        return to_json({"error": f"DNS lookup failed: {e}"})
+    except Exception as e:
+        logger.error(f"DNS lookup failed: {e}")
+        return to_json({"error": str(e)})
 
-        logger.info(f"DNS lookup for {hostname} ({record_type}): {len(results)} records")
 
-        return json.dumps(
-            {
-                "success": True,
-                "hostname": hostname,
-                "record_type": record_type,
-                "records": results,
-                "count": len(results),
-            },
-            indent=2,
+@tool_handler
+def dns_lookup_batch(hostnames: List[str], record_type: str = "A", max_concurrent: int = 64) -> str:
+    """
+    Look up DNS records of many hostnames concurrently.
+
+    Cached answers are returned without a query; the other names are queried
+    in parallel.
+
+    Args:
+        hostnames: Hostnames or domain names (max: 1000)
+        record_type: DNS record type - A, AAAA, CNAME, MX, NS, TXT, SOA, SRV, CAA,
+            PTR (default: A)
+        max_concurrent: Maximum queries in flight (default: 64, max: 256)
+
+    Returns:
+        JSON string with ``results`` in the order of hostnames (records, ttl and
+        rcode, which is NXDOMAIN for names that do not exist, or error), then
+        count, succeeded and failed
+    """
+    if len(hostnames) > MAX_BATCH_HOSTNAMES:
+        raise ValidationError(f"Too many hostnames: {len(hostnames)} (max: {MAX_BATCH_HOSTNAMES})")
+    record_type_code(record_type)
+    max_concurrent = max(1, min(max_concurrent, 256))
+
+    unique = list(dict.fromkeys(hostnames))
+    errors: Dict[str, str] = {}
+    for hostname in unique:
+        try:
+            normalize_name(hostname, record_type.upper())
+        except ValidationError as e:
+            errors[hostname] = str(e)
+
+    valid = [hostname for hostname in unique if hostname not in errors]
+    answers = dict(zip(valid, get_resolver().resolve_many(valid, record_type, max_concurrent)))
+    results = [
+        (
+            {"hostname": hostname, "error": errors[hostname]}
+            if hostname in errors
+            else {**answers[hostname].to_dict(), "hostname": hostname}
         )
+        for hostname in unique
+    ]
+    failed = sum(1 for result in results if "error" in result)
 
-    except Exception as e:
-        logger.error(f"DNS lookup failed: {e}")
-        return json.dumps({"error": str(e)})
+    hot_logger.info(f"DNS batch lookup ({record_type}): {len(unique)} names, {failed} failed")
+
+    return to_json(
+        {
+            "results": results,
+            "count": len(results),
+            "succeeded": len(results) - failed,
+            "failed": failed,
+        }
+    )
@@ -0,0 +1,504 @@
+"""
+HTTP response cache shared by the web tools.
+
+Successful GET responses are kept in memory and on disk, keyed by URL and the
+request headers named in the response's Vary header. A fresh entry is served
+without contacting the server; a stale entry is revalidated with
+If-None-Match/If-Modified-Since, so an unchanged page costs a 304 instead of
+a full download. Freshness follows Cache-Control (max-age, no-cache,
+no-store) and Expires; responses without either are fresh for a short default
+period, which covers the common pattern of several tools reading the same page
+in a row.
+
+Both tiers are bounded and evict the least recently used entries.
+
+Limits can be configured with environment variables:
+    MCP_SERVER_HTTP_CACHE_BYTES       - Memory budget (default: 64 MB, 0 disables the cache)
+    MCP_SERVER_HTTP_CACHE_DIR         - Directory for the disk tier
+                                        (default: ~/.oh-my-mcp/http_cache, empty disables it)
+    MCP_SERVER_HTTP_CACHE_DISK_BYTES  - Disk budget (default: 256 MB)
+    MCP_SERVER_HTTP_CACHE_FRESHNESS   - Seconds a response without caching headers
+                                        stays fresh (default: 30)
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from mcp_server.tools.metrics import register_cache
+from mcp_server.utils import logger
+
+DEFAULT_MEMORY_BYTES = 64 * 1024 * 1024
+DEFAULT_DISK_BYTES = 256 * 1024 * 1024
+DEFAULT_FRESHNESS = 30.0
+
+# Response headers that are kept with a cached entry
+_KEPT_HEADERS = (
+    "Content-Type",
+    "Content-Language",
+    "Cache-Control",
+    "Expires",
+    "Date",
+    "ETag",
+    "Last-Modified",
+    "Vary",
+)
+
+
+class CacheEntry:
+    """A cached response."""
+
+    def __init__(
+        self,
+        url: str,
+        final_url: str,
+        status_code: int,
+        reason: str,
+        headers: Dict[str, str],
+        body: bytes,
+        vary: Dict[str, str],
+        fresh_until: float,
+    ):
+        self.url = url
+        self.final_url = final_url
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+        self.vary = vary
+        self.fresh_until = fresh_until
+
+    @property
+    def size(self) -> int:
+        """Approximate memory held by the entry."""
+        return len(self.body) + 512
+
+    def is_fresh(self) -> bool:
+        """Whether the entry can be served without revalidation."""
+        return time.time() < self.fresh_until
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers for revalidating the entry."""
+        headers = CaseInsensitiveDict(self.headers)
+        conditional = {}
+        if "ETag" in headers:
+            conditional["If-None-Match"] = headers["ETag"]
+        if "Last-Modified" in headers:
+            conditional["If-Modified-Since"] = headers["Last-Modified"]
+        return conditional
+
+    def to_response(self) -> requests.Response:
+        """Build a fully read requests.Response from the entry."""
+        response = requests.Response()
+        response.status_code = self.status_code
+        response.reason = self.reason
+        response.url = self.final_url
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.body
+        response._content_consumed = True  # type: ignore[attr-defined]
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.from_cache = True  # type: ignore[attr-defined]
+        return response
+
+    def to_bytes(self) -> bytes:
+        """Serialize the entry for the disk tier."""
+        meta = {
+            "url": self.url,
+            "final_url": self.final_url,
+            "status_code": self.status_code,
+            "reason": self.reason,
+            "headers": self.headers,
+            "vary": self.vary,
+            "fresh_until": self.fresh_until,
+        }
+        return json.dumps(meta).encode("utf-8") + b"\n" + self.body
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "CacheEntry":
+        """Deserialize an entry written by to_bytes()."""
+        meta_line, _, body = data.partition(b"\n")
+        meta = json.loads(meta_line)
+        return cls(body=body, **meta)
+
+
+def freshness_lifetime(headers: Mapping[str, str], default: float) -> Optional[float]:
+    """
+    Compute how long a response stays fresh.
+
+    Args:
+        headers: Response headers
+        default: Lifetime for responses without Cache-Control or Expires
+
+    Returns:
+        Seconds the response is fresh (0 to always revalidate), or None if it
+        must not be stored
+    """
+    directives = {}
+    for part in headers.get("Cache-Control", "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"')
+
+    if "no-store" in directives or headers.get("Vary", "").strip() == "*":
+        return None
+    if "no-cache" in directives:
+        return 0.0
+    if "max-age" in directives:
+        try:
+            return max(0.0, float(directives["max-age"]))
+        except ValueError:
+            return 0.0
+
+    expires = headers.get("Expires")
+    if expires:
+        try:
+            expires_at = parsedate_to_datetime(expires).timestamp()
+            date = headers.get("Date")
+            now = parsedate_to_datetime(date).timestamp() if date else time.time()
+            return max(0.0, expires_at - now)
+        except (TypeError, ValueError):
+            # Invalid dates mean "already expired"
+            return 0.0
+
+    return default
+
+
+class HttpCache:
+    """Two-tier (memory and disk) LRU cache of HTTP responses."""
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MEMORY_BYTES,
+        cache_dir: Optional[Path] = None,
+        max_disk_bytes: int = DEFAULT_DISK_BYTES,
+        default_freshness: float = DEFAULT_FRESHNESS,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Memory budget (0 disables caching)
+            cache_dir: Directory for the disk tier (None for memory only)
+            max_disk_bytes: Disk budget
+            default_freshness: Lifetime of responses without caching headers
+        """
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.default_freshness = default_freshness
+        self.cache_dir = cache_dir
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        # Vary names and number of memory entries by URL (pruned with the entries)
+        self._vary: Dict[str, List[str]] = {}
+        self._url_entries: Dict[str, int] = {}
+        self._size = 0
+        self._disk_size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+        if cache_dir is not None:
+            try:
+                cache_dir.mkdir(parents=True, exist_ok=True)
+                self._disk_size = sum(f.stat().st_size for f in cache_dir.glob("*.entry"))
+            except OSError as e:
+                logger.warning(f"HTTP cache directory unavailable, using memory only: {e}")
+                self.cache_dir = None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether responses are cached at all."""
+        return self.max_bytes > 0
+
+    def lookup(self, url: str, request_headers: Mapping[str, str]) -> Optional[CacheEntry]:
+        """
+        Find the cached response for a request, fresh or stale.
+
+        Args:
+            url: Request URL
+            request_headers: Request headers (matched against the entry's Vary)
+
+        Returns:
+            The entry, or None if nothing matching is cached
+        """
+        if not self.enabled:
+            return None
+
+        vary_names = self._vary_names(url)
+        key = _entry_key(url, _vary_values(vary_names, request_headers))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+        entry = self._read_disk(key)
+        if entry is None or entry.status_code == 0:
+            # status 0 marks a record of Vary names, not a response
+            return None
+        self._remember(key, entry)
+        return entry
+
+    def max_entry_bytes(self) -> int:
+        """Largest body that is cached."""
+        return self.max_bytes // 8
+
+    def store(
+        self,
+        url: str,
+        request_headers: Mapping[str, str],
+        response: requests.Response,
+        body: Optional[bytes] = None,
+    ) -> Optional[CacheEntry]:
+        """
+        Cache a 200 response if its headers allow it.
+
+        Args:
+            url: Request URL
+            request_headers: Request headers
+            response: The response
+            body: The body, if it was streamed (default: response.content)
+
+        Returns:
+            The new entry, or None if the response was not cached
+        """
+        if not self.enabled or response.status_code != 200:
+            return None
+        lifetime = freshness_lifetime(response.headers, self.default_freshness)
+        if body is None:
+            body = response.content
+        if lifetime is None or len(body) > self.max_entry_bytes():
+            return None
+
+        vary_names = [
+            name.strip() for name in response.headers.get("Vary", "").split(",") if name.strip()
+        ]
+        entry = CacheEntry(
+            url=url,
+            final_url=response.url,
+            status_code=response.status_code,
+            reason=response.reason or "OK",
+            headers={k: response.headers[k] for k in _KEPT_HEADERS if k in response.headers},
+            body=body,
+            vary=_vary_values(vary_names, request_headers),
+            fresh_until=time.time() + lifetime,
+        )
+        with self._lock:
+            self._vary[url] = vary_names
+        self._save(entry)
+        return entry
+
+    def refresh(self, entry: CacheEntry, not_modified: requests.Response) -> CacheEntry:
+        """
+        Update a stale entry after the server answered 304 Not Modified.
+
+        Args:
+            entry: The revalidated entry
+            not_modified: The 304 response
+
+        Returns:
+            The updated entry
+        """
+        headers = CaseInsensitiveDict(entry.headers)
+        for name in _KEPT_HEADERS:
+            if name in not_modified.headers:
+                headers[name] = not_modified.headers[name]
+        entry.headers = dict(headers)
+        lifetime = freshness_lifetime(headers, self.default_freshness)
+        entry.fresh_until = time.time() + (lifetime or 0.0)
+        self._save(entry)
+        return entry
+
+    def record(self, outcome: str) -> None:
+        """
+        Count a lookup outcome for stats().
+
+        Args:
+            outcome: "hits", "revalidated" or "misses"
+        """
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def clear(self) -> None:
+        """Drop all cached responses from memory and disk."""
+        with self._lock:
+            self._entries.clear()
+            self._vary.clear()
+            self._url_entries.clear()
+            self._size = 0
+            if self.cache_dir is not None:
+                for path in self.cache_dir.glob("*.entry"):
+                    path.unlink(missing_ok=True)
+                self._disk_size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache usage statistics."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "disk_bytes": self._disk_size,
+                "max_disk_bytes": self.max_disk_bytes if self.cache_dir else 0,
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "misses": self.misses,
+            }
+
+    def _vary_names(self, url: str) -> List[str]:
+        with self._lock:
+            names = self._vary.get(url)
+        if names is not None:
+            return names
+        # Not seen in this process; the unvaried entry on disk records the names
+        entry = self._read_disk(_entry_key(url, {}))
+        if entry is None:
+            return []
+        names = sorted(entry.vary)
+        with self._lock:
+            self._vary[url] = names
+        return names
+
+    def _save(self, entry: CacheEntry) -> None:
+        key = _entry_key(entry.url, entry.vary)
+        self._remember(key, entry)
+        self._write_disk(key, entry)
+        if entry.vary:
+            # Record the Vary names under the plain URL key for later processes
+            marker = CacheEntry(entry.url, entry.url, 0, "", {}, b"", entry.vary, 0.0)
+            self._write_disk(_entry_key(entry.url, {}), marker)
+
+    def _remember(self, key: str, entry: CacheEntry) -> None:
+        if entry.status_code == 0:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous.size
+            else:
+                self._url_entries[entry.url] = self._url_entries.get(entry.url, 0) + 1
+            self._entries[key] = entry
+            self._size += entry.size
+            while self._size > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.size
+                remaining = self._url_entries.pop(evicted.url, 1) - 1
+                if remaining:
+                    self._url_entries[evicted.url] = remaining
+                else:
+                    # Read from the disk tier if the URL is requested again
+                    self._vary.pop(evicted.url, None)
+
+    def _read_disk(self, key: str) -> Optional[CacheEntry]:
+        if self.cache_dir is None:
+            return None
+        path = self.cache_dir / f"{key}.entry"
+        try:
+            data = path.read_bytes()
+            os.utime(path)  # mark as recently used
+            return CacheEntry.from_bytes(data)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError) as e:
+            logger.debug(f"Dropping unreadable HTTP cache entry {path.name}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+    def _write_disk(self, key: str, entry: CacheEntry) -> None:
+        if self.cache_dir is None:
+            return
+        path = self.cache_dir / f"{key}.entry"
+        data = entry.to_bytes()
+        try:
+            old_size = path.stat().st_size if path.exists() else 0
+            tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.debug(f"Could not write HTTP cache entry: {e}")
+            return
+
+        with self._lock:
+            self._disk_size += len(data) - old_size
+            over_budget = self._disk_size > self.max_disk_bytes
+        if over_budget:
+            self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        """Delete the least recently used disk entries down to 90% of the budget."""
+        assert self.cache_dir is not None
+        files: List[Tuple[float, int, Path]] = []
+        for path in self.cache_dir.glob("*.entry"):
+            try:
+                stat = path.stat()
+                files.append((stat.st_mtime, stat.st_size, path))
+            except OSError:
+                continue
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        target = self.max_disk_bytes * 0.9
+        for _, size, path in files:
+            if total <= target:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+        with self._lock:
+            self._disk_size = total
+
+
+def _vary_values(names: List[str], request_headers: Mapping[str, str]) -> Dict[str, str]:
+    headers = CaseInsensitiveDict(request_headers)
+    return {name.lower(): headers.get(name, "") for name in names}
+
+
+def _entry_key(url: str, vary: Dict[str, str]) -> str:
+    payload = json.dumps([url, sorted(vary.items())])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _env_number(name: str, default: float) -> float:
+    """Read a non-negative number from the environment."""
+    try:
+        return max(0.0, float(os.getenv(name, str(default))))
+    except ValueError:
+        logger.warning(f"Invalid value for {name}, using {default}")
+        return default
+
+
+# Global HTTP cache instance
+_http_cache: Optional[HttpCache] = None
+_http_cache_lock = threading.Lock()
+
+
+def get_http_cache() -> HttpCache:
+    """Get the global HTTP cache instance."""
+    global _http_cache
+    if _http_cache is None:
+        with _http_cache_lock:
+            if _http_cache is None:
+                cache_dir = os.getenv(
+                    "MCP_SERVER_HTTP_CACHE_DIR", str(Path.home() / ".oh-my-mcp" / "http_cache")
+                )
+                _http_cache = HttpCache(
+                    max_bytes=int(_env_number("MCP_SERVER_HTTP_CACHE_BYTES", DEFAULT_MEMORY_BYTES)),
+                    cache_dir=Path(cache_dir).expanduser() if cache_dir else None,
+                    max_disk_bytes=int(
+                        _env_number("MCP_SERVER_HTTP_CACHE_DISK_BYTES", DEFAULT_DISK_BYTES)
+                    ),
+                    default_freshness=_env_number(
+                        "MCP_SERVER_HTTP_CACHE_FRESHNESS", DEFAULT_FRESHNESS
+                    ),
+                )
+    return _http_cache
+
+
+register_cache("http_cache", lambda: get_http_cache().stats())
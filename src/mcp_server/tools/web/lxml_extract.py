@@ -0,0 +1,316 @@
+"""
+lxml-native extraction for the web tools.
+
+BeautifulSoup builds its tree and walks it in Python; these helpers run the
+same extractions on an lxml.html document, where parsing, XPath evaluation and
+text serialization happen in C. Results match the BeautifulSoup helpers in
+web/handlers.py: same text joining rules, and multi-valued attributes such as
+``class`` are split into lists like BeautifulSoup does.
+
+iter_text() extracts text from a response stream with a SAX-style parser
+target, without building a tree, so a caller can stop reading a large page
+once it has enough text.
+
+CSS selectors are translated to XPath with cssselect (optional, installed with
+the ``fast`` extra) and compiled once per selector string. Without cssselect,
+select_elements() is unavailable and callers fall back to BeautifulSoup.
+"""
+
+import functools
+import importlib
+import threading
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Union
+from urllib.parse import urljoin
+
+import lxml.html  # type: ignore[import-untyped]
+from bs4.builder import HTMLTreeBuilder
+from lxml import etree
+
+# Optional CSS-to-XPath translator
+try:
+    _cssselect: Any = importlib.import_module("cssselect")
+except ImportError:
+    _cssselect = None
+
+HAS_CSSSELECT = _cssselect is not None
+
+# Elements whose strings BeautifulSoup does not count as text (see bs4 string containers)
+_NON_STRING_TAGS = frozenset({"script", "style", "template", "rt", "rp"})
+
+# Elements whose descendants' strings are not text either
+_NON_STRING_CONTAINERS = ("template", "rt", "rp")
+
+# BeautifulSoup collapses blank strings to one space or newline, except in these
+_ASCII_SPACES = " \n\t\x0c\r"
+_PRESERVE_WHITESPACE_TAGS = HTMLTreeBuilder.DEFAULT_PRESERVE_WHITESPACE_TAGS
+
+# Attributes BeautifulSoup splits into lists of values, by tag ("*" for any tag)
+_LIST_ATTRIBUTES = HTMLTreeBuilder.DEFAULT_CDATA_LIST_ATTRIBUTES
+
+_LINKS = etree.XPath("//a[@href]")
+_TITLE = etree.XPath("(//title)[1]")
+# Text nodes of an element outside script, style etc. (slow; for the rare mixed cases)
+_ELEMENT_STRINGS = etree.XPath(
+    ".//text()[not(ancestor::*[{}])]".format(
+        " or ".join(f"self::{tag}" for tag in sorted(_NON_STRING_TAGS))
+    )
+)
+
+# XSLT objects are not shared between threads
+_local = threading.local()
+
+
+def parse(html: str) -> lxml.html.HtmlElement:
+    """
+    Parse an HTML document.
+
+    Args:
+        html: HTML content
+
+    Returns:
+        The root element (an empty document for empty input)
+    """
+    try:
+        return lxml.html.document_fromstring(html)
+    except ValueError:
+        # lxml refuses str input with an XML encoding declaration
+        parser = lxml.html.HTMLParser(encoding="utf-8")
+        try:
+            return lxml.html.document_fromstring(html.encode("utf-8"), parser=parser)
+        except etree.ParserError:
+            return lxml.html.document_fromstring("<html></html>")
+    except etree.ParserError:
+        return lxml.html.document_fromstring("<html></html>")
+
+
+@functools.lru_cache(maxsize=256)
+def compile_selector(selector: str) -> etree.XPath:
+    """
+    Compile a CSS selector to an XPath expression (cached per selector string).
+
+    Args:
+        selector: CSS selector
+
+    Returns:
+        The compiled XPath
+
+    Raises:
+        RuntimeError: If cssselect is not installed
+        ValueError: If the selector is invalid
+    """
+    if _cssselect is None:
+        raise RuntimeError("cssselect is not installed")
+    try:
+        return etree.XPath(_cssselect.HTMLTranslator().css_to_xpath(selector))
+    except _cssselect.SelectorError as e:
+        raise ValueError(str(e)) from e
+
+
+def element_texts(elements: List[lxml.html.HtmlElement]) -> List[str]:
+    """
+    Get the text of each element with each string stripped, like BeautifulSoup's
+    get_text(strip=True).
+
+    Args:
+        elements: Elements of one document
+
+    Returns:
+        The texts, in the order of the elements
+    """
+    if not elements:
+        return []
+
+    # Elements holding a <script> etc. or inside a <template> etc. need the slow path
+    root = elements[0].getroottree().getroot()
+    mixed: Set[lxml.html.HtmlElement] = set()
+    for node in root.iter(*_NON_STRING_TAGS):
+        for ancestor in node.iterancestors():
+            if ancestor in mixed:
+                break
+            mixed.add(ancestor)
+    for container in root.iter(*_NON_STRING_CONTAINERS):
+        mixed.update(container.iterdescendants())
+
+    texts = []
+    for element in elements:
+        if element in mixed and element.tag not in _NON_STRING_TAGS:
+            strings = _ELEMENT_STRINGS(element)
+        else:
+            strings = element.itertext()
+        texts.append("".join(text for text in (string.strip() for string in strings) if text))
+    return texts
+
+
+def element_attributes(element: lxml.html.HtmlElement) -> Dict[str, Any]:
+    """Attributes of an element, with multi-valued attributes split into lists."""
+    list_names = set(_LIST_ATTRIBUTES.get("*", ())) | set(_LIST_ATTRIBUTES.get(element.tag, ()))
+    return {
+        name: value.split() if name in list_names else value
+        for name, value in element.attrib.items()
+    }
+
+
+def select_elements(doc: lxml.html.HtmlElement, selector: str) -> List[Dict[str, Any]]:
+    """
+    Describe the elements matching a CSS selector.
+
+    Args:
+        doc: Parsed document
+        selector: CSS selector
+
+    Returns:
+        List of dictionaries with tag, text and attributes
+    """
+    elements = compile_selector(selector)(doc)
+    return [
+        {
+            "tag": element.tag,
+            "text": text,
+            "attributes": element_attributes(element),
+        }
+        for element, text in zip(elements, element_texts(elements))
+    ]
+
+
+def page_title(doc: lxml.html.HtmlElement) -> Optional[str]:
+    """Get the title of a document, or None if it has none."""
+    titles = _TITLE(doc)
+    return element_texts(titles)[0] if titles else None
+
+
+def page_links(doc: lxml.html.HtmlElement, url: str, absolute: bool = True) -> List[Dict[str, str]]:
+    """
+    List the links of a document.
+
+    Args:
+        doc: Parsed document
+        url: URL of the document, for resolving relative links
+        absolute: Convert relative URLs to absolute
+
+    Returns:
+        List of dictionaries with url and text
+    """
+    links = []
+    a_tags = _LINKS(doc)
+    for a_tag, text in zip(a_tags, element_texts(a_tags)):
+        href = a_tag.get("href")
+        if absolute and not href.startswith(("http://", "https://", "//")):
+            href = urljoin(url, href)
+        links.append({"url": href, "text": text})
+    return links
+
+
+def page_text(doc: lxml.html.HtmlElement, skipped: Iterable[str] = ()) -> str:
+    """
+    Get the text of a document, like BeautifulSoup's get_text().
+
+    Blank strings are collapsed to a space or newline as BeautifulSoup does when
+    parsing (form feeds aside, which XPath does not count as whitespace).
+
+    Args:
+        doc: Parsed document
+        skipped: Tag names whose content is left out
+
+    Returns:
+        The concatenated text strings
+    """
+    return str(_text_transform(frozenset(skipped) | _NON_STRING_TAGS)(doc))
+
+
+class _TextTarget:
+    """Parser target collecting text outside skipped elements."""
+
+    def __init__(self, skipped: FrozenSet[str]):
+        self.skipped = skipped
+        self.depth = 0  # open elements at or below a skipped element
+        self.preserving = 0  # open <pre> and <textarea> elements
+        self.data_parts: List[str] = []  # the text node being parsed
+        self.parts: List[str] = []
+
+    def start(self, tag: str, attrib: Dict[str, str]) -> None:
+        self.flush()
+        if self.depth or tag in self.skipped:
+            self.depth += 1
+        elif tag in _PRESERVE_WHITESPACE_TAGS:
+            self.preserving += 1
+
+    def end(self, tag: str) -> None:
+        self.flush()
+        if self.depth:
+            self.depth -= 1
+        elif tag in _PRESERVE_WHITESPACE_TAGS and self.preserving:
+            self.preserving -= 1
+
+    def data(self, data: str) -> None:
+        if not self.depth:
+            self.data_parts.append(data)
+
+    def comment(self, text: str) -> None:
+        self.flush()
+
+    def pi(self, target: str, data: Optional[str] = None) -> None:
+        self.flush()
+
+    def close(self) -> None:
+        self.flush()
+
+    def flush(self) -> None:
+        """End the current text node, collapsing it like BeautifulSoup if it is blank."""
+        if self.data_parts:
+            text = "".join(self.data_parts)
+            self.data_parts = []
+            if not self.preserving and not text.strip(_ASCII_SPACES):
+                text = "\n" if "\n" in text else " "
+            self.parts.append(text)
+
+    def take(self) -> List[str]:
+        parts, self.parts = self.parts, []
+        return parts
+
+
+def iter_text(chunks: Iterable[Union[str, bytes]], skipped: Iterable[str] = ()) -> Iterator[str]:
+    """
+    Parse an HTML stream incrementally, yielding its text as it is parsed.
+
+    The strings are those page_text() would return for the whole document. Stop
+    iterating to stop parsing; no tree is built.
+
+    Args:
+        chunks: The document in pieces (decoded text, or bytes whose encoding
+            the parser detects)
+        skipped: Tag names whose content is left out
+
+    Yields:
+        Text strings in document order
+    """
+    target = _TextTarget(frozenset(skipped) | _NON_STRING_TAGS)
+    parser = etree.HTMLParser(target=target)
+    for chunk in chunks:
+        if chunk:
+            parser.feed(chunk)
+            yield from target.take()
+    try:
+        parser.close()
+    except etree.XMLSyntaxError:
+        pass  # empty document
+    yield from target.take()
+
+
+def _text_transform(tags: FrozenSet[str]) -> etree.XSLT:
+    """Get this thread's XSLT printing a document's text outside the tags."""
+    transforms: Dict[FrozenSet[str], etree.XSLT] = _local.__dict__.setdefault("transforms", {})
+    transform = transforms.get(tags)
+    if transform is None:
+        stylesheet = f"""<xsl:stylesheet version="1.0" xmlns:xsl="http://www.w3.org/1999/XSL/Transform">
+    <xsl:output method="text" encoding="UTF-8"/>
+    <xsl:template match="{'|'.join(sorted(tags))}"/>
+    <xsl:template match="text()[not(translate(., ' &#9;&#10;&#13;', ''))]
+                                [not(ancestor::pre or ancestor::textarea)]">
+        <xsl:choose>
+            <xsl:when test="contains(., '&#10;')"><xsl:text>&#10;</xsl:text></xsl:when>
+            <xsl:otherwise><xsl:text> </xsl:text></xsl:otherwise>
+        </xsl:choose>
+    </xsl:template>
+</xsl:stylesheet>"""
+        transform = transforms[tags] = etree.XSLT(etree.XML(stylesheet))
+    return transform
@@ -3,32 +3,177 @@ Utility functions and infrastructure for the MCP server.
 
 Provides:
 - Error handling and custom exceptions
-- Logging configuration
+- Logging configuration (queued, rotating, optionally JSON, with hot-path sampling)
 - Input validation
 - Retry logic for external requests
 - Safe file operations
+- JSON serialization of tool results
+- Per-call deadlines and cooperative cancellation
 """
 
+import asyncio
+import atexit
+import contextvars
+import importlib
+import json
 import logging
+import logging.handlers
+import multiprocessing
+import os
+import queue
+import random
 import re
+import threading
 import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from functools import wraps
 from pathlib import Path
-from typing import Any, Callable, Optional
+from typing import Any, Awaitable, Callable, Iterator, Optional
 from urllib.parse import urlparse
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler("mcp_server.log", encoding="utf-8"),
-    ],
-)
+# Optional fast JSON backend
+try:
+    _orjson: Any = importlib.import_module("orjson")
+except ImportError:
+    _orjson = None
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Format log records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep one in every N records below WARNING.
+
+    Attached to the hot-path logger so per-call INFO/DEBUG messages do not
+    dominate log volume; warnings and errors always pass.
+    """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.every = max(1, round(1 / rate)) if rate > 0 else 0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        if self.every == 0:
+            return False
+        with self._lock:
+            self._count += 1
+            return (self._count - 1) % self.every == 0
+
+
+def _env_float(name: str, default: float) -> float:
+    """Read a float from the environment, falling back to default."""
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def configure_logging() -> None:
+    """
+    Configure the root logger from environment variables.
+
+    By default records are handed to a background thread through a queue
+    (QueueHandler/QueueListener), so callers never block on console or file
+    writes, and the log file is rotated by size. Process pool workers get no
+    handlers here; forward_worker_logs() sends their records to the parent.
+
+    Environment variables:
+        MCP_SERVER_LOG_MODE          - "async" (default) or "sync"
+        MCP_SERVER_LOG_LEVEL         - Root log level (default: INFO)
+        MCP_SERVER_LOG_FORMAT        - "text" (default) or "json"
+        MCP_SERVER_LOG_FILE          - Log file path (default: mcp_server.log, "" disables)
+        MCP_SERVER_LOG_MAX_BYTES     - Rotate the log file at this size (default: 10MB)
+        MCP_SERVER_LOG_BACKUP_COUNT  - Rotated files to keep (default: 3)
+        MCP_SERVER_LOG_SAMPLE_RATE   - Fraction of hot-path INFO/DEBUG records kept
+                                       (default: 0.1)
+    """
+    global _log_listener
+
+    root = logging.getLogger()
+    root.setLevel(os.getenv("MCP_SERVER_LOG_LEVEL", "INFO").upper())
+    hot_logger.addFilter(SamplingFilter(_env_float("MCP_SERVER_LOG_SAMPLE_RATE", 0.1)))
+    # parent_process() is not set yet while a spawned worker unpickles its
+    # initializer (which imports this module), but the process name is
+    if multiprocessing.current_process().name != "MainProcess":
+        # Do not open another console stream and rotating handler on the same file
+        return
+
+    if os.getenv("MCP_SERVER_LOG_FORMAT", "text").lower() == "json":
+        formatter: logging.Formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(LOG_FORMAT)
+
+    handlers: list[logging.Handler] = [logging.StreamHandler()]
+    log_file = os.getenv("MCP_SERVER_LOG_FILE", "mcp_server.log")
+    if log_file:
+        handlers.append(
+            logging.handlers.RotatingFileHandler(
+                log_file,
+                maxBytes=int(_env_float("MCP_SERVER_LOG_MAX_BYTES", 10 * 1024 * 1024)),
+                backupCount=int(_env_float("MCP_SERVER_LOG_BACKUP_COUNT", 3)),
+                encoding="utf-8",
+            )
+        )
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    if os.getenv("MCP_SERVER_LOG_MODE", "async").lower() == "sync":
+        for handler in handlers:
+            root.addHandler(handler)
+    else:
+        log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+        root.addHandler(logging.handlers.QueueHandler(log_queue))
+        _log_listener = logging.handlers.QueueListener(
+            log_queue, *handlers, respect_handler_level=True
+        )
+        _log_listener.start()
+        atexit.register(_log_listener.stop)
+
+
+def forward_worker_logs(log_queue: Any) -> None:
+    """
+    Send this process's log records to a queue read by the parent process.
+
+    Used as the process pool initializer; the parent passes the records to its
+    own handlers (see executor.get_process_pool).
+
+    Args:
+        log_queue: multiprocessing queue created by the parent
+    """
+    logging.getLogger().addHandler(logging.handlers.QueueHandler(log_queue))
+
 
 logger = logging.getLogger(__name__)
 
+# Logger for per-call messages on hot paths (cache lookups, command runs);
+# its INFO/DEBUG records are sampled.
+hot_logger = logger.getChild("hot")
+
+configure_logging()
+
 
 # Custom Exceptions
 class MCPServerError(Exception):
@@ -46,7 +191,23 @@ class ValidationError(MCPServerError):
 class NetworkError(MCPServerError):
     """Raised when network operations fail."""
 
-    pass
+    def __init__(
+        self,
+        message: str,
+        status_code: Optional[int] = None,
+        retry_after: Optional[float] = None,
+    ):
+        """
+        Initialize the error.
+
+        Args:
+            message: Error message
+            status_code: HTTP status of the failed response, if any
+            retry_after: Seconds the server asked clients to wait, if any
+        """
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
 
 
 class FileOperationError(MCPServerError):
@@ -97,6 +258,132 @@ class BrowserTimeoutError(BrowserError):
     pass
 
 
+class ToolBusyError(MCPServerError):
+    """Raised when a tool call is rejected because its concurrency limit is reached."""
+
+    pass
+
+
+class DeadlineExceededError(MCPServerError):
+    """Raised when a tool call runs past its deadline or is cancelled."""
+
+    pass
+
+
+# Deadlines and cancellation
+# The registry sets a deadline for every tool call. Blocking work (HTTP requests,
+# subprocesses, retries, Selenium waits) clamps its own timeouts to the time
+# remaining and checks for cancellation, so abandoned calls stop early.
+_call_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "mcp_call_deadline", default=None
+)
+_call_cancelled: contextvars.ContextVar[Optional[threading.Event]] = contextvars.ContextVar(
+    "mcp_call_cancelled", default=None
+)
+
+
+@contextmanager
+def call_deadline(
+    seconds: Optional[float], cancel_event: Optional[threading.Event] = None
+) -> Iterator[threading.Event]:
+    """
+    Run the enclosed code under a deadline.
+
+    Nested deadlines never extend an outer one. The context is carried into
+    worker threads by the registry, so handlers see it too.
+
+    Args:
+        seconds: Time allowed from now (None for no deadline)
+        cancel_event: Event that marks the call as cancelled (default: a new event)
+
+    Yields:
+        The cancellation event; setting it makes check_deadline() raise
+    """
+    deadline = _call_deadline.get()
+    if seconds is not None:
+        new_deadline = time.monotonic() + seconds
+        deadline = new_deadline if deadline is None else min(deadline, new_deadline)
+
+    event = cancel_event or threading.Event()
+    deadline_token = _call_deadline.set(deadline)
+    cancel_token = _call_cancelled.set(event)
+    try:
+        yield event
+    finally:
+        _call_cancelled.reset(cancel_token)
+        _call_deadline.reset(deadline_token)
+
+
+def time_remaining() -> Optional[float]:
+    """
+    Get the seconds left before the current call's deadline.
+
+    Returns:
+        Remaining seconds (may be negative), or None if there is no deadline
+    """
+    deadline = _call_deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def check_deadline() -> None:
+    """
+    Stop the current call if it was cancelled or its deadline has passed.
+
+    Raises:
+        DeadlineExceededError: If the call should stop
+    """
+    event = _call_cancelled.get()
+    if event is not None and event.is_set():
+        raise DeadlineExceededError("Tool call was cancelled")
+
+    remaining = time_remaining()
+    if remaining is not None and remaining <= 0:
+        raise DeadlineExceededError("Tool call deadline exceeded")
+
+
+def deadline_timeout(timeout: float) -> float:
+    """
+    Clamp an operation timeout to the time left in the current call.
+
+    Args:
+        timeout: The operation's own timeout in seconds
+
+    Returns:
+        The smaller of timeout and the remaining time
+
+    Raises:
+        DeadlineExceededError: If the call was cancelled or has no time left
+    """
+    check_deadline()
+    remaining = time_remaining()
+    if remaining is None:
+        return timeout
+    return max(0.001, min(timeout, remaining))
+
+
+def sleep_until_deadline(seconds: float) -> None:
+    """
+    Sleep, waking early if the current call is cancelled.
+
+    Args:
+        seconds: Time to sleep
+
+    Raises:
+        DeadlineExceededError: If the call is cancelled or the deadline passes first
+    """
+    remaining = time_remaining()
+    if remaining is not None and remaining < seconds:
+        raise DeadlineExceededError("Tool call deadline exceeded")
+
+    event = _call_cancelled.get()
+    if event is None:
+        time.sleep(seconds)
+    elif event.wait(seconds):
+        raise DeadlineExceededError("Tool call was cancelled")
+
+
 # Validation utilities
 def validate_url(url: str) -> bool:
     """
@@ -177,40 +464,303 @@ def safe_get_file_size(path: Path) -> int:
 
 
 # Retry decorator
+# Delays grow exponentially with full jitter, so clients that failed together do
+# not retry in lockstep. A Retry-After hint from the server (429/503) replaces
+# the computed delay. Every retry spends a token from a per-host budget that each
+# first attempt (successful or not) and a slow steady refill add to, so retries
+# stay a fraction of the traffic and cannot multiply the load on a service that
+# is already failing.
+RETRY_AFTER_STATUSES = (429, 503)
+
+# Client errors that may succeed when repeated (timeout, too early, rate limit)
+_RETRYABLE_CLIENT_ERRORS = (408, 425, 429)
+
+
+class RetryBudget:
+    """
+    Token bucket limiting retries per key (usually a host).
+
+    Each first attempt deposits ``ratio`` tokens and each retry spends one, so
+    retries stay at about ``ratio`` of the traffic to a host. A small steady
+    refill keeps hosts with little traffic able to retry.
+    """
+
+    def __init__(
+        self,
+        ratio: float = 0.2,
+        min_per_second: float = 0.5,
+        capacity: float = 10.0,
+        max_keys: int = 1024,
+    ):
+        """
+        Initialize the budget.
+
+        Args:
+            ratio: Retry tokens earned per first attempt
+            min_per_second: Retry tokens earned per second regardless of traffic
+            capacity: Maximum tokens saved per key
+            max_keys: Maximum number of keys tracked
+        """
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.capacity = capacity
+        self.max_keys = max_keys
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def _refill(self, key: str, now: float) -> float:
+        tokens, updated = self._buckets.get(key, (self.capacity, now))
+        return min(self.capacity, tokens + (now - updated) * self.min_per_second)
+
+    def record_attempt(self, key: str) -> None:
+        """Earn tokens for a first attempt."""
+        now = time.monotonic()
+        with self._lock:
+            tokens = self._refill(key, now)
+            self._buckets[key] = (min(self.capacity, tokens + self.ratio), now)
+            if len(self._buckets) > self.max_keys:
+                # Forget the key that was updated longest ago
+                oldest = min(self._buckets, key=lambda k: self._buckets[k][1])
+                del self._buckets[oldest]
+
+    def try_spend(self, key: str) -> bool:
+        """
+        Take a token for a retry.
+
+        Returns:
+            True if the retry may proceed
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens = self._refill(key, now)
+            if tokens < 1.0:
+                self._buckets[key] = (tokens, now)
+                return False
+            self._buckets[key] = (tokens - 1.0, now)
+            return True
+
+
+retry_budget = RetryBudget(ratio=max(0.0, _env_float("MCP_SERVER_RETRY_BUDGET_RATIO", 0.2)))
+
+
+def backoff_delay(attempt: int, base: float, max_delay: float, jitter: bool = True) -> float:
+    """
+    Compute the wait before a retry.
+
+    Args:
+        attempt: Number of failed attempts so far minus one (0 for the first retry)
+        base: Delay before the first retry
+        max_delay: Upper bound for the delay
+        jitter: Pick a random delay between 0 and the bound ("full jitter")
+
+    Returns:
+        Seconds to wait
+    """
+    bound = min(max_delay, base * (2**attempt))
+    return random.uniform(0, bound) if jitter else bound
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header value.
+
+    Args:
+        value: Delay in seconds or an HTTP date
+
+    Returns:
+        Seconds to wait, or None if the value is missing or invalid
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def retry_after_from(exc: BaseException) -> Optional[float]:
+    """
+    Get the server's requested retry delay from an exception.
+
+    Looks for a ``retry_after`` attribute, then for the Retry-After header of an
+    attached HTTP response with status 429 or 503.
+    """
+    retry_after = getattr(exc, "retry_after", None)
+    if retry_after is not None:
+        return float(retry_after)
+    response = getattr(exc, "response", None)
+    if getattr(response, "status_code", None) in RETRY_AFTER_STATUSES:
+        return parse_retry_after(response.headers.get("Retry-After"))  # type: ignore[union-attr]
+    return None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """
+    Decide whether an error may go away when the operation is repeated.
+
+    Invalid input, security violations, expired deadlines and HTTP client errors
+    (except 408, 425 and 429) are permanent.
+    """
+    if isinstance(exc, (ValidationError, SecurityError, DeadlineExceededError)):
+        return False
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    if isinstance(status, int) and 400 <= status < 500:
+        return status in _RETRYABLE_CLIENT_ERRORS
+    return True
+
+
+def host_of(url: str) -> str:
+    """Get the host of a URL, for use as a retry budget key."""
+    return urlparse(url).hostname or url
+
+
+class _RetryState:
+    """Retry bookkeeping shared by the sync and async decorators."""
+
+    def __init__(
+        self,
+        func: Callable[..., Any],
+        max_attempts: int,
+        delay: float,
+        max_delay: float,
+        jitter: bool,
+        exceptions: tuple[type[Exception], ...],
+        budget_key: Optional[Callable[..., str]],
+    ):
+        self.func = func
+        self.max_attempts = max_attempts
+        self.delay = delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.exceptions = exceptions
+        self.budget_key = budget_key
+
+    def key(self, args: tuple[Any, ...], kwargs: dict[str, Any]) -> str:
+        if self.budget_key is not None:
+            try:
+                return self.budget_key(*args, **kwargs)
+            except Exception as e:
+                logger.debug(f"Retry budget key of {self.func.__qualname__} failed: {e!r}")
+        return f"{self.func.__module__}.{self.func.__qualname__}"
+
+    def next_delay(self, attempt: int, key: str, e: Exception) -> Optional[float]:
+        """Get the wait before the next attempt, or None to give up."""
+        name = self.func.__name__
+        if not isinstance(e, self.exceptions) or not is_retryable(e):
+            return None
+        if attempt >= self.max_attempts - 1:
+            logger.error(f"All {self.max_attempts} attempts failed for {name}: {e}")
+            return None
+
+        wait = retry_after_from(e)
+        if wait is None:
+            wait = backoff_delay(attempt, self.delay, self.max_delay, self.jitter)
+        elif wait > self.max_delay:
+            logger.error(f"Server asked to wait {wait:g}s, not retrying {name}: {e}")
+            return None
+
+        remaining = time_remaining()
+        if remaining is not None and remaining < wait:
+            logger.error(f"No time left to retry {name}: {e}")
+            return None
+        if not retry_budget.try_spend(key):
+            logger.error(f"Retry budget for {key} exhausted, not retrying {name}: {e}")
+            return None
+
+        logger.warning(
+            f"Attempt {attempt + 1}/{self.max_attempts} failed for {name}: {e}. "
+            f"Retrying in {wait:.2f}s..."
+        )
+        return wait
+
+
 def retry(
     max_attempts: int = 3,
     delay: float = 1.0,
     exceptions: tuple[type[Exception], ...] = (Exception,),
+    max_delay: float = 30.0,
+    jitter: bool = True,
+    budget_key: Optional[Callable[..., str]] = None,
 ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
     """
     Retry decorator for functions that may fail transiently.
 
+    Permanent errors (see is_retryable()) are raised at once. A Retry-After
+    longer than max_delay is not waited for.
+
     Args:
-        max_attempts: Maximum number of retry attempts
-        delay: Delay between retries in seconds
+        max_attempts: Maximum number of attempts
+        delay: Backoff bound before the first retry; doubles on each retry
         exceptions: Tuple of exceptions to catch and retry
+        max_delay: Upper bound for the backoff
+        jitter: Randomize delays (full jitter)
+        budget_key: Called with the function's arguments to get the retry budget
+            key, usually the target host (default: one budget per function)
     """
 
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        state = _RetryState(func, max_attempts, delay, max_delay, jitter, exceptions, budget_key)
+
         @wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            last_exception: Optional[Exception] = None
-            for attempt in range(max_attempts):
+            key = state.key(args, kwargs)
+            retry_budget.record_attempt(key)
+            attempt = 0
+            while True:
                 try:
                     return func(*args, **kwargs)
-                except exceptions as e:
-                    last_exception = e
-                    if attempt < max_attempts - 1:
-                        logger.warning(
-                            f"Attempt {attempt + 1}/{max_attempts} failed for {func.__name__}: {e}. "
-                            f"Retrying in {delay}s..."
-                        )
-                        time.sleep(delay)
-                    else:
-                        logger.error(f"All {max_attempts} attempts failed for {func.__name__}: {e}")
-            if last_exception is not None:
-                raise last_exception
-            raise RuntimeError("Retry logic failed without capturing exception")
+                except Exception as e:
+                    wait = state.next_delay(attempt, key, e)
+                    if wait is None:
+                        raise
+                sleep_until_deadline(wait)
+                attempt += 1
+
+        return wrapper
+
+    return decorator
+
+
+def async_retry(
+    max_attempts: int = 3,
+    delay: float = 1.0,
+    exceptions: tuple[type[Exception], ...] = (Exception,),
+    max_delay: float = 30.0,
+    jitter: bool = True,
+    budget_key: Optional[Callable[..., str]] = None,
+) -> Callable[[Callable[..., Awaitable[Any]]], Callable[..., Awaitable[Any]]]:
+    """
+    Retry decorator for coroutine functions; same policy and arguments as retry().
+
+    Waiting between attempts does not block the event loop.
+    """
+
+    def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        state = _RetryState(func, max_attempts, delay, max_delay, jitter, exceptions, budget_key)
+
+        @wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            key = state.key(args, kwargs)
+            retry_budget.record_attempt(key)
+            attempt = 0
+            while True:
+                try:
+                    return await func(*args, **kwargs)
+                except Exception as e:
+                    wait = state.next_delay(attempt, key, e)
+                    if wait is None:
+                        raise
+                check_deadline()
+                await asyncio.sleep(wait)
+                attempt += 1
 
         return wrapper
 
@@ -255,6 +805,53 @@ def safe_read_file(path: str, encoding: str = "utf-8", max_size: int = 10 * 1024
         raise FileOperationError(f"Failed to read file {path}: {e}") from e
 
 
+def safe_iter_file(
+    path: str,
+    encoding: str = "utf-8",
+    max_size: int = 10 * 1024 * 1024,
+    chunk_size: int = 64 * 1024,
+) -> Iterator[str]:
+    """
+    Safely read file contents in chunks with size limit.
+
+    Args:
+        path: Path to file
+        encoding: File encoding
+        max_size: Maximum file size in bytes (default 10MB)
+        chunk_size: Characters per chunk
+
+    Yields:
+        Chunks of the file contents
+
+    Raises:
+        FileOperationError: If file cannot be read or is too large
+    """
+    try:
+        p = sanitize_path(path)
+
+        if not p.exists():
+            raise FileOperationError(f"File not found: {path}")
+
+        if not p.is_file():
+            raise FileOperationError(f"Not a file: {path}")
+
+        file_size = safe_get_file_size(p)
+        if file_size > max_size:
+            raise FileOperationError(f"File too large: {file_size} bytes (max: {max_size} bytes)")
+
+        with open(p, "r", encoding=encoding) as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    except FileOperationError:
+        raise
+    except Exception as e:
+        raise FileOperationError(f"Failed to read file {path}: {e}") from e
+
+
 def safe_write_file(
     path: str, content: str, encoding: str = "utf-8", overwrite: bool = True
 ) -> None:
@@ -359,6 +956,58 @@ def format_timestamp(timestamp: float) -> str:
     return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
 
 
+# JSON output
+# Tool results are compact by default; set MCP_SERVER_JSON_STYLE=pretty for
+# indented output. MCP_SERVER_JSON_BACKEND=json disables orjson.
+JSON_PRETTY = os.getenv("MCP_SERVER_JSON_STYLE", "compact").strip().lower() == "pretty"
+JSON_BACKEND = os.getenv("MCP_SERVER_JSON_BACKEND", "auto").strip().lower()
+
+
+def json_indent(pretty: Optional[bool] = None) -> Optional[int]:
+    """
+    Get the json.dumps indent for the output style.
+
+    Args:
+        pretty: Indent the output (default: server-wide MCP_SERVER_JSON_STYLE)
+
+    Returns:
+        2 for pretty output, None for compact output
+    """
+    if pretty is None:
+        pretty = JSON_PRETTY
+    return 2 if pretty else None
+
+
+def to_json(data: Any, pretty: Optional[bool] = None) -> str:
+    """
+    Serialize a tool result to JSON.
+
+    Output is compact unless pretty-printing is requested, and non-ASCII text
+    is kept as-is. orjson is used when installed, falling back to the json
+    module for values it does not support.
+
+    Args:
+        data: JSON-serializable value
+        pretty: Indent the output (default: server-wide MCP_SERVER_JSON_STYLE)
+
+    Returns:
+        JSON string
+    """
+    indent = json_indent(pretty)
+
+    if _orjson is not None and JSON_BACKEND != "json":
+        option = _orjson.OPT_NON_STR_KEYS | (_orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            result: str = _orjson.dumps(data, option=option).decode("utf-8")
+            return result
+        except TypeError:
+            pass
+
+    if indent:
+        return json.dumps(data, indent=indent, ensure_ascii=False)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
 # Archive safety constants
 MAX_EXTRACT_SIZE = 500 * 1024 * 1024  # 500MB
 
@@ -0,0 +1,532 @@
+#!/usr/bin/env python3
+"""Test plugin registry infrastructure"""
+
+import asyncio
+import inspect
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Iterator
+
+import pytest
+from fastmcp import FastMCP
+from fastmcp.tools import FunctionTool
+
+from mcp_server.utils import DeadlineExceededError, ToolBusyError, check_deadline, time_remaining
+
+sys.path.insert(0, str(Path(__file__).parent))
+from mcp_server.tools import discover_tool_plugins, load_all_plugins
+from mcp_server.tools import manifest as tool_manifest
+from mcp_server.tools.admission import ConcurrencyLimiter, limit_concurrency
+from mcp_server.tools.executor import apply_deadline, get_process_pool, make_async_handler
+from mcp_server.tools.manifest import build_manifest, describe_tool, load_manifest, write_manifest
+from mcp_server.tools.metrics import ToolMetrics, get_metrics
+from mcp_server.tools.registry import (
+    _TOOL_REGISTRY,
+    PluginRegistry,
+    ToolPlugin,
+    load_plugin_config,
+)
+from mcp_server.tools.reloader import PluginWatcher, reload_plugin
+from mcp_server.tools.result_cache import ResultCache, get_result_cache
+from mcp_server.tools.streaming import (
+    StreamedArray,
+    StreamedString,
+    iter_json_object,
+    paginate,
+    read_next_page,
+    report_progress,
+)
+
+
+def _load_plugin(name: str) -> ToolPlugin:
+    plugin_dir = next(d for d in discover_tool_plugins() if d.name == name)
+    return ToolPlugin(plugin_dir, load_plugin_config(plugin_dir))
+
+
+def test_manifest_roundtrip(temp_dir: Path) -> None:
+    """Manifest entries survive a write/load cycle."""
+    plugin = _load_plugin("text")
+    plugin.load_handlers()
+
+    manifest_path = write_manifest(build_manifest([plugin]), temp_dir / "manifest.json")
+    manifest = load_manifest(manifest_path)
+
+    assert manifest is not None
+    assert manifest["plugins"]["text"]["config"]["category_name"] == plugin.category_name
+    entries = manifest["plugins"]["text"]["tools"]
+    assert [entry["name"] for entry in entries] == [tool.__name__ for tool in plugin.tools]
+    assert "text" in entries[0]["schema"]["properties"]
+
+
+def test_lazy_plugin_defers_import(temp_dir: Path) -> None:
+    """Lazy stubs expose the handler signature and import handlers on first call."""
+    eager = _load_plugin("text")
+    eager.load_handlers()
+    entries = [describe_tool(tool) for tool in eager.tools]
+
+    lazy = _load_plugin("text")
+    lazy.load_stubs(entries)
+    assert not lazy.loaded
+
+    stub = next(tool for tool in lazy.tools if tool.__name__ == "count_words")
+    real = next(tool for tool in eager.tools if tool.__name__ == "count_words")
+    assert inspect.signature(stub) == inspect.signature(real)
+    assert stub.__doc__ == inspect.getdoc(real)
+
+    result = json.loads(stub("hello lazy world", detailed=False))
+    assert result["word_count"] == 3
+    assert lazy.loaded
+
+
+def test_lazy_plugin_registers_manifest_schema(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Lazy tools are registered from the stored schemas, even with unknown annotations."""
+    eager = _load_plugin("text")
+    eager.load_handlers()
+    entries = [describe_tool(tool) for tool in eager.tools]
+    eager_mcp = FastMCP("eager")
+    eager.register_to_mcp(eager_mcp)
+    expected = {tool.name: tool for tool in asyncio.run(eager_mcp.list_tools())}
+
+    entries[0]["params"][0]["annotation"] = "Literal['a', 'b'] | UnknownType"
+
+    def no_inspection(*args: Any, **kwargs: Any) -> Any:
+        raise AssertionError("lazy tools must not be inspected")
+
+    monkeypatch.setattr(FunctionTool, "from_function", no_inspection)
+    lazy = _load_plugin("text")
+    lazy.load_stubs(entries)
+    lazy_mcp = FastMCP("lazy")
+    lazy.register_to_mcp(lazy_mcp)
+
+    for tool in asyncio.run(lazy_mcp.list_tools()):
+        assert tool.parameters == expected[tool.name].parameters
+        assert tool.output_schema == expected[tool.name].output_schema
+        assert tool.description == expected[tool.name].description
+    assert not lazy.loaded
+
+    result = asyncio.run(lazy_mcp.call_tool("count_words", {"text": "hello lazy world"}))
+    assert "word_count" in str(result.content)
+    assert lazy.loaded
+
+
+def test_lazy_load_refreshes_manifest(temp_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A missing manifest is written after an eager load and used on the next load."""
+    manifest_path = temp_dir / "tool_manifest.json"
+    monkeypatch.setattr(tool_manifest, "get_manifest_path", lambda: manifest_path)
+
+    first = load_all_plugins(lazy=True)
+    assert manifest_path.exists()
+    assert all(plugin.loaded for plugin in first)
+
+    second = load_all_plugins(lazy=True)
+    assert [plugin.name for plugin in second] == [plugin.name for plugin in first]
+    assert not any(plugin.loaded for plugin in second)
+
+
+def test_plugin_registry_caches_payloads() -> None:
+    """Rendered payloads are reused until a plugin is replaced."""
+    plugin = _load_plugin("text")
+    registry = PluginRegistry([plugin])
+    calls = []
+
+    def builder() -> dict[str, int]:
+        calls.append(1)
+        return {"plugins": len(registry.plugins)}
+
+    assert registry.render("config://test", builder) == registry.render("config://test", builder)
+    assert len(calls) == 1
+
+    registry.replace(_load_plugin("text"))
+    assert json.loads(registry.render("config://test", builder)) == {"plugins": 1}
+    assert len(calls) == 2
+
+
+def test_async_handler_overlaps_blocking_calls() -> None:
+    """Blocking handlers wrapped for the thread pool run concurrently."""
+
+    def slow_tool(delay: float = 0.2) -> str:
+        """Sleep and return."""
+        time.sleep(delay)
+        return "done"
+
+    async_tool = make_async_handler(slow_tool)
+    assert inspect.signature(async_tool) == inspect.signature(slow_tool)
+
+    async def run_calls() -> list[str]:
+        return list(await asyncio.gather(*(async_tool(0.2) for _ in range(4))))
+
+    start = time.perf_counter()
+    assert asyncio.run(run_calls()) == ["done"] * 4
+    assert time.perf_counter() - start < 0.6
+
+
+def test_thread_handler_reports_progress(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Handlers on worker threads send progress through the request's context."""
+    from fastmcp.server import context as fastmcp_context
+
+    reports: list[tuple[float, float | None, str]] = []
+
+    class FakeContext:
+        async def report_progress(self, progress: float, total: float | None, message: str) -> None:
+            reports.append((progress, total, message))
+
+    def download_tool() -> str:
+        """Report progress twice."""
+        report_progress(1, 2, "half")
+        report_progress(2, 2, "done")
+        return "ok"
+
+    async def call() -> str:
+        fastmcp_context._current_context.set(FakeContext())  # type: ignore[arg-type]
+        result: str = await make_async_handler(download_tool)()
+        await asyncio.sleep(0.05)
+        return result
+
+    assert asyncio.run(call()) == "ok"
+    assert reports == [(1, 2, "half"), (2, 2, "done")]
+    assert download_tool() == "ok"  # no request, no notifications
+
+
+def test_cpu_bound_tool_runs_in_process_pool() -> None:
+    """Tools declared cpu_bound run through the process pool."""
+    plugin = _load_plugin("text")
+    plugin.load_handlers()
+    assert plugin.get_tool_options("calculate_text_similarity")["cpu_bound"] is True
+
+    tool = next(t for t in plugin.tools if t.__name__ == "calculate_text_similarity")
+    result = asyncio.run(plugin._wrap_tool(tool)("kitten", "sitting"))
+    assert json.loads(result)["distance"] == 3
+
+
+def test_process_pool_workers_log_through_parent() -> None:
+    """Process pool workers only hand their log records to the parent process."""
+    handlers = get_process_pool().submit(
+        eval, "[type(h).__name__ for h in __import__('logging').getLogger().handlers]"
+    )
+    assert handlers.result() == ["QueueHandler"]
+
+
+def test_tool_metrics_records_calls_and_errors() -> None:
+    """Instrumented tools report counts, latency percentiles and errors."""
+    metrics = ToolMetrics()
+    for latency in (0.01, 0.02, 0.03, 0.04):
+        metrics.record("fetch", "web", latency, 10, 100)
+    metrics.record("fetch", "web", 0.5, 10, 0, ValueError("bad"))
+
+    stats = metrics.snapshot()["tools"]["fetch"]
+    assert stats["calls"] == 5
+    assert stats["errors_by_type"] == {"ValueError": 1}
+    assert stats["latency_ms"]["p50"] == 30.0
+    assert stats["latency_ms"]["max"] == 500.0
+    assert stats["output_bytes"] == 400
+
+    text = metrics.render_prometheus()
+    assert 'mcp_tool_calls_total{tool="fetch",plugin="web"} 5' in text
+    assert 'mcp_tool_errors_total{tool="fetch",plugin="web",type="ValueError"} 1' in text
+
+
+def test_server_start_does_not_import_web_dependencies() -> None:
+    """With lazy loading, web dependencies load with the web tools, not at server start."""
+    modules = ("requests", "bs4", "lxml", "mcp_server.tools.web.dns_resolver")
+    code = f"import sys, mcp_server.main; print([m for m in {modules!r} if m in sys.modules])"
+    env = {**os.environ, "MCP_SERVER_LAZY_LOAD": "1"}
+    result = subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip().splitlines()[-1] == "[]"
+
+    # Caches are reported once their module is imported
+    from mcp_server.tools.metrics import cache_stats
+    from mcp_server.tools.web import dns_resolver, dom_cache, http_cache
+
+    assert cache_stats()["http_cache"] == http_cache.get_http_cache().stats()
+    assert cache_stats()["dom_cache"] == dom_cache.get_dom_cache().stats()
+    assert cache_stats()["dns_cache"] == dns_resolver.get_resolver().stats()
+
+
+def test_registered_tools_are_instrumented() -> None:
+    """Tools wrapped by the plugin are counted in the global metrics."""
+    plugin = _load_plugin("text")
+    plugin.load_handlers()
+    tool = next(t for t in plugin.tools if t.__name__ == "count_words")
+
+    before = get_metrics().snapshot()["tools"].get("count_words", {}).get("calls", 0)
+    asyncio.run(plugin._wrap_tool(tool)("one two"))
+    assert get_metrics().snapshot()["tools"]["count_words"]["calls"] == before + 1
+
+
+def test_reload_does_not_duplicate_tools() -> None:
+    """Re-importing a handlers module replaces its registry entries."""
+    plugin = _load_plugin("text")
+    plugin.load_handlers()
+    names = [tool.__name__ for tool in plugin.tools]
+
+    reloaded = _load_plugin("text")
+    reloaded.reload_handlers()
+    assert [tool.__name__ for tool in reloaded.tools] == names
+    assert len(_TOOL_REGISTRY["mcp_server.tools.text.handlers"]) == len(names)
+
+
+def test_reload_plugin_reregisters_tools() -> None:
+    """Reloading a plugin swaps its tools on the running server and in the registry."""
+    mcp = FastMCP("test")
+    plugin = _load_plugin("text")
+    plugin.load_handlers()
+    plugin.register_to_mcp(mcp)
+    registry = PluginRegistry([plugin])
+
+    result = reload_plugin(registry, mcp, "text")
+    assert result["added"] == [] and result["removed"] == []
+    assert registry.get("text") is not plugin
+
+    tools = asyncio.run(mcp.list_tools())
+    assert sorted(tool.name for tool in tools) == sorted(result["reloaded"])
+
+    with pytest.raises(ValueError):
+        reload_plugin(registry, mcp, "missing_plugin")
+
+
+def test_plugin_watcher_reloads_changed_plugin() -> None:
+    """The watcher only reloads plugins whose sources changed."""
+    mcp = FastMCP("test")
+    plugin = _load_plugin("text")
+    plugin.load_handlers()
+    plugin.register_to_mcp(mcp)
+    registry = PluginRegistry([plugin])
+
+    watcher = PluginWatcher(registry, mcp, interval=60)
+    watcher.start()
+    try:
+        assert watcher.check() == {}
+        watcher._mtimes["text"] = (0, 0)
+        assert list(watcher.check()) == ["text"]
+    finally:
+        watcher.stop()
+
+
+def test_result_cache_evicts_to_budget() -> None:
+    """The result cache stays within its entry and memory limits, evicting LRU first."""
+    cache = ResultCache(max_bytes=1000, max_entries=3)
+    for key in "abc":
+        cache.put("tool", key, "x" * 100)
+    cache.get("tool", "a")
+    cache.put("tool", "d", "x" * 100)
+
+    assert cache.stats()["entries"] == 3
+    assert cache.get("tool", "b") != "x" * 100
+    assert cache.get("tool", "a") == "x" * 100
+
+    cache.put("tool", "big", "x" * 600)
+    assert cache.get("tool", "big") != "x" * 600
+    cache.put("tool", "e", "x" * 400)
+    assert cache.stats()["bytes"] <= 1000
+
+
+def test_cacheable_tool_reuses_results() -> None:
+    """Cacheable tools serve repeated calls, however the arguments are passed."""
+    plugin = _load_plugin("data")
+    plugin.load_handlers()
+    assert plugin.get_tool_options("format_json")["cacheable"] is True
+
+    tool = next(t for t in plugin.tools if t.__name__ == "format_json")
+    wrapped = plugin._wrap_tool(tool)
+    cache = get_result_cache()
+    cache.clear()
+
+    first = asyncio.run(wrapped('{"b": 1, "a": 2}'))
+    second = asyncio.run(wrapped(json_string='{"b": 1, "a": 2}', indent=2))
+    assert first == second
+    assert cache.stats()["entries"] == 1
+    assert cache.stats()["hits"] >= 1
+
+
+@pytest.mark.parametrize("pretty", [False, True])
+def test_iter_json_object_matches_json_dumps(pretty: bool) -> None:
+    """Incrementally serialized objects are identical to json.dumps output."""
+    items = [{"name": "a", "size": 1}, {"name": "b", "nested": {"x": [1, 2]}}]
+    expected = {"path": "/tmp", "items": items, "empty": [], "text": 'line\n"é"', "n": 2}
+
+    def fields():
+        yield "path", "/tmp"
+        yield "items", StreamedArray(iter(items))
+        yield "empty", StreamedArray([])
+        yield "text", StreamedString(["line\n", '"é"'])
+        yield "n", 2
+
+    text = "".join(iter_json_object(fields(), pretty=pretty))
+    if pretty:
+        assert text == json.dumps(expected, indent=2, ensure_ascii=False)
+    else:
+        assert text == json.dumps(expected, ensure_ascii=False, separators=(",", ":"))
+
+
+def test_streaming_tool_returns_pages(temp_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Streaming tools return small results unchanged and large ones page by page."""
+    plugin = _load_plugin("file")
+    plugin.load_handlers()
+    tool = next(t for t in plugin.tools if t.__name__ == "read_file")
+    wrapped = plugin._wrap_tool(tool)
+    assert inspect.signature(wrapped).return_annotation is str
+
+    small = temp_dir / "small.txt"
+    small.write_text("hello")
+    assert asyncio.run(wrapped(str(small))) == "hello" == tool(str(small))
+
+    content = "".join(f"line {i}\n" for i in range(2000))
+    large = temp_dir / "large.txt"
+    large.write_text(content)
+    monkeypatch.setenv("MCP_SERVER_PAGE_SIZE", "4096")
+
+    async def read_all() -> list[dict]:
+        pages = [json.loads(await wrapped(str(large)))]
+        while pages[-1]["next_cursor"]:
+            pages.append(await read_next_page(pages[-1]["next_cursor"]))
+        return pages
+
+    pages = asyncio.run(read_all())
+    assert len(pages) == -(-len(content) // 4096)
+    assert pages[-1]["complete"] is True
+    assert "".join(page["content"] for page in pages) == content
+
+    with pytest.raises(KeyError):
+        asyncio.run(read_next_page(pages[0]["next_cursor"]))
+
+
+def test_later_pages_keep_call_context(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Later pages run under the originating call's deadline and hold its limiter slot."""
+    monkeypatch.setenv("MCP_SERVER_PAGE_SIZE", "4")
+    limiter = ConcurrencyLimiter("pages", 1)
+    seen = []
+
+    def chunks() -> Iterator[str]:
+        for _ in range(3):
+            seen.append((time_remaining() is not None, limiter.active))
+            yield "abcd"
+
+    async def stream_tool() -> Iterator[str]:
+        return chunks()
+
+    paged = limit_concurrency(paginate(stream_tool, "pages", [limiter]), [limiter])
+    paged = apply_deadline(paged, 60, "pages")
+
+    async def read_two() -> dict:
+        first = json.loads(await paged())
+        assert limiter.active == 0
+        return await read_next_page(first["next_cursor"])
+
+    assert asyncio.run(read_two())["content"] == "abcd"
+    assert seen == [(True, 1), (True, 1)]
+    assert limiter.active == 0
+
+
+def test_streaming_tool_raises_after_partial_output(
+    temp_dir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Errors before any output are reported in the result; later ones are raised."""
+    from mcp_server.tools.file import handlers as file_handlers
+    from mcp_server.utils import FileOperationError
+
+    assert file_handlers.read_file(str(temp_dir / "missing.txt")).startswith("Error: ")
+    broken = temp_dir / "broken.txt"
+    broken.write_bytes(b"x" * 200_000 + b"\xff")
+    with pytest.raises(FileOperationError):
+        file_handlers.read_file(str(broken))
+
+    def failing_diff(*args: object, **kwargs: object) -> Iterator[str]:
+        yield from ["+line\n"] * 10_000
+        raise DeadlineExceededError("Tool call exceeded its deadline")
+
+    old, new = temp_dir / "old.txt", temp_dir / "new.txt"
+    old.write_text("a\n")
+    new.write_text("b\n")
+    monkeypatch.setattr(file_handlers.difflib, "unified_diff", failing_diff)
+    with pytest.raises(DeadlineExceededError):
+        file_handlers.diff_files(str(old), str(new))
+    assert "error" in json.loads(file_handlers.diff_files(str(old), str(new), format="bad"))
+
+
+def test_concurrency_limiter_queues_and_rejects() -> None:
+    """Calls beyond the limit wait in the queue; calls beyond the queue are rejected."""
+    limiter = ConcurrencyLimiter("slow_tool", max_concurrent=2, max_queue=1, queue_timeout=5)
+    running = []
+
+    async def slow_tool() -> str:
+        running.append(limiter.active)
+        await asyncio.sleep(0.1)
+        return "done"
+
+    limited = limit_concurrency(slow_tool, [limiter])
+
+    async def run_calls() -> list:
+        return list(await asyncio.gather(*(limited() for _ in range(4)), return_exceptions=True))
+
+    results = asyncio.run(run_calls())
+    assert results.count("done") == 3
+    assert [type(r) for r in results if r != "done"] == [ToolBusyError]
+    assert max(running) == 2
+    assert limiter.stats()["active"] == 0
+    assert limiter.stats()["rejected"] == 1
+
+
+def test_concurrency_limiter_wait_times_out() -> None:
+    """A queued call is rejected when no slot frees up within queue_timeout."""
+    limiter = ConcurrencyLimiter("slow_tool", max_concurrent=1, max_queue=4, queue_timeout=0.05)
+
+    async def slow_tool() -> str:
+        await asyncio.sleep(0.3)
+        return "done"
+
+    limited = limit_concurrency(slow_tool, [limiter])
+
+    async def run_calls() -> list:
+        return list(await asyncio.gather(limited(), limited(), return_exceptions=True))
+
+    first, second = asyncio.run(run_calls())
+    assert first == "done"
+    assert isinstance(second, ToolBusyError)
+    assert limiter.stats() == {
+        "max_concurrent": 1,
+        "max_queue": 4,
+        "active": 0,
+        "waiting": 0,
+        "rejected": 1,
+    }
+
+
+def test_deadline_cancels_running_handler() -> None:
+    """A call past its deadline fails at once and its handler sees the cancellation."""
+    stopped = []
+
+    def slow_handler() -> str:
+        for _ in range(100):
+            try:
+                check_deadline()
+            except DeadlineExceededError:
+                stopped.append(True)
+                raise
+            time.sleep(0.01)
+        return "finished"
+
+    tool = apply_deadline(make_async_handler(slow_handler), 0.05, "slow_handler")
+
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceededError):
+        asyncio.run(tool())
+    assert time.monotonic() - start < 0.5
+
+    for _ in range(50):
+        if stopped:
+            break
+        time.sleep(0.01)
+    assert stopped == [True]
+
+
+def test_plugin_concurrency_from_config() -> None:
+    """Plugin-wide and per-tool limits come from config.yaml."""
+    plugin = _load_plugin("browser")
+    assert plugin.limiter is not None
+    assert plugin.get_tool_options("browser_open")["max_concurrent"] == 2
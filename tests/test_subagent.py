@@ -52,7 +52,7 @@ def test_openai_client_mock() -> None:
     mock_response.raise_for_status = Mock()
 
     with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
-        with patch("requests.post", return_value=mock_response):
+        with patch("mcp_server.tools.http_client.post", return_value=mock_response):
             client = OpenAIClient()
             messages = [{"role": "user", "content": "Hello"}]
             result = client.call("gpt-3.5-turbo", messages)
@@ -81,7 +81,7 @@ def test_anthropic_client_mock() -> None:
     mock_response.raise_for_status = Mock()
 
     with patch.dict(os.environ, {"ANTHROPIC_API_KEY": "test-key"}):
-        with patch("requests.post", return_value=mock_response):
+        with patch("mcp_server.tools.http_client.post", return_value=mock_response):
             client = AnthropicClient()
             messages = [{"role": "user", "content": "Hello"}]
             result = client.call("claude-3-haiku-20240307", messages)
@@ -135,7 +135,7 @@ def test_subagent_manager_call_ai_mock() -> None:
     mock_response.raise_for_status = Mock()
 
     with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
-        with patch("requests.post", return_value=mock_response):
+        with patch("mcp_server.tools.http_client.post", return_value=mock_response):
             manager = SubagentManager()
             messages = [{"role": "user", "content": "What is the capital of France?"}]
 
@@ -170,7 +170,7 @@ def test_subagent_orchestrator_mock() -> None:
     mock_response.raise_for_status = Mock()
 
     with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
-        with patch("requests.post", return_value=mock_response):
+        with patch("mcp_server.tools.http_client.post", return_value=mock_response):
             manager = SubagentManager()
             orchestrator = SubagentOrchestrator(manager)
 
@@ -236,7 +236,7 @@ def test_subagent_call_tool_mock() -> None:
     subagent.register_tools(mcp)
 
     with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
-        with patch("requests.post", return_value=mock_response):
+        with patch("mcp_server.tools.http_client.post", return_value=mock_response):
             messages_json = json.dumps([{"role": "user", "content": "Test message"}])
 
             result_str = mcp.tools["subagent_call"](
@@ -280,7 +280,7 @@ def test_subagent_parallel_tool_mock() -> None:
     subagent.register_tools(mcp)
 
     with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
-        with patch("requests.post", return_value=mock_response):
+        with patch("mcp_server.tools.http_client.post", return_value=mock_response):
             tasks = [
                 {
                     "name": "task1",
@@ -338,7 +338,7 @@ def test_subagent_conditional_tool_mock() -> None:
     subagent.register_tools(mcp)
 
     with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
-        with patch("requests.post") as mock_post:
+        with patch("mcp_server.tools.http_client.post") as mock_post:
             # 设置两次调用的返回值
             mock_post.side_effect = [mock_response_condition, mock_response_branch]
 
@@ -21,7 +21,7 @@ def test_subagent_call_response_structure():
     mock_response.raise_for_status = Mock()
 
     with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
-        with patch("requests.post", return_value=mock_response):
+        with patch("mcp_server.tools.http_client.post", return_value=mock_response):
             manager = SubagentManager()
             result = manager.call_ai(
                 provider="openai",
@@ -51,7 +51,7 @@ def test_parallel_execution_no_cost():
     mock_response.raise_for_status = Mock()
 
     with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
-        with patch("requests.post", return_value=mock_response):
+        with patch("mcp_server.tools.http_client.post", return_value=mock_response):
             manager = SubagentManager()
             orchestrator = SubagentOrchestrator(manager)
             tasks = [
@@ -93,7 +93,7 @@ def test_custom_model_support():
     mock_response.raise_for_status = Mock()
 
     with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
-        with patch("requests.post", return_value=mock_response):
+        with patch("mcp_server.tools.http_client.post", return_value=mock_response):
             manager = SubagentManager()
 
             # 使用一个自定义模型名称
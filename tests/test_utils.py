@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""Test shared infrastructure in mcp_server.utils"""
+
+import asyncio
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+from mcp_server.utils import (
+    DeadlineExceededError,
+    JsonFormatter,
+    NetworkError,
+    RetryBudget,
+    SamplingFilter,
+    ValidationError,
+    async_retry,
+    backoff_delay,
+    call_deadline,
+    check_deadline,
+    deadline_timeout,
+    parse_retry_after,
+    retry,
+    time_remaining,
+    to_json,
+)
+
+
+def _record(level: int, message: str) -> logging.LogRecord:
+    return logging.LogRecord("mcp_server.test", level, __file__, 1, message, None, None)
+
+
+def test_sampling_filter_keeps_warnings() -> None:
+    """Hot-path INFO records are sampled while warnings always pass."""
+    sampler = SamplingFilter(0.25)
+
+    kept = [sampler.filter(_record(logging.INFO, f"hit {i}")) for i in range(8)]
+    assert kept.count(True) == 2
+    assert kept[0]
+
+    assert all(sampler.filter(_record(logging.WARNING, "slow")) for _ in range(3))
+    assert not SamplingFilter(0).filter(_record(logging.INFO, "dropped"))
+
+
+def test_json_formatter_outputs_one_object_per_record() -> None:
+    """JSON log lines carry level, logger name and message."""
+    line = JsonFormatter().format(_record(logging.ERROR, "fetch failed: 中文"))
+    entry = json.loads(line)
+
+    assert entry["level"] == "ERROR"
+    assert entry["logger"] == "mcp_server.test"
+    assert entry["message"] == "fetch failed: 中文"
+
+
+def test_to_json_is_compact_unless_pretty() -> None:
+    """Tool results are compact by default and indented on request."""
+    data = {"name": "测试", "items": [1, 2]}
+
+    assert to_json(data, pretty=False) == '{"name":"测试","items":[1,2]}'
+    assert to_json(data, pretty=True) == json.dumps(data, indent=2, ensure_ascii=False)
+    assert json.loads(to_json(data)) == data
+
+
+def test_call_deadline_clamps_timeouts_and_never_extends() -> None:
+    """Nested deadlines keep the earlier one and timeouts shrink to the time left."""
+    assert time_remaining() is None
+    assert deadline_timeout(30) == 30
+
+    with call_deadline(1.0):
+        with call_deadline(60.0):
+            remaining = time_remaining()
+            assert remaining is not None and remaining <= 1.0
+            assert deadline_timeout(30) <= 1.0
+
+    with call_deadline(60.0) as cancelled:
+        cancelled.set()
+        with pytest.raises(DeadlineExceededError):
+            check_deadline()
+
+    assert time_remaining() is None
+
+
+def test_retry_stops_at_deadline() -> None:
+    """Retries are abandoned instead of sleeping past the call deadline."""
+    attempts = []
+
+    @retry(max_attempts=5, delay=1.0, exceptions=(ValueError,), jitter=False)
+    def flaky() -> None:
+        attempts.append(1)
+        raise ValueError("down")
+
+    start = time.monotonic()
+    with call_deadline(0.5), pytest.raises(ValueError):
+        flaky()
+
+    assert len(attempts) == 1
+    assert time.monotonic() - start < 0.5
+
+
+def test_retry_backoff_is_jittered_and_bounded() -> None:
+    """Backoff doubles per retry, is capped, and full jitter stays within the bound."""
+    assert [backoff_delay(n, 1.0, 5.0, jitter=False) for n in range(4)] == [1.0, 2.0, 4.0, 5.0]
+    assert all(0 <= backoff_delay(3, 1.0, 5.0) <= 5.0 for _ in range(100))
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+
+
+def test_retry_skips_permanent_errors_and_honors_retry_after() -> None:
+    """Validation errors and 4xx responses are not retried; Retry-After sets the wait."""
+    calls = []
+
+    @retry(max_attempts=3, delay=5.0)
+    def rejected() -> None:
+        calls.append("rejected")
+        raise ValidationError("bad key")
+
+    with pytest.raises(ValidationError):
+        rejected()
+    assert calls == ["rejected"]
+
+    @retry(max_attempts=3, delay=5.0, exceptions=(NetworkError,))
+    def rate_limited() -> str:
+        calls.append("limited")
+        if calls.count("limited") == 1:
+            raise NetworkError("slow down", status_code=429, retry_after=0.05)
+        if calls.count("limited") == 2:
+            raise NetworkError("not found", status_code=404)
+        return "unreachable"
+
+    start = time.monotonic()
+    with pytest.raises(NetworkError, match="not found"):
+        rate_limited()
+    assert calls.count("limited") == 2
+    assert time.monotonic() - start < 1.0
+
+
+def test_retry_budget_limits_retries_per_host() -> None:
+    """Once a host's budget is spent, failures are raised without retrying."""
+    budget = RetryBudget(ratio=0.5, min_per_second=0.0, capacity=2.0)
+
+    assert budget.try_spend("api.example.com")
+    assert budget.try_spend("api.example.com")
+    assert not budget.try_spend("api.example.com")
+    assert budget.try_spend("other.example.com")
+
+    budget.record_attempt("api.example.com")
+    budget.record_attempt("api.example.com")
+    assert budget.try_spend("api.example.com")
+
+
+def test_async_retry_retries_coroutines() -> None:
+    """The async variant retries without blocking the event loop."""
+    attempts = []
+
+    @async_retry(max_attempts=3, delay=0.01)
+    async def flaky() -> str:
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise NetworkError("reset")
+        return "ok"
+
+    assert asyncio.run(flaky()) == "ok"
+    assert len(attempts) == 3
@@ -1,12 +1,32 @@
 #!/usr/bin/env python3
 """Test network tools"""
 
+import hashlib
+import json
+import socket
+import struct
 import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from typing import Any, Callable, Dict
+from typing import Any, Callable, Dict, Generator, List
+
+import pytest
+import requests
 
 sys.path.insert(0, str(Path(__file__).parent))
-from mcp_server.tools import web
+from mcp_server.tools import http_client, web
+from mcp_server.tools.web import (
+    crawler,
+    dns_resolver,
+    dom_cache,
+    downloader,
+    fetcher,
+    http_cache,
+)
+from mcp_server.tools.web.handlers import fetch_webpages_batch
+from mcp_server.utils import NetworkError, ValidationError
 
 
 class MockMCP:
@@ -21,6 +41,795 @@ class MockMCP:
         return decorator
 
 
+# Served at /file with range support and at /file/whole without
+FILE_DATA = b"".join(hashlib.sha256(str(i).encode()).digest() for i in range(10000))
+
+# Links of the pages served under /site/, a small site for crawl_site
+SITE_LINKS = {
+    "/site/": [
+        "a",
+        "/site/a#top",
+        "/site/b?utm_source=test&x=1",
+        "/site/private",
+        "/site/report.pdf",
+        "http://other.invalid/",
+    ],
+    "/site/a": ["/site/", "/site/c"],
+    "/site/b?x=1": ["/site/c", "/site/news"],
+    "/site/c": ["/site/d"],
+    "/site/news": [],
+    "/site/d": [],
+}
+ROBOTS_TXT = b"User-agent: *\nDisallow: /site/private\n"
+
+
+class LocalHandler(BaseHTTPRequestHandler):
+    """Serves small pages over keep-alive connections and records client ports and paths."""
+
+    protocol_version = "HTTP/1.1"
+    client_ports: List[int] = []
+    paths: List[str] = []
+    ranges: List[str] = []
+    # Range responses of /file that are cut off halfway
+    broken_ranges = 0
+    # Bytes of the endless /stream body written before the client hung up
+    streamed = 0
+
+    def do_GET(self) -> None:
+        self.client_ports.append(self.client_address[1])
+        self.paths.append(self.path)
+        if self.path == "/file":
+            self._send_file()
+            return
+        if self.path == "/missing":
+            self.send_error(404)
+            return
+        if self.path == "/stream":
+            self._send_stream()
+            return
+        if self.path in SITE_LINKS:
+            links = "".join(f"<a href='{href}'>{href}</a>" for href in SITE_LINKS[self.path])
+            body = f"<html><title>{self.path}</title><body>{links}</body></html>"
+            self._send_body(body.encode(), [("Content-Type", "text/html")])
+            return
+        if self.path == "/robots.txt":
+            self._send_body(ROBOTS_TXT, [])
+            return
+        if self.path == "/file/whole":
+            self._send_body(FILE_DATA, [("Content-Type", "application/octet-stream")])
+            return
+        if self.path.startswith("/slow"):
+            time.sleep(0.2)
+        if self.path == "/etag":
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.send_header("ETag", '"v1"')
+                self.end_headers()
+                return
+            self._send_body(b"etag page", [("ETag", '"v1"'), ("Cache-Control", "no-cache")])
+            return
+        if self.path.startswith("/big"):
+            rows = [f"<p>Row {i}:  value {i}</p>" for i in range(5000)]
+            separator = "" if self.path == "/big/minified" else "\n"
+            body = separator.join(["<html><body><nav>Menu</nav><script>x()</script>", *rows])
+            self._send_body(body.encode(), [("Content-Type", "text/html; charset=utf-8")])
+            return
+        if self.path == "/vary":
+            language = self.headers.get("Accept-Language", "none").encode()
+            self._send_body(
+                language, [("Vary", "Accept-Language"), ("Cache-Control", "max-age=60")]
+            )
+            return
+        if self.path == "/redirect":
+            self.send_response(302)
+            self.send_header("Location", "/page")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = (
+            b"<html><head><title>Local</title></head><body><nav><a href='/slow'>Slow</a></nav>"
+            b"<p class='note'>ok</p></body></html>"
+        )
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Set-Cookie", "session=secret")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_body(self, body: bytes, headers: List[Any]) -> None:
+        self.send_response(200)
+        if not any(name == "Content-Type" for name, _ in headers):
+            self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self) -> None:
+        self.paths.append(f"HEAD {self.path}")
+        if self.path != "/page":
+            self.send_error(405)
+            return
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _send_file(self) -> None:
+        """Serve FILE_DATA, honouring Range and If-Range."""
+        requested = self.headers.get("Range")
+        if_range = self.headers.get("If-Range")
+        if requested is None or (if_range is not None and if_range != '"f1"'):
+            self._send_body(FILE_DATA, [("ETag", '"f1"'), ("Accept-Ranges", "bytes")])
+            return
+
+        self.ranges.append(requested)
+        first, last = requested.split("=")[1].split("-")
+        body = FILE_DATA[int(first) : int(last) + 1]
+        self.send_response(206)
+        self.send_header("ETag", '"f1"')
+        self.send_header("Content-Range", f"bytes {first}-{last}/{len(FILE_DATA)}")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if LocalHandler.broken_ranges and len(body) > 1:
+            LocalHandler.broken_ranges -= 1
+            self.wfile.write(body[: len(body) // 2])
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    def _send_stream(self) -> None:
+        """Send an endless body without Content-Length until the client disconnects."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        chunk = b"x" * 65536
+        try:
+            while LocalHandler.streamed < 256 * 1024 * 1024:
+                self.wfile.write(chunk)
+                LocalHandler.streamed += len(chunk)
+        except OSError:
+            pass
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def local_server(monkeypatch: pytest.MonkeyPatch) -> Generator[str, None, None]:
+    """Run a local HTTP server and yield its base URL; web tools get empty memory caches."""
+    monkeypatch.setattr(http_cache, "_http_cache", http_cache.HttpCache())
+    monkeypatch.setattr(dom_cache, "_dom_cache", dom_cache.DomCache())
+    monkeypatch.setattr(crawler, "robots_cache", crawler.RobotsCache())
+    LocalHandler.client_ports = []
+    LocalHandler.paths = []
+    LocalHandler.ranges = []
+    LocalHandler.broken_ranges = 0
+    LocalHandler.streamed = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), LocalHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _dns_name(name: str) -> bytes:
+    return b"".join(bytes([len(label)]) + label.encode() for label in name.split(".")) + b"\0"
+
+
+def _txt(*strings: str) -> bytes:
+    return b"".join(bytes([len(text)]) + text.encode() for text in strings)
+
+
+# Zone of the stub DNS server: (name, type) -> [(owner, type, ttl, rdata)]
+DNS_ZONE: Dict[Any, List[Any]] = {
+    ("host.test", 1): [
+        ("host.test", 1, 300, socket.inet_aton("10.0.0.1")),
+        ("host.test", 1, 120, socket.inet_aton("10.0.0.2")),
+    ],
+    ("www.test", 1): [
+        ("www.test", 5, 600, _dns_name("host.test")),
+        ("host.test", 1, 300, socket.inet_aton("10.0.0.1")),
+    ],
+    ("test", 15): [("test", 15, 300, struct.pack(">H", 10) + _dns_name("mail.test"))],
+    ("test", 16): [("test", 16, 300, _txt("v=spf1", " -all"))],
+    ("big.test", 16): [("big.test", 16, 300, _txt("x" * 200)) for _ in range(10)],
+}
+DNS_SOA = _dns_name("ns.test") + _dns_name("admin.test") + struct.pack(">IIIII", 1, 2, 3, 4, 30)
+
+
+def _dns_response(query: bytes, tcp: bool = False) -> bytes:
+    """Answer a query from DNS_ZONE; answers over 512 bytes are truncated over UDP."""
+    query_id = struct.unpack(">H", query[:2])[0]
+    offset = 12
+    labels = []
+    while query[offset]:
+        labels.append(query[offset + 1 : offset + 1 + query[offset]].decode())
+        offset += 1 + query[offset]
+    qname = ".".join(labels).lower()
+    qtype = struct.unpack(">H", query[offset + 1 : offset + 3])[0]
+    question = query[12 : offset + 5]
+
+    def record(owner: str, rtype: int, ttl: int, rdata: bytes) -> bytes:
+        name = b"\xc0\x0c" if owner == qname else _dns_name(owner)  # compressed owner name
+        return name + struct.pack(">HHIH", rtype, 1, ttl, len(rdata)) + rdata
+
+    answers = DNS_ZONE.get((qname, qtype), [])
+    known = any(name == qname for name, _ in DNS_ZONE)
+    authority = [] if answers else [record("test", 6, 3600, DNS_SOA)]
+    flags = 0x8180 | (0 if known else 3)
+    body = b"".join(record(*answer) for answer in answers) + b"".join(authority)
+    if not tcp and len(question) + len(body) + 12 > 512:
+        flags |= 0x0200
+        answers, authority, body = [], [], b""
+    header = struct.pack(">HHHHHH", query_id, flags, 1, len(answers), len(authority), 0)
+    return header + question + body
+
+
+class StubDnsServer:
+    """DNS server on localhost answering from DNS_ZONE over UDP and TCP."""
+
+    def __init__(self) -> None:
+        self.udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.udp.bind(("127.0.0.1", 0))
+        self.port = self.udp.getsockname()[1]
+        self.tcp = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.tcp.bind(("127.0.0.1", self.port))
+        self.tcp.listen()
+        self.queries: List[str] = []
+        self.tcp_queries = 0
+        self.threads = [
+            threading.Thread(target=self._serve_udp, daemon=True),
+            threading.Thread(target=self._serve_tcp, daemon=True),
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def _serve_udp(self) -> None:
+        while True:
+            try:
+                query, client = self.udp.recvfrom(4096)
+            except OSError:
+                return
+            self.queries.append(query[12:].split(b"\0")[0].decode(errors="replace"))
+            self.udp.sendto(_dns_response(query), client)
+
+    def _serve_tcp(self) -> None:
+        while True:
+            try:
+                conn, _ = self.tcp.accept()
+            except OSError:
+                return
+            with conn:
+                length = struct.unpack(">H", conn.recv(2))[0]
+                response = _dns_response(conn.recv(length), tcp=True)
+                self.tcp_queries += 1
+                conn.sendall(struct.pack(">H", len(response)) + response)
+
+    def close(self) -> None:
+        self.udp.close()
+        self.tcp.close()
+
+
+@pytest.fixture
+def dns_server(monkeypatch: pytest.MonkeyPatch) -> Generator[StubDnsServer, None, None]:
+    """Run a stub DNS server; the web tools' resolver asks a silent server first, then it."""
+    server = StubDnsServer()
+    silent = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    silent.bind(("127.0.0.1", 0))
+    servers = [silent.getsockname(), ("127.0.0.1", server.port)]
+    monkeypatch.setattr(dns_resolver, "_resolver", dns_resolver.DnsResolver(servers, timeout=0.2))
+    try:
+        yield server
+    finally:
+        server.close()
+        silent.close()
+
+
+def test_http_client_reuses_connections(local_server: str) -> None:
+    """Requests to the same host share one kept-alive connection and store no cookies."""
+    http_client.close_session()
+
+    for _ in range(3):
+        response = http_client.get(f"{local_server}/page", timeout=5)
+        assert response.status_code == 200
+        assert "Local" in response.text
+
+    assert len(LocalHandler.client_ports) == 3
+    assert len(set(LocalHandler.client_ports)) == 1
+    assert len(http_client.get_session().cookies) == 0
+
+
+def test_fetch_webpages_batch_runs_concurrently(local_server: str) -> None:
+    """Batch fetches overlap, skip duplicates and report invalid URLs."""
+    urls = [f"{local_server}/slow?page={i}" for i in range(6)] + ["not a url"]
+    urls.append(urls[0])
+
+    start = time.monotonic()
+    result = json.loads(fetch_webpages_batch(urls, timeout=5, max_concurrent=6))
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 0.2 * 6
+    assert result["count"] == 7
+    assert result["succeeded"] == 6
+    assert result["failed"] == 1
+    assert result["results"][0] == {"url": "not a url", "error": "Invalid URL: not a url"}
+    assert sorted(r["url"] for r in result["results"][1:]) == sorted(urls[:6])
+    assert result["results"][1]["content"].endswith("ok")
+
+
+def test_fetch_webpages_batch_dedupes_redirects_and_stops_at_deadline(local_server: str) -> None:
+    """Redirects to a fetched page are duplicates; pages past the deadline time out."""
+    urls = [f"{local_server}/page", f"{local_server}/redirect"]
+    result = json.loads(fetch_webpages_batch(urls, timeout=5, max_concurrent=1))
+
+    assert result["succeeded"] == 1
+    assert result["duplicates"] == 1
+    assert result["results"][1] == {
+        "url": f"{local_server}/redirect",
+        "final_url": f"{local_server}/page",
+        "status_code": 200,
+        "duplicate_of": f"{local_server}/page",
+    }
+
+    slow = [f"{local_server}/slow?page={i}" for i in range(20)]
+    pages = list(fetcher.fetch_all(slow, max_concurrent=2, deadline=0.3, timeout=5))
+    assert len(pages) == 20
+    assert sum(1 for page in pages if page.get("error") == "Batch deadline exceeded") >= 14
+
+
+def test_fetcher_respects_per_host_limit(
+    local_server: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """No more than the per-host limit of requests reach one server at once."""
+    limits = fetcher.HostLimits(per_host=2)
+    monkeypatch.setattr(fetcher, "host_limits", limits)
+    urls = [f"{local_server}/slow?page={i}" for i in range(4)]
+
+    start = time.monotonic()
+    results = list(fetcher.fetch_all(urls, max_concurrent=4))
+    elapsed = time.monotonic() - start
+
+    assert sorted(r["url"] for r in results) == sorted(urls)
+    assert all(r["status_code"] == 200 for r in results)
+    assert elapsed >= 0.4
+    assert limits._slots == {}  # idle hosts are dropped
+
+
+def test_http_cache_serves_fresh_and_revalidates_stale(local_server: str) -> None:
+    """Fresh pages are served from the cache; no-cache pages are revalidated with ETags."""
+    first = web.handlers._fetch_webpage_helper(f"{local_server}/page")
+    assert web.handlers._fetch_webpage_helper(f"{local_server}/page") == first
+    assert LocalHandler.paths.count("/page") == 1
+
+    for _ in range(2):
+        response = fetcher.get_cached(f"{local_server}/etag", timeout=5)
+        assert response.status_code == 200
+        assert response.text == "etag page"
+    assert getattr(response, "from_cache", False)
+    assert LocalHandler.paths.count("/etag") == 2
+
+    stats = http_cache.get_http_cache().stats()
+    assert (stats["hits"], stats["revalidated"], stats["misses"]) == (1, 1, 2)
+
+
+def test_http_cache_keys_on_vary_and_persists(local_server: str, tmp_path: Path) -> None:
+    """Responses are cached per Vary header value and survive in the disk tier."""
+    cache = http_cache.HttpCache(cache_dir=tmp_path)
+    http_cache._http_cache = cache
+    url = f"{local_server}/vary"
+
+    for language in ["en", "fr", "en"]:
+        response = fetcher.get_cached(url, headers={"Accept-Language": language})
+        assert response.text == language
+    assert LocalHandler.paths.count("/vary") == 2
+
+    # A new process finds the entries (and their Vary names) on disk
+    http_cache._http_cache = http_cache.HttpCache(cache_dir=tmp_path)
+    response = fetcher.get_cached(url, headers={"Accept-Language": "fr"})
+    assert response.text == "fr"
+    assert LocalHandler.paths.count("/vary") == 2
+
+
+def test_http_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    """Memory and disk tiers stay within their budgets, evicting the oldest entries."""
+    cache = http_cache.HttpCache(max_bytes=8 * 2048, cache_dir=tmp_path, max_disk_bytes=4 * 1100)
+
+    def stored(url: str) -> None:
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response._content = b"x" * 1000
+        cache.store(url, {}, response)
+
+    for i in range(12):
+        stored(f"http://example.com/{i}")
+        cache.lookup("http://example.com/0", {})  # keep the first entry in use
+
+    stats = cache.stats()
+    assert stats["bytes"] <= 8 * 2048
+    assert stats["disk_bytes"] <= 4 * 1100
+    assert cache.lookup("http://example.com/0", {}) is not None
+    assert cache.lookup("http://example.com/1", {}) is None
+    assert len(list(tmp_path.glob("*.entry"))) < 12
+    # Vary names are kept only for URLs with entries in memory
+    assert set(cache._vary) <= {entry.url for entry in cache._entries.values()}
+    cache.lookup("http://example.com/never-cached", {})
+    assert "http://example.com/never-cached" not in cache._vary
+
+
+def test_extract_page_parses_once(local_server: str) -> None:
+    """extract_page returns everything from one parse, which later extractions reuse."""
+    url = f"{local_server}/page"
+    result = json.loads(web.handlers.extract_page(url, selectors=["p.note", "p["], engine="bs4"))
+
+    assert result["title"] == "Local"
+    assert result["links"] == [{"url": f"{local_server}/slow", "text": "Slow"}]
+    assert result["text"] == "Localok"
+    assert result["selectors"]["p.note"]["count"] == 1
+    assert result["selectors"]["p.note"]["elements"][0]["text"] == "ok"
+    assert "error" in result["selectors"]["p["]
+
+    # Later extractions with the same engine reuse the parse
+    assert json.loads(web.handlers.extract_page(url))["text"] == "Localok"
+    assert web.handlers.get_page_title(url) == "Local"
+    assert json.loads(web.handlers.get_page_links(url))["count"] == 1
+    stats = dom_cache.get_dom_cache().stats()
+    assert (stats["hits"], stats["misses"]) == (2, 2)
+
+
+def test_lxml_engine_matches_beautifulsoup() -> None:
+    """The lxml fast path extracts the same title, links, text and elements as BeautifulSoup."""
+    html = (
+        "<html><head><title> Doc </title><style>p {}</style></head><body>"
+        "<header>Site</header><p class='a b'>One <b>two</b><!-- note -->three</p>"
+        "<a href='/x' rel='next'>Next</a><a href='https://example.com/'> Ext </a><a>none</a>"
+        "<script>var x;</script><ruby>漢<rp>(</rp><rt>kan</rt></ruby><footer>Foot</footer>"
+        "</body></html>"
+    )
+    handlers = web.handlers
+    soup = dom_cache.DomCache().parse(html, "bs4")
+    doc = dom_cache.DomCache().parse(html, "lxml")
+
+    assert handlers._page_title(doc) == handlers._page_title(soup) == "Doc"
+    assert handlers._page_text(doc) == handlers._page_text(soup)
+    base = "http://example.org/dir/"
+    assert handlers._page_links(doc, base) == handlers._page_links(soup, base)
+    assert handlers._page_links(doc, base)[0]["url"] == "http://example.org/x"
+
+    if web.lxml_extract.HAS_CSSSELECT:
+        for selector in ["p.a", "a[rel]", "script", "ruby"]:
+            assert handlers._select_elements(doc, selector) == handlers._select_elements(
+                soup, selector
+            )
+    else:
+        result = json.loads(handlers.parse_html(html, "p.a", engine="lxml"))
+        assert "cssselect" in result["error"]
+    assert json.loads(handlers.parse_html(html, "p.a"))["elements"][0]["attributes"] == {
+        "class": ["a", "b"]
+    }
+
+
+def test_fetch_webpage_text_stops_at_max_chars(local_server: str) -> None:
+    """Streamed text extraction returns the start of the full text, also for one-line pages."""
+    for path in ["/big", "/big/minified"]:
+        url = f"{local_server}{path}"
+        streamed = web.handlers.fetch_webpage_text(url, max_chars=100)  # not cached yet
+        full = web.handlers.fetch_webpage_text(url)
+        assert streamed == full[:100]
+        assert full.startswith("Row 0:\nvalue 0")
+        assert "Menu" not in full
+        for max_chars in [1, 100, 20000]:
+            assert web.handlers.fetch_webpage_text(url, max_chars=max_chars) == full[:max_chars]
+        assert web.handlers.fetch_webpage_text(url, max_chars=10**8) == full
+
+
+def test_download_file_parallel_ranges(
+    local_server: str, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Large files are downloaded in ranges over several connections and verified."""
+    monkeypatch.setattr(downloader, "MIN_SEGMENT_SIZE", 64 * 1024)
+    target = tmp_path / "file.bin"
+    checksum = "sha256:" + hashlib.sha256(FILE_DATA).hexdigest()
+
+    result = web.handlers.download_file(f"{local_server}/file", str(target), checksum=checksum)
+
+    assert target.read_bytes() == FILE_DATA
+    assert "sha256 verified" in result
+    assert len(LocalHandler.ranges) == 5  # the probe and one range per connection
+    assert sorted(tmp_path.iterdir()) == [target]
+
+
+def test_download_file_resumes_partial_download(
+    local_server: str, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A .part file from an earlier attempt is completed; cut-off ranges are retried."""
+    monkeypatch.setattr(downloader, "MIN_SEGMENT_SIZE", 64 * 1024)
+    target = tmp_path / "file.bin"
+    half = len(FILE_DATA) // 2
+    part = tmp_path / "file.bin.part"
+    part.write_bytes(FILE_DATA[:half] + bytes(len(FILE_DATA) - half))
+    state = {
+        "url": f"{local_server}/file",
+        "size": len(FILE_DATA),
+        "validators": {"etag": '"f1"', "last_modified": None},
+        "done": [[0, half]],
+    }
+    (tmp_path / "file.bin.part.json").write_text(json.dumps(state))
+    LocalHandler.broken_ranges = 1
+
+    result = web.handlers.download_file(f"{local_server}/file", str(target), connections=2)
+
+    assert target.read_bytes() == FILE_DATA
+    assert "resumed after" in result
+    assert all(int(r.split("=")[1].split("-")[0]) >= half for r in LocalHandler.ranges[1:])
+    assert not part.exists()
+
+    # Without resume, the download starts over
+    part.write_bytes(bytes(len(FILE_DATA)))
+    (tmp_path / "file.bin.part.json").write_text(json.dumps({**state, "done": [[0, 1000]]}))
+    result = web.handlers.download_file(f"{local_server}/file", str(target), resume=False)
+    assert target.read_bytes() == FILE_DATA
+    assert "resumed" not in result
+
+
+def test_download_file_without_ranges_and_checksum_mismatch(
+    local_server: str, tmp_path: Path
+) -> None:
+    """Servers without range support get one request; a wrong checksum keeps no file."""
+    target = tmp_path / "whole.bin"
+    web.handlers.download_file(f"{local_server}/file/whole", str(target))
+    assert target.read_bytes() == FILE_DATA
+
+    other = tmp_path / "other.bin"
+    with pytest.raises(NetworkError, match="Checksum mismatch"):
+        web.handlers.download_file(f"{local_server}/file", str(other), checksum="0" * 64)
+    assert not other.exists()
+    assert sorted(tmp_path.iterdir()) == [target]
+
+    with pytest.raises(ValidationError):
+        web.handlers.download_file(f"{local_server}/file", str(other), checksum="sha256:abc")
+
+
+def test_http_request_stops_reading_at_max_bytes(local_server: str) -> None:
+    """Oversized bodies are rejected from Content-Length or after max_bytes are read."""
+    result = json.loads(web.handlers.http_request(f"{local_server}/file", max_bytes=1000))
+    assert result["error"].startswith("Response too large: 320000 bytes")
+
+    result = json.loads(web.handlers.http_request(f"{local_server}/stream", max_bytes=100000))
+    assert result["error"] == "Response too large: over 100000 bytes"
+    assert LocalHandler.streamed < 64 * 1024 * 1024
+
+    result = json.loads(web.handlers.http_request(f"{local_server}/page"))
+    assert result["status_code"] == 200
+    assert "<title>Local</title>" in result["body"]
+    assert result["size"] == len(result["body"])
+    assert "Set-Cookie" not in result["headers"]
+
+
+def test_http_request_saves_body_and_reads_ranges(local_server: str) -> None:
+    """Bodies can be saved to a file instead of returned, and byte ranges requested."""
+    result = json.loads(web.handlers.http_request(f"{local_server}/file", save_to_file=True))
+    body_file = Path(result["body_file"])
+    try:
+        assert "body" not in result
+        assert result["size"] == len(FILE_DATA)
+        assert body_file.read_bytes() == FILE_DATA
+    finally:
+        body_file.unlink()
+
+    result = json.loads(
+        web.handlers.http_request(f"{local_server}/file", byte_range="100-199", save_to_file=True)
+    )
+    body_file = Path(result["body_file"])
+    try:
+        assert result["status_code"] == 206
+        assert result["content_range"] == f"bytes 100-199/{len(FILE_DATA)}"
+        assert body_file.read_bytes() == FILE_DATA[100:200]
+    finally:
+        body_file.unlink()
+
+    for bad in [{"byte_range": "a-b"}, {"max_bytes": 0}, {"max_bytes": 11 * 1024 * 1024}]:
+        assert "error" in json.loads(web.handlers.http_request(f"{local_server}/file", **bad))
+
+
+def test_check_urls_batch(local_server: str) -> None:
+    """URLs are checked with HEAD, or a ranged GET where HEAD is rejected."""
+    urls = [f"{local_server}/page", f"{local_server}/file", f"{local_server}/missing", "bad"]
+    result = json.loads(web.handlers.check_urls_batch(urls + [urls[0]]))
+    by_url = {item["url"]: item for item in result["results"]}
+
+    assert by_url[urls[0]]["method"] == "HEAD" and by_url[urls[0]]["accessible"]
+    assert (by_url[urls[1]]["method"], by_url[urls[1]]["status_code"]) == ("GET", 206)
+    assert by_url[urls[2]]["status_code"] == 404 and not by_url[urls[2]]["accessible"]
+    assert "error" in by_url["bad"]
+    assert (result["count"], result["accessible"], result["broken"], result["failed"]) == (
+        4,
+        2,
+        1,
+        1,
+    )
+    assert "bytes=0-0" in LocalHandler.ranges
+
+    # The output of get_page_links can be passed as is
+    links = web.handlers.get_page_links(f"{local_server}/page")
+    result = json.loads(web.handlers.check_urls_batch(links))
+    assert [item["url"] for item in result["results"]] == [f"{local_server}/slow"]
+
+
+def test_check_urls_batch_limits_requests_per_host(local_server: str) -> None:
+    """No more than per_host URLs of one host are checked at once."""
+    urls = [f"{local_server}/slow?page={i}" for i in range(6)]
+    start = time.monotonic()
+    result = json.loads(web.handlers.check_urls_batch(urls, per_host=2))
+    assert time.monotonic() - start >= 0.6  # three rounds of 0.2 s GETs
+    assert result["accessible"] == 6
+
+
+def test_normalize_url_and_seen_urls() -> None:
+    """Spellings of one URL normalize alike; the seen set turns into a Bloom filter."""
+    assert crawler.normalize_url("HTTP://Example.COM:80/a/./b/../c?b=2&utm_source=x&a=1#top") == (
+        "http://example.com/a/c?a=1&b=2"
+    )
+    assert crawler.normalize_url("https://example.com") == "https://example.com/"
+    assert crawler.normalize_url("https://example.com:8443/") == "https://example.com:8443/"
+    assert crawler.normalize_url("mailto:someone@example.com") is None
+
+    seen = crawler.SeenUrls(exact_limit=10)
+    urls = [f"https://example.com/{i}" for i in range(50)]
+    assert all(seen.add(url) for url in urls)
+    assert seen.bloom is not None and not seen.urls
+    assert not seen.add(urls[0])
+    restored = crawler.SeenUrls.from_dict(json.loads(json.dumps(seen.to_dict())))
+    assert all(url in restored for url in urls) and restored.count == 50
+    assert sum(f"https://example.org/{i}" in restored for i in range(1000)) < 20
+
+
+def test_crawl_site(local_server: str) -> None:
+    """Pages are crawled once each, breadth-first, within robots.txt, scope and depth."""
+    result = json.loads(web.handlers.crawl_site(f"{local_server}/site/", max_depth=2, delay=0))
+    depths = {item["url"].replace(local_server, ""): item["depth"] for item in result["results"]}
+
+    assert depths == {
+        "/site/": 0,
+        "/site/a": 1,
+        "/site/b?x=1": 1,
+        "/site/private": 1,
+        "/site/c": 2,
+        "/site/news": 2,
+    }
+    by_path = {item["url"].replace(local_server, ""): item for item in result["results"]}
+    assert by_path["/site/private"]["skipped"] == "Disallowed by robots.txt"
+    assert by_path["/site/"]["title"] == "/site/"
+    assert by_path["/site/"]["new_links"] == 3
+    assert (result["pages"], result["skipped"], result["failed"]) == (5, 1, 0)
+    assert (result["queued"], result["stopped"]) == (0, "done")
+    assert LocalHandler.paths.count("/robots.txt") == 1
+    assert "/site/private" not in LocalHandler.paths
+
+    # Links matching the priority keywords are crawled first
+    result = json.loads(
+        web.handlers.crawl_site(
+            f"{local_server}/site/b?x=1", max_pages=2, priority_keywords=["news"], delay=0
+        )
+    )
+    assert [item["url"] for item in result["results"]][1] == f"{local_server}/site/news"
+    assert (result["stopped"], result["queued"]) == ("max_pages", 1)
+
+
+def test_crawl_site_resumes_from_checkpoint(local_server: str, tmp_path: Path) -> None:
+    """A crawl stopped at its page budget continues from the checkpoint without refetching."""
+    checkpoint = str(tmp_path / "crawl.json")
+    start_url = f"{local_server}/site/"
+    first = json.loads(
+        web.handlers.crawl_site(
+            start_url, max_pages=2, max_concurrent=1, max_depth=5, delay=0, checkpoint=checkpoint
+        )
+    )
+    assert (first["pages"], first["stopped"], first["resumed"]) == (2, "max_pages", False)
+
+    second = json.loads(
+        web.handlers.crawl_site(
+            start_url, max_pages=50, max_concurrent=1, max_depth=5, delay=0, checkpoint=checkpoint
+        )
+    )
+    assert second["resumed"] and second["stopped"] == "done"
+    first_urls = {item["url"] for item in first["results"]}
+    second_urls = {item["url"] for item in second["results"]}
+    assert not first_urls & second_urls
+    assert len(first_urls | second_urls) == 7  # six pages and the skipped one
+    assert second["crawled"] == 6
+
+
+def test_crawl_site_spaces_requests_to_a_host(local_server: str) -> None:
+    """Requests to one host are at least delay seconds apart."""
+    start = time.monotonic()
+    result = json.loads(
+        web.handlers.crawl_site(f"{local_server}/site/", max_pages=4, max_concurrent=4, delay=0.2)
+    )
+    assert result["pages"] == 4
+    assert time.monotonic() - start >= 0.6
+
+
+def test_dns_resolver_record_types(dns_server: StubDnsServer) -> None:
+    """Records are decoded from the wire format, truncated answers retried over TCP."""
+    resolver = dns_resolver.DnsResolver([("127.0.0.1", dns_server.port)], timeout=1)
+
+    answer = resolver.resolve("WWW.test.", "A")
+    assert answer.records == ["10.0.0.1"]
+    assert answer.aliases == ["host.test"]
+    assert answer.ttl == 300
+    assert resolver.resolve("host.test").ttl == 120
+
+    assert resolver.resolve("test", "MX").records == [{"preference": 10, "exchange": "mail.test"}]
+    assert resolver.resolve("test", "TXT").records == ["v=spf1 -all"]
+    assert resolver.resolve("big.test", "TXT").records == ["x" * 200] * 10
+    assert dns_server.tcp_queries == 1
+
+    missing = resolver.resolve("missing.test", "A")
+    assert (missing.rcode, missing.records, missing.ttl) == ("NXDOMAIN", [], 30)
+    assert resolver.resolve("host.test", "AAAA").rcode == "NOERROR"
+
+    # Answers are cached for their TTL, negative answers too
+    sent = len(dns_server.queries)
+    assert resolver.resolve("www.test").from_cache
+    assert resolver.resolve("missing.test").rcode == "NXDOMAIN"
+    assert len(dns_server.queries) == sent
+    assert resolver.stats()["hits"] == 2
+
+    with pytest.raises(ValidationError):
+        resolver.resolve("host.test", "HINFO")
+
+
+def test_dns_resolver_honours_hosts_file_and_system_resolver(
+    dns_server: StubDnsServer, tmp_path: Path
+) -> None:
+    """Hosts-file names are answered without a query; names DNS lacks go to getaddrinfo."""
+    hosts = tmp_path / "hosts"
+    hosts.write_text("# containers\n10.9.8.7  db.internal db  # compose\nfe80::1%eth0 db\n")
+    resolver = dns_resolver.DnsResolver([("127.0.0.1", dns_server.port)], timeout=1)
+    resolver.hosts = dns_resolver.HostsFile(str(hosts))
+
+    assert resolver.resolve("DB").records == ["10.9.8.7"]
+    assert resolver.resolve("db", "AAAA").records == ["fe80::1%eth0"]
+    assert resolver.resolve("db.internal").records == ["10.9.8.7"]
+    assert dns_server.queries == []
+
+    # localhost is not in this hosts file nor in the zone; the system resolver knows it
+    answer = resolver.resolve("localhost")
+    assert answer.rcode == "NOERROR" and "127.0.0.1" in answer.records
+    assert resolver.resolve("host.test").records == ["10.0.0.1", "10.0.0.2"]
+    assert resolver.resolve("missing.test").rcode == "NXDOMAIN"
+
+    result = json.loads(web.handlers.dns_lookup("localhost"))
+    assert result["success"] and "127.0.0.1" in result["records"]
+
+
+def test_dns_lookup_tools(dns_server: StubDnsServer) -> None:
+    """dns_lookup supports all record types; batches are queried concurrently."""
+    result = json.loads(web.handlers.dns_lookup("test", "mx"))
+    assert result["success"] and result["records"][0]["exchange"] == "mail.test"
+    assert "NXDOMAIN" in json.loads(web.handlers.dns_lookup("missing.test"))["error"]
+
+    names = [f"n{i}.test" for i in range(50)] + ["host.test", "www.test", "bad..name"]
+    start = time.monotonic()
+    result = json.loads(web.handlers.dns_lookup_batch(names))
+    # The first server never answers, so every lookup waits one timeout, in parallel
+    assert time.monotonic() - start < 2
+    by_name = {item["hostname"]: item for item in result["results"]}
+    assert [item["hostname"] for item in result["results"]] == names
+    assert by_name["n0.test"]["rcode"] == "NXDOMAIN"
+    assert by_name["host.test"]["records"] == ["10.0.0.1", "10.0.0.2"]
+    assert "error" in by_name["bad..name"]
+    assert (result["count"], result["succeeded"], result["failed"]) == (53, 52, 1)
+
+
 def test_network_tools() -> None:
     print("=" * 60)
     print("Testing Network Tools (3 tools)")